@@ -0,0 +1,26 @@
+"""
+`bench_composites` [module]
+
+Benchmarks for the queries on the coordinates of the trials.
+
+See Also
+--------
+`core.composites.coordinate_set.CoordinateSet`
+"""
+from core.composites.coordinate_set import CoordinateSet
+from core.composites.exp_conditions import ExpCondition
+from core.coordinates.exp_factor_coord import CoordTask, CoordCategory
+from core.attributes.exp_factors import Task, Category
+
+from harness import make_labels
+
+
+def bench_coordinate_set_match(bench, scale, rng):
+    """Boolean mask of the trials of one unit in one condition."""
+    n = scale.n_trials * scale.n_units  # one long coordinate set, as for concatenated sessions
+    features = CoordinateSet(
+        CoordTask(make_labels(n, rng)),
+        CoordCategory(make_labels(n, rng, ("R", "T"))),
+    )
+    mask = bench(features.match, ExpCondition(Task("PTD"), Category("T")))
+    assert mask.shape == (n,)
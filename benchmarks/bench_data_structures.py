@@ -0,0 +1,43 @@
+"""
+`bench_data_structures` [module]
+
+Benchmarks for the accessors of the data structures.
+
+See Also
+--------
+`core.data_structures.spike_times.SpikeTrains`
+"""
+import numpy as np
+
+from core.data_structures.spike_times import SpikeTrains
+from core.data_components.core_data import CoreData
+from core.data_components.core_dimensions import Dimensions
+from core.coordinates.exp_structure_coord import CoordRecording, CoordBlock, CoordSlot
+from core.attributes.brain_info import Unit
+from core.attributes.exp_structure import Recording, Block, Slot
+
+from harness import make_spikes
+
+
+def bench_spike_trains_get_trial(bench, scale, rng):
+    """Extraction of the spikes of each trial of one unit."""
+    spikes, trials = make_spikes(scale, rng)
+    n_slots = Slot.MAX  # trials arranged in blocks of slots 1..n_slots, in a single recording
+    dims = Dimensions("spikes")
+    spike_trains = SpikeTrains(
+        unit=Unit("avo052a-d1"),
+        data=CoreData(spikes, dims=dims),
+        recording=CoordRecording(np.ones(len(trials), dtype=int), dims=dims),
+        block=CoordBlock(trials // n_slots + 1, dims=dims),
+        slot=CoordSlot(trials % n_slots + 1, dims=dims),
+    )
+    keys = [
+        (Recording(1), Block(i // n_slots + 1), Slot(i % n_slots + 1))
+        for i in range(scale.n_trials)
+    ]
+
+    def get_all_trials():
+        return [spike_trains.get_trial(*key) for key in keys]
+
+    by_trial = bench(get_all_trials)
+    assert sum(len(s) for s in by_trial) == len(spikes)
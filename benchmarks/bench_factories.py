@@ -0,0 +1,60 @@
+"""
+`bench_factories` [module]
+
+Benchmarks for the factories of the coordinates of the population data.
+
+See Also
+--------
+`core.factories.create_core_spikes.FactoryCoordSlot`
+`core.factories.create_pseudo_trials.FactoryPseudoTrials`
+"""
+import numpy as np
+
+from core.factories.create_core_spikes import FactoryCoordSlot
+from core.factories.create_pseudo_trials import FactoryPseudoTrials
+from core.data_components.core_data import CoreData
+from core.composites.coordinate_set import CoordinateSet
+from core.composites.exp_conditions import ExpCondition
+from core.coordinates.exp_factor_coord import CoordTask, CoordCategory
+from core.coordinates.exp_structure_coord import CoordSlot
+from core.coordinates.time_coord import CoordTimeEvent
+from core.coordinates.trial_analysis_label_coord import CoordFolds
+from core.attributes.exp_factors import Task, Category
+from core.attributes.exp_structure import Slot
+
+from harness import make_trial_bounds
+
+
+def bench_factory_coord_slot_mark_slots(bench, scale, rng):
+    """Assignment of the spikes of one session to the slots of the trials."""
+    bounds = make_trial_bounds(scale)
+    t_end = bounds[-1, 1]
+    spikes = CoreData(np.sort(rng.uniform(0, t_end, size=scale.n_trials * scale.n_spikes)))
+    trials_slot = CoordSlot(np.arange(scale.n_trials) % (Slot.MAX + 1))  # valid slot labels
+    trials_start = CoordTimeEvent(bounds[:, 0])
+    trials_end = CoordTimeEvent(bounds[:, 1])
+    _, coord = bench(FactoryCoordSlot.mark_slots, spikes, trials_slot, trials_start, trials_end)
+    assert len(coord) == len(spikes)
+
+
+def bench_factory_pseudo_trials(bench, scale, rng):
+    """Pseudo-trials of one ensemble in all the conditions and folds."""
+    n_folds = 3
+    order_conditions = [
+        ExpCondition(Task(task), Category(categ)) for task in ("PTD", "CLK") for categ in "RT"
+    ]
+    counts_by_condition = {cond: scale.n_trials // 4 for cond in order_conditions}
+    # Trials of each unit shuffled over all the strata (condition x fold), none of them empty, as
+    # after the selection of the units with enough trials in the pipeline
+    trials_by_unit = [rng.permutation(scale.n_trials) for _ in range(scale.n_units)]
+    features_by_unit = [
+        CoordinateSet(
+            CoordTask(np.array(["PTD", "CLK"])[trials % 2]),
+            CoordCategory(np.array(["R", "T"])[trials // 2 % 2]),
+        )
+        for trials in trials_by_unit
+    ]
+    folds_by_unit = [CoordFolds(trials // 4 % n_folds) for trials in trials_by_unit]
+    factory = FactoryPseudoTrials(n_folds, counts_by_condition, order_conditions)
+    pseudo_trials = bench(factory.create, features_by_unit, folds_by_unit, seed=0)
+    assert pseudo_trials.shape[:2] == (scale.n_units, n_folds)
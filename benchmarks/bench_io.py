@@ -0,0 +1,53 @@
+"""
+`bench_io` [module]
+
+Benchmarks for the savers and loaders of the data files, in each supported format.
+
+See Also
+--------
+`utils.io_data.savers`
+`utils.io_data.loaders`
+"""
+import numpy as np
+import pytest
+
+from utils.io_data.savers import SaverNPY, SaverNPZ, SaverPKL, SaverCSVArray
+from utils.io_data.loaders import LoaderNPY, LoaderNPZ, LoaderPKL, LoaderCSVtoArrayFloat
+
+from harness import make_spikes
+
+
+FORMATS = {
+    "npy": (SaverNPY, LoaderNPY),
+    "npz": (SaverNPZ, LoaderNPZ),
+    "pkl": (SaverPKL, LoaderPKL),
+    "csv": (SaverCSVArray, LoaderCSVtoArrayFloat),
+}
+"""Savers and loaders of the benchmarked formats, by file extension."""
+
+
+def make_content(fmt, scale, rng):
+    """Spiking times of one unit, wrapped as expected by the saver of the format."""
+    spikes, _ = make_spikes(scale, rng)
+    return {"spikes": spikes} if fmt == "npz" else spikes
+
+
+@pytest.mark.parametrize("fmt", FORMATS, ids=list(FORMATS))
+def bench_save(bench, scale, rng, tmp_path, fmt):
+    """Saving of the spiking times of one unit."""
+    saver_class, _ = FORMATS[fmt]
+    content = make_content(fmt, scale, rng)
+    path = tmp_path / f"spikes.{fmt}"
+    bench(lambda: saver_class(path).save(content))
+    assert path.is_file()
+
+
+@pytest.mark.parametrize("fmt", FORMATS, ids=list(FORMATS))
+def bench_load(bench, scale, rng, tmp_path, fmt):
+    """Loading of the spiking times of one unit."""
+    saver_class, loader_class = FORMATS[fmt]
+    content = make_content(fmt, scale, rng)
+    path = tmp_path / f"spikes.{fmt}"
+    saver_class(path).save(content)
+    loaded = bench(lambda: loader_class(path).load())
+    assert len(loaded) == len(content)
@@ -0,0 +1,107 @@
+"""
+`bench_pipelines` [module]
+
+Benchmarks for the end-to-end pipelines.
+
+See Also
+--------
+`core.pipelines.parse_sessions.ParseSessions`
+`core.pipelines.format_population_data.FormatPopulation`
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.pipelines.parse_sessions import ParseSessions, ParseSessionsConfig, ParseSessionsInputs
+from core.pipelines.format_population_data import (
+    FormatPopulation,
+    FormatPopulationConfig,
+    FormatPopulationInputs,
+)
+from core.attributes.brain_info import Area, Training, Unit
+from core.attributes.exp_factors import Task, Category
+from core.attributes.exp_structure import Session, Slot
+from core.composites.base_container import Container
+from core.composites.exp_conditions import ExpCondition
+from core.coordinates.exp_factor_coord import CoordTask, CoordCategory
+from core.data_components.core_data import CoreIndices
+from core.data_components.core_dimensions import Dimensions
+from core.data_structures.trials_properties import TrialsProperties
+from utils.storage_rulers.impl_path_rulers import EventsPropertiesPath
+
+
+N_SESSIONS = 4
+"""Number of sessions parsed by each run of the pipeline."""
+
+
+def write_events(root, session, n_trials, rng):
+    """
+    Write the raw events table of one session, with ``n_trials`` slots in blocks of `Slot.MAX`.
+
+    Each slot presents a reference or a target stimulus between silences, in the format of the CSV
+    files exported from the MATLAB structure ``exptevents``.
+    """
+    events = []
+    for start in range(0, n_trials, Slot.MAX):
+        events.append("TRIALSTART")
+        for categ in rng.choice(["Reference", "Target"], size=min(Slot.MAX, n_trials - start)):
+            stim = "TORC_448_06_v501" if categ == "Reference" else "2000"
+            events += [f"'{part} , {stim} , {categ}'" for part in ("PreStimSilence", "Stim")]
+            events.append(f"'PostStimSilence , {stim} , {categ}'")
+        events.append("TRIALSTOP")
+    times = np.arange(len(events), dtype=float)
+    table = pd.DataFrame({"Event": events, "StartTime": times, "StopTime": times + 0.5})
+    path = EventsPropertiesPath(root).get_path(session).with_suffix(".csv")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(path, index=False)
+
+
+@pytest.mark.parametrize("use_cache", argvalues=[False, True], ids=["parse", "cached"])
+def bench_parse_sessions_execute(bench, scale, rng, tmp_path, use_cache):
+    """Parsing of the raw events of several sessions and assembly of their trials properties."""
+    sessions = [Session(f"avo052a{rec:02d}_p_PTD") for rec in range(1, N_SESSIONS + 1)]
+    for session in sessions:
+        write_events(tmp_path, session, scale.n_trials, rng)
+    config = ParseSessionsConfig(n_workers=1, use_cache=use_cache, root_data=tmp_path)
+    pipeline = ParseSessions(config)
+    trials = bench(pipeline.execute, ParseSessionsInputs(sessions=sessions))
+    assert trials.n_trials == N_SESSIONS * scale.n_trials
+
+
+class TaskCategory(ExpCondition):
+    """Conditions of the population benchmark: both tasks and both categories."""
+
+    REQUIRED_FACTORS = {
+        Task: {Task("PTD"), Task("CLK")},
+        Category: {Category("R"), Category("T")},
+    }
+
+
+def bench_format_population_execute(bench, scale, rng):
+    """Coordinates of the ensembles, pseudo-trials, trials and time of one population."""
+    dims = Dimensions("trials")
+    units = [Unit(f"avo{u // 10 + 1:03d}a-d{u % 10}") for u in range(scale.n_units)]  # 10 per site
+    trials_properties = Container(
+        {
+            unit: TrialsProperties(
+                sessions=[Session("avo052a01_p_PTD")],
+                data=CoreIndices(np.arange(scale.n_trials), dims=dims),
+                task=CoordTask(rng.choice(["PTD", "CLK"], size=scale.n_trials), dims=dims),
+                category=CoordCategory(rng.choice(["R", "T"], size=scale.n_trials), dims=dims),
+            )
+            for unit in units
+        },
+        key_type=Unit,
+        value_type=TrialsProperties,
+    )
+    config = FormatPopulationConfig(
+        exp_condition_type=TaskCategory,
+        ensemble_size=max(1, scale.n_units // 2),
+        n_ensembles_max=scale.n_ens,
+        coords_trials={"task": CoordTask, "category": CoordCategory},
+    )
+    inputs = FormatPopulationInputs(
+        area=Area("A1"), training=Training(True), units=units, trials_properties=trials_properties
+    )
+    population = bench(FormatPopulation(config).execute, inputs)
+    assert population.units.shape[1] == config.ensemble_size
@@ -0,0 +1,57 @@
+"""
+`bench_processors` [module]
+
+Benchmarks for the processors applied to each unit or population.
+
+See Also
+--------
+`core.processors.preprocess.convert_to_rates.FiringRatesConverter`
+`core.processors.preprocess.bootstrap.Bootstrapper`
+`core.processors.preprocess.count_samples.TrialsCounter`
+"""
+import numpy as np
+
+from core.processors.preprocess.convert_to_rates import FiringRatesConverter
+from core.processors.preprocess.bootstrap import Bootstrapper
+from core.processors.preprocess.count_samples import TrialsCounter
+from core.composites.coordinate_set import CoordinateSet
+from core.composites.exp_conditions import ExpCondition
+from core.coordinates.exp_factor_coord import CoordTask, CoordCategory
+from core.attributes.exp_factors import Task, Category
+
+from harness import make_spikes, make_counts, make_labels
+
+
+def bench_firing_rates_converter(bench, scale, rng):
+    """Conversion of the spikes of all the trials of one unit, trial by trial."""
+    spikes, trials = make_spikes(scale, rng)
+    by_trial = np.split(spikes, np.cumsum(np.bincount(trials, minlength=scale.n_trials))[:-1])
+    converter = FiringRatesConverter(t_bin=0.01, t_max=1.0, smooth_window=0.1)
+
+    def convert():
+        return [converter.process(spikes=s) for s in by_trial]
+
+    rates = bench(convert)
+    assert len(rates) == scale.n_trials
+
+
+def bench_bootstrapper_combine_trials(bench, scale, rng):
+    """Pseudo-trials of a population in one condition."""
+    counts = make_counts(scale, rng)
+    n_pseudo = int(counts.max())
+    pseudo_trials = bench(Bootstrapper.combine_trials, counts, n_pseudo, seed=0)
+    assert pseudo_trials.shape == (scale.n_units, n_pseudo)
+
+
+def bench_trials_counter(bench, scale, rng):
+    """Counts of the trials of each unit in one condition."""
+    features_by_unit = [
+        CoordinateSet(
+            CoordTask(make_labels(scale.n_trials, rng)),
+            CoordCategory(make_labels(scale.n_trials, rng, ("R", "T"))),
+        )
+        for _ in range(scale.n_units)
+    ]
+    counter = TrialsCounter(features_by_unit)
+    counts = bench(counter.process, ExpCondition(Task("PTD"), Category("T")))
+    assert counts.shape == (scale.n_units,)
@@ -0,0 +1,93 @@
+"""
+`conftest` [module]
+
+Configuration of the benchmark suite: command line options, scales and fixtures.
+
+Fixtures
+--------
+scale : Scale
+    Size of the synthetic inputs. Each benchmark is run once per scale selected by ``--scales``.
+rng : np.random.Generator
+    Random generator with a fixed seed, for reproducible inputs.
+bench : Benchmark
+    Measure a function, record its runtime and peak memory, and compare them to the baseline.
+
+See Also
+--------
+`harness`: Measurement and comparison tools.
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from harness import SCALES, BaselineStore, Benchmark
+
+
+def pytest_addoption(parser):
+    """Register the options of the benchmark suite."""
+    group = parser.getgroup("benchmarks")
+    group.addoption("--scales", default="small", help="Comma-separated scales: small,medium,large")
+    group.addoption("--benchmark-repeat", type=int, default=5, help="Timed repetitions.")
+    group.addoption("--benchmark-save", type=Path, default=None, help="Store the results (JSON).")
+    group.addoption("--benchmark-compare", type=Path, default=None, help="Baseline file (JSON).")
+    group.addoption("--benchmark-tolerance", type=float, default=0.2, help="Runtime tolerance.")
+    group.addoption("--memory-tolerance", type=float, default=0.1, help="Peak memory tolerance.")
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize the benchmarks which request the fixture `scale` by the selected scales."""
+    if "scale" in metafunc.fixturenames:
+        names = [name.strip() for name in metafunc.config.getoption("--scales").split(",")]
+        invalid = set(names) - set(SCALES)
+        if invalid:
+            raise pytest.UsageError(f"Invalid scales: {invalid} (options: {list(SCALES)})")
+        metafunc.parametrize("scale", [SCALES[name] for name in names], ids=names)
+
+
+def pytest_configure(config):
+    """Create the store of the session, loading the baseline if any."""
+    config.benchmark_store = BaselineStore(
+        baseline_path=config.getoption("--benchmark-compare"),
+        tolerance=config.getoption("--benchmark-tolerance"),
+        memory_tolerance=config.getoption("--memory-tolerance"),
+    )
+
+
+def pytest_sessionfinish(session):
+    """Save the records of the session if requested."""
+    path = session.config.getoption("--benchmark-save")
+    if path is not None:
+        session.config.benchmark_store.save(path)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Display a table of the records of the session."""
+    records = config.benchmark_store.records
+    if not records:
+        return
+    terminalreporter.section("benchmarks")
+    width = max(len(key) for key in records)
+    terminalreporter.write_line(f"{'benchmark':<{width}}  {'min (s)':>10}  {'median (s)':>10}  "
+                                f"{'peak (MiB)':>10}")
+    for key, record in sorted(records.items()):
+        terminalreporter.write_line(
+            f"{key:<{width}}  {record.time_min:>10.4g}  {record.time_median:>10.4g}  "
+            f"{record.peak_bytes / 2**20:>10.3f}"
+        )
+
+
+@pytest.fixture
+def rng():
+    """Random generator with a fixed seed."""
+    return np.random.default_rng(0)
+
+
+@pytest.fixture
+def bench(request):
+    """Benchmark bound to the current test and to the store of the session."""
+    return Benchmark(
+        key=request.node.nodeid,
+        store=request.config.benchmark_store,
+        repeat=request.config.getoption("--benchmark-repeat"),
+    )
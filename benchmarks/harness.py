@@ -0,0 +1,283 @@
+"""
+`harness` [module]
+
+Measurement and comparison tools for the benchmark suite.
+
+Classes
+-------
+Scale
+Record
+Benchmark
+BaselineStore
+
+Functions
+---------
+make_spikes
+make_trial_bounds
+make_counts
+make_labels
+
+Notes
+-----
+Each benchmark measures:
+
+- Runtime: minimum and median wall-clock durations over several repetitions, after one warm-up
+  call. The minimum is used for comparisons since it is the least sensitive to the load of the
+  machine.
+- Peak memory: maximum size of the memory blocks allocated by Python and NumPy during one extra
+  call, traced by `tracemalloc` (separate call, since tracing slows down the execution).
+
+Regressions are detected by comparison with a baseline stored by a previous run (JSON file): a
+benchmark fails if its runtime or peak memory exceeds the baseline by more than a relative
+tolerance.
+"""
+from dataclasses import dataclass, asdict
+import json
+from pathlib import Path
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Scale:
+    """
+    Size of the synthetic inputs of the benchmarks.
+
+    Attributes
+    ----------
+    n_units : int
+        Number of units in the population.
+    n_trials : int
+        Number of trials per unit.
+    n_spikes : int
+        Mean number of spikes per trial.
+    n_ens : int
+        Number of ensembles (pseudo-populations).
+    """
+
+    n_units: int
+    n_trials: int
+    n_spikes: int
+    n_ens: int
+
+
+SCALES: Dict[str, Scale] = {
+    "small": Scale(n_units=10, n_trials=60, n_spikes=20, n_ens=2),
+    "medium": Scale(n_units=100, n_trials=200, n_spikes=50, n_ens=10),
+    "large": Scale(n_units=2000, n_trials=400, n_spikes=100, n_ens=100),
+}
+"""Predefined scales, from quick checks (small) to production-size populations (large)."""
+
+
+@dataclass
+class Record:
+    """
+    Measurements of one benchmark.
+
+    Attributes
+    ----------
+    time_min, time_median : float
+        Runtime statistics across the repetitions (in seconds).
+    peak_bytes : int
+        Peak traced memory during one call (in bytes).
+    repeat : int
+        Number of timed repetitions.
+    """
+
+    time_min: float
+    time_median: float
+    peak_bytes: int
+    repeat: int
+
+
+class BaselineStore:
+    """
+    Collect the records of a session, save them, and compare them to a stored baseline.
+
+    Attributes
+    ----------
+    records : Dict[str, Record]
+        Records of the current session, by benchmark identifier.
+    baseline : Dict[str, Dict[str, Any]]
+        Records of the baseline, by benchmark identifier. Empty if no baseline is provided.
+    tolerance : float
+        Relative increase of the runtime above which a benchmark is considered as a regression.
+    memory_tolerance : float
+        Relative increase of the peak memory above which a benchmark is considered as a regression.
+
+    Methods
+    -------
+    `load`
+    `save`
+    `compare`
+    """
+
+    def __init__(
+        self,
+        baseline_path: Optional[Path] = None,
+        tolerance: float = 0.2,
+        memory_tolerance: float = 0.1,
+    ) -> None:
+        self.records: Dict[str, Record] = {}
+        self.baseline = self.load(baseline_path) if baseline_path else {}
+        self.tolerance = tolerance
+        self.memory_tolerance = memory_tolerance
+
+    @staticmethod
+    def load(path: Path) -> Dict[str, Dict[str, Any]]:
+        """Load the records of a baseline file, without its metadata."""
+        with Path(path).open("r", encoding="utf-8") as file:
+            content = json.load(file)
+        return content.get("records", {})
+
+    def save(self, path: Path) -> None:
+        """Save the records of the session with metadata about the environment."""
+        content = {
+            "metadata": {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "processor": platform.processor(),
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "records": {key: asdict(record) for key, record in sorted(self.records.items())},
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with Path(path).open("w", encoding="utf-8") as file:
+            json.dump(content, file, indent=2)
+
+    def compare(self, key: str, record: Record) -> List[str]:
+        """
+        Compare a record to the baseline.
+
+        Returns
+        -------
+        regressions : List[str]
+            Descriptions of the regressions (empty if none, or if the benchmark is absent from the
+            baseline).
+        """
+        reference = self.baseline.get(key)
+        if reference is None:
+            return []
+        regressions = []
+        if record.time_min > reference["time_min"] * (1 + self.tolerance):
+            ratio = record.time_min / reference["time_min"]
+            regressions.append(
+                f"runtime {record.time_min:.4g}s vs {reference['time_min']:.4g}s (x{ratio:.2f})"
+            )
+        if record.peak_bytes > reference["peak_bytes"] * (1 + self.memory_tolerance) + 1024:
+            regressions.append(
+                f"peak memory {record.peak_bytes} B vs {reference['peak_bytes']} B"
+            )
+        return regressions
+
+
+class Benchmark:
+    """
+    Callable which measures one function for one benchmark.
+
+    Attributes
+    ----------
+    key : str
+        Identifier of the benchmark (pytest node identifier, including the scale).
+    store : BaselineStore
+        Collector of the records.
+    repeat : int
+        Number of timed repetitions.
+    record : Record, optional
+        Measurements, once the benchmark has been run.
+
+    Examples
+    --------
+    In a benchmark function, with the fixture `bench`:
+
+    >>> def bench_converter(bench, scale):
+    ...     spikes = ...
+    ...     rates = bench(converter.process, spikes)
+    """
+
+    def __init__(self, key: str, store: BaselineStore, repeat: int = 5) -> None:
+        self.key = key
+        self.store = store
+        self.repeat = repeat
+        self.record: Optional[Record] = None
+
+    def __call__(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Measure a function and return the result of its warm-up call.
+
+        Raises
+        ------
+        AssertionError
+            If the measurements regress compared to the baseline.
+        """
+        result = func(*args, **kwargs)  # warm-up (caches, lazy imports, page faults)
+        durations = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            func(*args, **kwargs)
+            durations.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.record = Record(min(durations), statistics.median(durations), peak, self.repeat)
+        self.store.records[self.key] = self.record
+        regressions = self.store.compare(self.key, self.record)
+        assert not regressions, f"Regression in {self.key}: " + "; ".join(regressions)
+        return result
+
+
+# --- Synthetic Inputs -----------------------------------------------------------------------------
+
+
+def make_spikes(
+    scale: Scale, rng: np.random.Generator, t_max: float = 1.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate the spiking times of one unit in all its trials (homogeneous Poisson process).
+
+    Returns
+    -------
+    spikes : np.ndarray
+        Spiking times relative to the start of their trial, in ``[0, t_max)``.
+        Shape: ``(n_spikes_tot,)``.
+    trials : np.ndarray
+        Index of the trial of each spike. Shape: ``(n_spikes_tot,)``.
+    """
+    n_by_trial = rng.poisson(scale.n_spikes, size=scale.n_trials)
+    trials = np.repeat(np.arange(scale.n_trials), n_by_trial)
+    spikes = rng.uniform(0, t_max, size=len(trials))
+    return spikes, trials
+
+
+def make_trial_bounds(scale: Scale, t_max: float = 1.0, gap: float = 0.1) -> np.ndarray:
+    """
+    Generate the boundaries of consecutive trials in a block, separated by gaps.
+
+    Returns
+    -------
+    bounds : np.ndarray
+        Start and end times of each trial, relative to the block. Shape: ``(n_trials, 2)``.
+    """
+    starts = np.arange(scale.n_trials) * (t_max + gap)
+    return np.stack([starts, starts + t_max], axis=1)
+
+
+def make_counts(scale: Scale, rng: np.random.Generator) -> np.ndarray:
+    """Generate the numbers of trials of the units in one condition. Shape: ``(n_units,)``."""
+    return rng.integers(scale.n_trials // 2, scale.n_trials + 1, size=scale.n_units)
+
+
+def make_labels(
+    n: int, rng: np.random.Generator, options: Tuple[str, ...] = ("PTD", "CLK")
+) -> np.ndarray:
+    """Draw labels of an experimental factor for ``n`` trials."""
+    return rng.choice(np.array(options), size=n)
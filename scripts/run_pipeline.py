@@ -90,6 +90,12 @@ Hydra Features Used:
 
 - `hydra.run.dir`: Controlling Hydra output storage.
 
+**Tracing**
+
+Each run is traced (see `utils.misc.tracing`): the trace of the nested spans (pipeline, steps,
+factories, builders, processors) is saved in the Hydra run directory and a summary table is logged
+at the end of the run. Inspect it later with ``mtcdb trace-summary <trace.json>``.
+
 See Also
 --------
 hydra : Configuration management tool for Python projects.
@@ -100,6 +106,8 @@ import logging
 import hydra
 from omegaconf import DictConfig
 
+from utils.misc.tracing import format_summary, trace_run, TRACER
+
 CONFIG_DIR = "config"
 """Name of the directory containing configuration files."""
 CONFIG_MAIN = "main"
@@ -145,12 +153,15 @@ def main(cfg: DictConfig):
         logger.error("Failed instantiating pipeline: %s", e)
         raise
 
-    # Run the pipeline
+    # Run the pipeline, tracing its execution in the Hydra run directory
     try:
-        pipeline_instance.run()
+        with trace_run():
+            pipeline_instance.run()
     except Exception as e:
         logger.error("Failed running pipeline: %s", e)
         raise
+    finally:
+        logger.info("Trace saved in %s:\n%s", TRACER.path, format_summary(TRACER.summary()))
 
 if __name__ == "__main__":
     main()  # pylint: disable=no-value-for-parameter
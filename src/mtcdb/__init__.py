@@ -5,7 +5,8 @@ Variables
 ---------
 __version__ : str, default "0.0.0+unknown"
     Version of the package. If the package metadata is unavailable (e.g. in editable or source-only
-    environments), a fallback value is provided (PEP 440 compliant).
+    environments), a fallback value is provided (PEP 440 compliant). It is resolved at the first
+    access (PEP 562 module `__getattr__`), since reading the metadata slows down the startup.
 __all__ : list
     Public objects exposed by this package.
 
@@ -13,6 +14,8 @@ Functions
 ---------
 info() -> str
     Format diagnostic information about the package and platform.
+get_version() -> str
+    Read the version of the package (cached after the first call).
 
 Examples
 --------
@@ -29,19 +32,33 @@ importlib.metadata.version
 PackageNotFoundError
     Exception raised when the package is not found in the environment.
 """
-from importlib.metadata import version, PackageNotFoundError
 import platform
 
-try:
-    if __package__ is None: # erroneous script execution
-        raise PackageNotFoundError
-    __version__ = version(__package__)
-except PackageNotFoundError:
-    __version__ = "0.0.0+unknown"
-
 __all__ = ["info", "__version__"]
 
 
+def get_version() -> str:
+    """Read the version of the package in its metadata (once), with a fallback value."""
+    if "__version__" not in globals():
+        # pylint: disable=import-outside-toplevel
+        from importlib.metadata import version, PackageNotFoundError
+
+        try:
+            if __package__ is None: # erroneous script execution
+                raise PackageNotFoundError
+            globals()["__version__"] = version(__package__)
+        except PackageNotFoundError:
+            globals()["__version__"] = "0.0.0+unknown"
+    return globals()["__version__"]
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        return get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def info() -> str:
     """Format diagnostic information on package and platform."""
-    return f"{__package__} {__version__} | Platform: {platform.system()} Python {platform.python_version()}"
+    system = f"{platform.system()} Python {platform.python_version()}"
+    return f"{__package__} {get_version()} | Platform: {system}"
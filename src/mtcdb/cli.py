@@ -6,6 +6,8 @@ Defines commands available via `python -m mtcdb` or `mtcdb` if installed as a sc
 Commands
 --------
 info : Display diagnostic information.
+trace-summary : Print the summary table of a saved execution trace.
+build-populations : Build the populations of all the brain areas and training statuses.
 
 See Also
 --------
@@ -13,8 +15,14 @@ typer.Typer
     Library for building CLI applications: https://typer.tiangolo.com/
 """
 
+from importlib import import_module
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
 import typer
-from . import info, __version__
+from . import info, get_version
 
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
@@ -25,6 +33,64 @@ def cli_info() -> None:
     typer.echo(info())
 
 
+@app.command("trace-summary")
+def cli_trace_summary(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False, help="Trace file (JSON).")
+) -> None:
+    """Print the summary table of a trace saved by a pipeline run (see `utils.misc.tracing`)."""
+    # pylint: disable=import-outside-toplevel
+    from utils.misc.tracing import format_summary, summarize
+
+    with path.open("r", encoding="utf-8") as file:
+        spans = json.load(file)["spans"]
+    typer.echo(format_summary(summarize(spans)))
+
+
+@app.command("build-populations")
+def cli_build_populations(
+    condition: str = typer.Option(
+        ..., help="Import path of the `ExpCondition` subclass to use (module:Class)."
+    ),
+    params: Optional[Path] = typer.Option(
+        None, exists=True, dir_okay=False, help="Parameters file listing `areas` and `trainings`."
+    ),
+    root_data: Optional[Path] = typer.Option(
+        None, file_okay=False, help="Root data directory (default: `DATA_DIR` variable)."
+    ),
+    workers: int = typer.Option(os.cpu_count() or 1, min=1, help="Number of worker processes."),
+    max_memory: Optional[float] = typer.Option(
+        None, min=0, help="Memory limit of each worker, in GiB (default: no limit)."
+    ),
+    resume: bool = typer.Option(False, "--resume", help="Skip the completed combinations."),
+) -> None:
+    """Run `FormatPopulation` for every area x training combination in a process pool."""
+    # pylint: disable=import-outside-toplevel
+    from core.pipelines.build_populations import BatchPopulations, DEFAULT_PARAMS, load_grid
+    from core.pipelines.format_population_data import FormatPopulationConfig
+
+    module_name, _, class_name = condition.replace(":", ".").rpartition(".")
+    exp_condition_type = getattr(import_module(module_name), class_name)
+    tasks = load_grid(params or DEFAULT_PARAMS)
+    batch = BatchPopulations(
+        FormatPopulationConfig(exp_condition_type=exp_condition_type),
+        root_data=root_data,
+        workers=workers,
+        max_memory=None if max_memory is None else int(max_memory * 2**30),
+        resume=resume,
+    )
+    typer.echo(f"Building {len(tasks)} populations with {workers} worker(s)")
+    results = batch.run(
+        tasks, callback=lambda r: typer.echo(f"[{r.status.upper()}] {r.key} {r.error}".rstrip())
+    )
+    typer.echo(f"{'population':<12} {'status':<8} {'time_s':>8} {'rss_mib':>8} {'loads':>5}")
+    for r in results:
+        typer.echo(
+            f"{r.key:<12} {r.status:<8} {r.duration:>8.1f} {r.rss / 2**20:>8.0f} {r.n_loads:>5}"
+        )
+    if any(r.status == "failed" for r in results):
+        raise typer.Exit(code=1)
+
+
 @app.callback()
 def main_callback(
     version: bool = typer.Option(
@@ -33,5 +99,5 @@ def main_callback(
 ) -> None:
     """Root command for the package command-line interface."""
     if version:
-        typer.echo(__version__)
+        typer.echo(get_version())
         raise typer.Exit()
@@ -95,8 +95,19 @@ See Also
 """
 # pylint: disable=unused-variable
 # pylint: disable=unused-wildcard-import
-from importlib.metadata import version
+from core.constants import *
 
-__version__ = version(__package__)
 
-from core.constants import *
+def __getattr__(name: str):
+    """
+    Resolve the package version at the first access (PEP 562).
+
+    Reading the installed metadata (`importlib.metadata`) takes tens of milliseconds, which would be
+    paid by every process importing any module of the package.
+    """
+    if name == "__version__":
+        from importlib.metadata import version  # pylint: disable=import-outside-toplevel
+
+        globals()["__version__"] = value = version(__package__)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
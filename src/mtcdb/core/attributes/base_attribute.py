@@ -155,9 +155,11 @@ class Attribute(Generic[BaseT]):
 
         Notes
         -----
-
+        The options are retrieved from the class, since attributes with free values (e.g. `Unit`)
+        do not define them: looking them up on the instance would call this method recursively
+        (e.g. when unpickling the object).
         """
-        if name in self.OPTIONS:
+        if name in getattr(type(self), "OPTIONS", ()):
             return self.__class__(name)  # type: ignore[call-arg]
         if hasattr(super(), "__getattr__"):  # fallback to parent class if possible
             return super().__getattr__(name)  # type: ignore[misc]
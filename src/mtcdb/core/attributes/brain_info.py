@@ -52,6 +52,12 @@ class Animal(BrainInfo):
     NAIVE : FrozenSet[str]
         Naive animals, which did not learn any task.
 
+    Notes
+    -----
+    The alias ``'syn'`` does not correspond to a real animal: it identifies the synthetic data sets
+    (see `core.processors.simulate.synthetic_sessions`), so that their sites, units and sessions
+    are valid identifiers.
+
     Attributes
     ----------
     alias : str
@@ -78,6 +84,7 @@ class Animal(BrainInfo):
             "plu": "Pluto",
             "saf": "Saffron",
             "sir": "Sirius",
+            "syn": "Synthetic",
             "tan": "Tango",
             "tel": "Telesto",
             "tul": "Tulip",
@@ -49,7 +49,7 @@ class ExpStructure(int, Attribute[int]):
     MAX: Optional[int] = None
 
     def __new__(cls, value: int) -> Self:
-        if cls.is_valid(value):  # method from the current subclass
+        if not cls.is_valid(value):  # method from the current subclass
             raise ValueError(
                 f"Invalid value for {cls.__name__}: {value} out of bounds "
                 f"(min: {cls.MIN}, max: {cls.MAX})."
@@ -183,7 +183,7 @@ class Session(str, Attribute[str]):
     """
 
     ID_PATTERN = re.compile(
-        f"^(?P<site>{Site.SITE_PATTERN})(?P<rec>[0-9]{2})_(?P<attn>[a-z])_(?P<task>[A-Z]{3})$"
+        f"^(?P<site>{Site.SITE_PATTERN})(?P<rec>[0-9]{{2}})_(?P<attn>[a-z])_(?P<task>[A-Z]{{3}})$"
     )
     DEFAULT_VALUE = ""
 
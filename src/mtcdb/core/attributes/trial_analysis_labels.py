@@ -27,7 +27,7 @@ class TrialAnalysisLabel(int, Attribute[int]):
     MIN = 0
 
     def __new__(cls, value: int) -> Self:
-        if cls.is_valid(value):  # method from the current subclass
+        if not cls.is_valid(value):  # method from the current subclass
             raise ValueError(f"Invalid value for {cls.__name__}: {value}")
         return super().__new__(cls, value)
 
@@ -16,6 +16,7 @@ builder.
 Modules
 -------
 `base_builder`
+`build_condition_averages`
 
 Notes
 -----
@@ -11,6 +11,7 @@ from abc import ABC, abstractmethod
 from typing import TypeVar, Generic, Type, Tuple, Optional
 
 from core.data_structures.base_data_structure import DataStructure
+from utils.misc.tracing import traced
 
 
 Product = TypeVar("Product", bound=DataStructure)
@@ -59,6 +60,13 @@ class Builder(Generic[Product], ABC):
     PRODUCT_CLASS: Type[Product]
     TMP_DATA: Tuple[str, ...]
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Trace the calls to `build` in each concrete builder."""
+        super().__init_subclass__(**kwargs)
+        method = cls.__dict__.get("build")
+        if callable(method) and not getattr(method, "__isabstractmethod__", False):
+            setattr(cls, "build", traced(method, cls.__name__, "builder"))
+
     def __init__(self) -> None:
         self.product: Optional[Product] = None  # declare the type of product to build
         self.reset()
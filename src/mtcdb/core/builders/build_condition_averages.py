@@ -0,0 +1,120 @@
+"""
+`core.builders.build_condition_averages` [module]
+
+Classes
+-------
+ConditionAveragesBuilder
+"""
+from typing import Sequence
+
+import numpy as np
+
+from core.builders.base_builder import Builder
+from core.composites.exp_conditions import ExpCondition
+from core.data_components.core_data import CoreRates
+from core.data_components.core_dimensions import Dimensions
+from core.data_structures.condition_averages import ConditionAverages
+from core.data_structures.firing_rates_pop import FiringRatesPop
+from core.processors.preprocess.group_trials import GroupedReducer, Statistic
+
+
+class ConditionAveragesBuilder(Builder[ConditionAverages]):
+    """
+    Reduce the pseudo-trials of a population into statistics by experimental condition.
+
+    Product: `ConditionAverages`
+
+    - Inputs: Firing rates of a pseudo-population, whose trials are arranged in contiguous blocks
+      of conditions.
+    - Output: Statistic of the firing rates in each condition, for all the ensembles, units, folds
+      and time points.
+
+    Attributes
+    ----------
+    reducer : GroupedReducer
+        Processor computing the statistic over the blocks of trials.
+
+    Methods
+    -------
+    build (implementation of the base class method)
+
+    Examples
+    --------
+    Condition means of a population built with the blocks of the factory:
+
+    >>> builder = ConditionAveragesBuilder(stat="mean")
+    >>> counts = [factory.counts_by_condition[cond] for cond in factory.order_conditions]
+    >>> averages = builder.build(pop, factory.order_conditions, counts)
+    >>> averages.shape  # (n_ens, n_units, n_folds, n_conditions, n_t)
+
+    See Also
+    --------
+    `core.processors.preprocess.group_trials.GroupedReducer`: Grouped reductions along the trials.
+    """
+
+    PRODUCT_CLASS = ConditionAverages
+    TMP_DATA = ()
+
+    def __init__(self, stat: Statistic = "mean", ddof: int = 0) -> None:
+        if stat == "count":
+            raise ValueError("Invalid statistic for firing rates: 'count' (see `counts`)")
+        # Call the base class constructor: declare empty product and internal data
+        super().__init__()
+        # Store configuration parameters
+        self.reducer = GroupedReducer(stat=stat, ddof=ddof)
+
+    def build(
+        self,
+        population: FiringRatesPop,
+        conditions: Sequence[ExpCondition],
+        counts: Sequence[int],
+    ) -> ConditionAverages:
+        """
+        Implement the base class method.
+
+        Arguments
+        ---------
+        population : FiringRatesPop
+            Firing rates of the pseudo-population, with the pseudo-trials of each condition in one
+            contiguous block along the dimension ``trials``.
+        conditions : Sequence[ExpCondition]
+            Experimental conditions, in the order of the blocks.
+        counts : Sequence[int]
+            Number of pseudo-trials in each block.
+
+        Returns
+        -------
+        averages : ConditionAverages
+            Statistic in each condition, with the metadata and the coordinates ``units`` and
+            ``time`` of the population.
+
+        Raises
+        ------
+        ValueError
+            If the numbers of conditions and counts differ, or if the blocks do not cover the
+            trials (see `GroupedReducer.starts_from_boundaries`).
+        """
+        if len(conditions) != len(counts):
+            raise ValueError(f"Conditions and counts differ: {len(conditions)} != {len(counts)}")
+        ends = np.cumsum(counts)
+        boundaries = list(zip(ends - np.asarray(counts), ends))
+        axis = population.get_axis("trials")
+        reduced, _ = self.reducer.process(
+            data=population.get_data(), axis=axis, boundaries=boundaries
+        )
+        dims = Dimensions(*["conditions" if dim == "trials" else dim for dim in population.dims])
+        data = CoreRates(reduced, dims=dims)
+        coords = {
+            name: population.get_coord(name)
+            for name in ("units", "time")
+            if name in population.coords
+        }
+        return self.PRODUCT_CLASS(
+            area=population.area,
+            training=population.training,
+            stat=self.reducer.stat,
+            conditions=tuple(conditions),
+            counts=tuple(int(n) for n in counts),
+            data=data,
+            **coords,
+        )
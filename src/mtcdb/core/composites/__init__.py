@@ -8,4 +8,5 @@ Modules
 `base_container`
 `containers_fixed`
 `candidates`
+`prefetch`
 """
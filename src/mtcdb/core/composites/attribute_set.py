@@ -55,6 +55,9 @@ class AttributeSet(Container[Type[Attribute], Attribute]):
     This behavior is relevant since each trial or condition is described by a unique value for each
     attribute.
 
+    Sets are hashable, so that conditions can be used as keys of dictionaries (e.g. counts by
+    condition). A set should not be modified while it is used as a key.
+
     Examples
     --------
     Initialize a set with three experimental factors:
@@ -84,6 +87,10 @@ class AttributeSet(Container[Type[Attribute], Attribute]):
         attr_classes = sorted(self.keys(), key=lambda cls: cls.__name__)  # order by names
         return f"{self.__class__.__name__}({', '.join(f'{self[cls]}' for cls in attr_classes)})"
 
+    def __hash__(self) -> int:
+        """Hash the attributes, consistently with the equality of mappings (keys of dicts)."""
+        return hash(frozenset(self.items()))
+
     def __init__(self, *args: Attribute) -> None:
         """Override the base constructor to fix `key_type` and `value_type`."""
         # Create the dictionary of attributes with the class of the attribute as key
@@ -4,8 +4,16 @@
 Classes
 -------
 Container
+
+Functions
+---------
+map_ordered
 """
 from collections import UserDict
+from concurrent.futures import Executor
+from functools import partial
+from operator import methodcaller
+import os
 from typing import List, Callable, Any, Iterable, Tuple, Dict, Self, TypeVar, Generic, Type
 
 
@@ -24,6 +32,53 @@ R = TypeVar("R")
 C = TypeVar("C", bound="Container")
 """Type variable for Container and its subclasses."""
 
+MIN_PARALLEL = 8
+"""Minimal number of items to use an executor (smaller containers are mapped serially)."""
+
+CHUNKS_PER_WORKER = 4
+"""Number of chunks per worker when the chunk size is not specified (balance vs. overhead)."""
+
+
+def map_ordered(
+    func: Callable[[Any], R],
+    items: List[Any],
+    executor: Executor | None = None,
+    chunksize: int | None = None,
+) -> List[R]:
+    """
+    Apply a function to items, serially or with an executor, preserving the order of the items.
+
+    Arguments
+    ---------
+    func : Callable[[Any], R]
+        Function of one argument. With a process pool, it must be picklable (module-level function,
+        bound method of a picklable object, `functools.partial`...), not a lambda.
+    items : List[Any]
+        Arguments of the successive calls.
+    executor : Executor, optional
+        Thread or process pool. If None, or if there are less than `MIN_PARALLEL` items, the
+        function is applied serially in the current thread.
+    chunksize : int, optional
+        Number of items sent at once to a worker process (ignored by thread pools). If None, the
+        items are split in about `CHUNKS_PER_WORKER` chunks per worker.
+
+    Returns
+    -------
+    results : List[R]
+        Results in the order of the items.
+
+    Notes
+    -----
+    Exceptions raised by the function are propagated to the caller (at the position of the first
+    failed item), after which the pending items of the call are cancelled by the executor.
+    """
+    if executor is None or len(items) < MIN_PARALLEL:
+        return [func(item) for item in items]
+    if chunksize is None:
+        n_workers = getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+        chunksize = max(1, -(-len(items) // (CHUNKS_PER_WORKER * n_workers)))
+    return list(executor.map(func, items, chunksize=chunksize))
+
 
 class Container(UserDict[K, V], Generic[K, V]):
     """
@@ -310,7 +365,13 @@ class Container(UserDict[K, V], Generic[K, V]):
 
     # --- Transform Container Data -----------------------------------------------------------------
 
-    def fill(self, func: Callable[[K], V], **kwargs: Any) -> None:
+    def fill(
+        self,
+        func: Callable[[K], V],
+        executor: Executor | None = None,
+        chunksize: int | None = None,
+        **kwargs: Any,
+    ) -> None:
         """
         Generate values from the keys by applying a function on them.
 
@@ -318,13 +379,32 @@ class Container(UserDict[K, V], Generic[K, V]):
         ---------
         func : Callable[[K], V]
             Function that takes a key and returns a value.
+        executor : Executor, optional
+            Thread or process pool in which to call the function (see `map_ordered`).
+        chunksize : int, optional
+            Number of keys sent at once to a worker process.
         **kwargs : Any
             Additional keyword arguments to pass to the function.
-        """
-        for key in self.data.keys():
-            self.data[key] = func(key, **kwargs)
 
-    def apply(self, func: Callable[[V], R], **kwargs: Any) -> "Container[K, R]":
+        Examples
+        --------
+        Count the trials of each unit in parallel:
+
+        >>> with ProcessPoolExecutor() as executor:
+        ...     counts.fill(counter.process, executor=executor)
+        """
+        keys = list(self.data.keys())
+        values = map_ordered(partial(func, **kwargs), keys, executor, chunksize)
+        for key, value in zip(keys, values):
+            self.data[key] = value
+
+    def apply(
+        self,
+        func: Callable[[V], R],
+        executor: Executor | None = None,
+        chunksize: int | None = None,
+        **kwargs: Any,
+    ) -> "Container[K, R]":
         """
         Apply a function to all values across keys, optionally with additional keyword arguments.
 
@@ -333,6 +413,10 @@ class Container(UserDict[K, V], Generic[K, V]):
         func : Callable[[V, Any], R]
             Function to apply to each value in the container. The function should take the value as
             a first argument and additional keyword arguments.
+        executor : Executor, optional
+            Thread or process pool in which to call the function (see `map_ordered`).
+        chunksize : int, optional
+            Number of values sent at once to a worker process.
         **kwargs
             Keyword arguments to pass to the function.
 
@@ -362,10 +446,16 @@ class Container(UserDict[K, V], Generic[K, V]):
         Signature of the function (`Callable[[V], R]`):
 
         - It imposes a single positional argument: the value of type `V`.
-        - It allows to pass any additional arguments as keyword arguments `**kwargs`.
+        - It allows to pass any additional arguments as keyword arguments `**kwargs`, except the
+          names `executor` and `chunksize` which are reserved.
+
+        Parallel execution: The results are collected in the order of the keys of the container,
+        whatever the order of completion in the executor.
         """
         # Apply the function to all values
-        result_data = {k: func(v, **kwargs) for k, v in self.data.items()}
+        keys = list(self.data.keys())
+        values = map_ordered(partial(func, **kwargs), self.list_values(keys), executor, chunksize)
+        result_data = dict(zip(keys, values))
         # Determine the type of the result values
         _, result_type = self.find_types(result_data)
         # Create a new container with new data
@@ -423,18 +513,28 @@ class Container(UserDict[K, V], Generic[K, V]):
         {1: '1', 2: '2'}
         >>> print(string_container.value_type)
         <class 'str'>
+
+        Call the method in a thread pool (the arguments `executor` and `chunksize` are consumed by
+        the proxy, like in `apply`):
+
+        >>> with ThreadPoolExecutor() as executor:
+        ...     container.transform(factor=2, executor=executor)
         """
+        # Special methods (e.g. `__deepcopy__` looked up by `copy`) belong to the container itself,
+        # and no value type is set before initialization (e.g. `hasattr` in subclass constructors)
+        if method_name.startswith("__") or "value_type" not in self.__dict__:
+            raise AttributeError(method_name)
         # Ensure the method exists on the value type
         if not hasattr(self.value_type, method_name):
             raise AttributeError(f"'{self.value_type.__name__}' has no attribute '{method_name}'")
 
         # Return a callable that applies the method to all values
-        def method_proxy(*args, **kwargs):
-            # Apply the method to all values
-            result_data = {
-                key: getattr(value, method_name)(*args, **kwargs)
-                for key, value in self.data.items()
-            }
+        def method_proxy(*args, executor=None, chunksize=None, **kwargs):
+            # Apply the method to all values (`methodcaller` can be pickled for process pools)
+            keys = list(self.data.keys())
+            func = methodcaller(method_name, *args, **kwargs)
+            values = map_ordered(func, self.list_values(keys), executor, chunksize)
+            result_data = dict(zip(keys, values))
             # Determine the type of the result values
             _, result_type = self.find_types(result_data)
             # Create a new container with new data
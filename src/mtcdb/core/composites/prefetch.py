@@ -0,0 +1,268 @@
+"""
+`core.composites.prefetch` [module]
+
+Classes
+-------
+PrefetchedContainer
+
+Notes
+-----
+Per-unit loops alternate between reading the file of a unit (on local disk or network storage)
+and computing on its content, so that I/O and CPU never overlap. The `PrefetchedContainer` reads
+the files of the next units in background threads while the current unit is processed:
+
+- Read-ahead: At most ``read_ahead`` files beyond the current key are loading or loaded and not
+  yet consumed.
+- Byte budget: The total size of these files (estimated from the file system) stays below
+  ``max_bytes``. The file of the requested key is always read, even if it exceeds the budget.
+- Errors: The exception raised while loading a file is re-raised when its key is accessed, and
+  does not affect the other keys.
+
+File reads release the GIL, so that threads are sufficient to overlap them with computations.
+
+See Also
+--------
+`core.composites.base_container.Container`: In-memory container with the same interface.
+"""
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Type, TypeVar
+
+import numpy as np
+
+from core.composites.base_container import Container
+from utils.io_data.base_io import IOHandler
+from utils.io_data.base_loader import Loader
+from utils.io_data.loaders import LoaderNPY
+from utils.storage_rulers.base_path_ruler import PathRuler
+
+K = TypeVar("K")
+"""Type variable for the keys in the container."""
+
+V = TypeVar("V")
+"""Type variable for the values loaded from the files."""
+
+R = TypeVar("R")
+"""Type variable for the return type of a function applied to the values."""
+
+
+class PrefetchedContainer(Mapping, Generic[K, V]):
+    """
+    Read-only container whose values are loaded from files on access, with read-ahead.
+
+    Arguments
+    ---------
+    keys : Iterable[K]
+        Keys of the container, in the order of iteration (e.g. units).
+    path_ruler : PathRuler
+        Path generation rules, called with each key (e.g. `SpikeTrainsPath`).
+    loader : Type[Loader], default=`LoaderNPY`
+        Loader for the format of the files.
+    key_type : Type[K]
+        Type of the keys (keyword-only, as in `Container`).
+    value_type : Type[V], default=`np.ndarray`
+        Type of the loaded values.
+    read_ahead : int, default=4
+        Maximal number of files loaded in advance beyond the current key.
+    max_bytes : int, optional
+        Maximal size of the files loaded in advance. Default: no limit.
+    max_workers : int, optional
+        Number of reading threads. Default: `read_ahead`.
+
+    Attributes
+    ----------
+    pending : Dict[K, Future]
+        Loads submitted and not consumed yet, by key.
+    pending_bytes : int
+        Total size of the files of the pending loads.
+
+    Methods
+    -------
+    `__getitem__`
+    `list_keys`
+    `list_values`
+    `to_dict`
+    `apply`
+    `get_path`
+    `get_size`
+    `close`
+
+    Examples
+    --------
+    Iterate over the spike trains of the units while the next files are read:
+
+    >>> path_ruler = SpikeTrainsPath(root_data)
+    >>> with PrefetchedContainer(units, path_ruler, key_type=str, max_bytes=2**30) as spikes:
+    ...     for unit, spikes_unit in spikes.items():
+    ...         process(spikes_unit)
+
+    Apply a function to all the values (the result is an in-memory `Container`):
+
+    >>> counts = spikes.apply(len)
+
+    Warning
+    -------
+    The container is meant to be consumed by a single thread. Loads are scheduled in the order of
+    the keys following the accessed key: random access remains correct but defeats prefetching.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[K],
+        path_ruler: PathRuler,
+        loader: Type[Loader] = LoaderNPY,
+        *,
+        key_type: Type[K] | None = None,
+        value_type: Type[V] = np.ndarray,
+        read_ahead: int = 4,
+        max_bytes: int | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        if key_type is None:
+            raise ValueError(f"Missing argument: `key_type` for {self.__class__.__name__}")
+        if read_ahead < 0:
+            raise ValueError(f"Invalid read-ahead: {read_ahead} < 0")
+        self.keys_order: List[K] = list(keys)
+        self.positions = {key: i for i, key in enumerate(self.keys_order)}
+        self.path_ruler = path_ruler
+        self.loader = loader
+        self.key_type = key_type
+        self.value_type = value_type
+        self.read_ahead = read_ahead
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers or max(read_ahead, 1)
+        self.pending: Dict[K, Future] = {}
+        self.pending_bytes = 0
+        self._sizes: Dict[K, int] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> "PrefetchedContainer[K, V]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}> {len(self)} keys, {len(self.pending)} pending "
+            f"({self.pending_bytes} bytes)"
+        )
+
+    # --- Mapping Interface ------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.keys_order)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self.keys_order)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.positions  # without loading the value (default of `Mapping`)
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value of a key, and schedule the loads of the next keys.
+
+        Raises
+        ------
+        KeyError
+            If the key is not in the container.
+        Exception
+            Error raised while loading the file of the key.
+        """
+        if key not in self.positions:
+            raise KeyError(key)
+        position = self.positions[key]
+        self._discard_before(position)
+        if key not in self.pending:  # not prefetched: always read, whatever the budget
+            self._submit(key)
+        future = self.pending.pop(key)
+        self.pending_bytes -= self._sizes.pop(key)
+        # Start the next loads before waiting for this one
+        self._schedule(position + 1, min(position + self.read_ahead + 1, len(self.keys_order)))
+        return future.result()
+
+    # --- Container Interface ----------------------------------------------------------------------
+
+    def list_keys(self) -> List[K]:
+        """Get the list of keys, in order."""
+        return list(self.keys_order)
+
+    def list_values(self, keys: Iterable[K] | None = None) -> List[V]:
+        """Load the values for all or a subset of keys, in order."""
+        return [self[key] for key in (self.keys_order if keys is None else keys)]
+
+    def to_dict(self) -> Dict[K, V]:
+        """Load all the values in a dictionary."""
+        return dict(self.items())
+
+    def apply(self, func: Callable[[V], R], **kwargs: Any) -> Container[K, R]:
+        """
+        Apply a function to each value as it is loaded, while the next files are read.
+
+        Returns
+        -------
+        Container[K, R]
+            In-memory container of the results (see `Container.apply`).
+        """
+        results = {key: func(value, **kwargs) for key, value in self.items()}
+        _, result_type = Container.find_types(results)
+        return Container(results, key_type=self.key_type, value_type=result_type)
+
+    # --- Scheduling -------------------------------------------------------------------------------
+
+    def get_path(self, key: K) -> Path:
+        """Path of the file of a key, with the extension of the loader."""
+        return IOHandler.enforce_ext(self.path_ruler.get_path(key), self.loader.EXT)
+
+    def get_size(self, key: K) -> int:
+        """Size of the file of a key (0 if missing: the error is raised by the load)."""
+        path = self.get_path(key)
+        return path.stat().st_size if path.is_file() else 0
+
+    def _schedule(self, start: int, stop: int) -> None:
+        """Submit the loads of the keys in a range of positions, within the byte budget."""
+        for position in range(start, stop):
+            key = self.keys_order[position]
+            if key in self.pending:
+                continue
+            size = self.get_size(key)
+            over_budget = self.max_bytes is not None and self.pending_bytes + size > self.max_bytes
+            if self.pending and over_budget:
+                break
+            self._submit(key, size)
+
+    def _submit(self, key: K, size: int | None = None) -> None:
+        """Submit the load of one key, without checking the budget."""
+        if size is None:
+            size = self.get_size(key)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="prefetch"
+            )
+        self.pending[key] = self._executor.submit(self._load, self.get_path(key))
+        self._sizes[key] = size
+        self.pending_bytes += size
+
+    def _load(self, path: Path) -> V:
+        """Read one file (in a reading thread)."""
+        return self.loader(path).load()
+
+    def _discard_before(self, position: int) -> None:
+        """Cancel the loads of the keys preceding a position (skipped by random access)."""
+        for key in list(self.pending):
+            if self.positions[key] < position:
+                self.pending.pop(key).cancel()
+                self.pending_bytes -= self._sizes.pop(key)
+
+    def close(self) -> None:
+        """Cancel the pending loads and stop the reading threads (idempotent)."""
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self._sizes.clear()
+        self.pending_bytes = 0
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -64,7 +64,8 @@ class Coordinate(DataComponent, Generic[AnyAttribute]):
         """
         Validate the values of the coordinate.
 
-        Default implementation: Check the values consistency with the attribute type.
+        Default implementation: Check the values consistency with the attribute type. The sentinel
+        value of the class marks unset values (e.g. in `from_shape`) and is always accepted.
 
         Warning
         -------
@@ -93,7 +94,10 @@ class Coordinate(DataComponent, Generic[AnyAttribute]):
         `Attribute.is_valid`
         """
         if hasattr(cls, "ATTRIBUTE"):  # only if ATTRIBUTE is defined
+            values = np.asarray(values)
             mask = cls.are_valid(values)
+            if hasattr(cls, "SENTINEL"):  # unset values
+                mask |= values == cls.SENTINEL
             if not np.all(mask):
                 raise ValueError(f"Invalid values for {cls.__name__}")
 
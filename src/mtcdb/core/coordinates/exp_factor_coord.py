@@ -12,6 +12,7 @@ CoordCategory
 CoordStimulus
 CoordBehavior
 CoordOutcome
+CoordError
 CoordEventDescription
 """
 
@@ -194,9 +195,63 @@ class CoordOutcome(CoordExpFactor[ResponseOutcome]):
     ATTRIBUTE = ResponseOutcome
 
 
+class CoordError(Coordinate):
+    """
+    Coordinate labels marking the error trials, in which a shock was delivered.
+
+    Class Attributes
+    ----------------
+    DTYPE : np.bool_
+        Data type of the labels, always boolean.
+    SENTINEL : bool
+        Value for unset labels, here ``False`` (no shock).
+
+    Arguments
+    ---------
+    values : np.ndarray[Tuple[Any], np.bool_]
+        True for the trials containing a ``BEHAVIOR,SHOCKON`` event (false alarms in NoGo trials).
+        Shape: ``(n_smpl,)``.
+
+    Notes
+    -----
+    No specific attribute is associated with errors.
+    """
+
+    # No ATTRIBUTE
+    DTYPE = np.dtype("bool")
+    SENTINEL: bool = False
+
+
 class CoordEventDescription(Coordinate[EventDescription]):
     """
     Coordinate labels for event descriptions.
+
+    Notes
+    -----
+    Raw descriptions contain the event type followed by details about the stimulus, separated by
+    commas (e.g. ``'PreStimSilence , TORC_448_06_v501 , Reference'``). Only the event type (first
+    token, or the full description for shocks) is validated against `EventDescription`.
     """
 
     ATTRIBUTE = EventDescription
+
+    @classmethod
+    def are_valid(cls, values) -> np.ndarray:
+        """
+        Override the base class method to validate the event type of each description.
+
+        Implementation
+        --------------
+        Each distinct description is checked once, and the result is broadcast to the values.
+        """
+        values = np.asarray(values, dtype=str)
+        uniques, inverse = np.unique(values, return_inverse=True)
+        valid = np.array(
+            [
+                cls.ATTRIBUTE.is_valid(desc)
+                or cls.ATTRIBUTE.is_valid(desc.strip(" '\"").split(",")[0].strip())
+                for desc in uniques
+            ],
+            dtype=bool,
+        )
+        return valid[inverse].reshape(values.shape)
@@ -15,7 +15,7 @@ from typing import TypeVar, Type, Dict
 
 import numpy as np
 
-from coordinates.base_coordinate import Coordinate
+from core.coordinates.base_coordinate import Coordinate
 from core.attributes.exp_structure import Recording, Block, Slot
 
 
@@ -214,7 +214,7 @@ class CoordTime(Coordinate):
         else:
             raise ValueError("Invalid parameter combination.")
         values = np.arange(n_smpl) * t_bin + t_min
-        return cls(values=values, t_bin=t_bin)
+        return cls(values=values, t_bin=t_bin, dims=Dimensions("time"))
 
 
 class CoordTimeEvent(Coordinate):
@@ -5,7 +5,7 @@ Classes
 -------
 DataComponent
 """
-from typing import Tuple, Self, Mapping, Dict, Type
+from typing import Any, Tuple, Self, Mapping, Dict, Type
 
 import numpy as np
 from numpy.typing import ArrayLike
@@ -188,8 +188,11 @@ class DataComponent(np.ndarray):
         # Set dimensions
         if dims is None:  # default dimension names
             dims = Dimensions.default(obj.ndim)
-        else:  # validate the dimension names for this class
-            cls.DIMENSIONS_SPEC.validate(dims)
+        else:
+            if not isinstance(dims, Dimensions):  # tuple of names (checked for duplicates)
+                dims = Dimensions(*dims)
+            if hasattr(cls, "DIMENSIONS_SPEC"):  # validate the dimension names for this class
+                cls.DIMENSIONS_SPEC.validate(dims)
         if len(dims) != obj.ndim:  # check consistency between dimensions and array shape
             raise ValueError(f"len(dims) = {len(dims)} != array.ndim = {obj.ndim}")
         obj.dims = dims  # assign dimension names as new attribute
@@ -213,8 +216,26 @@ class DataComponent(np.ndarray):
         """
         if obj is None:  # brand-new object with no parent (in __new__)
             return
-        self.propagate_dimensions(obj, self)
-        self.propagate_metadata(obj, self)
+        self.propagate_dimensions(self, obj)
+        self.propagate_metadata(self, obj)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Add the custom attributes (dimensions, metadata) to the state of the array for pickling.
+
+        Notes
+        -----
+        The default pickling of numpy arrays only stores the values: the attributes of the subclass
+        would be lost when the object is sent to another process or loaded from a file.
+        """
+        reconstruct, args, state = super().__reduce__()[:3]
+        return reconstruct, args, (state, self.__dict__)
+
+    def __setstate__(self, state: Tuple[Any, Dict[str, Any]]) -> None:
+        """Restore the array state and the custom attributes stored by `__reduce__`."""
+        array_state, attributes = state
+        super().__setstate__(array_state)
+        self.__dict__.update(attributes)
 
     @classmethod
     def validate(cls, values: ArrayLike) -> None:
@@ -410,6 +431,10 @@ class DataComponent(np.ndarray):
         """
         # Convert DataComponent objects to numpy arrays
         args = [i.view(np.ndarray) if isinstance(i, DataComponent) else i for i in inputs]
+        if "out" in kwargs:  # output buffers as well, to avoid dispatching back to this method
+            kwargs["out"] = tuple(
+                o.view(np.ndarray) if isinstance(o, DataComponent) else o for o in kwargs["out"]
+            )
         # Apply the ufunc to input arrays
         result = getattr(ufunc, method)(*args, **kwargs)
         # Convert the result back to a DataComponent object if necessary
@@ -76,8 +76,9 @@ class Dimensions(UserList):
     # --- Creation of Dimensions -------------------------------------------------------------------
 
     def __init__(self, *args: str) -> None:
-        # Check uniqueness of dimension names
-        if len(set(args)) != len(args):
+        # Check uniqueness of dimension names (except the placeholder of unnamed dimensions)
+        named = [arg for arg in args if arg != self.DEFAULT]
+        if len(set(named)) != len(named):
             raise ValueError(f"Duplicate dimension names: {args}")
         # Call parent constructor (UserList)
         super().__init__(args)
@@ -393,7 +394,7 @@ class DimensionsSpec:
         self.spec: OrderedDict[str, bool]
         if len(set(kwargs.keys())) != len(kwargs):
             raise ValueError("Duplicate dimension names in the specification.")
-        self.spec = OrderedDict(*kwargs)
+        self.spec = OrderedDict(kwargs)
 
     def required(self) -> Dimensions:
         """Get the required dimensions in an instance of the `Dimensions` class."""
@@ -403,7 +404,7 @@ class DimensionsSpec:
         """Get the optional dimensions in an instance of the `Dimensions` class."""
         return Dimensions(*[dim for dim, required in self.spec.items() if not required])
 
-    def validate(self, dims: Dimensions) -> None:
+    def validate(self, dims: Dimensions, partial: bool = False) -> None:
         """
         Validate an instance of `Dimensions` against the specification.
 
@@ -411,18 +412,22 @@ class DimensionsSpec:
         ----------
         dims : Dimensions
             Dimensions to validate.
+        partial : bool, default=False
+            If True, skip the check of the required dimensions, for components which span a subset
+            of the dimensions (e.g. coordinates).
 
         Raises
         ------
         ValueError
-            If any required dimensions is missing.
+            If any required dimensions is missing (unless `partial`).
             If any extra dimension is present.
             If the order of the dimensions is incorrect.
         """
         dims_set = set(dims)
         spec_set = set(self.spec.keys())
         # Check dimension names
-        missing = [dim for dim, required in self.spec.items() if required and dim not in dims_set]
+        required = [] if partial else [dim for dim, req in self.spec.items() if req]
+        missing = [dim for dim in required if dim not in dims_set]
         extra = [dim for dim in dims_set if dim not in spec_set]
         if missing:
             raise ValueError(f"Missing required dimensions: {missing}")
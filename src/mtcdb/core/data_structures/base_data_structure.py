@@ -343,8 +343,14 @@ class DataStructure(ABC, Generic[AnyCoreData]):
         Notes
         -----
         The attributes considered are all the active components, the dimensions and the IDENTIFIERS.
+
+        The method is only called when the normal lookup fails. The own attributes of the data
+        structure (unset data, or any attribute before the constructor declares them) are not
+        delegated, to avoid an infinite recursion.
         """
-        nested_attr = self.coords | {"data", "dims"} | self.identifiers
+        if name in {"data", "dims", "coords"}:
+            raise AttributeError(f"Attribute '{name}' not set in '{self.__class__.__name__}'.")
+        nested_attr = self.coords | {"data", "dims"} | set(self.IDENTIFIERS)
         for attr in nested_attr:
             obj = getattr(self, attr, None)
             if hasattr(obj, name):
@@ -414,8 +420,8 @@ class DataStructure(ABC, Generic[AnyCoreData]):
         """
         # Validate name and type (COMPONENTS_SPEC)
         self.COMPONENTS_SPEC.validate(name, coord)
-        # Validate dimensions
-        self.DIMENSIONS_SPEC.validate(coord.dims)
+        # Validate dimensions (coordinates span a subset of the dimensions)
+        self.DIMENSIONS_SPEC.validate(coord.dims, partial=True)
         # Validate shape consistency with the other components
         self.validate_shape(coord)
         # Store the coordinate
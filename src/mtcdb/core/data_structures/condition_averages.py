@@ -0,0 +1,128 @@
+"""
+`core.data_structures.condition_averages` [module]
+
+Classes
+-------
+ConditionAverages
+"""
+from types import MappingProxyType
+from typing import Tuple
+
+from core.data_components.core_dimensions import DimensionsSpec
+from core.data_components.base_data_component import ComponentSpec
+from core.data_components.core_metadata import MetaDataField
+from core.data_components.core_data import CoreRates
+from core.coordinates.base_coordinate import Coordinate
+from core.coordinates.brain_info_coord import CoordUnit
+from core.coordinates.time_coord import CoordTime
+from core.composites.exp_conditions import ExpCondition
+
+from core.data_structures.base_data_structure import DataStructure
+from core.attributes.brain_info import Area, Training
+
+
+class ConditionAverages(DataStructure[CoreRates]):
+    """
+    Statistic of the firing rates of a pseudo-population in each experimental condition.
+
+    Key Features
+    ------------
+    Dimensions : ``ensembles``, ``units``, ``folds``, ``conditions``, ``time``
+
+    Coordinates:
+
+    - ``units`` (dimensions ``ensembles``, ``units``)
+    - ``time``  (dimension ``time``)
+
+    Identity Metadata: ``area``, ``training``, ``stat``
+
+    Descriptive Metadata: ``conditions``, ``counts``
+
+    Attributes
+    ----------
+    area : Area
+        Brain area from which the units were recorded.
+    training : Training
+        Training condition of the animals from which the units were recorded.
+    stat : str
+        Statistic computed over the pseudo-trials of each condition ("mean", "var", "sum").
+    conditions : Tuple[ExpCondition, ...]
+        Experimental conditions, in the order of the dimension ``conditions``.
+    counts : Tuple[int, ...]
+        Number of pseudo-trials in each condition.
+    data : CoreRates
+        Statistic of the firing rates in each condition.
+        Shape: ``(n_ens, n_units, n_folds, n_conditions, n_t)``.
+    units : CoordUnit
+        Coordinate labels of the units in each ensemble of the pseudo-population.
+        Dimensions: ``ensembles``, ``units``.
+    time : CoordTime
+        Time points of the firing rate time courses (in seconds).
+    n_conditions : int
+        (Property) Number of conditions.
+
+    Notes
+    -----
+    This data structure is obtained from a `FiringRatesPop` by reducing the dimension ``trials``
+    into the dimension ``conditions``. The coordinates of the experimental factors along the trials
+    are replaced by the conditions themselves, which gather the values of all the factors.
+
+    See Also
+    --------
+    `core.data_structures.firing_rates_pop.FiringRatesPop`: Source data structure.
+    `core.processors.preprocess.group_trials.GroupedReducer`: Grouped reductions along the trials.
+    """
+
+    # --- Data Structure Schema --------------------------------------------------------------------
+
+    DIMENSIONS_SPEC = DimensionsSpec(
+        ensembles=False,  # optional, if unique pseudo-population
+        units=True,  # optional, if single unit
+        folds=False,  # optional, if no cross-validation
+        conditions=True,
+        time=False,  # optional, if time-averaged data
+    )
+    COMPONENTS_SPEC = ComponentSpec(
+        data=CoreRates,
+        units=CoordUnit,
+        time=CoordTime,
+    )
+    IDENTIFIERS = MappingProxyType(
+        {
+            "area": MetaDataField(Area, ""),
+            "training": MetaDataField(Training, ""),
+            "stat": MetaDataField(str, "mean"),
+        }
+    )
+
+    def __init__(
+        self,
+        area: Area,
+        training: Training,
+        stat: str = "mean",
+        conditions: Tuple[ExpCondition, ...] = (),
+        counts: Tuple[int, ...] = (),
+        data: CoreRates | None = None,
+        **coords: Coordinate,
+    ):
+        # Set sub-class specific metadata
+        self.area = area
+        self.training = training
+        self.stat = stat
+        self.conditions = tuple(conditions)
+        self.counts = tuple(counts)
+        # Set data and coordinate attributes via the base class constructor
+        super().__init__(data=data, **coords)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}>: Area {self.area}, Training {self.training}, "
+            f"Stat {self.stat}, #conditions={self.n_conditions}" + super().__repr__()
+        )
+
+    # --- Getter Methods ---------------------------------------------------------------------------
+
+    @property
+    def n_conditions(self) -> int:
+        """Number of conditions (length of the dimension `conditions`)."""
+        return len(self.conditions)
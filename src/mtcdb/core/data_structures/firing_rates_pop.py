@@ -15,6 +15,7 @@ from core.coordinates.base_coordinate import Coordinate
 from core.coordinates.brain_info_coord import CoordUnit
 from core.coordinates.exp_factor_coord import CoordTask, CoordAttention, CoordCategory
 from core.coordinates.time_coord import CoordTime
+from core.coordinates.trial_analysis_label_coord import CoordPseudoTrialsIdx
 
 from core.data_structures.base_data_structure import DataStructure
 from core.attributes.brain_info import Area, Training
@@ -31,6 +32,7 @@ class FiringRatesPop(DataStructure[CoreRates]):
     Coordinates:
 
     - ``units`` (dimensions ``ensembles``, ``units``)
+    - ``pseudo_trials_idx`` (dimensions ``ensembles``, ``units``, ``folds``, ``trials``)
     - ``task``  (dimension ``trials``)
     - ``attention``   (dimension ``trials``)
     - ``category``  (dimension ``trials``)
@@ -61,6 +63,9 @@ class FiringRatesPop(DataStructure[CoreRates]):
     units : CoordUnit
         Coordinate labels of the units in each ensemble of the pseudo-population.
         Dimensions: ``ensembles``, ``units``.
+    pseudo_trials_idx : CoordPseudoTrialsIdx
+        Indices of the actual trials of each unit picked in each pseudo-trial.
+        Dimensions: ``ensembles``, ``units``, ``folds``, ``trials``.
     task : CoordTask
         Coordinate labels for the task from which each trial comes.
     attn : CoordAttention
@@ -85,6 +90,7 @@ class FiringRatesPop(DataStructure[CoreRates]):
     COMPONENTS_SPEC = ComponentSpec(
         data=CoreRates,
         units=CoordUnit,
+        pseudo_trials_idx=CoordPseudoTrialsIdx,
         task=CoordTask,
         attention=CoordAttention,
         category=CoordCategory,
@@ -22,6 +22,7 @@ from core.coordinates.exp_factor_coord import (
     CoordCategory,
     CoordBehavior,
     CoordOutcome,
+    CoordError,
 )
 from core.coordinates.time_coord import CoordTimeEvent
 from core.data_structures.base_data_structure import DataStructure
@@ -50,6 +51,7 @@ class TrialsProperties(DataStructure[CoreIndices]):
     - ``t_off``
     - ``t_warn``
     - ``t_end``
+    - ``error``
 
     Metadata: ``sessions``
 
@@ -86,13 +88,17 @@ class TrialsProperties(DataStructure[CoreIndices]):
     t_dur : CoordTimeEvent
         Coordinate for the duration of each trial.
     error : CoordError
-        Coordinate for the behavioral choice of each trial.
+        Coordinate marking the trials in which a shock was delivered.
     n_trials : int
         (Property) Number of trials in the subset.
     n_sessions : int
         (Property) Number of sessions from which the trials come.
     n_blocks : int
         (Property) Maximal number of blocks across session(s).
+    offsets : np.ndarray | None
+        Start index of the trials of each session, in the order of `sessions`, followed by the total
+        number of trials. Shape: ``(n_sessions + 1,)``. Optional, only valid when the trials of each
+        session are contiguous (e.g. after concatenating sessions).
 
     Methods
     -------
@@ -146,14 +152,20 @@ class TrialsProperties(DataStructure[CoreIndices]):
         t_off=CoordTimeEvent,
         t_warn=CoordTimeEvent,
         t_end=CoordTimeEvent,
+        error=CoordError,
     )
     IDENTIFIERS = MappingProxyType({"sessions": MetaDataField(list, [])})
 
     def __init__(
-        self, sessions: List[Session], data: CoreIndices | None = None, **coords: Coordinate
+        self,
+        sessions: List[Session],
+        data: CoreIndices | None = None,
+        offsets: np.ndarray | None = None,
+        **coords: Coordinate,
     ) -> None:
         # Set sub-class specific metadata
         self.sessions = sessions
+        self.offsets = offsets
         # Set data and coordinate attributes via the base class constructor
         super().__init__(data=data, **coords)
 
@@ -184,7 +196,7 @@ class TrialsProperties(DataStructure[CoreIndices]):
         else:
             return 0
 
-    def get_subset(self, idx: np.ndarray | List[int]) -> Self:
+    def get_subset(self, idx: np.ndarray | List[int] | slice) -> Self:
         """
         Get a subset of the trials based on a boolean mask.
 
@@ -230,6 +242,10 @@ class TrialsProperties(DataStructure[CoreIndices]):
             session = Session(session)
         if session not in self.sessions:
             raise ValueError(f"Invalid session identifier ({session}) in sessions: {self.sessions}")
+        # Slice the contiguous trials of the session if the offsets are known
+        if self.offsets is not None:
+            i = self.sessions.index(session)
+            return self.get_subset(slice(self.offsets[i], self.offsets[i + 1]))
         # Find the trials' indices from the recording number of the session
         recording = session.recording
         coord = self.get_coord("recording")
@@ -9,6 +9,7 @@ from abc import ABC, abstractmethod
 from typing import TypeVar, Generic, Type, Tuple
 
 from core.data_components.base_data_component import DataComponent
+from utils.misc.tracing import traced
 
 
 Products = TypeVar("Products", bound=DataComponent | Tuple[DataComponent, ...])
@@ -34,6 +35,13 @@ class Factory(Generic[Products], ABC):
 
     PRODUCT_CLASSES: Type[DataComponent] | Tuple[Type[DataComponent], ...]
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Trace the calls to `create` in each concrete factory (see `utils.misc.tracing`)."""
+        super().__init_subclass__(**kwargs)
+        method = cls.__dict__.get("create")
+        if callable(method) and not getattr(method, "__isabstractmethod__", False):
+            setattr(cls, "create", traced(method, cls.__name__, "factory"))
+
     @abstractmethod
     def create(self, *args, **kwargs) -> Products:
         """
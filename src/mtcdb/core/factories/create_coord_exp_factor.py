@@ -15,7 +15,10 @@ FactoryCoordExpFactor
 from typing import Type, Dict, Iterable, Tuple
 from functools import cached_property
 
+import numpy as np
+
 from core.factories.base_factory import Factory
+from core.data_components.core_dimensions import Dimensions
 from core.coordinates.exp_factor_coord import CoordExpFactor
 from core.composites.exp_conditions import ExpCondition
 
@@ -93,14 +96,15 @@ class FactoryCoordExpFactor(Factory[CoordExpFactor]):
             Coordinates for the experimental factor in the pseudo-trials.
         """
         self.validate_factor(coord_type)
-        # Initialize empty coordinates with as many trials as the total number of pseudo-trials
-        coord = coord_type.from_shape(self.n_trials)
-        # Fill the coordinates by condition
+        # Initialize empty labels with as many trials as the total number of pseudo-trials
+        # (not an empty coordinate: its generic string type would truncate the labels)
+        values = np.full(self.n_trials, coord_type.SENTINEL, dtype=object)
+        # Fill the labels by condition
         attribute_type = coord_type.get_attribute()  # attribute associated with the coordinate
         for cond, (start, end) in self.conditions_boundaries.items():
             value = cond.get(attribute_type)  # value to fill
-            coord[start:end] = value
-        return coord
+            values[start:end] = value
+        return coord_type(values.tolist(), dims=Dimensions("trials"))
 
     @cached_property
     def n_trials(self) -> int:
@@ -1,5 +1,5 @@
 """
-`core.factories.create_ensembles` [module]
+`core.factories.create_coord_units` [module]
 
 Classes
 -------
@@ -17,6 +17,7 @@ from typing import List
 import numpy as np
 
 from core.factories.base_factory import Factory
+from core.data_components.core_dimensions import Dimensions
 from core.coordinates.brain_info_coord import CoordUnit
 from core.processors.preprocess.assign_ensembles import EnsembleAssigner, Ensembles
 from core.attributes.brain_info import Unit
@@ -110,16 +111,14 @@ class FactoryCoordUnit(Factory[CoordUnit]):
         --------------
         Advanced indexing and broadcasting:
 
-        ``coord[:, :] = np.array(units)[ensembles]``
+        ``np.array(units)[ensembles]``
 
         - Select elements from the units array using the indices specified in ensembles.
         - Broadcast the units array to the shape of ensembles.
 
-        See Also
-        --------
-        `Coordinate.from_shape`
+        The coordinate is built from the selected labels rather than filled in place in an empty
+        coordinate (`Coordinate.from_shape`): the generic string type of `CoordUnit` would create an
+        array of single characters, truncating the identifiers.
         """
-        n_ensembles, _ = ensembles.shape
-        coord = CoordUnit.from_shape((n_ensembles, self.ensemble_size))
-        coord[:, :] = np.array(units)[ensembles]
-        return coord
+        labels = np.array(units, dtype=str)[ensembles]
+        return CoordUnit(labels, dims=Dimensions("ensembles", "units"))
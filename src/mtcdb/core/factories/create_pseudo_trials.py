@@ -17,6 +17,7 @@ from typing import List, Dict, Iterable
 import numpy as np
 
 from core.factories.base_factory import Factory
+from core.data_components.core_dimensions import Dimensions
 from core.attributes.trial_analysis_labels import Fold
 from core.composites.coordinate_set import CoordinateSet
 from core.coordinates.trial_analysis_label_coord import CoordPseudoTrialsIdx, CoordFolds
@@ -301,4 +302,6 @@ class FactoryPseudoTrials(Factory[CoordPseudoTrialsIdx]):
         if len(set(shapes)) != 1:
             raise ValueError(f"Mismatch in the shape of pseudo-trials across ensembles: {shapes}")
         # Stack along the ensemble dimension
-        return CoordPseudoTrialsIdx(np.stack(pseudo_trials, axis=0))
+        return CoordPseudoTrialsIdx(
+            np.stack(pseudo_trials, axis=0), dims=Dimensions("ensembles", "units", "folds", "trials")
+        )
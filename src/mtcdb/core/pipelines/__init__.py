@@ -8,7 +8,10 @@ Highest level orchestrators of the analysis. These modules are responsible for:
 
 Modules
 -------
-
+:mod:`base_pipeline`
+:mod:`format_population_data`
+:mod:`build_populations`
+:mod:`task_graph`
 
 Notes
 -----
@@ -13,6 +13,8 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import TypeVar, Generic, Any
 
+from utils.misc.tracing import traced
+
 
 @dataclass
 class PipelineConfig(ABC):
@@ -79,6 +81,13 @@ class Pipeline(ABC, Generic[C, I]):
     this steps in the next run.
     """
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Trace the runs of each concrete pipeline (see `utils.misc.tracing`)."""
+        super().__init_subclass__(**kwargs)
+        method = cls.__dict__.get("execute")
+        if callable(method) and not getattr(method, "__isabstractmethod__", False):
+            setattr(cls, "execute", traced(method, cls.__name__, "pipeline"))
+
     def __init__(self, config: C, **kwargs: Any) -> None:
         """
         Initialize the pipeline state.
@@ -0,0 +1,407 @@
+"""
+`core.pipelines.build_populations` [module]
+
+Run the pipeline `FormatPopulation` for all the combinations of brain areas and training statuses,
+in a pool of worker processes.
+
+Classes
+-------
+PopulationTask
+TaskResult
+PopulationWorker
+BatchPopulations
+
+Functions
+---------
+load_grid
+set_memory_limit
+
+Notes
+-----
+Running each combination as a separate application reloads all the inputs and leaves cores idle.
+Instead, the combinations are dispatched to a shared process pool. Each worker process holds one
+`PopulationWorker` (created by the pool initializer), whose cache keeps the inputs shared by several
+combinations (inventory of the units, trials properties) across the tasks it runs: those inputs
+are loaded at most once per worker.
+
+Each successful combination writes a marker file next to its output (see `PopulationTask.marker`),
+so that an interrupted batch can be resumed without running the completed combinations again.
+
+See Also
+--------
+`core.pipelines.format_population_data.FormatPopulation`: Pipeline run for each combination.
+`mtcdb.cli`: Command ``mtcdb build-populations``.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+import time
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Type, Union
+
+from core.attributes.brain_info import Area, Training, Unit
+from core.pipelines.base_pipeline import PipelineConfig
+from utils.io_data.loaders import LoaderCSVtoDataFrame, LoaderPKL, LoaderYAML
+from utils.misc.tracing import current_rss
+from utils.storage_rulers.impl_path_rulers import (
+    FiringRatesPopPath,
+    TrialsPropertiesUnitsPath,
+    UnitsInfoPath,
+)
+
+
+DEFAULT_PARAMS = Path(__file__).resolve().parents[4] / "config" / "parameters" / "default.yaml"
+"""Configuration file listing the brain areas (``areas``) and training statuses (``trainings``)."""
+
+
+@dataclass(frozen=True)
+class PopulationTask:
+    """
+    Combination of a brain area and a training status for which to build a population.
+
+    Attributes
+    ----------
+    area : Area
+    training : Training
+    key : str
+        (Property) Identifier of the combination, e.g. ``"A1_Trained"``.
+
+    Methods
+    -------
+    `marker`
+    """
+
+    area: Area
+    training: Training
+
+    @property
+    def key(self) -> str:
+        """Identifier of the combination."""
+        return f"{self.area}_{Training.LABELS[bool(self.training)]}"
+
+    def marker(self, root_data: Optional[Union[str, Path]] = None) -> Path:
+        """Path of the marker file written after the successful run of the combination."""
+        label = Training.LABELS[bool(self.training)]
+        return FiringRatesPopPath(root_data).get_path(self.area, label).with_suffix(".done")
+
+
+@dataclass
+class TaskResult:
+    """
+    Outcome of one task.
+
+    Attributes
+    ----------
+    key : str
+        Identifier of the combination (see `PopulationTask.key`).
+    status : str
+        ``"done"``, ``"skipped"`` (completed in a previous run) or ``"failed"``.
+    duration : float
+        Wall time of the task in the worker (in seconds).
+    rss : int
+        Resident set size of the worker at the end of the task (in bytes).
+    n_loads : int
+        Number of inputs loaded by the worker for this task (0 if all were cached).
+    error : str
+        Error message if the task failed.
+    """
+
+    key: str
+    status: str
+    duration: float = 0.0
+    rss: int = 0
+    n_loads: int = 0
+    error: str = ""
+
+
+def load_grid(path: Union[str, Path] = DEFAULT_PARAMS) -> List[PopulationTask]:
+    """
+    Enumerate the combinations of brain areas and training statuses listed in a configuration file.
+
+    Arguments
+    ---------
+    path : str or Path
+        YAML file with the key ``areas`` (list of areas) and optionally the key ``trainings`` (list
+        of booleans, default: both training statuses).
+
+    Returns
+    -------
+    tasks : List[PopulationTask]
+        Valid combinations, trained animals first. Areas which were not recorded in naive animals
+        (see `Area.get_naive`) are excluded for the naive status.
+    """
+    params = LoaderYAML(path).load()
+    areas = [Area(area) for area in params["areas"]]
+    trainings = [Training(t) for t in params.get("trainings", [True, False])]
+    naive_areas = Area.get_naive()
+    return [
+        PopulationTask(area, training)
+        for training in trainings
+        for area in areas
+        if training or area in naive_areas
+    ]
+
+
+def set_memory_limit(max_bytes: int) -> None:
+    """
+    Limit the memory of the current process, so that a task exceeding it fails with a `MemoryError`
+    instead of exhausting the memory of a shared node.
+
+    Notes
+    -----
+    The limit applies to the data segment of the process (``RLIMIT_DATA``), which includes the heap
+    and the anonymous memory maps used by NumPy arrays. It is not available on Windows, where no
+    limit is set.
+    """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:  # pragma: no cover
+        print("[WARNING] Memory limit not supported on this platform")
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_DATA)
+    limit = max_bytes if hard == resource.RLIM_INFINITY else min(max_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_DATA, (limit, hard))
+
+
+class PopulationWorker:
+    """
+    Runner of the population tasks in one process, with a cache of the shared inputs.
+
+    Attributes
+    ----------
+    config : PipelineConfig
+        Configuration of the pipeline, identical for all the tasks.
+    root_data : Path, optional
+        Root directory of the data (default: see `PathRuler.get_root`).
+    cache : Dict[Hashable, Any]
+        Inputs loaded by the worker, by key.
+    n_loads : int
+        Number of inputs loaded since the creation of the worker.
+
+    Methods
+    -------
+    `get`
+    `load_inputs`
+    `create_pipeline`
+    `run`
+
+    Notes
+    -----
+    Subclasses can adapt the batch to other pipelines by overriding `load_inputs` and
+    `create_pipeline`.
+    """
+
+    def __init__(
+        self, config: PipelineConfig, root_data: Optional[Union[str, Path]] = None
+    ) -> None:
+        self.config = config
+        self.root_data = root_data
+        self.cache: Dict[Hashable, Any] = {}
+        self.n_loads = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Retrieve an input from the cache, or load it at the first request."""
+        if key not in self.cache:
+            self.cache[key] = loader()
+            self.n_loads += 1
+        return self.cache[key]
+
+    def load_inputs(self, task: PopulationTask) -> Any:
+        """
+        Gather the inputs of the pipeline for one combination.
+
+        Returns
+        -------
+        inputs : FormatPopulationInputs
+            Units of the area and training status, and their trials properties. The inventory of
+            the units and the trials properties of all the units are shared by all the combinations.
+        """
+        # pylint: disable=import-outside-toplevel
+        from core.pipelines.format_population_data import FormatPopulationInputs
+
+        units_info = self.get(
+            "units_info",
+            lambda: LoaderCSVtoDataFrame(UnitsInfoPath(self.root_data).get_path()).load(),
+        )
+        trials_properties = self.get(
+            "trials_properties",
+            lambda: LoaderPKL(TrialsPropertiesUnitsPath(self.root_data).get_path()).load(),
+        )
+        mask = (units_info["area"] == task.area) & (units_info["training"] == bool(task.training))
+        units = [Unit(unit) for unit in units_info.loc[mask, "unit"]]
+        return FormatPopulationInputs(
+            area=task.area,
+            training=task.training,
+            units=units,
+            trials_properties=trials_properties.get_subset(units),
+        )
+
+    def create_pipeline(self) -> Any:
+        """Instantiate the pipeline run for each task."""
+        # pylint: disable=import-outside-toplevel
+        from core.pipelines.format_population_data import FormatPopulation
+
+        return FormatPopulation(self.config)
+
+    def run(self, task: PopulationTask) -> TaskResult:
+        """
+        Run the pipeline for one combination and write its marker file if it succeeds.
+
+        Returns
+        -------
+        result : TaskResult
+            Outcome of the task. Errors are caught and reported, so that the other tasks of the
+            batch are not interrupted.
+        """
+        t_start, n_loads = time.perf_counter(), self.n_loads
+        try:
+            self.create_pipeline().execute(self.load_inputs(task))
+        except Exception as exc:  # pylint: disable=broad-except
+            status, error = "failed", f"{type(exc).__name__}: {exc}"
+        else:
+            status, error = "done", ""
+        result = TaskResult(
+            key=task.key,
+            status=status,
+            duration=time.perf_counter() - t_start,
+            rss=current_rss(),
+            n_loads=self.n_loads - n_loads,
+            error=error,
+        )
+        if status == "done":
+            marker = task.marker(self.root_data)
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(json.dumps(asdict(result)), encoding="utf-8")
+        return result
+
+
+_WORKER: Optional[PopulationWorker] = None
+"""Worker of the current process, created by `init_worker` in each process of the pool."""
+
+
+def init_worker(
+    worker_type: Type[PopulationWorker],
+    config: PipelineConfig,
+    root_data: Optional[Union[str, Path]],
+    max_memory: Optional[int],
+) -> None:
+    """Initializer of the processes of the pool: create the worker and set the memory limit."""
+    global _WORKER  # pylint: disable=global-statement
+    if max_memory is not None:
+        set_memory_limit(max_memory)
+    _WORKER = worker_type(config, root_data)
+
+
+def run_task(task: PopulationTask) -> TaskResult:
+    """Run a task with the worker of the current process."""
+    assert _WORKER is not None, "Worker not initialized"
+    return _WORKER.run(task)
+
+
+class BatchPopulations:
+    """
+    Orchestrator of the population tasks in a process pool.
+
+    Attributes
+    ----------
+    config : PipelineConfig
+        Configuration of the pipeline, identical for all the tasks.
+    root_data : Path, optional
+        Root directory of the data.
+    workers : int
+        Number of worker processes. If 1, the tasks are run in the current process.
+    max_memory : int, optional
+        Memory limit of each worker (in bytes). Default: no limit.
+    resume : bool
+        Whether to skip the combinations completed in a previous run (marker file present).
+    worker_type : Type[PopulationWorker]
+        Class of the workers.
+
+    Methods
+    -------
+    `run`
+
+    Examples
+    --------
+    >>> batch = BatchPopulations(config, workers=8, max_memory=16 * 2**30, resume=True)
+    >>> results = batch.run(load_grid())
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        root_data: Optional[Union[str, Path]] = None,
+        workers: int = 1,
+        max_memory: Optional[int] = None,
+        resume: bool = False,
+        worker_type: Type[PopulationWorker] = PopulationWorker,
+    ) -> None:
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: {workers} < 1")
+        if max_memory is not None and max_memory <= 0:
+            raise ValueError(f"Invalid memory limit: {max_memory} <= 0")
+        self.config = config
+        self.root_data = root_data
+        self.workers = workers
+        self.max_memory = max_memory
+        self.resume = resume
+        self.worker_type = worker_type
+
+    def run(
+        self, tasks: List[PopulationTask], callback: Optional[Callable[[TaskResult], None]] = None
+    ) -> List[TaskResult]:
+        """
+        Run all the tasks.
+
+        Arguments
+        ---------
+        tasks : List[PopulationTask]
+            Combinations to build.
+        callback : Callable, optional
+            Function called with the result of each task as soon as it completes (e.g. to report
+            progress).
+
+        Returns
+        -------
+        results : List[TaskResult]
+            Results in the order of the tasks.
+        """
+        results: Dict[str, TaskResult] = {}
+        pending = []
+        for task in tasks:
+            if self.resume and task.marker(self.root_data).is_file():
+                results[task.key] = TaskResult(task.key, "skipped")
+                if callback is not None:
+                    callback(results[task.key])
+            else:
+                pending.append(task)
+        for result in self._execute(pending):
+            results[result.key] = result
+            if callback is not None:
+                callback(result)
+        return [results[task.key] for task in tasks]
+
+    def _execute(self, tasks: List[PopulationTask]) -> Iterator[TaskResult]:
+        """
+        Yield the results of the tasks as soon as they complete.
+
+        With a single worker, the tasks are run in the current process, without memory limit.
+        """
+        if not tasks:
+            return
+        if self.workers == 1:
+            worker = self.worker_type(self.config, self.root_data)
+            for task in tasks:
+                yield worker.run(task)
+            return
+        n_workers = min(self.workers, len(tasks))
+        initargs = (self.worker_type, self.config, self.root_data, self.max_memory)
+        with ProcessPoolExecutor(n_workers, initializer=init_worker, initargs=initargs) as pool:
+            futures = {pool.submit(run_task, task): task for task in tasks}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except BrokenProcessPool as exc:  # worker killed, e.g. by the system out of memory
+                    key = futures[future].key
+                    yield TaskResult(key, "failed", error=f"BrokenProcessPool: {exc}")
@@ -14,6 +14,7 @@ import numpy as np
 
 from core.constants import N_FOLDS, N_TRIALS_MIN, BOOTSTRAP_THRES_PERC, T_BIN, T_MAX
 from core.pipelines.base_pipeline import Pipeline, PipelineConfig, PipelineInputs
+from core.pipelines.task_graph import TaskGraph
 from core.processors.preprocess.count_samples import SampleSizer, TrialsCounter
 from core.attributes.brain_info import Area, Training, Unit
 from core.composites.exp_conditions import ExpCondition
@@ -23,10 +24,11 @@ from core.composites.candidates import Candidates
 from core.coordinates.exp_factor_coord import CoordExpFactor
 from core.coordinates.trial_analysis_label_coord import CoordPseudoTrialsIdx
 from core.coordinates.time_coord import CoordTime
-from core.factories.create_ensembles import EnsemblesBuilder
-from core.factories.create_coord_exp_factor import ExpFactorCoordBuilder
-from core.factories.create_folds import FoldsBuilder
-from core.factories.create_pseudo_trials import PseudoTrialsBuilder
+from core.coordinates.brain_info_coord import CoordUnit
+from core.factories.create_coord_units import FactoryCoordUnit
+from core.factories.create_coord_exp_factor import FactoryCoordExpFactor
+from core.factories.create_folds import FactoryFolds
+from core.factories.create_pseudo_trials import FactoryPseudoTrials
 from core.data_structures.firing_rates_pop import FiringRatesPop
 from core.data_structures.trials_properties import TrialsProperties
 
@@ -59,6 +61,9 @@ class FormatPopulationConfig(PipelineConfig):
         Duration of a trial, in seconds.
     with_time : bool
         Whether to include a time coordinate. Default: True.
+    max_workers : int
+        Number of threads running the independent tasks of the pipeline concurrently. Default: 1
+        (sequential execution).
 
     See Also
     --------
@@ -75,6 +80,7 @@ class FormatPopulationConfig(PipelineConfig):
     t_bin: float | None = T_BIN
     t_max: float | None = T_MAX
     with_time: bool = True
+    max_workers: int = 1
 
 
 @dataclass
@@ -110,86 +116,188 @@ class FormatPopulationInputs(PipelineInputs):
 class FormatPopulation(Pipeline[FormatPopulationConfig, FormatPopulationInputs]):
     """
     Pipeline to format population data.
+
+    Methods
+    -------
+    execute
+    build_graph
+    get_features
+    count_trials
+    size_samples
+    select_units
+    build_ensembles
+    build_pseudo_trials
+    build_trials_coords
+    build_time
+
+    Notes
+    -----
+    The tasks are declared in a `TaskGraph` (see `build_graph`). The coordinates which do not depend
+    on each other (pseudo-trials, trial coordinates, time) can be built concurrently, and the
+    intermediate results (features and counts by unit) are released as soon as they are consumed.
     """
 
+    TARGETS = ("coord_units", "coord_pseudo_trials", "coords_trials", "coord_time")
+    """Outputs of the task graph which are stored in the data structure."""
+
     def __init__(self, config: FormatPopulationConfig, **kwargs: Any) -> None:
         super().__init__(config, **kwargs)
         self.exp_conditions = self.config.exp_condition_type.generate()
 
-    def execute(self, inputs: FormatPopulationInputs) -> None:
+    def execute(self, inputs: FormatPopulationInputs) -> FiringRatesPop:
         """
         Implement the abstract method from the base class `Pipeline`.
+
+        Returns
+        -------
+        data_structure : FiringRatesPop
+            Data structure of the population, with the coordinates of the units, pseudo-trials,
+            trials and time.
         """
         # Initialize the data structure
         data_structure = FiringRatesPop(area=inputs.area, training=inputs.training)
 
-        # Initialize the candidate units
-        units = Candidates(inputs.units)
-        # Retrieve the coordinates of interest along the trials dimension
-        features_by_unit = inputs.trials_properties.apply(
-            lambda tp: CoordinateSet(**tp.get_coords_from_dim("trials"))
+        # Build the coordinates
+        graph = self.build_graph()
+        coords = graph.run(
+            {"units": inputs.units, "trials_properties": inputs.trials_properties},
+            targets=self.TARGETS,
+            max_workers=self.config.max_workers,
         )
+        # shape: (n_ensembles, ensemble_size)
+        data_structure.set_coord("units", coords["coord_units"])
+        data_structure.set_coord("pseudo_trials_idx", coords["coord_pseudo_trials"])
+        for name, coord in coords["coords_trials"].items():
+            data_structure.set_coord(name, coord)
+        if coords["coord_time"] is not None:
+            data_structure.set_coord("time", coords["coord_time"])
+
+        # Create core data values (firing rates)
 
-        # Count the number of trials available for each unit in each condition
+        # Apply pre-processing transformations (normalization, firing rates)
+
+        return data_structure
+
+    def build_graph(self) -> TaskGraph:
+        """
+        Declare the tasks of the pipeline and their dependencies.
+
+        Returns
+        -------
+        graph : TaskGraph
+            Graph consuming the values ``units`` and ``trials_properties`` (inputs of the pipeline).
+        """
+        graph = TaskGraph()
+        graph.add("features_by_unit", self.get_features, inputs=("trials_properties",))
+        graph.add("counts_actual", self.count_trials, inputs=("features_by_unit",))
+        graph.add("counts_final", self.size_samples, inputs=("counts_actual",))
+        graph.add(
+            "selected_units", self.select_units, inputs=("units", "counts_actual", "counts_final")
+        )
+        graph.add("coord_units", self.build_ensembles, inputs=("selected_units",))
+        graph.add(
+            "coord_pseudo_trials",
+            self.build_pseudo_trials,
+            inputs=("coord_units", "features_by_unit", "counts_final"),
+        )
+        graph.add("coords_trials", self.build_trials_coords, inputs=("counts_final",))
+        graph.add("coord_time", self.build_time)
+        return graph
+
+    @staticmethod
+    def get_features(
+        trials_properties: Container[Unit, TrialsProperties],
+    ) -> Container[Unit, CoordinateSet]:
+        """Retrieve the experimental factors along the trials dimension, for each unit."""
+
+        def extract(trials: TrialsProperties) -> CoordinateSet:
+            coords = trials.get_coords_from_dim("trials").values()
+            return CoordinateSet(*(c for c in coords if isinstance(c, CoordExpFactor)))
+
+        return trials_properties.apply(extract)
+
+    def count_trials(
+        self, features_by_unit: Container[Unit, CoordinateSet]
+    ) -> Container[ExpCondition, np.ndarray]:
+        """Count the number of trials available for each unit in each condition."""
         counter = TrialsCounter(features_by_unit=features_by_unit.list_values())
         counts_actual = Container[ExpCondition, np.ndarray].from_keys(
             keys=self.exp_conditions.to_list(),
             fill_value=np.zeros(1),
+            key_type=ExpCondition,
             value_type=np.ndarray,
         )
         counts_actual.fill(counter.process)
-        # Determine the number of trials to form in each condition based on the actual counts
+        return counts_actual
+
+    def size_samples(
+        self, counts_actual: Container[ExpCondition, np.ndarray]
+    ) -> Container[ExpCondition, int]:
+        """Determine the number of trials to form in each condition based on the actual counts."""
         sizer = SampleSizer(self.config.n_folds, self.config.n_min, self.config.thres_perc)
-        counts_final = counts_actual.apply(sizer.process)
+        return counts_actual.apply(sizer.process)
 
-        # Exclude units with insufficient trials in any condition
+    @staticmethod
+    def select_units(
+        units: List[Unit],
+        counts_actual: Container[ExpCondition, np.ndarray],
+        counts_final: Container[ExpCondition, int],
+    ) -> List[Unit]:
+        """Exclude units with insufficient trials in any condition."""
+        candidates = Candidates(units)
         for cond, n_min in counts_final.items():
-            units.filter_by_associated(counts_actual[cond], lambda x: x >= n_min)
+            candidates.filter_by_associated(counts_actual[cond], lambda x: x >= n_min)
+        return candidates.to_list()
+
+    def build_ensembles(self, units: List[Unit]) -> CoordUnit:
+        """Build ensembles (pseudo-populations). Shape: ``(n_ensembles, ensemble_size)``."""
         ens_size = len(units) if self.config.ensemble_size is None else self.config.ensemble_size
+        factory_units = FactoryCoordUnit(ens_size, self.config.n_ensembles_max)
+        return factory_units.create(units=units, seed=0)
 
-        # Build ensembles (pseudo-populations)
-        builder_ens = EnsemblesBuilder(ens_size, self.config.n_ensembles_max)
-        coord_units = builder_ens.build(units=units.to_list(), seed=0)
-        # shape: (n_ensembles, ensemble_size)
-        data_structure.set_coord("units", coord_units)
+    def build_pseudo_trials(
+        self,
+        coord_units: CoordUnit,
+        features_by_unit: Container[Unit, CoordinateSet],
+        counts_final: Container[ExpCondition, int],
+    ) -> CoordPseudoTrialsIdx:
+        """Build folds and pseudo-trials by ensemble, and gather them in a single coordinate."""
         # Split units into ensembles (make duplicate units independent from each other in distinct
         # ensembles): extract rows of `coord_units` (ensembles dimension)
         ensembles = Container(dict(enumerate(coord_units)), key_type=int, value_type=np.ndarray)
-
-        # Initialize trial-related builders with shared parameters
+        # Initialize trial-related factories with shared parameters
         order_conditions = self.exp_conditions.to_list()
-        counts_by_condition = counts_final.to_dict()
-        builder_folds = FoldsBuilder(self.config.n_folds, order_conditions)
-        builder_pseudo_trials = PseudoTrialsBuilder(
-            self.config.n_folds, counts_by_condition, order_conditions
+        factory_folds = FactoryFolds(self.config.n_folds, order_conditions)
+        factory_pseudo_trials = FactoryPseudoTrials(
+            self.config.n_folds, counts_final.to_dict(), order_conditions
         )
-        # Build folds and pseudo-trials by ensemble
         pseudo_trials_by_ensemble: List[CoordPseudoTrialsIdx] = []
-        for ens, ensemble in ensembles.items():  # ens: seed for PseudoTrialsBuilder
+        for ens, ensemble in ensembles.items():  # ens: seed for FactoryPseudoTrials
             # Retrieve features of the units in the ensemble
             features_in_ens = features_by_unit.list_values(ensemble)
             # Build folds for each unit in the ensemble (not saved, implicit in pseudo-trials)
             folds_in_ens = [  # u: seed for FoldAssigner
-                builder_folds.build(features, seed=u) for u, features in enumerate(features_in_ens)
+                factory_folds.create(features, seed=u) for u, features in enumerate(features_in_ens)
             ]
             # Build pseudo-trials for the ensemble
-            pseudo_trials = builder_pseudo_trials.build(features_in_ens, folds_in_ens, seed=ens)
+            pseudo_trials = factory_pseudo_trials.create(features_in_ens, folds_in_ens, seed=ens)
             pseudo_trials_by_ensemble.append(pseudo_trials)
-        # Gather all pseudo-trials in a single coordinate
-        coord_pseudo_trials = builder_pseudo_trials.gather_ensembles(pseudo_trials_by_ensemble)
-        data_structure.set_coord("pseudo_trials_idx", coord_pseudo_trials)
-
-        # Build trial coordinates indicating experimental factors
-        builder_trials_coords = ExpFactorCoordBuilder(counts_by_condition, order_conditions)
-        for name, coord_type in self.config.coords_trials.items():
-            coord = builder_trials_coords.build(coord_type=coord_type)
-            data_structure.set_coord(name, coord)
-
-        # Build time coordinate if needed
-        if self.config.with_time:
-            coord_time = CoordTime.build_labels(t_bin=self.config.t_bin, t_max=self.config.t_max)
-            data_structure.set_coord("time", coord_time)
+        return factory_pseudo_trials.gather_ensembles(pseudo_trials_by_ensemble)
 
-        # Create core data values (firing rates)
+    def build_trials_coords(
+        self, counts_final: Container[ExpCondition, int]
+    ) -> Dict[str, CoordExpFactor]:
+        """Build trial coordinates indicating experimental factors."""
+        factory_trials_coords = FactoryCoordExpFactor(
+            counts_final.to_dict(), self.exp_conditions.to_list()
+        )
+        return {
+            name: factory_trials_coords.create(coord_type=coord_type)
+            for name, coord_type in self.config.coords_trials.items()
+        }
 
-        # Apply pre-processing transformations (normalization, firing rates)
+    def build_time(self) -> CoordTime | None:
+        """Build the time coordinate if needed."""
+        if not self.config.with_time:
+            return None
+        return CoordTime.build_labels(t_bin=self.config.t_bin, t_max=self.config.t_max)
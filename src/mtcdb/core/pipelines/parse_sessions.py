@@ -0,0 +1,285 @@
+"""
+`core.pipelines.parse_sessions` [module]
+
+Classes
+-------
+ParseSessionsConfig
+ParseSessionsInputs
+ParseSessions
+
+Functions
+---------
+parser_fingerprint
+parse_session
+
+Notes
+-----
+Parsing the raw events of all the sessions is required after any change in the parser. Sessions are
+independent from each other, so that they are parsed in parallel in a pool of processes, and each
+session's result is cached on disk to skip unchanged sessions in subsequent runs.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+import hashlib
+from itertools import repeat
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, TypeAlias
+
+import numpy as np
+
+from core.pipelines.base_pipeline import Pipeline, PipelineConfig, PipelineInputs
+from core.processors.parse import extract_events
+from core.processors.parse.extract_events import SessionParser
+from core.attributes.exp_structure import Session
+from core.data_components.core_data import CoreIndices
+from core.data_components.core_dimensions import Dimensions
+from core.coordinates.exp_structure_coord import CoordRecording, CoordBlock, CoordSlot
+from core.coordinates.exp_factor_coord import (
+    CoordTask,
+    CoordAttention,
+    CoordCategory,
+    CoordError,
+)
+from core.coordinates.time_coord import CoordTimeEvent
+from core.data_structures.trials_properties import TrialsProperties
+from utils.io_data.loaders import LoaderCSVtoDataFrame, LoaderPKL
+from utils.io_data.savers import SaverPKL
+from utils.storage_rulers.impl_path_rulers import EventsPropertiesPath, ParsedSessionPath
+
+
+SessionColumns: TypeAlias = Dict[str, np.ndarray]
+"""Type alias for the parsed columns of one session (one element per trial in each column)."""
+
+COLUMNS = ("slot", "block", "category", "t_on", "t_off", "t_warn", "t_end", "error")
+"""Names of the columns produced by `SessionParser`, in the order of its outputs."""
+
+
+@lru_cache(maxsize=1)
+def parser_fingerprint() -> str:
+    """
+    Compute a fingerprint of the source code of the parser, to invalidate the cached sessions after
+    any modification of the parsing rules.
+
+    Returns
+    -------
+    fingerprint : str
+        Hexadecimal digest of the content of the module `core.processors.parse.extract_events`.
+    """
+    return hashlib.sha1(Path(extract_events.__file__).read_bytes()).hexdigest()
+
+
+def parse_session(
+    session: str, root_data: Optional[Path] = None, use_cache: bool = True
+) -> SessionColumns:
+    """
+    Parse the raw events of one session, or retrieve the cached result.
+
+    Arguments
+    ---------
+    session : str
+        Identifier of the session.
+    root_data : Path, optional
+        Root directory of the data, passed to the path rulers. Default: environment variable.
+    use_cache : bool, default=True
+        Whether to reuse (and store) the parsed columns of the session.
+
+    Returns
+    -------
+    columns : SessionColumns
+        Parsed columns of the session. Keys: see :data:`COLUMNS`.
+
+    Notes
+    -----
+    This function is defined at the module level to be picklable by the process pool.
+
+    The cache (Pickle file at the path of `ParsedSessionPath`) stores the parsed columns along
+    with a key made of the modification time and size of the raw events file and the fingerprint of
+    the parser's source code. It is valid as long as neither the raw file nor the parser change.
+
+    See Also
+    --------
+    `parser_fingerprint`
+    """
+    path_events = LoaderCSVtoDataFrame.enforce_ext(
+        EventsPropertiesPath(root_data).get_path(session), LoaderCSVtoDataFrame.EXT
+    )
+    path_cache = SaverPKL.enforce_ext(ParsedSessionPath(root_data).get_path(session), SaverPKL.EXT)
+    stat = path_events.stat()
+    key = (stat.st_mtime_ns, stat.st_size, parser_fingerprint())
+    if use_cache and path_cache.is_file():
+        cached = LoaderPKL(path_cache).load()
+        if cached.get("key") == key:
+            return cached["columns"]
+    events = LoaderCSVtoDataFrame(path_events, cache=False).load()
+    columns = dict(zip(COLUMNS, SessionParser().process(events=events)))
+    if use_cache:
+        path_cache.parent.mkdir(parents=True, exist_ok=True)
+        SaverPKL(path_cache).save({"key": key, "columns": columns})
+    return columns
+
+
+@dataclass
+class ParseSessionsConfig(PipelineConfig):
+    """
+    Configuration for the pipeline to parse sessions.
+
+    Attributes
+    ----------
+    n_workers : int | None
+        Number of worker processes. Default: number of CPUs. If 1, sessions are parsed serially in
+        the current process.
+    use_cache : bool
+        Whether to reuse the parsed sessions from previous runs. Default: True.
+    root_data : Path | None
+        Root directory of the data. Default: environment variable `DATA_DIR`.
+
+    See Also
+    --------
+    `dataclasses.dataclass`
+    """
+
+    n_workers: int | None = None
+    use_cache: bool = True
+    root_data: Path | None = None
+
+
+@dataclass
+class ParseSessionsInputs(PipelineInputs):
+    """
+    Inputs for the pipeline to parse sessions.
+
+    Attributes
+    ----------
+    sessions : List[Session]
+        Sessions to parse and gather (e.g. all the sessions in which one unit was recorded).
+
+    See Also
+    --------
+    `dataclasses.dataclass`
+    """
+
+    sessions: List[Session] = field(default_factory=list)
+
+
+class ParseSessions(Pipeline[ParseSessionsConfig, ParseSessionsInputs]):
+    """
+    Pipeline to parse the raw events of several sessions and gather their trials properties.
+
+    Methods
+    -------
+    `execute`
+    `parse_all`
+    `eval_offsets`
+    `assemble`
+
+    Examples
+    --------
+    >>> config = ParseSessionsConfig(n_workers=8)
+    >>> pipeline = ParseSessions(config)
+    >>> trials_properties = pipeline.execute(ParseSessionsInputs(sessions=sessions))
+
+    See Also
+    --------
+    `parse_session`
+    `core.processors.parse.extract_events.SessionParser`
+    """
+
+    def execute(self, inputs: ParseSessionsInputs) -> TrialsProperties:
+        """
+        Implement the abstract method from the base class `Pipeline`.
+
+        Returns
+        -------
+        trials_properties : TrialsProperties
+            Properties of the trials across all the sessions, in the order of the input sessions.
+        """
+        results = self.parse_all(inputs.sessions)
+        return self.assemble(inputs.sessions, results)
+
+    def parse_all(self, sessions: List[Session]) -> List[SessionColumns]:
+        """
+        Parse all the sessions, in parallel if several workers are available.
+
+        Returns
+        -------
+        results : List[SessionColumns]
+            Parsed columns for each session, in the order of the input sessions.
+
+        See Also
+        --------
+        `concurrent.futures.ProcessPoolExecutor.map`: Preserve the order of the inputs.
+        """
+        n_workers = self.config.n_workers or os.cpu_count() or 1
+        n_workers = min(n_workers, len(sessions))
+        args = (repeat(self.config.root_data), repeat(self.config.use_cache))
+        if n_workers <= 1:
+            return list(map(parse_session, sessions, *args))
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            return list(executor.map(parse_session, sessions, *args))
+
+    @staticmethod
+    def eval_offsets(results: List[SessionColumns]) -> np.ndarray:
+        """
+        Compute the start index of each session among the concatenated trials.
+
+        Returns
+        -------
+        offsets : np.ndarray
+            Offsets of the sessions, followed by the total number of trials.
+            Shape: ``(n_sessions + 1,)``.
+        """
+        counts = [len(columns["slot"]) for columns in results]
+        return np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+
+    @classmethod
+    def assemble(cls, sessions: List[Session], results: List[SessionColumns]) -> TrialsProperties:
+        """
+        Concatenate the parsed columns of all the sessions into a single data structure.
+
+        Arguments
+        ---------
+        sessions : List[Session]
+            Sessions, in the order of the results.
+        results : List[SessionColumns]
+            Parsed columns of each session.
+
+        Returns
+        -------
+        trials_properties : TrialsProperties
+            Properties of the trials across all the sessions, with precomputed offsets.
+
+        Implementation
+        --------------
+        Each column is concatenated once across sessions (instead of appending trial by trial).
+        Session-level labels (recording, task, attention) are broadcast to the trials of each
+        session with `np.repeat` over the counts derived from the offsets.
+        """
+        offsets = cls.eval_offsets(results)
+        counts = np.diff(offsets)
+
+        dims = Dimensions("trials")
+
+        def concat(name: str) -> np.ndarray:
+            return np.concatenate([columns[name] for columns in results])
+
+        def broadcast(labels: List) -> np.ndarray:
+            return np.repeat(np.asarray(labels), counts)
+
+        return TrialsProperties(
+            sessions=list(sessions),
+            data=CoreIndices(np.arange(offsets[-1], dtype=np.int64), dims=dims),
+            offsets=offsets,
+            recording=CoordRecording(broadcast([int(s.recording) for s in sessions]), dims=dims),
+            task=CoordTask(broadcast([str(s.task) for s in sessions]), dims=dims),
+            attention=CoordAttention(broadcast([str(s.attention) for s in sessions]), dims=dims),
+            block=CoordBlock(concat("block"), dims=dims),
+            slot=CoordSlot(concat("slot"), dims=dims),
+            category=CoordCategory(concat("category"), dims=dims),
+            t_on=CoordTimeEvent(concat("t_on"), dims=dims),
+            t_off=CoordTimeEvent(concat("t_off"), dims=dims),
+            t_warn=CoordTimeEvent(concat("t_warn"), dims=dims),
+            t_end=CoordTimeEvent(concat("t_end"), dims=dims),
+            error=CoordError(concat("error"), dims=dims),
+        )
@@ -0,0 +1,324 @@
+"""
+`core.pipelines.task_graph` [module]
+
+Dependency graph of the tasks of a pipeline, executed by a scheduler which runs independent tasks
+concurrently and frees intermediate results as soon as they are consumed.
+
+Classes
+-------
+Node
+TaskGraph
+
+Notes
+-----
+A pipeline declares its tasks (calls to factories, builders or processors) as nodes of a directed
+acyclic graph. Each node consumes named values (inputs of the run or outputs of other nodes) and
+produces named values. The edges of the graph are deduced from these names.
+
+Scheduling: With several workers, the nodes whose inputs are available are submitted to a thread
+pool (the tasks share large arrays, and NumPy releases the GIL in most of its operations). With a
+single worker, the nodes are run in the calling thread in a topological order.
+
+Memory: Each value is referenced by the scheduler until its last consumer completes, then
+released, except the targets of the run which are returned. The peak memory is thus bounded by
+the values live at the same time rather than by all the intermediates of the pipeline.
+
+Examples
+--------
+Declare the tasks of a pipeline:
+
+>>> graph = TaskGraph()
+>>> graph.add("counts", counter.process, inputs=("features",))
+>>> graph.add("sizes", sizer.process, inputs=("counts",))
+>>> graph.add("time", partial(CoordTime.build_labels, t_bin=0.1, t_max=1.0))
+
+Run them with two threads, keeping only the final results:
+
+>>> results = graph.run({"features": features}, targets=("sizes", "time"), max_workers=2)
+
+Visualize the graph with Graphviz:
+
+>>> Path("graph.dot").write_text(graph.to_dot())  # then: dot -Tsvg graph.dot -o graph.svg
+
+See Also
+--------
+`graphlib.TopologicalSorter`: Ordering of the nodes.
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from graphlib import CycleError, TopologicalSorter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from utils.misc.tracing import TRACER, SpanRecord
+
+
+@dataclass(frozen=True)
+class Node:
+    """
+    Task of a graph.
+
+    Attributes
+    ----------
+    name : str
+        Unique name of the node.
+    func : Callable[..., Any]
+        Function called with the values of the inputs as positional arguments, in order.
+    inputs : Tuple[str, ...]
+        Names of the values consumed by the node.
+    outputs : Tuple[str, ...]
+        Names of the values produced by the node. If the node has several outputs, the function
+        should return a tuple of the same length.
+
+    Notes
+    -----
+    Each call opens a span of kind ``node`` (see `utils.misc.tracing`), in which the spans of the
+    factories and processors called by the task are nested.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+    def call(self, values: List[Any], parent: Optional[SpanRecord] = None) -> Dict[str, Any]:
+        """
+        Run the task and name its outputs.
+
+        The span of the task is nested in `parent` when the task runs in a thread of the pool
+        (see `Tracer.span`).
+        """
+        with TRACER.span(self.name, "node", parent):  # no-op if the tracer is disabled
+            result = self.func(*values)
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: result}
+        if len(result) != len(self.outputs):
+            raise ValueError(
+                f"Node '{self.name}' returned {len(result)} values for outputs {self.outputs}."
+            )
+        return dict(zip(self.outputs, result))
+
+
+class TaskGraph:
+    """
+    Directed acyclic graph of tasks exchanging named values.
+
+    Attributes
+    ----------
+    nodes : Dict[str, Node]
+        Nodes by name, in order of registration.
+    producers : Dict[str, str]
+        Name of the node producing each value.
+
+    Methods
+    -------
+    `add`
+    `dependencies`
+    `consumers`
+    `validate`
+    `run`
+    `to_dot`
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, Node] = {}
+        self.producers: Dict[str, str] = {}
+
+    def __repr__(self) -> str:
+        return f"<TaskGraph> {len(self.nodes)} nodes: {', '.join(self.nodes)}"
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] | None = None,
+    ) -> Node:
+        """
+        Register a task.
+
+        Arguments
+        ---------
+        name : str
+            Name of the node, unique in the graph.
+        func : Callable[..., Any]
+            Function of the task. Parameters that are not values of the graph should be bound
+            beforehand (e.g. with `functools.partial`).
+        inputs : Iterable[str]
+            Names of the values passed to the function, in order.
+        outputs : Iterable[str], optional
+            Names of the values returned by the function. Default: single output named as the node.
+
+        Returns
+        -------
+        node : Node
+
+        Raises
+        ------
+        ValueError
+            If the name of the node or of one of its outputs is already used.
+        """
+        if name in self.nodes:
+            raise ValueError(f"Node '{name}' already in the graph.")
+        outputs = (name,) if outputs is None else tuple(outputs)
+        for output in outputs:
+            if output in self.producers:
+                producer = self.producers[output]
+                raise ValueError(f"Value '{output}' already produced by '{producer}'.")
+        node = Node(name, func, tuple(inputs), outputs)
+        self.nodes[name] = node
+        self.producers.update({output: name for output in outputs})
+        return node
+
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Nodes on which each node depends (producers of its inputs)."""
+        return {
+            name: [self.producers[inp] for inp in node.inputs if inp in self.producers]
+            for name, node in self.nodes.items()
+        }
+
+    def consumers(self) -> Dict[str, List[str]]:
+        """Nodes consuming each value (inputs of the runs and outputs of the nodes)."""
+        consumers: Dict[str, List[str]] = {value: [] for value in self.producers}
+        for name, node in self.nodes.items():
+            for inp in node.inputs:
+                consumers.setdefault(inp, []).append(name)
+        return consumers
+
+    def validate(self, inputs: Iterable[str] = (), targets: Iterable[str] = ()) -> List[str]:
+        """
+        Check that the graph can be run and determine a sequential order of the nodes.
+
+        Arguments
+        ---------
+        inputs : Iterable[str]
+            Names of the values provided to the run.
+        targets : Iterable[str]
+            Names of the values to return.
+
+        Returns
+        -------
+        order : List[str]
+            Names of the nodes in a topological order.
+
+        Raises
+        ------
+        ValueError
+            If an input of a node is neither provided nor produced, if a target is not produced, or
+            if the graph contains a cycle.
+        """
+        available = set(inputs) | set(self.producers)
+        for name, node in self.nodes.items():
+            missing = [inp for inp in node.inputs if inp not in available]
+            if missing:
+                raise ValueError(f"Missing inputs for node '{name}': {missing}")
+        missing = [target for target in targets if target not in available]
+        if missing:
+            raise ValueError(f"Targets not produced in the graph: {missing}")
+        try:
+            return list(TopologicalSorter(self.dependencies()).static_order())
+        except CycleError as exc:
+            raise ValueError(f"Cycle in the graph: {exc.args[1]}") from exc
+
+    def run(
+        self,
+        inputs: Mapping[str, Any] | None = None,
+        targets: Iterable[str] = (),
+        max_workers: int = 1,
+    ) -> Dict[str, Any]:
+        """
+        Execute all the nodes, concurrently when their dependencies allow it.
+
+        Arguments
+        ---------
+        inputs : Mapping[str, Any], optional
+            Values consumed by the nodes which are not produced in the graph.
+        targets : Iterable[str]
+            Names of the values to return. All the other values are released after their last
+            consumer.
+        max_workers : int, default=1
+            Number of threads. If 1, the nodes are run sequentially in the calling thread.
+
+        Returns
+        -------
+        results : Dict[str, Any]
+            Values of the targets.
+
+        Raises
+        ------
+        Exception
+            First exception raised by a node. The nodes already submitted complete, and no other
+            node is started.
+
+        Implementation
+        --------------
+        Each value holds a count of its pending consumers. When a node completes, the counts of its
+        inputs are decremented, and the values whose count reaches zero are deleted from the store
+        (values without consumers are not stored), unless they are targets.
+        """
+        inputs = dict(inputs or {})
+        targets = tuple(targets)
+        order = self.validate(inputs, targets)
+        pending = {value: len(names) for value, names in self.consumers().items()}
+        store = {key: value for key, value in inputs.items() if pending.get(key) or key in targets}
+
+        def collect(node: Node, produced: Dict[str, Any]) -> None:
+            for output, value in produced.items():
+                if pending.get(output) or output in targets:
+                    store[output] = value
+            for inp in node.inputs:
+                pending[inp] -= 1
+                if pending[inp] == 0 and inp not in targets:
+                    store.pop(inp, None)  # release the last reference held by the scheduler
+
+        if max_workers <= 1:
+            for name in order:
+                node = self.nodes[name]
+                collect(node, node.call([store[inp] for inp in node.inputs]))
+        else:
+            self._run_concurrent(store, collect, max_workers)
+        return {target: store[target] for target in targets}
+
+    def _run_concurrent(
+        self,
+        store: Dict[str, Any],
+        collect: Callable[[Node, Dict[str, Any]], None],
+        max_workers: int,
+    ) -> None:
+        """Submit the ready nodes to a thread pool until all the nodes are done."""
+        sorter = TopologicalSorter(self.dependencies())
+        sorter.prepare()
+        running: Dict[Future, Node] = {}
+        parent = TRACER.current()  # span of the caller, in which to nest the spans of the nodes
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while sorter.is_active():
+                for name in sorter.get_ready():
+                    node = self.nodes[name]
+                    values = [store[inp] for inp in node.inputs]
+                    future = executor.submit(node.call, values, parent)
+                    running[future] = node
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    collect(node, future.result())  # re-raise the errors of the node
+                    sorter.done(node.name)
+
+    def to_dot(self) -> str:
+        """
+        Describe the graph in the DOT language (Graphviz).
+
+        Returns
+        -------
+        dot : str
+            Tasks as boxes, values as ellipses, edges from the values to their consumers and from
+            the nodes to their outputs.
+        """
+        lines = ["digraph tasks {", "  rankdir=LR;"]
+        for name in self.nodes:
+            lines.append(f'  "{name}" [shape=box];')
+        for value in self.consumers():
+            lines.append(f'  "value:{value}" [shape=ellipse, label="{value}"];')
+        for name, node in self.nodes.items():
+            lines.extend(f'  "value:{inp}" -> "{name}";' for inp in node.inputs)
+            lines.extend(f'  "{name}" -> "value:{output}";' for output in node.outputs)
+        lines.append("}")
+        return "\n".join(lines)
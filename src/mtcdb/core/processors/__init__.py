@@ -13,6 +13,7 @@ Processors are designed to process data using a consistent framework across diff
 Modules
 -------
 `core.processors.base_processor`
+`core.processors.profiling`
 `core.processors.preprocess`
 
 Examples
@@ -171,3 +172,14 @@ Use the processor on actual input data:
     # Output: array([2, 4, 6])}
 
 """
+from utils.misc.lazy import lazy_exports
+
+# Base interface exported lazily (PEP 562), so that importing one processor module does not load
+# the others.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "core.processors.base_processor": ("Processor", "set_random_state"),
+        "core.processors.profiling": ("PROFILER", "profile_processors"),
+    },
+)
@@ -16,6 +16,8 @@ import warnings
 
 import numpy as np
 
+from core.processors.profiling import instrument
+
 
 # --- Base Processor Class ------------------------------------------------------------------------
 
@@ -61,6 +63,8 @@ class Processor(ABC):
             - Compare the new state of `self.__dict__` with the original to identify new attributes.
             - Update the `config_params` set with these new attributes.
         - Replace the original `__init__` method with the new one.
+        - Wrap the `process` method defined by the subclass (if any) to record its calls when the
+          profiler is enabled (see `core.processors.profiling`).
         """
         super().__init_subclass__(**kwargs)
         cls.config_params = set()
@@ -73,6 +77,9 @@ class Processor(ABC):
             cls.config_params.update(new_attributes)
 
         setattr(cls, "__init__", new_init)
+        process = cls.__dict__.get("process")
+        if callable(process) and not getattr(process, "__isabstractmethod__", False):
+            setattr(cls, "process", instrument(process, cls.__name__))
 
     def __repr__(self):
         config = ", ".join(f"{attr}={getattr(self, attr)}" for attr in self.config_params)
@@ -5,6 +5,12 @@ Fit various models on the data.
 
 Modules
 -------
+`cross_validation`
+`decoding`
+`design_matrix`
+`epairs`
+`gmm_sweep`
+`linear_regression`
 
 See Also
 --------
@@ -0,0 +1,215 @@
+"""
+`core.processors.fit_models.cross_validation` [module]
+
+Classes
+-------
+CrossValidator
+
+Notes
+-----
+Folds follow the layout of `FiringRatesPop`, as in `PCADenoiser` and `LinearDecoder`: the targets
+have a ``folds`` axis and a ``trials`` axis, and the pseudo-trials of all the folds share the same
+conditions, hence the same design matrix :math:`X`. In K-fold cross-validation, the model is fitted
+on the pseudo-trials of ``K - 1`` folds and evaluated on those of the remaining fold.
+
+For ordinary least squares, the sufficient statistics of the training set are the Gram matrix and
+the cross-product with the targets, which are sums over the folds. Since all the folds share
+:math:`X`, the training statistics of fold :math:`k` are obtained by "downdating" the statistics of
+the full data set:
+
+.. math::
+
+    X_{train}^T X_{train} = (K - 1) X^T X \\qquad X_{train}^T Y_{train} = \\sum_j X^T Y_j - X^T Y_k
+
+The training Gram matrix is identical for all the folds: it is factorized once, and the
+coefficients of all the folds and targets are obtained by a single solve with multiple right-hand
+sides. The cross-products of all the folds are computed by a single matrix product.
+
+See Also
+--------
+`core.data_structures.firing_rates_pop.FiringRatesPop`: Layout of the input data.
+`core.processors.fit_models.linear_regression.LinearRegressionModel`: Fit on a single set.
+"""
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` method in `CrossValidator`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.processors.base_processor import Processor
+from core.processors.fit_models.linear_regression import LinearRegressionModel
+
+
+class CrossValidator(Processor):
+    """
+    Cross-validate linear regression models sharing the same predictors, for many targets at once.
+
+    Attributes
+    ----------
+    fit_intercept : bool, default=True
+        Whether to fit an intercept for each target.
+
+    Methods
+    -------
+    `eval_stats`
+    `solve_downdated`
+    `eval_r2`
+
+    Examples
+    --------
+    Held-out R² for each ensemble, unit and time bin of a population, with the dimensions of
+    `FiringRatesPop` ``(n_ens, n_units, n_folds, n_trials, n_t)``:
+
+    >>> cv = CrossValidator()
+    >>> r2, predictions = cv.process(X=X, Y=pop.data, folds_axis=2, trials_axis=3)
+    >>> r2.shape  # (n_ens, n_units, n_t)
+
+    See Also
+    --------
+    `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
+    """
+
+    def __init__(self, fit_intercept: bool = True) -> None:
+        self.fit_intercept = fit_intercept
+
+    # --- Processing Methods -----------------------------------------------------------------------
+
+    def process(
+        self,
+        X: Optional[np.ndarray] = None,
+        Y: Optional[np.ndarray] = None,
+        folds_axis: int = 2,
+        trials_axis: int = 3,
+        **kwargs,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        X : np.ndarray
+            Design matrix (predictors) of the pseudo-trials, shared by all the folds.
+            Shape: ``(n_trials, n_features)``.
+        Y : np.ndarray
+            Targets. Shape: any, with ``n_folds`` along `folds_axis` and ``n_trials`` along
+            `trials_axis` (default: dimensions of `FiringRatesPop`).
+        folds_axis, trials_axis : int, default=2, 3
+            Axes of the folds and of the pseudo-trials in `Y`.
+
+        Returns
+        -------
+        r2 : np.ndarray
+            Held-out coefficient of determination for each target, pooled across folds.
+            Shape: shape of `Y` without the folds and trials axes.
+        predictions : np.ndarray
+            Held-out predictions: each fold is predicted by the model fitted on the other folds.
+            Shape: shape of `Y`.
+
+        Raises
+        ------
+        ValueError
+            If the shapes are invalid, or if there are less than two folds.
+        """
+        assert X is not None and Y is not None
+        Y = np.asarray(Y, dtype=np.float64)
+        LinearRegressionModel.validate(X, Y, trials_axis)
+        n_folds = Y.shape[folds_axis]
+        if n_folds < 2:
+            raise ValueError(f"Cross-validation requires >= 2 folds: {n_folds} along {folds_axis}")
+        X = np.asarray(X, dtype=np.float64)
+        if self.fit_intercept:
+            X = np.column_stack([np.ones(len(X)), X])
+        Y_folds = np.moveaxis(Y, (folds_axis, trials_axis), (0, 1))
+        shape_folds = Y_folds.shape
+        Y_folds = Y_folds.reshape(n_folds, len(X), -1)  # (n_folds, n_trials, n_targets)
+        gram, cross_folds = self.eval_stats(X, Y_folds)
+        B = self.solve_downdated(gram, cross_folds)  # (n_folds, p, n_targets)
+        predictions = np.matmul(X, B)  # broadcast over the folds
+        n_targets = Y_folds.shape[2]
+        r2 = self.eval_r2(Y_folds.reshape(-1, n_targets), predictions.reshape(-1, n_targets))
+        r2 = r2.reshape(shape_folds[2:])
+        predictions = predictions.reshape(shape_folds)
+        return r2, np.moveaxis(predictions, (0, 1), (folds_axis, trials_axis))
+
+    @staticmethod
+    def eval_stats(X: np.ndarray, Y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the contributions of each fold to the sufficient statistics.
+
+        Arguments
+        ---------
+        X : np.ndarray
+            Design matrix, including the intercept column if fitted. Shape: ``(n_trials, p)``.
+        Y : np.ndarray
+            Flattened targets of each fold. Shape: ``(n_folds, n_trials, n_targets)``.
+
+        Returns
+        -------
+        gram : np.ndarray
+            Gram matrix :math:`X^T X`, contribution of each fold. Shape: ``(p, p)``.
+        cross_folds : np.ndarray
+            Cross-products :math:`X^T Y_k` of each fold. Shape: ``(n_folds, p, n_targets)``.
+
+        Implementation
+        --------------
+        The cross-products of all the folds are computed by a single BLAS call, with the folds
+        and targets gathered in the columns of the right-hand side.
+        """
+        n_folds, n_trials, n_targets = Y.shape
+        Y_columns = np.moveaxis(Y, 0, 1).reshape(n_trials, n_folds * n_targets)
+        cross = (X.T @ Y_columns).reshape(X.shape[1], n_folds, n_targets)
+        return X.T @ X, np.moveaxis(cross, 1, 0)
+
+    @staticmethod
+    def solve_downdated(gram: np.ndarray, cross_folds: np.ndarray) -> np.ndarray:
+        """
+        Solve the normal equations of the training sets of all the folds by downdating.
+
+        Arguments
+        ---------
+        gram, cross_folds : np.ndarray
+            Contributions of each fold (see `eval_stats`).
+
+        Returns
+        -------
+        B : np.ndarray
+            Coefficients fitted on all the folds except the held-out one, for each fold.
+            Shape: ``(n_folds, p, n_targets)``.
+
+        Notes
+        -----
+        The training Gram matrix is symmetric positive definite if the design has full rank.
+        Otherwise, the minimum-norm solution is obtained with the pseudo-inverse.
+        """
+        from scipy.linalg import LinAlgError, solve  # pylint: disable=import-outside-toplevel
+
+        n_folds, p, n_targets = cross_folds.shape
+        gram_train = (n_folds - 1) * gram
+        cross_train = cross_folds.sum(axis=0) - cross_folds
+        rhs = np.moveaxis(cross_train, 0, 1).reshape(p, n_folds * n_targets)
+        try:
+            B = solve(gram_train, rhs, assume_a="pos")
+        except LinAlgError:
+            B = np.linalg.pinv(gram_train) @ rhs
+        return np.moveaxis(B.reshape(p, n_folds, n_targets), 1, 0)
+
+    @staticmethod
+    def eval_r2(Y: np.ndarray, predictions: np.ndarray) -> np.ndarray:
+        """
+        Compute the coefficient of determination of the held-out predictions for each target.
+
+        Returns
+        -------
+        r2 : np.ndarray
+            :math:`1 - SS_{res} / SS_{tot}`, NaN for constant targets. Shape: ``(n_targets,)``.
+        """
+        ss_res = np.sum((Y - predictions) ** 2, axis=0)
+        ss_tot = np.sum((Y - Y.mean(axis=0)) ** 2, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.nan)
@@ -0,0 +1,265 @@
+"""
+`core.processors.fit_models.decoding` [module]
+
+Classes
+-------
+LinearDecoder
+
+Notes
+-----
+Time-resolved decoding trains one classifier per time bin, to decode an experimental factor (e.g.
+the stimulus category) from the population activity. Cross-temporal generalization evaluates the
+classifier trained at each time bin on the data at every other time bin.
+
+The classifier is a linear discriminant analysis (LDA) with a covariance matrix shared by all the
+classes *and all the time bins* (pooled within-class covariance), and class means specific to each
+time bin. For class :math:`c` and training time :math:`t`:
+
+.. math::
+
+    w_{c,t} = \\Sigma^{-1} \\mu_{c,t} \\qquad b_{c,t} = -\\frac{1}{2} \\mu_{c,t}^T w_{c,t}
+    + \\log \\pi_c
+
+A trial at test time :math:`s` is assigned to the class
+:math:`\\arg\\max_c w_{c,t}^T x_s + b_{c,t}`.
+
+Implementation
+--------------
+- Sharing the covariance across time bins requires a single factorization per training set, and
+  the weights of all the classes and time bins are obtained by one solve with multiple right-hand
+  sides. It also pools more samples into the estimate, which matters with many units.
+- The training sets of the cross-validation are obtained by downdating the sufficient statistics of
+  the full data set (Gram matrix and class sums of each fold), as in `CrossValidator`.
+- The scores of all the pairs of training and test time bins are computed by a single matrix
+  product of the weights ``(n_t * n_classes, n_units)`` with the test data
+  ``(n_units, n_trials * n_t)``.
+
+See Also
+--------
+`core.data_structures.firing_rates_pop.FiringRatesPop`: Layout of the input data.
+`core.processors.fit_models.cross_validation.CrossValidator`: Downdating of the statistics.
+`utils.storage_rulers.impl_path_rulers.DecoderPath`: Storage of the decoders.
+"""
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` method in `LinearDecoder`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.processors.base_processor import Processor
+
+
+class LinearDecoder(Processor):
+    """
+    Decode class labels from pseudo-population activity, for each time bin and across time bins.
+
+    Attributes
+    ----------
+    shrinkage : float, default=0.1
+        Shrinkage of the pooled covariance towards a scaled identity:
+        :math:`(1 - \\lambda) \\Sigma + \\lambda \\frac{tr(\\Sigma)}{n} I`. Required when the
+        number of units approaches the number of training samples.
+    cross_temporal : bool, default=True
+        Whether to evaluate each classifier at all the test time bins (full generalization matrix)
+        or only at its own time bin.
+
+    Methods
+    -------
+    `eval_stats`
+    `fit`
+    `score`
+
+    Examples
+    --------
+    Decode the stimulus category from the firing rates of a pseudo-population:
+
+    >>> decoder = LinearDecoder(shrinkage=0.1)
+    >>> accuracy = decoder.process(data=pop.data, labels=pop.category.values)
+    >>> accuracy.shape  # (n_ens, n_folds, n_t_train, n_t_test)
+
+    See Also
+    --------
+    `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
+    """
+
+    def __init__(self, shrinkage: float = 0.1, cross_temporal: bool = True) -> None:
+        if not 0 <= shrinkage <= 1:
+            raise ValueError(f"Invalid shrinkage: {shrinkage} (expected in [0, 1])")
+        self.shrinkage = shrinkage
+        self.cross_temporal = cross_temporal
+
+    # --- Processing Methods -----------------------------------------------------------------------
+
+    def process(
+        self, data: Optional[np.ndarray] = None, labels: Optional[np.ndarray] = None, **kwargs
+    ) -> np.ndarray:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        data : np.ndarray
+            Firing rates, with the dimensions of `FiringRatesPop`.
+            Shape: ``(n_ens, n_units, n_folds, n_trials, n_t)``.
+        labels : np.ndarray
+            Class label of each pseudo-trial (e.g. values of the coordinate ``category``), shared by
+            all the ensembles and folds. Shape: ``(n_trials,)``.
+
+        Returns
+        -------
+        accuracy : np.ndarray
+            Fraction of test trials correctly classified, when testing on each fold the classifier
+            trained on the other folds.
+            Shape: ``(n_ens, n_folds, n_t_train, n_t_test)`` if `cross_temporal`,
+            ``(n_ens, n_folds, n_t)`` otherwise.
+
+        Raises
+        ------
+        ValueError
+            If the shapes are invalid, or if there are less than two folds or two classes.
+        """
+        assert data is not None and labels is not None
+        labels = np.asarray(labels)
+        if data.ndim != 5 or labels.shape != (data.shape[3],):
+            raise ValueError(f"Invalid data {data.shape} or labels {labels.shape}")
+        classes, codes = np.unique(labels, return_inverse=True)
+        n_ens, _, n_folds, _, n_t = data.shape
+        if n_folds < 2 or len(classes) < 2:
+            raise ValueError(f"Decoding requires >= 2 folds and classes: {n_folds}, {classes}")
+        shape = (n_ens, n_folds, n_t, n_t) if self.cross_temporal else (n_ens, n_folds, n_t)
+        accuracy = np.empty(shape)
+        for i_ens in range(n_ens):
+            x = np.asarray(data[i_ens], dtype=np.float64)  # (n_units, n_folds, n_trials, n_t)
+            gram_folds, sums_folds = self.eval_stats(x, codes, len(classes))
+            counts = np.bincount(codes, minlength=len(classes)) * (n_folds - 1)
+            for k in range(n_folds):
+                gram = gram_folds.sum(axis=0) - gram_folds[k]
+                sums = sums_folds.sum(axis=0) - sums_folds[k]
+                weights, bias = self.fit(gram, sums, counts, n_t, self.shrinkage)
+                accuracy[i_ens, k] = self.score(weights, bias, x[:, k], codes, self.cross_temporal)
+        return accuracy
+
+    @staticmethod
+    def eval_stats(
+        x: np.ndarray, codes: np.ndarray, n_classes: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the sufficient statistics of each fold.
+
+        Arguments
+        ---------
+        x : np.ndarray
+            Firing rates of one ensemble. Shape: ``(n_units, n_folds, n_trials, n_t)``.
+        codes : np.ndarray
+            Class index of each trial. Shape: ``(n_trials,)``.
+        n_classes : int
+            Number of classes.
+
+        Returns
+        -------
+        gram_folds : np.ndarray
+            Uncentered second moments summed over the trials and time bins of each fold.
+            Shape: ``(n_folds, n_units, n_units)``.
+        sums_folds : np.ndarray
+            Sums of the activity over the trials of each class, at each time bin.
+            Shape: ``(n_folds, n_classes, n_units, n_t)``.
+        """
+        n_units, n_folds, n_trials, n_t = x.shape
+        flat = x.reshape(n_units, n_folds, n_trials * n_t)
+        gram_folds = np.einsum("ufs,vfs->fuv", flat, flat, optimize=True)
+        onehot = (codes[:, None] == np.arange(n_classes)).astype(np.float64)  # (n_trials, n_c)
+        sums_folds = np.einsum("ufnt,nc->fcut", x, onehot, optimize=True)
+        return gram_folds, sums_folds
+
+    @staticmethod
+    def fit(
+        gram: np.ndarray, sums: np.ndarray, counts: np.ndarray, n_t: int, shrinkage: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fit the classifiers of all the time bins from the statistics of a training set.
+
+        Arguments
+        ---------
+        gram : np.ndarray
+            Uncentered second moments of the training set. Shape: ``(n_units, n_units)``.
+        sums : np.ndarray
+            Class sums of the training set. Shape: ``(n_classes, n_units, n_t)``.
+        counts : np.ndarray
+            Number of training trials in each class. Shape: ``(n_classes,)``.
+        n_t : int
+            Number of time bins.
+        shrinkage : float
+            See the attributes of the processor.
+
+        Returns
+        -------
+        weights : np.ndarray
+            Discriminant weights. Shape: ``(n_t, n_classes, n_units)``.
+        bias : np.ndarray
+            Discriminant offsets. Shape: ``(n_t, n_classes)``.
+
+        Implementation
+        --------------
+        Pooled within-class scatter: :math:`\\sum x x^T - \\sum_{c,t} n_c \\mu_{c,t} \\mu_{c,t}^T`,
+        divided by the number of degrees of freedom ``n_t * (n_samples - n_classes)``. The
+        regularized covariance is factorized by Cholesky (pseudo-inverse fallback) and the weights
+        of all the classes and time bins are solved at once.
+        """
+        n_classes, n_units, _ = sums.shape
+        means = sums / counts[:, None, None]  # (n_c, n_units, n_t)
+        M = np.moveaxis(means, 2, 0).reshape(n_t * n_classes, n_units).T  # (n_units, n_t * n_c)
+        scatter = gram - (M * np.tile(counts, n_t)) @ M.T
+        cov = scatter / max(n_t * (counts.sum() - n_classes), 1)
+        target = np.trace(cov) / n_units
+        cov = (1 - shrinkage) * cov + shrinkage * target * np.eye(n_units)
+        # pylint: disable=import-outside-toplevel
+        from scipy.linalg import LinAlgError, cho_factor, cho_solve
+
+        try:
+            W = cho_solve(cho_factor(cov), M)
+        except LinAlgError:
+            W = np.linalg.pinv(cov) @ M
+        bias = -0.5 * np.sum(M * W, axis=0) + np.tile(np.log(counts / counts.sum()), n_t)
+        return W.T.reshape(n_t, n_classes, n_units), bias.reshape(n_t, n_classes)
+
+    @staticmethod
+    def score(
+        weights: np.ndarray,
+        bias: np.ndarray,
+        x_test: np.ndarray,
+        codes: np.ndarray,
+        cross_temporal: bool = True,
+    ) -> np.ndarray:
+        """
+        Compute the accuracy of the classifiers on test data.
+
+        Arguments
+        ---------
+        weights, bias : np.ndarray
+            Outputs of `fit`.
+        x_test : np.ndarray
+            Test firing rates. Shape: ``(n_units, n_trials, n_t)``.
+        codes : np.ndarray
+            Class index of each test trial. Shape: ``(n_trials,)``.
+        cross_temporal : bool
+            See the attributes of the processor.
+
+        Returns
+        -------
+        accuracy : np.ndarray
+            Shape: ``(n_t_train, n_t_test)`` if `cross_temporal`, ``(n_t,)`` otherwise.
+        """
+        n_t, n_classes, n_units = weights.shape
+        if cross_temporal:
+            scores = weights.reshape(-1, n_units) @ x_test.reshape(n_units, -1)
+            scores = scores.reshape(n_t, n_classes, *x_test.shape[1:]) + bias[:, :, None, None]
+            predicted = scores.argmax(axis=1)  # (n_t_train, n_trials, n_t_test)
+            return np.mean(predicted == codes[None, :, None], axis=1)
+        scores = np.einsum("tcu,unt->tcn", weights, x_test, optimize=True) + bias[:, :, None]
+        return np.mean(scores.argmax(axis=1) == codes[None, :], axis=1)
@@ -0,0 +1,236 @@
+"""
+`core.processors.fit_models.design_matrix` [module]
+
+Classes
+-------
+DesignMatrixBuilder
+
+Functions
+---------
+build_design
+
+Notes
+-----
+In pseudo-populations, trials are arranged in contiguous blocks of experimental conditions, in the
+order and with the counts used by `FactoryCoordExpFactor` to create the coordinates ``task``,
+``attention`` and ``category``. Therefore, the regressors are constant within each block: the
+design matrix is obtained by computing one row per *condition* and repeating it over the trials of
+the block, without reading the trial labels.
+
+The same design matrix is shared by all the ensembles and folds of a pseudo-population (same
+conditions and counts). It is cached (keyed by the configuration, the order of the conditions and
+their counts) to avoid rebuilding it for each fit. Cached matrices are read-only to prevent side
+effects between clients.
+
+See Also
+--------
+`core.factories.create_coord_exp_factor.FactoryCoordExpFactor`
+`core.processors.fit_models.linear_regression.LinearRegressionModel`
+"""
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` method in `DesignMatrixBuilder`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
+
+from functools import lru_cache
+from itertools import product
+from typing import Hashable, List, Literal, Mapping, Optional, Sequence, Tuple, Type, TypeAlias
+
+import numpy as np
+
+from core.attributes.exp_factors import ExpFactor
+from core.processors.base_processor import Processor
+
+
+Encoding: TypeAlias = Literal["onehot", "effect"]
+"""Type alias for the encodings of the experimental factors."""
+
+Interaction: TypeAlias = Tuple[Type[ExpFactor], ...]
+"""Type alias for an interaction between several experimental factors."""
+
+DesignMatrix: TypeAlias = Tuple[np.ndarray, Tuple[str, ...]]
+"""Type alias for a design matrix, shape ``(n_trials, n_regressors)``, and the regressors' names."""
+
+
+def encode_factor(
+    levels: Sequence[Hashable], name: str, encoding: Encoding
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode one experimental factor for each condition.
+
+    Arguments
+    ---------
+    levels : Sequence[Hashable]
+        Value of the factor in each condition. Length: ``n_conditions``.
+    name : str
+        Name of the factor, used as a prefix for the regressors' names.
+    encoding : Encoding
+        - "onehot": One indicator column per level.
+        - "effect": Sum-to-zero coding, one column per level except the reference (first level in
+          sorted order), which is coded as -1 in all the columns.
+
+    Returns
+    -------
+    columns : np.ndarray
+        Encoded regressors for each condition. Shape: ``(n_conditions, n_columns)``.
+    names : List[str]
+        Names of the regressors, formatted as ``name[level]``.
+    """
+    unique = sorted(set(levels))
+    codes = np.array([unique.index(level) for level in levels], dtype=np.int64)
+    onehot = (codes[:, None] == np.arange(len(unique))).astype(np.float64)
+    if encoding == "onehot":
+        return onehot, [f"{name}[{level}]" for level in unique]
+    if encoding == "effect":
+        columns = onehot[:, 1:] - onehot[:, [0]]
+        return columns, [f"{name}[{level}]" for level in unique[1:]]
+    raise ValueError(f"Invalid encoding: {encoding} ('onehot'/'effect')")
+
+
+@lru_cache(maxsize=32)
+def build_design(
+    factors: Tuple[Type[ExpFactor], ...],
+    encoding: Encoding,
+    interactions: Tuple[Interaction, ...],
+    normalize: bool,
+    conditions: Tuple[Hashable, ...],
+    counts: Tuple[int, ...],
+) -> DesignMatrix:
+    """
+    Build the design matrix for trials arranged in contiguous blocks of conditions (cached).
+
+    Arguments
+    ---------
+    factors, encoding, interactions, normalize
+        See the attributes of `DesignMatrixBuilder`.
+    conditions : Tuple[ExpCondition, ...]
+        Experimental conditions, in the order of the blocks of trials.
+    counts : Tuple[int, ...]
+        Number of trials in each block.
+
+    Returns
+    -------
+    X : np.ndarray
+        Design matrix (read-only). Shape: ``(n_trials, n_regressors)``.
+    names : Tuple[str, ...]
+        Names of the regressors.
+
+    Implementation
+    --------------
+    1. Encode the factors on the conditions only: one row per condition.
+    2. Interactions: products of the columns of the interacting factors (all combinations).
+    3. Normalization: mean and standard deviation of each regressor over the trials, obtained from
+       the rows of the conditions weighted by their counts.
+    4. Repeat the row of each condition over its block of trials.
+    """
+    blocks = {}
+    for factor in factors:
+        levels = [condition.get(factor) for condition in conditions]
+        blocks[factor] = encode_factor(levels, factor.__name__.lower(), encoding)
+    columns = [blocks[factor][0] for factor in factors]
+    names = [name for factor in factors for name in blocks[factor][1]]
+    for interaction in interactions:
+        parts = [blocks[factor] for factor in interaction]
+        for combination in product(*(range(len(names_f)) for _, names_f in parts)):
+            column = np.prod([cols[:, j] for (cols, _), j in zip(parts, combination)], axis=0)
+            columns.append(column[:, None])
+            names.append(":".join(names_f[j] for (_, names_f), j in zip(parts, combination)))
+    rows = np.hstack(columns) if columns else np.zeros((len(conditions), 0))
+    weights = np.asarray(counts, dtype=np.float64)
+    if normalize and weights.sum() > 0:
+        mean = np.average(rows, axis=0, weights=weights)
+        std = np.sqrt(np.average((rows - mean) ** 2, axis=0, weights=weights))
+        rows = (rows - mean) / np.where(std > 0, std, 1.0)
+    X = np.repeat(rows, counts, axis=0)
+    X.setflags(write=False)
+    return X, tuple(names)
+
+
+class DesignMatrixBuilder(Processor):
+    """
+    Build the design matrix of the experimental factors for pseudo-trials arranged by conditions.
+
+    Attributes
+    ----------
+    factors : Tuple[Type[ExpFactor], ...]
+        Experimental factors to encode as regressors (e.g. `Task`, `Attention`, `Category`).
+    encoding : Encoding, default="effect"
+        Encoding of the factors, see `encode_factor`. With "onehot", the columns of each factor sum
+        to one, so that the intercept should not be fitted separately.
+    interactions : Tuple[Interaction, ...], default=()
+        Interactions between factors to add as regressors (e.g. ``((Task, Category),)``).
+    normalize : bool, default=False
+        Whether to z-score each regressor across the trials.
+
+    Examples
+    --------
+    Build the design matrix for the trials created by a `FactoryCoordExpFactor`:
+
+    >>> builder = DesignMatrixBuilder(factors=(Task, Category), interactions=((Task, Category),))
+    >>> X, names = builder.process(
+    ...     order_conditions=factory.order_conditions,
+    ...     counts_by_condition=factory.counts_by_condition,
+    ... )
+    >>> names
+    ('task[PTD]', 'category[T]', 'task[PTD]:category[T]')
+
+    Subsequent calls with the same conditions and counts (e.g. other ensembles or folds) return the
+    cached matrix.
+
+    See Also
+    --------
+    `build_design`
+    `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
+    """
+
+    def __init__(
+        self,
+        factors: Sequence[Type[ExpFactor]],
+        encoding: Encoding = "effect",
+        interactions: Sequence[Interaction] = (),
+        normalize: bool = False,
+    ) -> None:
+        if encoding not in ("onehot", "effect"):
+            raise ValueError(f"Invalid encoding: {encoding} ('onehot'/'effect')")
+        for interaction in interactions:
+            if not set(interaction).issubset(factors):
+                raise ValueError(f"Interaction {interaction} involves factors not in {factors}")
+        self.factors = tuple(factors)
+        self.encoding = encoding
+        self.interactions = tuple(tuple(interaction) for interaction in interactions)
+        self.normalize = normalize
+
+    # --- Processing Methods -----------------------------------------------------------------------
+
+    def process(
+        self,
+        order_conditions: Optional[Sequence[Hashable]] = None,
+        counts_by_condition: Optional[Mapping[Hashable, int]] = None,
+        **kwargs,
+    ) -> DesignMatrix:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        order_conditions : Sequence[ExpCondition]
+            Order of the blocks of conditions along the trials, as in `FactoryCoordExpFactor`.
+        counts_by_condition : Mapping[ExpCondition, int]
+            Number of trials in each condition, as in `FactoryCoordExpFactor`.
+
+        Returns
+        -------
+        X : np.ndarray
+            Design matrix (read-only). Shape: ``(n_trials, n_regressors)``.
+        names : Tuple[str, ...]
+            Names of the regressors.
+        """
+        assert order_conditions is not None and counts_by_condition is not None
+        conditions = tuple(order_conditions)
+        counts = tuple(int(counts_by_condition[condition]) for condition in conditions)
+        return build_design(
+            self.factors, self.encoding, self.interactions, self.normalize, conditions, counts
+        )
@@ -0,0 +1,289 @@
+"""
+`core.processors.fit_models.epairs` [module]
+
+Classes
+-------
+EPAIRS
+
+Notes
+-----
+Elliptical Projection Angle Index of Response Similarity (ePAIRS), from Raposo et al. (2014) and
+Hirokawa et al. (2019): tests whether the selectivity vectors of the units (coefficients of the
+linear model, one vector per unit) are clustered in a few preferred directions, rather than
+distributed according to a random mixed selectivity.
+
+For each unit, the statistic is the mean angle between its selectivity vector and those of its
+``k`` nearest neighbors (smallest angles). The population statistic is the mean of these angles
+across units. It is compared to a null distribution obtained from Gaussian vectors with the same
+covariance as the data (elliptical null: correlated selectivity without clusters). The null vectors
+are centered, so that the selectivity vectors of the data are centered as well before measuring
+their angles: a common offset of all the units is not a cluster.
+
+Implementation
+--------------
+- All the pairwise cosines are computed at once by a matrix product of the normalized vectors, and
+  the largest ``k`` cosines of each unit are selected by partial sorting (`np.partition`), in
+  ``O(n_units^2)`` operations performed in BLAS and NumPy rather than in Python loops.
+- Null draws are generated in batches, as tensors of shape ``(n_batch, n_units, n_features)``. The
+  batch size is chosen so that the draws and the batched cosine matrices
+  ``(n_batch, n_units, n_units)`` fit in a memory budget, so that thousands of draws run in bounded
+  memory.
+- Ensembles are independent and processed in parallel threads (the heavy operations release the
+  GIL). The memory budget is shared by the threads.
+"""
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` method in `EPAIRS`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import os
+from typing import Literal, Optional, Tuple
+
+import numpy as np
+
+from core.processors.base_processor import Processor
+
+
+class EPAIRS(Processor):
+    """
+    Test the clustering of selectivity vectors with the ePAIRS statistic.
+
+    Attributes
+    ----------
+    n_neighbors : int, default=3
+        Number of nearest neighbors averaged for each unit.
+    n_null : int, default=1000
+        Number of draws in the null distribution.
+    alternative : {"two-sided", "less"}, default="two-sided"
+        Alternative hypothesis: angles different from the null ("two-sided") or smaller than the
+        null, i.e. clustered ("less").
+    max_bytes : int, default=2**28
+        Memory budget for the batches of null draws (bytes), shared by all the threads.
+    n_workers : int, optional
+        Number of ensembles processed in parallel. Default: see `ThreadPoolExecutor`.
+
+    Methods
+    -------
+    `nn_angles`
+    `eval_batch_size`
+    `sample_null`
+    `eval_p_value`
+    `test_ensemble`
+
+    Examples
+    --------
+    Test the selectivity coefficients of 2000 units in 100 ensembles (5 regressors):
+
+    >>> epairs = EPAIRS(n_neighbors=3, n_null=1000)
+    >>> angles, null_stats, p_values = epairs.process(coefficients=B, seed=0)
+    >>> angles.shape, null_stats.shape, p_values.shape
+    ((100, 2000), (100, 1000), (100,))
+
+    See Also
+    --------
+    `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
+    """
+
+    def __init__(
+        self,
+        n_neighbors: int = 3,
+        n_null: int = 1000,
+        alternative: Literal["two-sided", "less"] = "two-sided",
+        max_bytes: int = 1 << 28,
+        n_workers: Optional[int] = None,
+    ) -> None:
+        if alternative not in ("two-sided", "less"):
+            raise ValueError(f"Invalid alternative: {alternative} ('two-sided'/'less')")
+        self.n_neighbors = n_neighbors
+        self.n_null = n_null
+        self.alternative = alternative
+        self.max_bytes = max_bytes
+        self.n_workers = n_workers
+
+    # --- Processing Methods -----------------------------------------------------------------------
+
+    def process(
+        self, coefficients: Optional[np.ndarray] = None, seed: int = 0, **kwargs
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        coefficients : np.ndarray
+            Selectivity vectors of the units. Shape: ``(n_ens, n_units, n_features)``, or
+            ``(n_units, n_features)`` for a single ensemble.
+        seed : int
+            Seed for the null draws. Each ensemble uses an independent stream derived from it, so
+            that the results do not depend on the scheduling of the threads.
+
+        Returns
+        -------
+        angles : np.ndarray
+            Mean angle (radians) between each unit and its nearest neighbors, after centering the
+            selectivity vectors of the ensemble. Shape: ``(n_ens, n_units)``.
+        null_stats : np.ndarray
+            Population statistic (mean angle across units) for each null draw.
+            Shape: ``(n_ens, n_null)``.
+        p_values : np.ndarray
+            P-value of the population statistic of the data under the null. Shape: ``(n_ens,)``.
+        """
+        assert coefficients is not None
+        B = np.asarray(coefficients, dtype=np.float64)
+        if B.ndim == 2:
+            B = B[None]
+        if B.ndim != 3 or B.shape[1] <= self.n_neighbors:
+            raise ValueError(f"Invalid shape: {B.shape} (n_ens, n_units > n_neighbors, n_feat)")
+        streams = np.random.SeedSequence(seed).spawn(len(B))
+        n_workers = min(self.n_workers or os.cpu_count() or 1, len(B))
+        test = partial(self.test_ensemble, max_bytes=self.max_bytes // n_workers)
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(test, B, streams))
+        angles, null_stats, p_values = map(np.stack, zip(*results))
+        return angles, null_stats, p_values
+
+    def test_ensemble(
+        self, B: np.ndarray, seed: np.random.SeedSequence, max_bytes: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Compute the ePAIRS statistic and its null distribution for one ensemble.
+
+        Arguments
+        ---------
+        B : np.ndarray
+            Selectivity vectors. Shape: ``(n_units, n_features)``.
+        seed : np.random.SeedSequence
+            Independent random stream for this ensemble.
+        max_bytes : int, optional
+            Memory budget of this ensemble. Default: `max_bytes` of the processor.
+
+        Returns
+        -------
+        angles, null_stats, p_value
+            See the outputs of `process`, for one ensemble. The angles are measured between the
+            centered selectivity vectors, as in the null draws.
+        """
+        rng = np.random.default_rng(seed)
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        angles = self.nn_angles(B - B.mean(axis=0), self.n_neighbors)
+        null_stats = self.sample_null(B, self.n_null, self.n_neighbors, max_bytes, rng)
+        p_value = self.eval_p_value(float(angles.mean()), null_stats, self.alternative)
+        return angles, null_stats, p_value
+
+    @staticmethod
+    def nn_angles(B: np.ndarray, n_neighbors: int) -> np.ndarray:
+        """
+        Compute the mean angle between each vector and its nearest neighbors.
+
+        Arguments
+        ---------
+        B : np.ndarray
+            Vectors. Shape: ``(..., n_units, n_features)``, with optional batch dimensions.
+        n_neighbors : int
+            Number of nearest neighbors.
+
+        Returns
+        -------
+        angles : np.ndarray
+            Mean angle (radians) to the nearest neighbors. Shape: ``(..., n_units)``.
+
+        Implementation
+        --------------
+        The nearest neighbors have the largest cosines. The unit itself is excluded by setting the
+        diagonal to -inf. `np.partition` places the ``k`` largest cosines in the last positions
+        without sorting the full rows.
+        """
+        norms = np.linalg.norm(B, axis=-1, keepdims=True)
+        V = B / np.where(norms > 0, norms, 1.0)
+        cos = V @ np.swapaxes(V, -1, -2)
+        n_units = cos.shape[-1]
+        diag = np.arange(n_units)
+        cos[..., diag, diag] = -np.inf
+        nearest = np.partition(cos, n_units - n_neighbors, axis=-1)[..., n_units - n_neighbors :]
+        return np.arccos(np.clip(nearest, -1.0, 1.0)).mean(axis=-1)
+
+    @staticmethod
+    def eval_batch_size(n_units: int, n_features: int, n_null: int, max_bytes: int) -> int:
+        """
+        Number of null draws per batch, so that the arrays of a batch fit in `max_bytes`.
+
+        Notes
+        -----
+        Arrays per draw: cosine matrix and its partition (``n_units * n_units`` each), standard
+        normal vectors, correlated vectors and normalized vectors (``n_units * n_features`` each).
+        """
+        n_values = 2 * n_units * n_units + 3 * n_units * n_features
+        per_draw = n_values * np.dtype(np.float64).itemsize
+        return int(np.clip(max_bytes // per_draw, 1, max(n_null, 1)))
+
+    @classmethod
+    def sample_null(
+        cls,
+        B: np.ndarray,
+        n_null: int,
+        n_neighbors: int,
+        max_bytes: int,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """
+        Sample the null distribution of the population statistic.
+
+        Arguments
+        ---------
+        B : np.ndarray
+            Selectivity vectors of the data, used to estimate the covariance of the null.
+            Shape: ``(n_units, n_features)``.
+        n_null, n_neighbors, max_bytes
+            See the attributes of the processor.
+        rng : np.random.Generator
+            Random generator.
+
+        Returns
+        -------
+        null_stats : np.ndarray
+            Mean angle across units for each null draw. Shape: ``(n_null,)``.
+
+        Implementation
+        --------------
+        Gaussian vectors with covariance :math:`\\Sigma = L L^T` are obtained as :math:`Z L^T` from
+        standard normal vectors :math:`Z`. The factor `L` is computed from the eigendecomposition of
+        the empirical covariance, which is robust to singular covariances (e.g. collinear
+        regressors). The null vectors have zero mean, as the centered vectors of the data compared
+        to them (see `test_ensemble`).
+        """
+        n_units, n_features = B.shape
+        cov = np.atleast_2d(np.cov(B, rowvar=False))
+        eigval, eigvec = np.linalg.eigh(cov)
+        L = eigvec * np.sqrt(np.clip(eigval, 0, None))
+        batch = cls.eval_batch_size(n_units, n_features, n_null, max_bytes)
+        null_stats = np.empty(n_null)
+        for start in range(0, n_null, batch):
+            n_draws = min(batch, n_null - start)
+            Z = rng.standard_normal((n_draws, n_units, n_features)) @ L.T
+            null_stats[start : start + n_draws] = cls.nn_angles(Z, n_neighbors).mean(axis=-1)
+        return null_stats
+
+    @staticmethod
+    def eval_p_value(
+        statistic: float, null_stats: np.ndarray, alternative: Literal["two-sided", "less"]
+    ) -> float:
+        """
+        Compute the empirical p-value of a statistic under the null distribution.
+
+        Notes
+        -----
+        The counts include the observed statistic itself (``+ 1``) so that the p-value is never 0
+        with a finite number of draws.
+        """
+        n = len(null_stats)
+        p_less = (1 + np.sum(null_stats <= statistic)) / (1 + n)
+        if alternative == "less":
+            return float(p_less)
+        p_greater = (1 + np.sum(null_stats >= statistic)) / (1 + n)
+        return float(min(1.0, 2 * min(p_less, p_greater)))
@@ -0,0 +1,318 @@
+"""
+`core.processors.fit_models.gmm_sweep` [module]
+
+Classes
+-------
+GMMSweep
+
+Functions
+---------
+log_densities
+fit_em
+split_component
+fit_chain
+
+Notes
+-----
+Estimation of the number of subpopulations (Hirokawa et al., 2019): Gaussian mixture models (GMM)
+are fitted on the selectivity vectors of the units for an increasing number of clusters ``k``. The
+increase of the log-likelihood for each additional cluster is compared across conditions (e.g.
+against the increases obtained on null data without clusters).
+
+Implementation
+--------------
+- Warm starts: the model with ``k`` clusters is initialized from the model with ``k - 1`` clusters,
+  by splitting one of its components along its principal axis. Therefore, the models with
+  successive numbers of clusters are fitted in a single "chain", and each EM run starts close to
+  its optimum.
+- Restarts: each chain is repeated with different random choices of the components to split. The
+  best log-likelihood across restarts is retained for each ``k``.
+- Parallelism: the chains of all the ensembles and restarts are independent tasks, distributed in
+  a process pool. Each task receives its own seed sequence, so that the results do not depend on
+  the number of workers.
+- EM is implemented in NumPy with full covariance matrices, vectorized over the components.
+"""
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` method in `GMMSweep`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import os
+from typing import Optional, Tuple, TypeAlias
+
+import numpy as np
+import pandas as pd
+
+from core.processors.base_processor import Processor
+
+
+GMMParams: TypeAlias = Tuple[np.ndarray, np.ndarray, np.ndarray]
+"""Parameters of a GMM: weights ``(k,)``, means ``(k, n_features)``, covariances
+``(k, n_features, n_features)``."""
+
+
+def log_densities(X: np.ndarray, means: np.ndarray, covs: np.ndarray) -> np.ndarray:
+    """
+    Compute the log-densities of the samples under each Gaussian component.
+
+    Arguments
+    ---------
+    X : np.ndarray
+        Samples. Shape: ``(n_samples, n_features)``.
+    means, covs : np.ndarray
+        Parameters of the components. Shapes: ``(k, n_features)``, ``(k, n_features, n_features)``.
+
+    Returns
+    -------
+    log_dens : np.ndarray
+        Shape: ``(n_samples, k)``.
+    """
+    n_features = X.shape[1]
+    L = np.linalg.cholesky(covs)  # (k, d, d)
+    diff = X[None, :, :] - means[:, None, :]  # (k, n, d)
+    z = np.linalg.solve(L, np.swapaxes(diff, 1, 2))  # (k, d, n)
+    maha = np.sum(z**2, axis=1)  # (k, n)
+    log_det = 2 * np.sum(np.log(np.diagonal(L, axis1=1, axis2=2)), axis=1)  # (k,)
+    return (-0.5 * (maha + log_det[:, None] + n_features * np.log(2 * np.pi))).T
+
+
+def fit_em(
+    X: np.ndarray, params: GMMParams, max_iter: int, tol: float, reg_covar: float
+) -> Tuple[GMMParams, float]:
+    """
+    Fit a GMM by expectation-maximization from initial parameters.
+
+    Returns
+    -------
+    params : GMMParams
+        Fitted parameters.
+    log_likelihood : float
+        Total log-likelihood of the samples under the fitted model.
+    """
+    weights, means, covs = params
+    n_samples, n_features = X.shape
+    eye = reg_covar * np.eye(n_features)
+    log_likelihood = -np.inf
+    for _ in range(max_iter):
+        log_joint = log_densities(X, means, covs) + np.log(weights)
+        log_norm = np.logaddexp.reduce(log_joint, axis=1)
+        resp = np.exp(log_joint - log_norm[:, None])
+        previous, log_likelihood = log_likelihood, float(log_norm.sum())
+        if abs(log_likelihood - previous) <= tol * n_samples:
+            break
+        nk = resp.sum(axis=0) + 10 * np.finfo(np.float64).eps
+        weights = nk / n_samples
+        means = (resp.T @ X) / nk[:, None]
+        diff = X[None, :, :] - means[:, None, :]
+        covs = np.einsum("nk,kni,knj->kij", resp, diff, diff) / nk[:, None, None] + eye
+    else:  # evaluate the parameters of the last M-step
+        log_joint = log_densities(X, means, covs) + np.log(weights)
+        log_likelihood = float(np.logaddexp.reduce(log_joint, axis=1).sum())
+    return (weights, means, covs), log_likelihood
+
+
+def split_component(params: GMMParams, rng: np.random.Generator) -> GMMParams:
+    """
+    Add one component by splitting an existing one along its principal axis.
+
+    The component to split is drawn with a probability proportional to its weight. The two halves
+    are shifted by one standard deviation along the principal axis, in opposite directions.
+    """
+    weights, means, covs = params
+    j = rng.choice(len(weights), p=weights / weights.sum())
+    eigval, eigvec = np.linalg.eigh(covs[j])
+    shift = np.sqrt(max(eigval[-1], 0.0)) * eigvec[:, -1]
+    weights = np.concatenate([weights, [weights[j] / 2]])
+    weights[j] /= 2
+    means = np.vstack([means, means[j] + shift])
+    means[j] = means[j] - shift
+    covs = np.concatenate([covs, covs[j][None]])
+    return weights, means, covs
+
+
+def fit_chain(
+    X: np.ndarray,
+    k_max: int,
+    seed: np.random.SeedSequence,
+    max_iter: int = 200,
+    tol: float = 1e-6,
+    reg_covar: float = 1e-6,
+) -> np.ndarray:
+    """
+    Fit GMMs with 1 to `k_max` components, each warm-started from the previous one.
+
+    Arguments
+    ---------
+    X : np.ndarray
+        Samples (selectivity vectors of one ensemble). Shape: ``(n_samples, n_features)``.
+    k_max : int
+        Maximal number of components.
+    seed : np.random.SeedSequence
+        Random stream for the choices of the components to split.
+    max_iter, tol, reg_covar
+        See the attributes of `GMMSweep`.
+
+    Returns
+    -------
+    log_likelihoods : np.ndarray
+        Log-likelihood of the model with ``k`` components, for ``k = 1, ..., k_max``.
+        Shape: ``(k_max,)``.
+
+    Notes
+    -----
+    This function is defined at the module level to be picklable by the process pool.
+    """
+    rng = np.random.default_rng(seed)
+    n_features = X.shape[1]
+    cov = np.atleast_2d(np.cov(X, rowvar=False, bias=True)) + reg_covar * np.eye(n_features)
+    params: GMMParams = (np.ones(1), X.mean(axis=0, keepdims=True), cov[None])
+    params, log_likelihood = fit_em(X, params, 1, tol, reg_covar)  # one M-step: closed form
+    log_likelihoods = np.empty(k_max)
+    log_likelihoods[0] = log_likelihood
+    for k in range(1, k_max):
+        params, log_likelihoods[k] = fit_em(
+            X, split_component(params, rng), max_iter, tol, reg_covar
+        )
+    return log_likelihoods
+
+
+class GMMSweep(Processor):
+    """
+    Sweep the number of clusters of Gaussian mixture models on selectivity vectors.
+
+    Attributes
+    ----------
+    k_max : int, default=10
+        Maximal number of clusters.
+    n_restarts : int, default=20
+        Number of chains fitted per ensemble, with different random splits.
+    max_iter : int, default=200
+        Maximal number of EM iterations for each model.
+    tol : float, default=1e-6
+        Convergence threshold on the change of the log-likelihood per sample.
+    reg_covar : float, default=1e-6
+        Regularization added to the diagonal of the covariances.
+    n_workers : int, optional
+        Number of worker processes. Default: number of CPUs. If 1, chains are fitted serially.
+
+    Methods
+    -------
+    `to_table`
+
+    Examples
+    --------
+    Sweep 10 numbers of clusters with 20 restarts for 100 ensembles of selectivity vectors:
+
+    >>> sweep = GMMSweep(k_max=10, n_restarts=20)
+    >>> table = sweep.process(coefficients=B, seed=0)  # B: (100, n_units, n_features)
+    >>> table.columns.tolist()
+    ['ensemble', 'k', 'log_likelihood', 'delta_log_likelihood']
+
+    See Also
+    --------
+    `core.processors.fit_models.epairs.EPAIRS`: Test for the presence of clusters.
+    `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
+    """
+
+    def __init__(
+        self,
+        k_max: int = 10,
+        n_restarts: int = 20,
+        max_iter: int = 200,
+        tol: float = 1e-6,
+        reg_covar: float = 1e-6,
+        n_workers: Optional[int] = None,
+    ) -> None:
+        if k_max < 1 or n_restarts < 1:
+            raise ValueError(f"Invalid sweep: k_max={k_max}, n_restarts={n_restarts} (>= 1)")
+        self.k_max = k_max
+        self.n_restarts = n_restarts
+        self.max_iter = max_iter
+        self.tol = tol
+        self.reg_covar = reg_covar
+        self.n_workers = n_workers
+
+    # --- Processing Methods -----------------------------------------------------------------------
+
+    def process(
+        self, coefficients: Optional[np.ndarray] = None, seed: int = 0, **kwargs
+    ) -> pd.DataFrame:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        coefficients : np.ndarray
+            Selectivity vectors of the units. Shape: ``(n_ens, n_units, n_features)``, or
+            ``(n_units, n_features)`` for a single ensemble.
+        seed : int
+            Seed for the random splits. Each chain uses an independent stream derived from it.
+
+        Returns
+        -------
+        table : pd.DataFrame
+            See `to_table`.
+        """
+        assert coefficients is not None
+        B = np.asarray(coefficients, dtype=np.float64)
+        if B.ndim == 2:
+            B = B[None]
+        if B.ndim != 3 or B.shape[1] < self.k_max:
+            raise ValueError(f"Invalid shape: {B.shape} (n_ens, n_units >= k_max, n_features)")
+        n_ens = len(B)
+        streams = np.random.SeedSequence(seed).spawn(n_ens * self.n_restarts)
+        samples = [B[i] for i in range(n_ens) for _ in range(self.n_restarts)]
+        args = (
+            samples,
+            repeat(self.k_max),
+            streams,
+            repeat(self.max_iter),
+            repeat(self.tol),
+            repeat(self.reg_covar),
+        )
+        n_workers = min(self.n_workers or os.cpu_count() or 1, len(samples))
+        if n_workers <= 1:
+            chains = list(map(fit_chain, *args))
+        else:
+            chunksize = max(1, len(samples) // (4 * n_workers))
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                chains = list(executor.map(fit_chain, *args, chunksize=chunksize))
+        log_likelihoods = np.reshape(chains, (n_ens, self.n_restarts, self.k_max)).max(axis=1)
+        return self.to_table(log_likelihoods)
+
+    @staticmethod
+    def to_table(log_likelihoods: np.ndarray) -> pd.DataFrame:
+        """
+        Gather the best log-likelihoods and their increases in a long-format table.
+
+        Arguments
+        ---------
+        log_likelihoods : np.ndarray
+            Best log-likelihood across restarts. Shape: ``(n_ens, k_max)``.
+
+        Returns
+        -------
+        table : pd.DataFrame
+            One row per ensemble and number of clusters, with columns:
+
+            - ``ensemble``: Index of the ensemble.
+            - ``k``: Number of clusters.
+            - ``log_likelihood``: Best log-likelihood across restarts.
+            - ``delta_log_likelihood``: Increase from ``k - 1`` to ``k`` clusters (NaN for k=1).
+        """
+        n_ens, k_max = log_likelihoods.shape
+        delta = np.full_like(log_likelihoods, np.nan)
+        delta[:, 1:] = np.diff(log_likelihoods, axis=1)
+        return pd.DataFrame(
+            {
+                "ensemble": np.repeat(np.arange(n_ens), k_max),
+                "k": np.tile(np.arange(1, k_max + 1), n_ens),
+                "log_likelihood": log_likelihoods.ravel(),
+                "delta_log_likelihood": delta.ravel(),
+            }
+        )
@@ -9,6 +9,11 @@ Notes
 -----
 The processor is not called `LinearRegression` to avoid confusion with the scikit-learn class.
 
+In the analysis, the same regressors (design matrix `X`) are used to fit the activity of all the
+units at all the time points, within each fold. Ordinary least squares solutions for all these
+targets share the same operator :math:`X^+ = (X^T X)^{-1} X^T`, which only depends on `X`.
+Therefore, `X` is factorized once, and all the targets are solved by a single matrix product
+:math:`B = X^+ Y`, where the columns of `Y` gather all the units and time points.
 """
 # DISABLED WARNINGS
 # --------------------------------------------------------------------------------------------------
@@ -17,142 +22,215 @@ The processor is not called `LinearRegression` to avoid confusion with the sciki
 # Reason: See the note in ``core/__init__.py``
 # --------------------------------------------------------------------------------------------------
 
-
-from typing import Literal, overload, TypeAlias, Any, Tuple, Union, List, Dict
+from typing import Literal, TypeAlias, Any, Tuple, Optional
 
 import numpy as np
-from sklearn.linear_model import LinearRegression
-
 
 from core.processors.base_processor import Processor
 
 
+SolverOperator: TypeAlias = np.ndarray[Tuple[Any, Any], np.dtype[np.float64]]
+"""Type alias for the least squares operator of a design matrix. Shape: ``(n_features, n_trials)``,
+with one additional row for the intercept (first row) if it is fitted."""
+
+
 class LinearRegressionModel(Processor):
     """
-    Fitting a linear regression model on input data.
-    This class fits a linear model to predict the target variable `y` from predictors `X`.
-    The model uses the ordinary least squares method for fitting.
-
-    Configuration Attributes
-    ------------------------
-    fit_intercept : bool, optional
-        Whether to calculate the intercept for this model. If set to False, no intercept will be
-        used.
-    normalize : bool, optional
-        Whether to normalize the predictors before fitting. If `fit_intercept` is set to False, this
-        is ignored.
-
-    Processing Arguments
-    --------------------
-    X : np.ndarray
-        Predictor data of shape (n_samples, n_features).
-    y : np.ndarray
-        Target values of shape (n_samples,).
-
-    Returns
-    -------
-    coefficients : np.ndarray
-        Coefficients of the linear model, shape (n_features,).
-    intercept : float
-        Intercept of the model, scalar.
+    Fit linear regression models sharing the same predictors, for many targets at once.
+
+    The model uses the ordinary least squares method for fitting:
+
+    .. math::
+
+        Y = \\beta_0 + X B + \\epsilon
+
+    Attributes
+    ----------
+    fit_intercept : bool, default=True
+        Whether to fit an intercept for each target. If False, the data is assumed to be centered.
+    method : {"qr", "pinv"}, default="qr"
+        Method to factorize the design matrix:
+
+        - "qr": QR decomposition, numerically stable for full-rank design matrices. Falls back to
+          "pinv" if the design matrix is rank-deficient.
+        - "pinv": Moore-Penrose pseudo-inverse (SVD), minimum-norm solution for rank-deficient
+          design matrices.
 
     Methods
     -------
-    `fit`
+    `factorize`
+    `solve`
     `predict`
 
     Examples
     --------
+    Fit the firing rates of a population, shape ``(n_units, n_trials, n_t)``, with the trials along
+    axis 1:
 
+    >>> model = LinearRegressionModel()
+    >>> coefficients, intercept = model.process(X=X, Y=rates, axis=1)
+    >>> coefficients.shape  # (n_units, n_features, n_t)
+    >>> intercept.shape  # (n_units, n_t)
+
+    Reuse the factorization of the design matrix across several calls (e.g. ensembles):
+
+    >>> operator = model.factorize(X, fit_intercept=True)
+    >>> for rates in ensembles:
+    ...     coefficients, intercept = model.process(X=X, Y=rates, axis=1, operator=operator)
 
     See Also
     --------
     `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
     """
 
-    IS_RANDOM = False
-
-    def __init__(self):
-        super().__init__()
+    def __init__(self, fit_intercept: bool = True, method: Literal["qr", "pinv"] = "qr") -> None:
+        if method not in ("qr", "pinv"):
+            raise ValueError(f"Invalid method: {method} ('qr'/'pinv')")
+        self.fit_intercept = fit_intercept
+        self.method = method
 
     # --- Processing Methods -----------------------------------------------------------------------
 
-    def _process(self, **input_data: Any):
-        """Implement the template method called in the base class `process` method."""
-
-    def __init__(self, fit_intercept: bool = True, normalize: bool = False) -> None:
-        self.fit_intercept = fit_intercept
-        self.normalize = normalize
-        self.model = LinearRegression(fit_intercept=self.fit_intercept)
-        self.is_fitted = False
+    def process(
+        self,
+        X: Optional[np.ndarray] = None,
+        Y: Optional[np.ndarray] = None,
+        axis: int = 0,
+        operator: Optional[SolverOperator] = None,
+        **kwargs,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Implement the abstract method of the base class `Processor`.
 
-    # --- Validation Method -----------------------------------------------------------------------
+        Arguments
+        ---------
+        X : np.ndarray
+            Design matrix (predictors). Shape: ``(n_trials, n_features)``.
+        Y : np.ndarray
+            Targets. Shape: any, with ``n_trials`` along `axis`. For instance, firing rates of a
+            pseudo-population, shape ``(n_ens, n_units, n_trials, n_t)`` with ``axis=2``.
+        axis : int, default=0
+            Axis of the trials in `Y`.
+        operator : SolverOperator, optional
+            Precomputed least squares operator of `X` (see `factorize`), to skip the factorization.
 
-    def _pre_process(self, **input_data: Any) -> Dict[str, Any]:
+        Returns
+        -------
+        coefficients : np.ndarray
+            Coefficients of the linear models. Shape: shape of `Y`, with the trials axis replaced by
+            the features axis (length ``n_features``).
+        intercept : np.ndarray
+            Intercepts of the linear models. Shape: shape of `Y` without the trials axis. Zeros if
+            `fit_intercept` is False.
+        """
+        assert X is not None and Y is not None
+        self.validate(X, Y, axis)
+        if operator is None:
+            operator = self.factorize(X, fit_intercept=self.fit_intercept, method=self.method)
+        Y_trials = np.moveaxis(Y, axis, 0)
+        B = self.solve(operator, Y_trials.reshape(len(Y_trials), -1))
+        B = B.reshape(len(B), *Y_trials.shape[1:])
+        if self.fit_intercept:
+            intercept, coefficients = B[0], B[1:]
+        else:
+            intercept, coefficients = np.zeros(Y_trials.shape[1:]), B
+        return np.moveaxis(coefficients, 0, axis % Y.ndim), intercept
+
+    @staticmethod
+    def validate(X: np.ndarray, Y: np.ndarray, axis: int) -> None:
         """
-        Validate the input data for linear regression fitting.
+        Validate the shapes of the design matrix and the targets.
 
         Raises
         ------
         ValueError
-            If `X` and `y` have incompatible shapes.
+            If `X` is not 2D or if the number of trials differs between `X` and `Y`.
         """
-        X = input_data.get("X")
-        y = input_data.get("y")
-
-        if X is None or y is None:
-            raise ValueError("Both `X` (predictors) and `y` (target) must be provided.")
         if X.ndim != 2:
-            raise ValueError("`X` must be a 2D array with shape (n_samples, n_features).")
-        if y.ndim != 1 or y.shape[0] != X.shape[0]:
-            raise ValueError(
-                "`y` must be a 1D array with length matching the number of samples in `X`."
-            )
-
-        return {"X": X, "y": y}
-
-    # --- Processing Method -----------------------------------------------------------------------
+            raise ValueError(f"Invalid shape for X: {X.shape} (expected (n_trials, n_features))")
+        if Y.shape[axis] != X.shape[0]:
+            raise ValueError(f"Mismatch in trials: X {X.shape[0]} != Y {Y.shape[axis]} ({axis=})")
+
+    @staticmethod
+    def factorize(
+        X: np.ndarray, fit_intercept: bool = True, method: Literal["qr", "pinv"] = "qr"
+    ) -> SolverOperator:
+        """
+        Compute the least squares operator of a design matrix.
 
-    def _process(self, **input_data: Any) -> Dict[str, Union[np.ndarray, float]]:
-        """Fits the linear model to the data and returns coefficients and intercept."""
-        X = input_data["X"]
-        y = input_data["y"]
+        Arguments
+        ---------
+        X : np.ndarray
+            Design matrix. Shape: ``(n_trials, n_features)``.
+        fit_intercept, method
+            See the attributes of the processor.
 
-        # Fit the model
-        self.model.fit(X, y)
-        self.is_fitted = True
+        Returns
+        -------
+        operator : SolverOperator
+            Least squares operator :math:`X^+`, such that the coefficients are :math:`B = X^+ Y`.
 
-        # Retrieve coefficients and intercept
-        coefficients = self.model.coef_
-        intercept = self.model.intercept_
+        Implementation
+        --------------
+        QR decomposition: :math:`X = Q R`, hence :math:`X^+ = R^{-1} Q^T`, obtained by solving the
+        triangular system :math:`R X^+ = Q^T`. The rank is checked on the diagonal of `R`.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if fit_intercept:
+            X = np.column_stack([np.ones(len(X)), X])
+        if method == "qr" and X.shape[0] >= X.shape[1]:
+            Q, R = np.linalg.qr(X, mode="reduced")
+            diag = np.abs(np.diag(R))
+            tol = diag.max(initial=0) * max(X.shape) * np.finfo(np.float64).eps
+            if diag.size and np.all(diag > tol):
+                from scipy.linalg import solve_triangular  # pylint: disable=import-outside-toplevel
+
+                return solve_triangular(R, Q.T)
+        return np.linalg.pinv(X)
+
+    @staticmethod
+    def solve(operator: SolverOperator, Y: np.ndarray) -> np.ndarray:
+        """
+        Apply the least squares operator to a batch of targets.
 
-        return {"coefficients": coefficients, "intercept": intercept}
+        Arguments
+        ---------
+        operator : SolverOperator
+            See `factorize`.
+        Y : np.ndarray
+            Targets. Shape: ``(n_trials, n_targets)``.
 
-    # --- Prediction Method -----------------------------------------------------------------------
+        Returns
+        -------
+        B : np.ndarray
+            Coefficients (including the intercept if fitted). Shape: ``(n_params, n_targets)``.
+        """
+        return operator @ np.asarray(Y, dtype=np.float64)
 
-    def predict(self, X: np.ndarray) -> np.ndarray:
+    @staticmethod
+    def predict(
+        X: np.ndarray, coefficients: np.ndarray, intercept: np.ndarray | float = 0.0, axis: int = 0
+    ) -> np.ndarray:
         """
-        Predict target values using the fitted linear model.
+        Predict the targets from fitted coefficients.
 
-        Parameters
-        ----------
+        Arguments
+        ---------
         X : np.ndarray
-            Predictor data for which to predict target values.
-            Shape: (n_samples, n_features).
+            Design matrix. Shape: ``(n_trials, n_features)``.
+        coefficients, intercept : np.ndarray
+            Outputs of `process`. The intercept has the shape of the coefficients without the
+            features axis.
+        axis : int, default=0
+            Axis of the features in `coefficients` (and of the trials in the predictions).
 
         Returns
         -------
         predictions : np.ndarray
-            Predicted target values, shape (n_samples,).
-
-        Raises
-        ------
-        ValueError
-            If the model has not been fitted yet.
+            Predicted targets. Shape: shape of `coefficients` with the features axis replaced by the
+            trials axis.
         """
-        if not self.is_fitted:
-            raise ValueError(
-                "Model has not been fitted yet. Call `_process` with training data first."
-            )
-
-        return self.model.predict(X)
+        B = np.moveaxis(coefficients, axis, 0)
+        Y = (X @ B.reshape(len(B), -1)).reshape(len(X), *B.shape[1:]) + intercept
+        return np.moveaxis(Y, 0, axis)
@@ -7,6 +7,7 @@ Raw data consists in `.csv` files obtained from `.m` files (Matlab scripts).
 
 Modules
 -------
+`extract_events`
 
 See Also
 --------
@@ -1,11 +1,16 @@
 """
 `core.parse.extract_events` [module]
 
+Classes
+-------
+EventType
+StimulusCategory
+SessionParser
+
 Notes
 -----
 The input arrays contain one element per event. They specify the following information:
 
-- ``block``:   Number of the block within the session (denoted as "trial" in the raw data)
 - ``t_start``: Start time of the event (in seconds) relative to the start of the session
 - ``t_end``:   Stop time of the event (in seconds) relative to the start of the session
 - ``description``: Description of the event in the raw data
@@ -23,11 +28,11 @@ Examples of strings that can be encountered :
 
 - ``'PreStimSilence , TORC_448_06_v501 , Reference'`` (3 elements)
 - ``'TRIALSTART'`` (single element)
+- ``'BEHAVIOR,SHOCKON'`` (2 elements, no space)
 
 The output arrays should contain one element per slot. See the `SessionParser` class for more
 details.
 
-
 In the raw data, the events are organized in blocks, each block containing a sequence of slots. The
 boundaries to group events (in blocks or slots) can be identified from the events descriptions:
 
@@ -36,45 +41,30 @@ boundaries to group events (in blocks or slots) can be identified from the event
 
 Implementation
 --------------
-Data Structures:
-Several classes are defined to separate concerns for the different hierarchical level in the data:
-
-- EventManager: Represents individual events from the raw data.
-- SlotManager: Represents slots within blocks.
-- BlockManager: Represents blocks containing slots.
-- SessionParser: Main class for processing the entire session.
-
-Processing Flow:
-1. Initialize SessionParser with new raw event data.
-2. Convert raw events to EventManager objects.
-3. Iterate through events:
-    - Start a new block on TRIALSTART events.
-    - End the current block on TRIALSTOP events.
-    - Process other events within the current block:
-    * Start a new slot on PreStimSilence events.
-    * Update slot information for Stim, PostStimSilence, and other events.
-4. Aggregate results from all blocks and slots.
-
-Output: The parser returns numpy arrays for slot_number, block_number, categ, t_on, t_off, t_warn,
-t_end, and error, representing the processed session data.
-
-TODO: Determine slot's t_end based on the next slot's t_on
-TODO: Add support for the CLK task (t_warn field): two stimuli are presented in each slot (warning
-TORC and click sound). Therefore, the processing should be adapted to handle two stimuli per slot,
-and in this case the first stimulus is category N ('neutral') and the second is either R or T.
-Should I create two instances of StimulusCategory for the two tasks PDT and CLK to implement two
-distinct mappings ?
-TODO: Take into account the BEHAVIOR,SHOCKON convention (no space) to perform the split by comas and
-spaces and give a single label "SHOCK" in the enum class.
-TODO: Assign category "0" to the first reference stimulus in each block ?
+The parser operates on whole columns of the events table rather than on individual events:
 
+1. Tokenize the descriptions. Since sessions contain few distinct descriptions, the string
+   operations are applied to the *unique* descriptions only and broadcast back to the events.
+2. Derive the block and slot membership of each event with cumulative sums over the masks of the
+   delimiting event types (``TRIALSTART``, ``TRIALSTOP``, ``PreStimSilence``).
+3. Scatter the times and labels of the relevant events (``Stim``, ``PostStimSilence``, shocks) into
+   the output columns, indexed by slot.
+
+TODO: Assign category "0" to the first reference stimulus in each block ?
 """
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` method in `SessionParser`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
 
-from dataclasses import dataclass, field
-from typing import Optional
 from enum import Enum
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple, TypeAlias
 
 import numpy as np
+import pandas as pd
 
 from core.processors.base_processor import Processor
 
@@ -139,264 +129,67 @@ class StimulusCategory:
         return cls.CATEGORY_MAP.get(category, cls.UNKNOWN_LABEL)
 
 
-@dataclass
-class EventManager:
-    """
-    Represents an individual event in the raw data and extracts its components.
-
-    Attributes
-    ----------
-    event_number : int
-        Event number in the raw data.
-    block : int
-        Block number in which the event occurred.
-    t_start : float
-        Start time of the event (in seconds) relative to the start of the session.
-    t_end : float
-        Stop time of the event (in seconds) relative to the start of the session.
-    description : str
-        Description of the event in the raw data (from the field 'Event' in the raw data).
-    event_type : {"TRIALSTART", "PreStimSilence", "Stim", "PostStimSilence", "BEHAVIOR",
-    "SHOCKON", "TRIALSTOP"}
-        Type of event, among the possible values. See the `EventTypes` enum.
-    stimulus : Optional[str]
-        Stimulus identity (if applicable). Examples: 'TORC_448_06_v501', '2000', '8000'...
-    category : Optional[str]
-        Stimulus category (if applicable). Examples: 'Reference', 'Target'...
-    intensity : Optional[str]
-        Sound intensity (if applicable). Examples: '0dB', '10dB'...
-
-    Methods
-    -------
-    parse_description()
-    is_type(event_type: str) -> bool
-
-    Examples
-    --------
-
-    Create an `EventManager` object and access its attributes:
-
-    >>> event = EventManager(1, 1, 0.0, 0.4, "'PreStimSilence , TORC_448_06_v501 , Reference'", None)
-    >>> event.event_type
-    <EventType.PRESTIM: 'PreStimSilence'>
-    >>> event.stimulus
-    'TORC_448_06_v501'
-    >>> event.category
-    'Reference'
-    >>> event.intensity
-    None
-
-    """
-
-    event_number: int
-    block: int
-    t_start: float
-    t_end: float
-    description: str
-    event_type: EventType = field(init=False)
-    stimulus: Optional[str] = field(init=False)
-    category: Optional[str] = field(init=False)
-    intensity: Optional[str] = field(init=False)
-
-    def __post_init__(self):
-        self.parse_description()
-
-    def parse_description(self):
-        """
-        Split the description string of an event into its components.
-
-        See Also
-        --------
-        `split`: Split a string into a list of substrings, using a delimiter.
-        `strip`: Remove leading and trailing whitespaces from a string.
-        """
-        parts = [p.strip() for p in self.description.split(",")]
-        self.event_type = EventType(parts[0])  # validate event type
-        self.stimulus = parts[1] if len(parts) > 1 else ""
-        self.category = StimulusCategory.from_string(parts[2]) if len(parts) > 2 else ""
-        self.intensity = parts[3] if len(parts) > 3 else ""
-
-    def is_type(self, event_type: EventType) -> bool:
-        """Check if the event is of a specific type."""
-        return self.event_type == EventType(event_type)
-
-
-@dataclass
-class SlotManager:
-    """
-    Represents the information about one slot in the session.
-
-    One slot corresponds to a segment of a block where specific events related to stimulus
-    presentation occur.
-
-    Attributes
-    ----------
-    slot_number : int
-        Slot number within the bock to which it belongs.
-    block_number : int
-        Block number in which the slot occurred.
-    categ : Optional[str]
-        Stimulus identity.
-    t_on : Optional[float]
-        Start time of the slot (onset of the stimulus).
-    t_off : Optional[float]
-        End time of the slot.
-    t_warn : Optional[float]
-        Time of the warning sound in the CLK task.
-    t_end : Optional[float]
-        End time of the slot.
-    error : bool
-        Error status of the slot. True if the shock was delivered.
-
-    Examples
-    --------
-
-    Create a `SlotManager` object and access its attributes:
-
-    >>> slot = SlotManager(1, 1)
-    >>> slot.slot_number
-    1
-    >>> slot.block_number
-    1
-
-    """
-
-    slot_number: int
-    block_number: int
-    categ: Optional[str] = None
-    t_on: Optional[float] = None
-    t_off: Optional[float] = None
-    t_warn: Optional[float] = None
-    t_end: Optional[float] = None
-    error: bool = False
-
-
-@dataclass
-class BlockManager:
-    """
-    Manages the information and lifecycle of a block within the session.
-
-    One block consists of multiple slots, each containing stimulus presentation events.
-
-    Attributes
-    ----------
-    block_number : int
-        Block number in the raw data.
-    slots : List[SlotManager]
-        Slots belonging to the block.
-    t_start : float
-        Start time of the block (in seconds) relative to the start of the session.
-    t_end : float
-        Stop time of the block (in seconds) relative to the start of the session. Initialized to
-        None and set when the block is closed.
-
-    Methods
-    -------
-    start_slot()
-    close_slot()
-    process_event(event: EventManager)
-
-    Examples
-    --------
+Tokens: TypeAlias = Tuple[np.ndarray, np.ndarray]
+"""Type alias for the tokens of the descriptions: event types and stimulus categories."""
 
-    Create a `BlockManager` object and access its attributes:
+SlotsColumns: TypeAlias = Tuple[
+    np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray
+]
+"""Type alias for the output columns of the parser (one element per slot)."""
 
-    >>> block = BlockManager(1, 0.0, 0.4)
-    >>> block.block_number
-    1
-    >>> block.t_start
-    0.0
-    >>> block.t_end
-    0.4
 
-    """
-
-    block_number: int
-    t_start: Optional[float] = None
-    t_end: Optional[float] = None
-    slots: list[SlotManager] = field(default_factory=list)
-    current_slot: Optional[SlotManager] = None
-    current_event: Optional[EventManager] = None
-
-    def start_slot(self):
-        """Start a new slot in the block."""
-        slot_number = len(self.slots) + 1  # increment slot number (start at 1)
-        self.current_slot = SlotManager(slot_number, self.block_number)
-
-    def close_slot(self):
-        """Close the current slot in the block."""
-        self.slots.append(self.current_slot)
-        self.current_slot = None
-
-    def process_event(self, event: EventManager):
-        """Process events and assign them to the current slot."""
-        if event.is_type(EventType.PRESTIM):
-            self.start_slot()
-        elif event.is_type(EventType.STIM):
-            setattr(self.current_slot, "categ", event.stimulus)
-            setattr(self.current_slot, "t_on", event.t_start)
-        elif event.is_type(EventType.POSTSTIM):
-            setattr(self.current_slot, "t_off", event.t_end)
-            self.close_slot()
-        elif event.is_type(EventType.SHOCK):
-            setattr(self.current_slot, "error", True)
-
-
-# TODO: Update to match the new interface
 class SessionParser(Processor):
     """
     Extract trials information from raw data relative to the events in one session.
 
     Class Attributes
     ----------------
-
-    Configuration Attributes
-    ------------------------
-
-    Processing Arguments
-    --------------------
-    events : List[Tuple[int, int, float, float, str]]
-        Raw event data, each specifying event number, block, start time, end time, and description.
-        .. _events:
-
-    Returns
-    -------
-    output : Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray,
-    np.ndarray, np.ndarray]
-        Arrays containing information for each slot:
-
-        - slot_number: Number of the slot within the block.
-        - block_number: Number of the block to which the slot belongs.
-        - categ: Nature of the stimulus presented in the slot.
-        - t_on: Onset time of the stimulus presentation within the slot.
-        - t_off: Offset time of the stimulus presentation within the slot.
-        - t_warn: Onset of the warning sound (in the CLK task only).
-        - t_end: End time of the slot.
-        - error: Behavioral choice of the slot, if Target (True if the shock was delivered).
-
-        Length of each array: ``(n_slots,)``
+    COLUMNS : MappingProxyType[str, str]
+        Mapping from the names of the inputs to the names of the columns in the raw events table
+        (CSV file exported from the MATLAB structure ``exptevents``).
 
     Methods
     -------
+    `tokenize`
+    `mark_blocks`
+    `mark_slots`
+    `collect_slots`
 
     Examples
     --------
-
-    >>> events = [
-    ...     (1, 1, 0.0, 0.0, "TRIALSTART"),
-    ...     (2, 1, 0.0, 0.4, "'PreStimSilence , TORC_448_06_v501 , Reference'"),
-    ...     (3, 1, 0.4, 0.8, "'Stim , TORC_448_06_v501 , Reference'"),
-    ...     (4, 1, 0.8, 1.2, "'PostStimSilence , TORC_448_06_v501 , Reference'"),
-    ...     (5, 1, 1.2, 1.6, "TRIALSTOP"),
-    ...     (6, 2, 1.6, 1.6, "TRIALSTART"),
-    ...     (7, 2, 1.6, 2.0, "'PreStimSilence , TORC_448_06_v501 , Reference'"),
-    ...     (8, 2, 2.0, 2.4, "'Stim , TORC_448_06_v501 , Reference'"),
-    ...     (9, 2, 2.4, 2.8, "'PostStimSilence , TORC_448_06_v501 , Reference'"),
-    ...     (10, 2, 2.8, 3.2, "TRIALSTOP"),
-    ... ]
+    >>> events = pd.DataFrame({
+    ...     "Event": [
+    ...         "TRIALSTART",
+    ...         "'PreStimSilence , TORC_448_06_v501 , Reference'",
+    ...         "'Stim , TORC_448_06_v501 , Reference'",
+    ...         "'PostStimSilence , TORC_448_06_v501 , Reference'",
+    ...         "TRIALSTOP",
+    ...     ],
+    ...     "StartTime": [0.0, 0.0, 0.4, 0.8, 1.2],
+    ...     "StopTime": [0.0, 0.4, 0.8, 1.2, 1.2],
+    ... })
     >>> parser = SessionParser()
     >>> results = parser.process(events=events) # all output arrays in a tuple
     >>> slot, block, categ, t_on, t_off, t_warn, t_end, error = results # unpack
+    >>> categ, t_on, t_off, t_end
+    (array(['R'], dtype='<U1'), array([0.4]), array([0.8]), array([1.2]))
+
+    Notes
+    -----
+    Rules to build slots from events:
+
+    - A block starts at ``TRIALSTART`` and ends at ``TRIALSTOP``. Events outside blocks and blocks
+      which are never closed are ignored.
+    - A slot starts at ``PreStimSilence`` and extends until the next ``PreStimSilence`` or the end
+      of its block. Slots without ``PostStimSilence`` (interrupted) are ignored.
+    - ``t_on`` and ``t_off``: Start and end of the last ``Stim`` event in the slot.
+    - ``t_warn``: Start of the first ``Stim`` event if the slot contains several stimuli (warning
+      TORC in task CLK), else NaN.
+    - ``t_end``: End of the ``PostStimSilence`` event of the slot.
+    - ``categ``: Category of the last stimulus in the slot (see `StimulusCategory`).
+    - ``error``: True if a ``BEHAVIOR,SHOCKON`` event occurs in the slot.
+
+    Blocks and slots are numbered from 1, by order of appearance among the valid ones.
 
     See Also
     --------
@@ -404,57 +197,254 @@ class SessionParser(Processor):
         Base class for all processors: see class-level attributes and template methods.
     """
 
-    events: list[EventManager]
-    blocks: list[BlockManager]
-    current_block: Optional[BlockManager]
+    COLUMNS = MappingProxyType(
+        {"description": "Event", "t_start": "StartTime", "t_end": "StopTime"}
+    )
+
+    def __init__(self) -> None:
+        pass
+
+    def process(self, events: pd.DataFrame | Mapping[str, Any]) -> SlotsColumns:
+        """
+        Implement the abstract method of the base class `Processor`.
 
-    def __init__(self):
-        super().__init__()
+        Arguments
+        ---------
+        events : pd.DataFrame | Mapping[str, ArrayLike]
+            Raw events table, with one element per event in each column. Columns can be named either
+            after the raw CSV file (``"Event"``, ``"StartTime"``, ``"StopTime"``) or after the
+            inputs (``"description"``, ``"t_start"``, ``"t_end"``). See :attr:`COLUMNS`.
 
-    def _process(self, **input_data):
-        """Implement the template method called in the base class `process` method."""
-        events = input_data["events"]
-        self.reset(events)
-        return self.aggregate_results()
+        Returns
+        -------
+        output : SlotsColumns
+            Arrays containing information for each slot:
+
+            - slot_number: Number of the slot within the block.
+            - block_number: Number of the block to which the slot belongs.
+            - categ: Category of the stimulus presented in the slot.
+            - t_on: Onset time of the stimulus presentation within the slot.
+            - t_off: Offset time of the stimulus presentation within the slot.
+            - t_warn: Onset of the warning sound (in the CLK task only).
+            - t_end: End time of the slot.
+            - error: Behavioral choice of the slot, if Target (True if the shock was delivered).
+
+            Length of each array: ``(n_slots,)``
+        """
+        description, t_start, t_end = (self.get_column(events, name) for name in self.COLUMNS)
+        event_type, category = self.tokenize(description)
+        block = self.mark_blocks(event_type)
+        slot = self.mark_slots(event_type, block)
+        return self.collect_slots(
+            event_type, category, block, slot, t_start.astype(np.float64), t_end.astype(np.float64)
+        )
 
-    def reset(self, events):
-        """Reset the processor with new events."""
-        self.events = [EventManager(*event) for event in events]
-        self.blocks = []
-        self.current_block = None
+    @classmethod
+    def get_column(cls, events: pd.DataFrame | Mapping[str, Any], name: str) -> np.ndarray:
+        """Extract one column from the events table, under its input name or raw CSV name."""
+        if name in events:
+            return np.asarray(events[name])
+        return np.asarray(events[cls.COLUMNS[name]])
 
     # --- Processing Methods -----------------------------------------------------------------------
 
-    def start_block(self, t_start):
-        """Initialize a new block."""
-        block_number = len(self.blocks) + 1  # increment block number (start at 1)
-        self.current_block = BlockManager(block_number)
-        setattr(self.current_block, "t_start", t_start)
-
-    def close_block(self, t_end):
-        """Set the end time of the block."""
-        setattr(self.current_block, "t_end", t_end)
-        self.blocks.append(self.current_block)
-        self.current_block = None
-
-    def process_event(self, event: EventManager):
-        """Process events and assign them to the current block."""
-        if event.is_type(EventType.TRIALSTART):
-            self.start_block(event.t_start)
-        elif event.is_type(EventType.TRIALSTOP):
-            self.close_block(event.t_end)
-        elif self.current_block is not None:
-            self.current_block.process_event(event)
-
-    def aggregate_results(self):
-        """Aggregate results into output arrays."""
-        all_slots = [slot for block in self.blocks for slot in block.slots]
-        slot_number = np.array([slot.slot_number for slot in all_slots])
-        block_number = np.array([slot.block_number for slot in all_slots])
-        categ = np.array([slot.categ for slot in all_slots])
-        t_on = np.array([slot.t_on for slot in all_slots])
-        t_off = np.array([slot.t_off for slot in all_slots])
-        t_warn = np.array([slot.t_warn for slot in all_slots])
-        t_end = np.array([slot.t_end for slot in all_slots])
-        error = np.array([slot.error for slot in all_slots])
-        return slot_number, block_number, categ, t_on, t_off, t_warn, t_end, error
+    @staticmethod
+    def tokenize(description: np.ndarray) -> Tokens:
+        """
+        Extract the event type and stimulus category from the descriptions of all the events.
+
+        Arguments
+        ---------
+        description : np.ndarray
+            Descriptions of the events. Shape: ``(n_events,)``.
+
+        Returns
+        -------
+        event_type : np.ndarray[str]
+            Type of each event (first token, or ``"BEHAVIOR,SHOCKON"`` for shocks).
+            Shape: ``(n_events,)``.
+        category : np.ndarray[str]
+            Alias of the stimulus category of each event (third token), empty if not applicable.
+            Shape: ``(n_events,)``.
+
+        Implementation
+        --------------
+        1. Factorize the descriptions into integer codes and unique values.
+        2. Split the unique descriptions on commas, strip quotes and spaces (vectorized pandas
+           string operations).
+        3. Broadcast the tokens back to the events via the codes.
+
+        See Also
+        --------
+        `pandas.factorize`
+        `pandas.Series.str.split`
+        """
+        codes, uniques = pd.factorize(np.asarray(description, dtype=str))
+        tokens = pd.Series(uniques, dtype=str).str.strip(" '\"").str.split(",", n=3, expand=True)
+        tokens = tokens.reindex(columns=range(3)).fillna("")
+        tokens = tokens.apply(lambda col: col.str.strip())
+        event_type = tokens[0].to_numpy(dtype=str).astype(object)
+        is_shock = (tokens[0] == "BEHAVIOR") & (tokens[1] == "SHOCKON")
+        event_type[is_shock.to_numpy()] = EventType.SHOCK.value
+        category = tokens[2].map(
+            lambda c: StimulusCategory.from_string(c) if c else ""
+        ).to_numpy(dtype=str)
+        return event_type.astype(str)[codes], category[codes]
+
+    @staticmethod
+    def mark_blocks(event_type: np.ndarray) -> np.ndarray:
+        """
+        Assign each event to its block.
+
+        Arguments
+        ---------
+        event_type : np.ndarray[str]
+            Type of each event. Shape: ``(n_events,)``.
+
+        Returns
+        -------
+        block : np.ndarray[int]
+            Index of the block containing each event (from 1, among closed blocks), or 0 for events
+            outside any closed block (including the delimiters themselves). Shape: ``(n_events,)``.
+
+        Implementation
+        --------------
+        - Forward-fill the position of the last delimiter (``TRIALSTART`` or ``TRIALSTOP``) up to
+          each event: the event lies inside a block only if this delimiter is a ``TRIALSTART``.
+        - A block is closed if the delimiter which follows its ``TRIALSTART`` is a ``TRIALSTOP``.
+          Duplicate ``TRIALSTOP`` events and events after a ``TRIALSTOP`` are thus outside blocks,
+          and a ``TRIALSTART`` followed by another ``TRIALSTART`` opens a block never closed.
+        - Keep only closed blocks, and renumber them consecutively.
+        """
+        is_start = event_type == EventType.TRIALSTART.value
+        is_stop = event_type == EventType.TRIALSTOP.value
+        is_delim = is_start | is_stop
+        pos = np.arange(len(event_type))
+        last = np.maximum.accumulate(np.where(is_delim, pos, -1)) if len(pos) else pos
+        delims = np.flatnonzero(is_delim)
+        closed = np.zeros(len(event_type), dtype=bool)  # at the TRIALSTART of closed blocks
+        closed[delims[:-1]] = is_start[delims[:-1]] & is_stop[delims[1:]]
+        renumber = np.cumsum(closed) * closed  # 0 for blocks never closed
+        return np.where(~is_delim & (last >= 0), renumber[np.maximum(last, 0)], 0)
+
+    @staticmethod
+    def mark_slots(event_type: np.ndarray, block: np.ndarray) -> np.ndarray:
+        """
+        Assign each event to its slot.
+
+        Arguments
+        ---------
+        event_type : np.ndarray[str]
+            Type of each event. Shape: ``(n_events,)``.
+        block : np.ndarray[int]
+            Block of each event (0 outside blocks). Shape: ``(n_events,)``.
+
+        Returns
+        -------
+        slot : np.ndarray[int]
+            Global index of the slot containing each event (from 1, across the session), or 0 for
+            events outside any slot. Shape: ``(n_events,)``.
+
+        Implementation
+        --------------
+        Count the ``PreStimSilence`` events within blocks up to each event. An event belongs to the
+        last slot started if this slot was started in the same block.
+        """
+        is_pre = (event_type == EventType.PRESTIM.value) & (block > 0)
+        slot = np.cumsum(is_pre)
+        slot_block = np.zeros(slot[-1] + 1 if len(slot) else 1, dtype=block.dtype)
+        slot_block[slot[is_pre]] = block[is_pre]
+        return np.where((block > 0) & (slot_block[slot] == block), slot, 0)
+
+    @staticmethod
+    def collect_slots(
+        event_type: np.ndarray,
+        category: np.ndarray,
+        block: np.ndarray,
+        slot: np.ndarray,
+        t_start: np.ndarray,
+        t_end: np.ndarray,
+    ) -> SlotsColumns:
+        """
+        Gather the information about each slot from the events it contains.
+
+        Arguments
+        ---------
+        event_type, category : np.ndarray[str]
+            See `tokenize`.
+        block : np.ndarray[int]
+            See `mark_blocks`.
+        slot : np.ndarray[int]
+            See `mark_slots`.
+        t_start, t_end : np.ndarray[float]
+            Start and end times of the events. Shape: ``(n_events,)``.
+
+        Returns
+        -------
+        output : SlotsColumns
+            See `process`.
+
+        Implementation
+        --------------
+        Since slot indices are non-decreasing along the events, the events of each type are sorted
+        by slot. The first and last events of one type in each slot are identified by comparing
+        consecutive slot indices, which avoids relying on the order of repeated assignments.
+
+        Slots are numbered within their block by subtracting the position of the first slot of the
+        block (running maximum of the positions where the block changes).
+        """
+        n_slots = int(slot.max()) if len(slot) else 0
+        size = n_slots + 1  # index 0: events outside slots (discarded)
+
+        def select(kind: EventType) -> np.ndarray:
+            return np.flatnonzero((event_type == kind.value) & (slot > 0))
+
+        def first_last(idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            s = slot[idx]
+            is_first = np.r_[True, s[1:] != s[:-1]] if len(s) else np.zeros(0, dtype=bool)
+            is_last = np.r_[s[1:] != s[:-1], True] if len(s) else np.zeros(0, dtype=bool)
+            return idx[is_first], idx[is_last]
+
+        # Blocks: assigned at the start of each slot
+        idx_pre = select(EventType.PRESTIM)
+        block_of_slot = np.zeros(size, dtype=np.int64)
+        block_of_slot[slot[idx_pre]] = block[idx_pre]
+        # Stimuli: last one is the main stimulus, first one is the warning if several
+        idx_stim = select(EventType.STIM)
+        first_stim, last_stim = first_last(idx_stim)
+        t_on = np.full(size, np.nan)
+        t_off = np.full(size, np.nan)
+        categ = np.full(size, "", dtype=category.dtype if category.size else str)
+        t_on[slot[last_stim]] = t_start[last_stim]
+        t_off[slot[last_stim]] = t_end[last_stim]
+        categ[slot[last_stim]] = category[last_stim]
+        t_warn = np.full(size, np.nan)
+        n_stim = np.bincount(slot[idx_stim], minlength=size)
+        warn = first_stim[n_stim[slot[first_stim]] > 1]
+        t_warn[slot[warn]] = t_start[warn]
+        # Post-stimulus silence: closes the slot
+        _, last_post = first_last(select(EventType.POSTSTIM))
+        closed = np.zeros(size, dtype=bool)
+        closed[slot[last_post]] = True
+        t_end_slot = np.full(size, np.nan)
+        t_end_slot[slot[last_post]] = t_end[last_post]
+        # Shocks: error
+        error = np.zeros(size, dtype=bool)
+        error[slot[select(EventType.SHOCK)]] = True
+        # Retain closed slots and number them within their blocks
+        keep = np.flatnonzero(closed)
+        block_number = block_of_slot[keep]
+        n_kept = len(keep)
+        is_new_block = np.r_[True, block_number[1:] != block_number[:-1]] if n_kept else closed[:0]
+        positions = np.arange(n_kept)
+        slot_number = positions - np.maximum.accumulate(np.where(is_new_block, positions, 0)) + 1
+        return (
+            slot_number,
+            block_number,
+            categ[keep],
+            t_on[keep],
+            t_off[keep],
+            t_warn[keep],
+            t_end_slot[keep],
+            error[keep],
+        )
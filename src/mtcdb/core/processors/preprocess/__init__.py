@@ -10,6 +10,9 @@ assign_ensembles
 assign_folds
 bootstrap
 convert_to_rates
+count_cache
+denoise_pca
+group_trials
 map_indices
 stratify
 z_score
@@ -196,7 +196,7 @@ class FoldAssigner(Processor):
         fold_labels : np.ndarray
             See the return value `fold_labels` in the `process` method.
         """
-        n_samples = np.max(fold_members) + 1
+        n_samples = sum(len(idx_samples) for idx_samples in fold_members)  # folds may be uneven
         fold_labels = np.full(n_samples, -1, dtype=np.int64)
         for i_fold, idx_samples in enumerate(fold_members):
             fold_labels[idx_samples] = i_fold
@@ -15,7 +15,6 @@ FiringRatesConverter
 from typing import TypeAlias, Any, Tuple, Optional
 
 import numpy as np
-from scipy.signal import fftconvolve
 
 from core.constants import T_BIN, T_MAX
 from core.processors.base_processor import Processor
@@ -240,6 +239,8 @@ class FiringRatesConverter(Processor):
         :func:`scipy.signal.fftconvolve(arr, kernel, mode, axes)`
             Convolve the firing rate time course with kernel.
         """
+        from scipy.signal import fftconvolve  # pylint: disable=import-outside-toplevel
+
         kernel = np.ones(int(smooth_window / t_bin))  # boxcar kernel
         f_smoothed = fftconvolve(f_binned, kernel, mode=mode, axes=0) / len(kernel)
         return f_smoothed
@@ -0,0 +1,315 @@
+"""
+`core.processors.preprocess.count_cache` [module]
+
+Classes
+-------
+FineCounts
+FineCountsCache
+
+Notes
+-----
+Sweeps over the parameters of `FiringRatesConverter` (``t_bin``, ``smooth_window``) re-bin the raw
+spike times of every unit for each setting, which is the most expensive step of the conversion.
+Instead, the spikes of each unit are counted once at a fine resolution (default: 1 ms, aligned to
+the sampling rate of the recordings), and all the coarser settings are derived from these counts:
+
+- Binning: for any ``t_bin`` which is an integer multiple ``k`` of the fine bin, the counts are
+  summed over groups of ``k`` consecutive fine bins by a reshape and a sum.
+- Smoothing: a boxcar average over ``w`` bins is a difference of cumulative sums, in ``O(n_t)``
+  operations whatever the window size.
+
+The fine counts of each unit can be persisted alongside the spike trains (see `FineCountsPath`), so
+that they are computed once across sessions of analysis. They are keyed by the fingerprint of the
+spike file of the unit (see `SidecarCache.fingerprint`), so that they are recomputed whenever this
+file changes (e.g. after re-sorting or realignment).
+
+See Also
+--------
+`core.processors.preprocess.convert_to_rates.FiringRatesConverter`: Direct conversion.
+`utils.storage_rulers.impl_path_rulers.FineCountsPath`: Storage of the fine counts.
+"""
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Optional, Self, Union
+
+import numpy as np
+
+from core.constants import SMPL_RATE, T_MAX
+from utils.io_data.loaders import LoaderNPZ
+from utils.io_data.savers import SaverNPZ
+from utils.io_data.sidecar import SidecarCache
+from utils.storage_rulers.impl_path_rulers import FineCountsPath
+
+
+DT_FINE: float = round(1e-3 * SMPL_RATE) / SMPL_RATE
+"""Default fine time bin (in seconds): 1 ms, rounded to an integer number of samples."""
+
+
+@dataclass(frozen=True)
+class FineCounts:
+    """
+    Spike counts of one unit in all its trials, at a fine temporal resolution.
+
+    Attributes
+    ----------
+    counts : np.ndarray
+        Number of spikes in each fine bin of each trial. Shape: ``(n_trials, n_fine)``.
+    dt : float
+        Fine time bin (in seconds).
+    key : str
+        Fingerprint of the spike file from which the counts were computed, empty if unknown.
+    n_trials : int
+        (Property) Number of trials.
+    n_fine : int
+        (Property) Number of fine bins in each trial.
+
+    Methods
+    -------
+    `from_spikes`
+    `get_factor`
+    `rebin`
+    `boxcar`
+    `rates`
+    `save`
+    `load`
+
+    Examples
+    --------
+    Count the spikes of a unit once, then derive the rates for several settings:
+
+    >>> fine = FineCounts.from_spikes(spikes, trials, n_trials=50, t_max=1.0)
+    >>> for t_bin, window in product([0.01, 0.05], [0.05, 0.1]):
+    ...     rates = fine.rates(t_bin=t_bin, smooth_window=window)
+    """
+
+    counts: np.ndarray
+    dt: float = DT_FINE
+    key: str = ""
+
+    @property
+    def n_trials(self) -> int:
+        """Number of trials."""
+        return self.counts.shape[0]
+
+    @property
+    def n_fine(self) -> int:
+        """Number of fine bins in each trial."""
+        return self.counts.shape[1]
+
+    @classmethod
+    def from_spikes(
+        cls,
+        spikes: np.ndarray,
+        trials: np.ndarray,
+        n_trials: int,
+        t_max: float = T_MAX,
+        dt: float = DT_FINE,
+    ) -> Self:
+        """
+        Count the spikes of all the trials in fine bins.
+
+        Arguments
+        ---------
+        spikes : np.ndarray
+            Spiking times in seconds, relative to the start of their trial. Shape: ``(n_spikes,)``.
+        trials : np.ndarray
+            Index of the trial of each spike, from 0 to ``n_trials - 1``. Shape: ``(n_spikes,)``.
+        n_trials : int
+            Number of trials (including trials without spikes).
+        t_max : float
+            Duration of the trials (in seconds).
+        dt : float
+            Fine time bin (in seconds).
+
+        Returns
+        -------
+        fine : FineCounts
+
+        Implementation
+        --------------
+        Each spike is assigned to the flat bin ``trial * n_fine + floor(t / dt)``, and all the bins
+        are counted by a single `np.bincount`. As in `np.histogram`, spikes outside ``[0, t_max]``
+        are discarded and the last bin includes its right edge.
+        """
+        n_fine = int(round(t_max / dt))
+        spikes, trials = np.asarray(spikes, dtype=np.float64), np.asarray(trials, dtype=np.int64)
+        idx = np.floor(spikes / dt + 1e-9).astype(np.int64)
+        idx[(idx == n_fine) & (spikes <= t_max + 1e-12)] = n_fine - 1  # right edge
+        valid = (spikes >= 0) & (idx >= 0) & (idx < n_fine)
+        flat = trials[valid] * n_fine + idx[valid]
+        counts = np.bincount(flat, minlength=n_trials * n_fine).astype(np.int32)
+        return cls(counts=counts.reshape(n_trials, n_fine), dt=dt)
+
+    def get_factor(self, t_bin: float) -> int:
+        """
+        Number of fine bins in a coarse time bin.
+
+        Raises
+        ------
+        ValueError
+            If `t_bin` is not an integer multiple of the fine bin.
+        """
+        factor = int(round(t_bin / self.dt))
+        if factor < 1 or not np.isclose(factor * self.dt, t_bin, rtol=1e-9, atol=1e-12):
+            raise ValueError(f"Time bin {t_bin} is not a multiple of the fine bin {self.dt}")
+        return factor
+
+    def rebin(self, t_bin: float) -> np.ndarray:
+        """
+        Compute the firing rates in coarser time bins.
+
+        Arguments
+        ---------
+        t_bin : float
+            Time bin (in seconds), integer multiple of `dt`.
+
+        Returns
+        -------
+        f_binned : np.ndarray
+            Firing rates in spikes/s. Shape: ``(n_trials, n_t)``, with ``n_t = n_fine // k`` and
+            ``k = t_bin / dt``. Incomplete coarse bins at the end of the trials are discarded.
+        """
+        k = self.get_factor(t_bin)
+        n_t = self.n_fine // k
+        coarse = self.counts[:, : n_t * k].reshape(self.n_trials, n_t, k).sum(axis=2)
+        return coarse / t_bin
+
+    @staticmethod
+    def boxcar(x: np.ndarray, width: int, mode: str = "valid") -> np.ndarray:
+        """
+        Average consecutive values in a sliding window along the last axis, with cumulative sums.
+
+        Arguments
+        ---------
+        x : np.ndarray
+            Values to smooth. Shape: ``(..., n)``.
+        width : int
+            Window size (number of values).
+        mode : str
+            Convolution mode, as in `FiringRatesConverter.smooth`: ``'valid'`` (output of length
+            ``n - width + 1``) or ``'same'`` (output of length ``n``, zero-padding at the edges).
+
+        Returns
+        -------
+        smoothed : np.ndarray
+        """
+        n = x.shape[-1]
+        csum = np.concatenate([np.zeros((*x.shape[:-1], 1)), np.cumsum(x, axis=-1)], axis=-1)
+        if mode == "valid":
+            return (csum[..., width:] - csum[..., : n - width + 1]) / width
+        if mode == "same":  # window [i - width // 2, i + (width - 1) // 2], as `np.convolve`
+            i = np.arange(n)
+            upper = np.minimum(i + (width - 1) // 2 + 1, n)
+            lower = np.maximum(i - width // 2, 0)
+            return (csum[..., upper] - csum[..., lower]) / width
+        raise ValueError(f"Invalid mode: {mode}")
+
+    def rates(self, t_bin: float, smooth_window: float, mode: str = "valid") -> np.ndarray:
+        """
+        Compute smoothed firing rates, equivalent to `FiringRatesConverter.process` for each trial.
+
+        Returns
+        -------
+        f_smoothed : np.ndarray
+            Smoothed firing rates in spikes/s. Shape: ``(n_trials, n_t_smth)``.
+
+        Raises
+        ------
+        ValueError
+            If the smoothing window is shorter than the time bin.
+        """
+        width = int(smooth_window / t_bin + 1e-9)
+        if width < 1:
+            raise ValueError(f"Smoothing window {smooth_window} shorter than the time bin {t_bin}")
+        f_binned = self.rebin(t_bin)
+        return self.boxcar(f_binned, width, mode)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the counts, the fine bin and the key in a NPZ file."""
+        SaverNPZ(path).save({"counts": self.counts, "dt": np.array(self.dt), "key": self.key})
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Self:
+        """Load counts saved by `save`."""
+        arrays = LoaderNPZ(path).load()
+        key = str(arrays["key"]) if "key" in arrays else ""
+        return cls(counts=arrays["counts"], dt=float(arrays["dt"]), key=key)
+
+
+class FineCountsCache:
+    """
+    Per-unit cache of fine spike counts, in memory and on disk.
+
+    Attributes
+    ----------
+    path_ruler : FineCountsPath
+        Path generation rules for the files of the cache.
+    memory : Dict[str, FineCounts]
+        Counts already loaded or computed in the current process, by unit.
+
+    Methods
+    -------
+    `get`
+
+    Examples
+    --------
+    >>> cache = FineCountsCache(root_data)
+    >>> fine = cache.get("avo052a-d1", spikes, trials, n_trials=50, source=path)  # computed, saved
+    >>> fine = cache.get("avo052a-d1", spikes, trials, n_trials=50, source=path)  # from memory
+    """
+
+    def __init__(self, root_data: Optional[Union[str, Path]] = None) -> None:
+        self.path_ruler = FineCountsPath(root_data)
+        self.memory: Dict[str, FineCounts] = {}
+
+    def get(
+        self,
+        unit: str,
+        spikes: np.ndarray,
+        trials: np.ndarray,
+        n_trials: int,
+        t_max: float = T_MAX,
+        dt: float = DT_FINE,
+        source: Optional[Union[str, Path]] = None,
+    ) -> FineCounts:
+        """
+        Retrieve the fine counts of a unit, from memory, from disk, or by computing them.
+
+        Arguments
+        ---------
+        unit : str
+            Identifier of the unit.
+        spikes, trials, n_trials, t_max, dt
+            See `FineCounts.from_spikes`. Only used if the counts are not cached yet, or if the
+            cached counts do not match `n_trials`, `t_max`, `dt` or `source`.
+        source : str | Path, optional
+            Spike file of the unit, whose fingerprint (path, modification time and size) keys the
+            cached counts. If None, the cached counts are only checked against their shape and
+            `dt`, and cannot detect changes of the spikes.
+
+        Returns
+        -------
+        fine : FineCounts
+        """
+        n_fine = int(round(t_max / dt))
+        key = SidecarCache(source, ext=".npz").fingerprint() if source is not None else ""
+
+        def is_valid(fine: Optional[FineCounts]) -> bool:
+            return (
+                fine is not None
+                and fine.counts.shape == (n_trials, n_fine)
+                and bool(np.isclose(fine.dt, dt))
+                and fine.key == key
+            )
+
+        fine = self.memory.get(unit)
+        path = self.path_ruler.get_path(unit).with_suffix(".npz")
+        if not is_valid(fine) and path.is_file():
+            fine = FineCounts.load(path)
+        if not is_valid(fine):
+            fine = replace(FineCounts.from_spikes(spikes, trials, n_trials, t_max, dt), key=key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fine.save(path)
+        assert fine is not None
+        self.memory[unit] = fine
+        return fine
@@ -0,0 +1,292 @@
+"""
+`core.processors.preprocess.denoise_pca` [module]
+
+Classes
+-------
+PCADenoiser
+
+Notes
+-----
+Denoising procedure, for each ensemble of a pseudo-population and each held-out fold:
+
+1. Compute the condition means on the training folds (all the folds except the held-out one):
+   average firing rates of each unit across the training trials of each experimental condition, at
+   each time point. Shape: ``(n_units, n_conditions * n_t)``.
+2. Fit principal components across units on these condition means (centered for each unit), and
+   keep the smallest number of components which explain a fraction of the variance (default: 90%).
+3. Project the trials of the held-out fold onto the subspace of these components, and add back the
+   mean of each unit.
+
+Fitting on condition means rather than on single trials removes the trial-to-trial noise from the
+estimation of the subspace, which then captures the task-related variance. Fitting on the training
+folds only keeps the held-out trials out of the estimation of the subspace, so that the denoised
+folds can be used for cross-validated analyses without leakage.
+
+Implementation
+--------------
+- Condition means are obtained by a grouped reduction over the blocks of contiguous trials of each
+  condition (`np.add.reduceat`), for all the ensembles and folds at once. All the folds contain the
+  same conditions with the same counts, so that the training means of each held-out fold are
+  obtained by removing its means from the sum over folds.
+- The training means of the held-out folds of several ensembles are stacked, and their components
+  are computed by a single batched SVD (`np.linalg.svd` on a 4D array).
+- Ensembles are processed in batches whose condition means and SVD outputs fit in a memory budget
+  (`eval_batch_size`), and the projection is applied chunk by chunk along the trials, so that the
+  temporary arrays are bounded and the output can be written in place.
+
+See Also
+--------
+`core.data_structures.firing_rates_pop.FiringRatesPop`: Layout of the input data.
+`core.factories.create_coord_exp_factor.FactoryCoordExpFactor`: Blocks of conditions.
+"""
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` method in `PCADenoiser`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.processors.base_processor import Processor
+
+
+class PCADenoiser(Processor):
+    """
+    Denoise the firing rates of a pseudo-population by projection onto principal components fitted
+    on the condition means of the training folds.
+
+    Attributes
+    ----------
+    var_explained : float, default=0.9
+        Minimal fraction of the variance of the condition means to retain.
+    chunk_trials : int, default=256
+        Number of trials projected at once.
+    max_bytes : int, default=2**28
+        Memory budget for the condition means and the SVD of each batch of ensembles (bytes).
+
+    Methods
+    -------
+    `condition_means`
+    `training_means`
+    `fit_components`
+    `project`
+    `eval_batch_size`
+
+    Examples
+    --------
+    Denoise a population with 3 conditions of 20, 20 and 10 trials, in place:
+
+    >>> denoiser = PCADenoiser(var_explained=0.9)
+    >>> data, n_components = denoiser.process(data=rates, counts=[20, 20, 10], out=rates)
+    >>> n_components.shape  # (n_ens, n_folds)
+
+    See Also
+    --------
+    `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
+    """
+
+    def __init__(
+        self, var_explained: float = 0.9, chunk_trials: int = 256, max_bytes: int = 1 << 28
+    ) -> None:
+        if not 0 < var_explained <= 1:
+            raise ValueError(f"Invalid variance fraction: {var_explained} (expected in (0, 1])")
+        self.var_explained = var_explained
+        self.chunk_trials = chunk_trials
+        self.max_bytes = max_bytes
+
+    # --- Processing Methods -----------------------------------------------------------------------
+
+    def process(
+        self,
+        data: Optional[np.ndarray] = None,
+        counts: Optional[Sequence[int]] = None,
+        out: Optional[np.ndarray] = None,
+        **kwargs,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        data : np.ndarray
+            Firing rates, with the dimensions of `FiringRatesPop`.
+            Shape: ``(n_ens, n_units, n_folds, n_trials, n_t)``.
+        counts : Sequence[int]
+            Number of trials in each condition, in the order of the contiguous blocks along the
+            trials dimension (e.g. `FactoryCoordExpFactor.counts_by_condition` in the order
+            `order_conditions`), identical in all the folds.
+        out : np.ndarray, optional
+            Output array of floating data type and same shape as `data`. Pass ``out=data`` to
+            denoise in place.
+
+        Returns
+        -------
+        denoised : np.ndarray
+            Denoised firing rates: each fold is projected onto the components fitted on the other
+            folds. Shape: same as `data`.
+        n_components : np.ndarray
+            Number of components retained for each ensemble and held-out fold.
+            Shape: ``(n_ens, n_folds)``.
+
+        Raises
+        ------
+        ValueError
+            If the shape of the data or the counts are invalid, or if there are less than two
+            folds.
+        """
+        assert data is not None and counts is not None
+        counts = np.asarray(counts, dtype=np.int64)
+        if data.ndim != 5 or counts.sum() != data.shape[3] or np.any(counts <= 0):
+            raise ValueError(f"Invalid data {data.shape} or counts {counts} (sum along trials)")
+        if data.shape[2] < 2:
+            raise ValueError(f"Denoising requires >= 2 folds to fit and apply: {data.shape[2]}")
+        if out is None:
+            out = np.empty(data.shape, dtype=np.result_type(data.dtype, np.float64))
+        n_ens, n_units, n_folds, _, n_t = data.shape
+        n_components = np.empty((n_ens, n_folds), dtype=np.int64)
+        batch = self.eval_batch_size(n_units, n_folds, len(counts) * n_t, n_ens, self.max_bytes)
+        for start in range(0, n_ens, batch):
+            ens = slice(start, start + batch)  # views: `out[ens]` is written in place
+            means = self.training_means(self.condition_means(data[ens], counts))
+            mu, components, n_components[ens] = self.fit_components(means)
+            self.project(data[ens], mu, components, out[ens], self.chunk_trials)
+        return out, n_components
+
+    @staticmethod
+    def condition_means(x: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Average the trials within each block of condition.
+
+        Arguments
+        ---------
+        x : np.ndarray
+            Firing rates, with the trials along the second to last axis.
+            Shape: ``(..., n_trials, n_t)``.
+        counts : np.ndarray
+            Number of trials in each condition block. Shape: ``(n_conditions,)``.
+
+        Returns
+        -------
+        means : np.ndarray
+            Condition means. Shape: ``(..., n_conditions, n_t)``.
+        """
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.add.reduceat(x, starts, axis=-2, dtype=np.float64)
+        return sums / counts[:, None]
+
+    @staticmethod
+    def training_means(means: np.ndarray) -> np.ndarray:
+        """
+        Compute the condition means of the training set of each held-out fold.
+
+        Arguments
+        ---------
+        means : np.ndarray
+            Condition means of each fold. Shape: ``(n_ens, n_units, n_folds, n_conditions, n_t)``.
+
+        Returns
+        -------
+        train : np.ndarray
+            Condition means over all the folds except the held-out one, with conditions and time
+            points flattened as samples. Shape: ``(n_ens, n_folds, n_units, n_conditions * n_t)``.
+
+        Notes
+        -----
+        All the folds contain the same number of trials in each condition, so that the mean over
+        the training trials is the mean of the condition means of the training folds.
+        """
+        n_folds = means.shape[2]
+        train = (means.sum(axis=2, keepdims=True) - means) / (n_folds - 1)
+        train = np.moveaxis(train, 2, 1)  # (n_ens, n_folds, n_units, n_conditions, n_t)
+        return train.reshape(train.shape[:3] + (-1,))
+
+    def fit_components(self, means: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Fit the principal components which explain the required fraction of variance, for a stack
+        of condition means.
+
+        Arguments
+        ---------
+        means : np.ndarray
+            Condition means. Shape: ``(..., n_units, n_samples)``.
+
+        Returns
+        -------
+        mu : np.ndarray
+            Mean of each unit across the samples. Shape: ``(..., n_units)``.
+        components : np.ndarray
+            Orthonormal principal axes in the space of units, with zero columns beyond the number
+            of components retained in each stacked matrix. Shape: ``(..., n_units, k_max)``, with
+            ``k_max`` the maximal number of components across the stack.
+        n_components : np.ndarray
+            Number of components retained in each stacked matrix. Shape: ``(...)``.
+
+        Implementation
+        --------------
+        A single call to `np.linalg.svd` decomposes all the stacked matrices. The variance criterion
+        is evaluated on the cumulative squared singular values of each matrix.
+        """
+        mu = means.mean(axis=-1)
+        A = means - mu[..., None]
+        total = np.sum(A**2, axis=(-2, -1))
+        U, S, _ = np.linalg.svd(A, full_matrices=False)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.cumsum(S**2, axis=-1) / total[..., None]
+        reached = ratio >= self.var_explained - 1e-12
+        n_components = np.where(total > 0, np.argmax(reached, axis=-1) + 1, 0)
+        k_max = int(n_components.max(initial=0))
+        keep = np.arange(k_max) < n_components[..., None]  # (..., k_max)
+        return mu, U[..., :k_max] * keep[..., None, :], n_components
+
+    @staticmethod
+    def project(
+        x: np.ndarray, mu: np.ndarray, components: np.ndarray, out: np.ndarray, chunk_trials: int
+    ) -> None:
+        """
+        Project the trials of each fold onto its subspace, chunk by chunk along the trials.
+
+        Arguments
+        ---------
+        x : np.ndarray
+            Firing rates. Shape: ``(n_ens, n_units, n_folds, n_trials, n_t)``.
+        mu, components : np.ndarray
+            Outputs of `fit_components` for each ensemble and fold.
+            Shapes: ``(n_ens, n_folds, n_units)``, ``(n_ens, n_folds, n_units, k_max)``.
+        out : np.ndarray
+            Output array, which can be `x` itself. Shape: same as `x`.
+        chunk_trials : int
+            Number of trials projected at once.
+
+        Notes
+        -----
+        The projector :math:`P = W W^T` is applied in two steps (:math:`W^T` then :math:`W`), so
+        that the intermediate array has ``k_max`` rows instead of ``n_units``.
+        """
+        mu = np.moveaxis(mu, 2, 1)[..., None, None]  # (n_ens, n_units, n_folds, 1, 1)
+        for start in range(0, x.shape[3], chunk_trials):
+            block = x[:, :, :, start : start + chunk_trials] - mu
+            scores = np.einsum("efuk,eufnt->efknt", components, block, optimize=True)
+            out[:, :, :, start : start + chunk_trials] = (
+                np.einsum("efuk,efknt->eufnt", components, scores, optimize=True) + mu
+            )
+
+    @staticmethod
+    def eval_batch_size(
+        n_units: int, n_folds: int, n_samples: int, n_ens: int, max_bytes: int
+    ) -> int:
+        """
+        Number of ensembles per batch, so that the arrays of a batch fit in `max_bytes`.
+
+        Notes
+        -----
+        Arrays per ensemble and fold: condition means of the fold, training means and their
+        centered version (``n_units * n_samples`` each), left singular vectors (``n_units *
+        min(n_units, n_samples)``).
+        """
+        n_values = n_folds * n_units * (3 * n_samples + min(n_units, n_samples))
+        per_ens = n_values * np.dtype(np.float64).itemsize
+        return int(np.clip(max_bytes // per_ens, 1, max(n_ens, 1)))
@@ -8,7 +8,6 @@ from typing import Literal, TypeAlias
 
 import numpy as np
 import numpy.typing as npt
-from scipy.signal import fftconvolve
 
 
 from core.constants import T_BIN
@@ -140,6 +139,8 @@ def smooth(
     - ``'same'``: Keep the output shape as the input sequence.
     - ``'valid'``: Keep only the values which are not influenced by zero-padding.
     """
+    from scipy.signal import fftconvolve  # pylint: disable=import-outside-toplevel
+
     kernel = np.ones((int(window / t_bin), 1))  # add one dimension for shape compatibility
     smoothed = fftconvolve(frates, kernel, mode=mode, axes=0) / len(kernel)
     return smoothed
@@ -0,0 +1,278 @@
+"""
+`core.processors.preprocess.group_trials` [module]
+
+Classes
+-------
+GroupedReducer
+
+Notes
+-----
+Grouped reductions compute one statistic (count, sum, mean or variance) over the trials of each
+group (typically, each experimental condition), for all the other dimensions at once (ensembles,
+units, folds, time points).
+
+Two strategies are used depending on how the groups are specified:
+
+- Contiguous blocks (fast path): in pseudo-populations, trials are arranged in contiguous blocks of
+  conditions, whose boundaries are given by `FactoryCoordExpFactor.conditions_boundaries`. The sums
+  of all the blocks are obtained by a single call to `np.add.reduceat` on the start indices.
+- Arbitrary labels (fallback): for any coordinate along the trials (e.g. unsorted labels), the
+  labels are encoded as integers, and the sums are obtained by a single call to `np.bincount` on
+  the flattened data, with one bin per pair (group, position in the other dimensions).
+
+In both cases, no Python loop runs over the groups. Variances are computed in two passes (sums of
+squared deviations from the group means), which is numerically more stable than the difference
+between the mean of squares and the squared mean.
+
+See Also
+--------
+`core.factories.create_coord_exp_factor.FactoryCoordExpFactor`: Blocks of conditions.
+`core.data_structures.condition_averages.ConditionAverages`: Data structure for the results.
+"""
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` method in `GroupedReducer`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
+
+from typing import Literal, Optional, Sequence, Tuple, TypeAlias
+
+import numpy as np
+
+from core.processors.base_processor import Processor
+
+
+Statistic: TypeAlias = Literal["count", "sum", "mean", "var"]
+"""Type alias for the statistics supported by the grouped reductions."""
+
+
+class GroupedReducer(Processor):
+    """
+    Reduce the trials of each group (condition) along one axis.
+
+    Attributes
+    ----------
+    stat : Statistic, default="mean"
+        Statistic to compute in each group.
+    ddof : int, default=0
+        Delta degrees of freedom for the variance.
+
+    Methods
+    -------
+    `starts_from_boundaries`
+    `reduce_blocks`
+    `reduce_labels`
+
+    Examples
+    --------
+    Condition averages of a pseudo-population, from the blocks of conditions of the factory:
+
+    >>> reducer = GroupedReducer(stat="mean")
+    >>> boundaries = list(factory.conditions_boundaries.values())
+    >>> means, groups = reducer.process(data=pop.data, axis=3, boundaries=boundaries)
+    >>> means.shape  # (n_ens, n_units, n_folds, n_conditions, n_t)
+
+    Variances for the groups of an arbitrary coordinate:
+
+    >>> reducer = GroupedReducer(stat="var", ddof=1)
+    >>> variances, groups = reducer.process(data=pop.data, axis=3, labels=pop.task.values)
+    >>> groups  # sorted unique labels, in the order of the groups along the output axis
+
+    See Also
+    --------
+    `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
+    """
+
+    def __init__(self, stat: Statistic = "mean", ddof: int = 0) -> None:
+        if stat not in ("count", "sum", "mean", "var"):
+            raise ValueError(f"Invalid statistic: {stat} ('count'/'sum'/'mean'/'var')")
+        self.stat = stat
+        self.ddof = ddof
+
+    # --- Processing Methods -----------------------------------------------------------------------
+
+    def process(
+        self,
+        data: Optional[np.ndarray] = None,
+        axis: int = 0,
+        boundaries: Optional[Sequence[Tuple[int, int]]] = None,
+        labels: Optional[np.ndarray] = None,
+        **kwargs,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        data : np.ndarray
+            Data to reduce, with the trials along `axis`.
+        axis : int, default=0
+            Axis of the trials in `data`.
+        boundaries : Sequence[Tuple[int, int]], optional
+            Start and end indices of the contiguous blocks of trials of each group, in order (e.g.
+            values of `FactoryCoordExpFactor.conditions_boundaries`). The blocks should cover all
+            the trials without overlap. Exclusive with `labels`.
+        labels : np.ndarray, optional
+            Group label of each trial, in any order. Shape: ``(n_trials,)``. Exclusive with
+            `boundaries`.
+
+        Returns
+        -------
+        reduced : np.ndarray
+            Statistic in each group. Shape: shape of `data`, with the trials axis replaced by the
+            groups axis (length ``n_groups``). For "count", the shape is ``(n_groups,)``.
+        groups : np.ndarray
+            Identifiers of the groups along the output axis: indices of the blocks (`boundaries`)
+            or sorted unique labels (`labels`).
+
+        Raises
+        ------
+        ValueError
+            If neither or both `boundaries` and `labels` are provided, or if they are inconsistent
+            with the number of trials.
+        """
+        assert data is not None
+        if (boundaries is None) == (labels is None):
+            raise ValueError("Provide exactly one of `boundaries` or `labels`.")
+        axis = axis % data.ndim
+        n_trials = data.shape[axis]
+        if boundaries is not None:
+            starts, counts = self.starts_from_boundaries(boundaries, n_trials)
+            groups = np.arange(len(starts))
+            if self.stat == "count":
+                return counts, groups
+            reduced = self.reduce_blocks(data, starts, counts, axis, self.stat, self.ddof)
+            return reduced, groups
+        labels = np.asarray(labels)
+        if labels.shape != (n_trials,):
+            raise ValueError(f"Invalid labels: shape {labels.shape} != ({n_trials},)")
+        groups, codes = np.unique(labels, return_inverse=True)
+        if self.stat == "count":
+            return np.bincount(codes, minlength=len(groups)), groups
+        reduced = self.reduce_labels(data, codes, len(groups), axis, self.stat, self.ddof)
+        return reduced, groups
+
+    @staticmethod
+    def starts_from_boundaries(
+        boundaries: Sequence[Tuple[int, int]], n_trials: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert the boundaries of contiguous blocks to start indices and counts.
+
+        Raises
+        ------
+        ValueError
+            If the blocks are empty, not contiguous, or do not cover all the trials.
+        """
+        bounds = np.asarray(boundaries, dtype=np.int64).reshape(-1, 2)
+        starts, ends = bounds[:, 0], bounds[:, 1]
+        counts = ends - starts
+        contiguous = np.array_equal(starts[1:], ends[:-1])
+        if not contiguous or starts[0] != 0 or ends[-1] != n_trials or np.any(counts <= 0):
+            raise ValueError(f"Blocks should be contiguous and cover {n_trials} trials: {bounds}")
+        return starts, counts
+
+    @staticmethod
+    def reduce_blocks(
+        x: np.ndarray,
+        starts: np.ndarray,
+        counts: np.ndarray,
+        axis: int,
+        stat: Statistic,
+        ddof: int = 0,
+    ) -> np.ndarray:
+        """
+        Reduce contiguous blocks of trials with `np.add.reduceat`.
+
+        Arguments
+        ---------
+        x : np.ndarray
+            Data, with the trials along `axis`.
+        starts, counts : np.ndarray
+            Start index and number of trials of each block. Shape: ``(n_groups,)``.
+        axis : int
+            Axis of the trials.
+        stat : {"sum", "mean", "var"}
+            Statistic to compute.
+        ddof : int
+            Delta degrees of freedom for the variance.
+
+        Returns
+        -------
+        reduced : np.ndarray
+            Shape: shape of `x` with ``n_groups`` along `axis`.
+        """
+        shape = [1] * x.ndim
+        shape[axis] = len(counts)
+        n = counts.reshape(shape)
+        sums = np.add.reduceat(x, starts, axis=axis, dtype=np.float64)
+        if stat == "sum":
+            return sums
+        means = sums / n
+        if stat == "mean":
+            return means
+        deviations = x - np.repeat(means, counts, axis=axis)
+        ss = np.add.reduceat(deviations**2, starts, axis=axis)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return ss / np.where(n - ddof > 0, n - ddof, np.nan)
+
+    @staticmethod
+    def reduce_labels(
+        x: np.ndarray,
+        codes: np.ndarray,
+        n_groups: int,
+        axis: int,
+        stat: Statistic,
+        ddof: int = 0,
+    ) -> np.ndarray:
+        """
+        Reduce groups of trials identified by integer codes with `np.bincount`.
+
+        Arguments
+        ---------
+        x : np.ndarray
+            Data, with the trials along `axis`.
+        codes : np.ndarray
+            Group index of each trial, from 0 to ``n_groups - 1``. Shape: ``(n_trials,)``.
+        n_groups : int
+            Number of groups.
+        axis, stat, ddof
+            See `reduce_blocks`.
+
+        Returns
+        -------
+        reduced : np.ndarray
+            Shape: shape of `x` with ``n_groups`` along `axis`. Empty groups yield NaN for the
+            mean and variance.
+
+        Implementation
+        --------------
+        The trials axis is moved last and the other dimensions are flattened into ``n_rows``. Each
+        element is assigned to the bin ``row * n_groups + code``, so that a single `np.bincount`
+        over ``n_rows * n_groups`` bins computes the sums of all the groups in all the rows.
+        """
+        moved = np.moveaxis(x, axis, -1)
+        rows = moved.reshape(-1, len(codes))
+        bins = (np.arange(len(rows))[:, None] * n_groups + codes[None, :]).ravel()
+        size = len(rows) * n_groups
+
+        def grouped_sum(values: np.ndarray) -> np.ndarray:
+            totals = np.bincount(bins, weights=values.ravel(), minlength=size)
+            return totals.reshape(len(rows), n_groups)
+
+        sums = grouped_sum(rows)
+        n = np.bincount(codes, minlength=n_groups).astype(np.float64)
+        if stat == "sum":
+            reduced = sums
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                means = sums / n
+                if stat == "mean":
+                    reduced = means
+                else:
+                    ss = grouped_sum((rows - means[:, codes]) ** 2)
+                    reduced = ss / np.where(n - ddof > 0, n - ddof, np.nan)
+        reduced = reduced.reshape(*moved.shape[:-1], n_groups)
+        return np.moveaxis(reduced, -1, axis)
@@ -3,20 +3,110 @@
 
 Classes
 -------
+RunningStats
 ZScorer
-"""
-# TODO: Update to match the new interface
-# Disable error codes for attributes which are not detected by the type checker:
-# (configuration and data attributes are initialized by the base class constructor)
-# pylint: disable=useless-parent-delegation
 
-from typing import Union, Any, Tuple, Dict, Optional
+Notes
+-----
+Statistics are accumulated in a streaming fashion (Welford's algorithm generalized to batches by
+Chan et al.), so that the mean and variance can be computed over data which does not fit in memory
+(e.g. one ensemble or one fold at a time) or in parallel over several chunks. Each chunk yields
+partial statistics (count, mean, sum of squared deviations ``M2``), which are merged pairwise:
+
+.. math::
+
+    n = n_a + n_b \\qquad
+    \\delta = \\mu_b - \\mu_a \\qquad
+    \\mu = \\mu_a + \\delta \\frac{n_b}{n} \\qquad
+    M_2 = M_{2,a} + M_{2,b} + \\delta^2 \\frac{n_a n_b}{n}
+
+This merge is numerically stable (no subtraction of large sums of squares) and associative, so
+that the order of the chunks does not matter.
+"""
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` method in `ZScorer`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import reduce
+from typing import Union, Iterable, Iterator, Tuple, Optional, Sequence
 
 import numpy as np
 
 from core.processors.base_processor import Processor
 
 
+@dataclass
+class RunningStats:
+    """
+    Partial statistics of a set of samples, mergeable across chunks.
+
+    Attributes
+    ----------
+    count : int
+        Number of samples accumulated along the reduced axes.
+    mean : np.ndarray
+        Mean of the samples. Shape: shape of the chunks with size 1 along the reduced axes.
+    m2 : np.ndarray
+        Sum of squared deviations from the mean. Shape: same as `mean`.
+
+    Methods
+    -------
+    `from_chunk`
+    `merge`
+    `var`
+    `std`
+    """
+
+    count: int
+    mean: np.ndarray
+    m2: np.ndarray
+
+    @classmethod
+    def from_chunk(
+        cls, x: np.ndarray, axes: Optional[Tuple[int, ...]] = None
+    ) -> "RunningStats":
+        """
+        Compute the statistics of one chunk of samples.
+
+        Arguments
+        ---------
+        x : np.ndarray
+            Chunk of samples.
+        axes : Tuple[int, ...], optional
+            Axes along which the statistics are computed. Default: all the axes.
+        """
+        axes = tuple(range(x.ndim)) if axes is None else axes
+        count = int(np.prod([x.shape[ax] for ax in axes]))
+        mean = np.mean(x, axis=axes, keepdims=True, dtype=np.float64)
+        m2 = np.sum(np.square(x - mean), axis=axes, keepdims=True, dtype=np.float64)
+        return cls(count, mean, m2)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Merge the statistics of two disjoint sets of samples (Chan's formula)."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * (other.count / count)
+        m2 = self.m2 + other.m2 + np.square(delta) * (self.count * other.count / count)
+        return RunningStats(count, mean, m2)
+
+    def var(self, ddof: int = 0) -> np.ndarray:
+        """Variance of the samples, with `ddof` delta degrees of freedom."""
+        return self.m2 / max(self.count - ddof, 1)
+
+    def std(self, ddof: int = 0) -> np.ndarray:
+        """Standard deviation of the samples, with `ddof` delta degrees of freedom."""
+        return np.sqrt(self.var(ddof))
+
+
 class ZScorer(Processor):
     """
     Z-score data in of samples, with either the standard method or a custom method.
@@ -44,6 +134,9 @@ class ZScorer(Processor):
 
     Class Attributes
     ----------------
+    CHUNK_SIZE : int
+        Approximate number of values per chunk when the statistics are computed over an array in
+        memory (bounds the size of the temporary arrays).
 
     Configuration Attributes
     ------------------------
@@ -61,20 +154,13 @@ class ZScorer(Processor):
         Custom scaling factor which divides the centered data.
         Shape: ???
 
-    Processing Arguments
-    --------------------
-    x : np.ndarray
-        Data samples to z-score. Shape: Any, as long as it is compatible with the configuration
-        parameters `axes`, `mu` and `sigma` (if provided).
-        .. _x:
-
-    Returns
-    -------
-    z : np.ndarray
-        Z-scored data. Shape: Identical to the shape of `x`.
-
     Methods
     -------
+    `validate`
+    `iter_chunks`
+    `accumulate`
+    `reduce_parallel`
+    `compute_stats`
     `z_score`
 
     Examples
@@ -111,13 +197,26 @@ class ZScorer(Processor):
     array([[-1., -0.5, -1., -0.5],
            [-1., -1., -1., -1.]])
 
+    Z-score a population which does not fit in memory, one ensemble at a time:
+
+    >>> zscorer = ZScorer(axes=(0, 2))  # statistics per unit, across ensembles and trials
+    >>> stats = zscorer.accumulate(load_ensemble(i) for i in range(n_ens))
+    >>> for i in range(n_ens):
+    ...     rates = load_ensemble(i)
+    ...     zscorer.process(x=rates, stats=stats, out=rates)  # in place
+
+    Compute the statistics of chunks in parallel:
+
+    >>> stats = zscorer.reduce_parallel(chunks, n_workers=4)
+
     See Also
     --------
+    :class:`RunningStats`
     :class:`core.processors.preprocess.base_processor.Processor`
         Base class for all processors: see class-level attributes and template methods.
     """
 
-    IS_RANDOM: bool = False
+    CHUNK_SIZE: int = 1 << 22
 
     def __init__(
         self,
@@ -125,16 +224,61 @@ class ZScorer(Processor):
         mu: Optional[Union[float, np.ndarray]] = None,
         sigma: Optional[Union[float, np.ndarray]] = None,
     ) -> None:
-        super().__init__()
         if isinstance(axes, int):
             axes = (axes,)
         self.axes = axes
         self.mu = mu
         self.sigma = sigma
 
-    # --- Validation Methods -----------------------------------------------------------------------
+    # --- Processing Methods -----------------------------------------------------------------------
+
+    def process(
+        self,
+        x: Optional[np.ndarray] = None,
+        stats: Optional[RunningStats] = None,
+        out: Optional[np.ndarray] = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        x : np.ndarray
+            Data samples to z-score. Shape: Any, as long as it is compatible with the configuration
+            parameters `axes`, `mu` and `sigma` (if provided).
+        stats : RunningStats, optional
+            Statistics accumulated beforehand (e.g. over all the chunks of an out-of-core data set,
+            see `accumulate`). Ignored for the parameters `mu` and `sigma` if they are set.
+        out : np.ndarray, optional
+            Output array, of floating data type and same shape as `x`. Pass ``out=x`` to z-score a
+            floating array in place (e.g. a memory-mapped array), without allocating a copy.
 
-    def _pre_process(self, **input_data: Any) -> Dict[str, Any]:
+        Returns
+        -------
+        z : np.ndarray
+            Z-scored data. Shape: Identical to the shape of `x`.
+        """
+        assert x is not None
+        self.validate(x, self.axes, self.mu, self.sigma, out)
+        mu, sigma = self.mu, self.sigma
+        if mu is None or sigma is None:
+            if stats is not None:
+                mu_x, sigma_x = stats.mean, stats.std()
+            else:
+                mu_x, sigma_x = self.compute_stats(x)
+            mu = mu_x if mu is None else mu
+            sigma = sigma_x if sigma is None else sigma
+        return self.z_score(x, mu, sigma, out=out)
+
+    @staticmethod
+    def validate(
+        x: np.ndarray,
+        axes: Optional[Tuple[int, ...]],
+        mu: Optional[Union[float, np.ndarray]],
+        sigma: Optional[Union[float, np.ndarray]],
+        out: Optional[np.ndarray] = None,
+    ) -> None:
         """
         Validate the data with respects to the configuration parameters.
 
@@ -144,84 +288,149 @@ class ZScorer(Processor):
             If the shape of `x` does not contain the axes specified in the configuration parameter
             `axes`.
             If the shape of `x` is incompatible to broadcast with `mu` and `sigma`.
+            If `out` does not have the shape of `x` or a floating data type.
 
         See Also
         --------
         :func:`np.broadcast_shapes`: Check if two shapes are broadcast-compatible.
         """
-        x = input_data.get("x", np.zeros((0,)))
         # Check if axes are within the range of x's dimensions
-        if self.axes is not None and any(ax >= x.ndim for ax in self.axes):
-            raise ValueError(f"Invalid shape: {x.shape} incompatible with `axes` {self.axes}")
+        if axes is not None and any(ax >= x.ndim for ax in axes):
+            raise ValueError(f"Invalid shape: {x.shape} incompatible with `axes` {axes}")
         # Check broadcast compatibility
-        for stat, name in zip([self.mu, self.sigma], ["mu", "sigma"]):
+        for stat, name in zip([mu, sigma], ["mu", "sigma"]):
             if stat is not None:
                 shape = np.shape(stat)  # handle the case of a single number
-                if not np.broadcast_shapes(x.shape, shape):
-                    raise ValueError(f"Shape of `x` {x.shape} incompatible with `{name}` {shape}.")
-        return input_data
+                try:
+                    np.broadcast_shapes(x.shape, shape)
+                except ValueError as exc:
+                    msg = f"Shape of `x` {x.shape} incompatible with `{name}` {shape}."
+                    raise ValueError(msg) from exc
+        if out is not None:
+            if out.shape != x.shape or not np.issubdtype(out.dtype, np.floating):
+                raise ValueError(f"Invalid `out`: {out.shape} {out.dtype} (float {x.shape})")
+
+    # --- Statistics -------------------------------------------------------------------------------
+
+    @staticmethod
+    def iter_chunks(
+        x: np.ndarray, axes: Optional[Tuple[int, ...]], chunk_size: int
+    ) -> Iterator[np.ndarray]:
+        """
+        Split an array into chunks along one of the reduced axes (views, no copy).
 
-    # --- Processing Methods -----------------------------------------------------------------------
+        Arguments
+        ---------
+        x : np.ndarray
+            Data samples.
+        axes : Tuple[int, ...], optional
+            Reduced axes. The chunks are taken along the first one (default: axis 0).
+        chunk_size : int
+            Approximate number of values per chunk.
+
+        Yields
+        ------
+        chunk : np.ndarray
+            View of `x` restricted to a range of indices along the chunked axis.
+        """
+        if x.ndim == 0:
+            yield x.reshape(1)
+            return
+        axis = 0 if axes is None else axes[0]
+        n = x.shape[axis]
+        step = max(1, (chunk_size * n) // max(x.size, 1))
+        for start in range(0, n, step):
+            index = [slice(None)] * x.ndim
+            index[axis] = slice(start, start + step)
+            yield x[tuple(index)]
+
+    def accumulate(self, chunks: Iterable[np.ndarray]) -> RunningStats:
+        """
+        Accumulate the statistics over a sequence of chunks, in a streaming fashion.
 
-    def _process(self, **input_data: Any) -> np.ndarray:
-        """Implement the template method called in the base class `process` method."""
-        x = input_data["x"]
-        mu = self.compute_mean(x) if self.mu is None else self.mu
-        sigma = self.compute_std(x) if self.sigma is None else self.sigma
-        z = self.z_score(x, mu, sigma)
-        return z
+        Arguments
+        ---------
+        chunks : Iterable[np.ndarray]
+            Chunks of samples, split along the reduced axes (same shape along the other axes). Can
+            be a generator which loads each chunk on demand (e.g. one ensemble or fold at a time).
 
-    def compute_mean(self, x: np.ndarray) -> Union[float, np.ndarray]:
+        Returns
+        -------
+        stats : RunningStats
+            Statistics of all the samples.
         """
-        Compute the mean of a set of samples.
+        stats = None
+        for chunk in chunks:
+            partial = RunningStats.from_chunk(chunk, self.axes)
+            stats = partial if stats is None else stats.merge(partial)
+        if stats is None:
+            raise ValueError("No chunk to accumulate statistics from.")
+        return stats
+
+    def reduce_parallel(
+        self, chunks: Sequence[np.ndarray], n_workers: Optional[int] = None
+    ) -> RunningStats:
+        """
+        Compute the partial statistics of several chunks in parallel, then merge them.
 
         Arguments
         ---------
-        x : np.ndarray
-            See the processing attribute :ref:`x`.
+        chunks : Sequence[np.ndarray]
+            Chunks of samples, see `accumulate`.
+        n_workers : int, optional
+            Number of worker threads. Default: see `ThreadPoolExecutor`.
 
         Returns
         -------
-        mu : Union[float, np.ndarray]
-            Mean across the samples.
-            If `axes` is set, the mean is taken along the specified axes and an array is returned.
-            Its shape matches the shape of `x` with the specified `axes` removed.
-            Otherwise, the mean is taken across all the values, and a scalar is returned.
+        stats : RunningStats
+            Statistics of all the samples.
+
+        Notes
+        -----
+        Threads are sufficient since NumPy releases the GIL in the reductions, and they avoid
+        copying the chunks to other processes. The partial statistics are small (one value per
+        non-reduced position) and merged in the main thread.
         """
-        if self.axes is not None:
-            mu = np.mean(x, axis=self.axes, keepdims=True)
-        else:
-            mu = np.mean(x)
-        return mu
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            partials = list(executor.map(lambda c: RunningStats.from_chunk(c, self.axes), chunks))
+        if not partials:
+            raise ValueError("No chunk to accumulate statistics from.")
+        return reduce(RunningStats.merge, partials)
 
-    def compute_std(self, x: np.ndarray) -> Union[float, np.ndarray]:
+    def compute_stats(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Compute the standard deviation of a set of samples.
+        Compute the mean and the standard deviation of a set of samples.
 
         Arguments
         ---------
         x : np.ndarray
-            See the processing attribute :ref:`x`.
+            See the argument `x` of the `process` method.
 
         Returns
         -------
-        sigma : Union[float, np.ndarray]
-            STD across the samples. See the `compute_mean` method for details.
+        mu, sigma : np.ndarray
+            Mean and standard deviation across the samples, along the axes `axes` (with size 1
+            along these axes) or across all the values (with size 1 along all the axes).
         """
-        if self.axes is not None:
-            sigma = np.std(x, axis=self.axes, keepdims=True)
-        else:
-            sigma = np.std(x)
-        return sigma
-
-    def z_score(self, x, mu, sigma):
+        stats = self.accumulate(self.iter_chunks(x, self.axes, self.CHUNK_SIZE))
+        return stats.mean, stats.std()
+
+    @staticmethod
+    def z_score(
+        x: np.ndarray,
+        mu: Union[float, np.ndarray],
+        sigma: Union[float, np.ndarray],
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
         """
         Compute the z-score for the set of samples.
 
         Arguments
         ---------
         x, mu, sigma : np.ndarray
-            See the attributes :ref:`x`, `mu`, `sigma`.
+            See the argument `x` and the attributes `mu`, `sigma`.
+        out : np.ndarray, optional
+            See the argument `out` of the `process` method.
 
         Raises
         ------
@@ -230,5 +439,8 @@ class ZScorer(Processor):
         """
         if np.any(np.isclose(sigma, 0)):
             raise ZeroDivisionError("Z-scoring failure: null values in `sigma`")
-        z = (x - mu) / sigma
-        return z
+        if out is None:
+            out = np.empty(x.shape, dtype=np.result_type(x.dtype, np.float64))
+        np.subtract(x, mu, out=out, casting="same_kind")
+        np.divide(out, sigma, out=out, casting="same_kind")
+        return out
@@ -0,0 +1,350 @@
+"""
+`core.processors.profiling` [module]
+
+Opt-in instrumentation of the `process` methods of all the processors.
+
+Classes
+-------
+CallStats
+ProcessorProfiler
+
+Functions
+---------
+instrument
+profile_processors
+nbytes
+
+Notes
+-----
+The `process` method of each `Processor` subclass is wrapped once, at class creation (see
+`Processor.__init_subclass__`). When the profiler is disabled (default), the wrapper only checks
+one flag before calling the original method. When enabled, each call records:
+
+- its wall time (inclusive of nested processors),
+- the size of the NumPy arrays in its inputs and outputs (including arrays nested in tuples,
+  lists and dictionaries),
+- optionally, its peak of traced memory (`tracemalloc`), which slows down the execution. Peaks
+  are global to the process: they are only meaningful when processors do not run in concurrent
+  threads.
+
+Results are aggregated by processor class (call counts, cumulative and percentile times) and can
+be exported as JSON or as a Chrome trace-event file (viewable in ``chrome://tracing`` or Perfetto),
+in which nested processors appear as nested spans.
+
+Examples
+--------
+Profile a pipeline run:
+
+>>> with profile_processors(trace_memory=True) as profiler:
+...     pipeline.execute(inputs)
+>>> profiler.summary().sort_values("total_s", ascending=False).head()
+>>> profiler.to_chrome_trace("trace.json")
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+import json
+import os
+from pathlib import Path
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Union, TYPE_CHECKING
+
+import numpy as np
+
+from utils.misc.tracing import TRACER
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class CallStats:
+    """
+    Statistics of the calls to the `process` method of one processor class.
+
+    Attributes
+    ----------
+    durations : List[float]
+        Wall time of each call (in seconds).
+    input_bytes, output_bytes : int
+        Cumulative size of the arrays passed to and returned by the calls.
+    peak_bytes : int
+        Maximal peak of traced memory during a call, relative to the memory at its start (0 if
+        memory tracing is disabled).
+    """
+
+    durations: List[float] = field(default_factory=list)
+    input_bytes: int = 0
+    output_bytes: int = 0
+    peak_bytes: int = 0
+
+
+class ProcessorProfiler:
+    """
+    Collector of the calls to the instrumented processors.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether the calls are recorded.
+    trace_memory : bool
+        Whether the peak memory of each call is traced.
+    stats : Dict[str, CallStats]
+        Statistics by processor class name.
+    events : List[Dict[str, Any]]
+        Trace events of the calls (Chrome trace-event format), in order of completion.
+    max_events : int
+        Maximal number of trace events kept (the statistics are always updated).
+
+    Methods
+    -------
+    `enable`
+    `disable`
+    `reset`
+    `call`
+    `record`
+    `summary`
+    `to_json`
+    `to_chrome_trace`
+    """
+
+    def __init__(self, max_events: int = 1_000_000) -> None:
+        self.enabled = False
+        self.trace_memory = False
+        self.max_events = max_events
+        self.stats: Dict[str, CallStats] = {}
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()  # stack of the memory frames of the current thread
+        self._started_tracing = False
+
+    def enable(self, trace_memory: bool = False) -> None:
+        """Start recording the calls, optionally with memory tracing."""
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording the calls (the results are kept)."""
+        self.enabled = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.trace_memory = False
+
+    def reset(self) -> None:
+        """Clear the results."""
+        with self._lock:
+            self.stats.clear()
+            self.events.clear()
+
+    def call(self, name: str, func: Callable, obj: Any, args: tuple, kwargs: dict) -> Any:
+        """
+        Call a `process` method and record its statistics.
+
+        Implementation
+        --------------
+        Memory peaks of nested calls: `tracemalloc` exposes a single peak, reset at the start of
+        each call. Each call keeps a frame on a per-thread stack. Before resetting the peak, a
+        nested call folds the peak reached so far into the frame of the enclosing call, and it
+        reports its own absolute peak there before returning. The peak of the outer call is thus
+        the maximum of its own peaks (before, between and after nested calls) and the peaks of its
+        nested calls.
+
+        Warning
+        -------
+        The traced memory and its peak are global to the process. When processors run in
+        concurrent threads, the allocations of all the threads are mixed and each call resets the
+        peak of the others: the recorded peaks are then meaningless (durations remain valid).
+        """
+        trace_memory = self.trace_memory and tracemalloc.is_tracing()
+        if trace_memory:
+            stack = getattr(self._local, "stack", None)
+            if stack is None:
+                stack = self._local.stack = []
+            start_mem, peak_before = tracemalloc.get_traced_memory()
+            if stack:  # keep the peak reached by the enclosing call before this one
+                stack[-1][1] = max(stack[-1][1], peak_before)
+            tracemalloc.reset_peak()
+            frame = [start_mem, 0]  # memory at start, maximal peak of nested calls
+            stack.append(frame)
+        output = None
+        t_start = time.perf_counter()
+        try:
+            output = func(obj, *args, **kwargs)
+            return output
+        finally:  # record failed calls as well (without output)
+            duration = time.perf_counter() - t_start
+            peak = 0
+            if trace_memory:
+                stack.pop()
+                peak_abs = max(tracemalloc.get_traced_memory()[1], frame[1])
+                peak = peak_abs - frame[0]
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], peak_abs)
+            self.record(name, t_start, duration, nbytes((args, kwargs)), nbytes(output), peak)
+
+    def record(
+        self,
+        name: str,
+        t_start: float,
+        duration: float,
+        input_bytes: int,
+        output_bytes: int,
+        peak_bytes: int = 0,
+    ) -> None:
+        """Update the statistics of a processor and append a trace event."""
+        with self._lock:
+            stats = self.stats.setdefault(name, CallStats())
+            stats.durations.append(duration)
+            stats.input_bytes += input_bytes
+            stats.output_bytes += output_bytes
+            stats.peak_bytes = max(stats.peak_bytes, peak_bytes)
+            if len(self.events) < self.max_events:
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": "processor",
+                        "ph": "X",
+                        "ts": t_start * 1e6,
+                        "dur": duration * 1e6,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": {
+                            "input_bytes": input_bytes,
+                            "output_bytes": output_bytes,
+                            "peak_bytes": peak_bytes,
+                        },
+                    }
+                )
+
+    def summary(self) -> "pd.DataFrame":
+        """
+        Aggregate the statistics of each processor.
+
+        Returns
+        -------
+        summary : pd.DataFrame
+            One row per processor class, with columns: ``processor``, ``n_calls``, ``total_s``,
+            ``mean_s``, ``p50_s``, ``p95_s``, ``max_s``, ``input_bytes``, ``output_bytes``,
+            ``peak_bytes``.
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        rows = []
+        with self._lock:
+            for name, stats in self.stats.items():
+                durations = np.asarray(stats.durations)
+                p50, p95 = np.percentile(durations, [50, 95])
+                rows.append(
+                    {
+                        "processor": name,
+                        "n_calls": len(durations),
+                        "total_s": durations.sum(),
+                        "mean_s": durations.mean(),
+                        "p50_s": p50,
+                        "p95_s": p95,
+                        "max_s": durations.max(),
+                        "input_bytes": stats.input_bytes,
+                        "output_bytes": stats.output_bytes,
+                        "peak_bytes": stats.peak_bytes,
+                    }
+                )
+        columns = ["processor", "n_calls", "total_s", "mean_s", "p50_s", "p95_s", "max_s"]
+        columns += ["input_bytes", "output_bytes", "peak_bytes"]
+        return pd.DataFrame(rows, columns=columns)
+
+    def to_json(self, path: Union[str, Path]) -> None:
+        """Save the summary as a JSON list of records (one per processor)."""
+        with Path(path).open("w", encoding="utf-8") as file:
+            json.dump(self.summary().to_dict(orient="records"), file, indent=2)
+
+    def to_chrome_trace(self, path: Union[str, Path]) -> None:
+        """Save the trace events in the Chrome trace-event format (JSON object format)."""
+        with self._lock:
+            content = {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+        with Path(path).open("w", encoding="utf-8") as file:
+            json.dump(content, file)
+
+
+PROFILER = ProcessorProfiler()
+"""Profiler shared by all the instrumented processors (disabled by default)."""
+
+
+def instrument(func: Callable, name: str) -> Callable:
+    """
+    Wrap a `process` method to record its calls in the shared profiler when it is enabled.
+
+    Arguments
+    ---------
+    func : Callable
+        Original `process` method.
+    name : str
+        Name of the processor class, under which the calls are recorded.
+
+    Returns
+    -------
+    wrapper : Callable
+        Method with the same signature. When the profiler and the tracer are disabled, it only
+        checks their flags before calling the original method. When the tracer is enabled, each
+        call opens a span of kind ``processor`` (see `utils.misc.tracing`).
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not (PROFILER.enabled or TRACER.enabled):
+            return func(self, *args, **kwargs)
+        with TRACER.span(name, "processor"):  # no-op if the tracer is disabled
+            if PROFILER.enabled:
+                return PROFILER.call(name, func, self, args, kwargs)
+            return func(self, *args, **kwargs)
+
+    wrapper.__instrumented__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+@contextmanager
+def profile_processors(
+    trace_memory: bool = False, reset: bool = True
+) -> Iterator[ProcessorProfiler]:
+    """
+    Enable the shared profiler within a context.
+
+    Arguments
+    ---------
+    trace_memory : bool, default=False
+        Whether to trace the peak memory of each call.
+    reset : bool, default=True
+        Whether to clear the previous results when entering the context.
+
+    Yields
+    ------
+    profiler : ProcessorProfiler
+        Shared profiler, whose results remain available after the context.
+    """
+    if reset:
+        PROFILER.reset()
+    PROFILER.enable(trace_memory=trace_memory)
+    try:
+        yield PROFILER
+    finally:
+        PROFILER.disable()
+
+
+def nbytes(obj: Any, depth: int = 3) -> int:
+    """
+    Total size of the NumPy arrays in an object, including those nested in tuples, lists and
+    dictionaries (up to `depth` levels).
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if depth > 0:
+        if isinstance(obj, (tuple, list)):
+            return sum(nbytes(item, depth - 1) for item in obj)
+        if isinstance(obj, dict):
+            return sum(nbytes(item, depth - 1) for item in obj.values())
+    return 0
@@ -0,0 +1,13 @@
+"""
+`core.processors.simulate` [package]
+
+Generate synthetic data sets which mimic the structure of the recordings, for stress tests and
+benchmarks at production scale.
+
+Modules
+-------
+`synthetic_sessions`
+
+See Also
+--------
+"""
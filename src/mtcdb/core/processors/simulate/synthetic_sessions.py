@@ -0,0 +1,725 @@
+"""
+`core.processors.simulate.synthetic_sessions` [module]
+
+Classes
+-------
+TaskLayout
+RateModel
+SessionGenerator
+SpikesGenerator
+
+Functions
+---------
+generate_dataset
+to_spike_trains
+to_trials_properties
+
+Notes
+-----
+The synthetic data reproduce the structure of the raw recordings:
+
+- Sessions: Each site is recorded in several sessions, alternating between tasks (PTD, CLK) and
+  attentional states (passive, active). Identifiers of sites, units and sessions are valid
+  `Site`, `Unit` and `Session` objects, with the synthetic animal ``'syn'`` (see `Animal`).
+- Blocks and slots: Each session contains blocks (``TRIALSTART`` to ``TRIALSTOP``), each block
+  contains a random number of reference slots, optionally followed by one target slot. Each slot
+  contains a pre-stimulus silence, a stimulus (preceded by a warning TORC in task CLK) and a
+  post-stimulus silence. Shocks occur after a fraction of the targets (errors).
+- Events: The events of each session are formatted as the raw CSV files exported from the
+  ``exptevents`` structures (columns ``TrialNum``, ``Event``, ``StartTime``, ``StopTime``, times
+  relative to the start of each block), so that they can be parsed by `SessionParser` and loaded in
+  `EventsProperties` like real data.
+- Spikes: Spiking times follow inhomogeneous Poisson processes with piecewise-constant rates in
+  each slot (baseline, warning, onset transient, sustained response, baseline). Baseline rates and
+  selectivity to each category are heterogeneous across units (log-normal distributions), and
+  responses are scaled in the active state. Times are relative to the start of each slot and
+  labeled by recording, block and slot, as in `SpikeTrains` (see `to_spike_trains`).
+- Trials: The ground truth of the trials is assembled into `TrialsProperties` exactly as the
+  parsed sessions (see `to_trials_properties`).
+
+Implementation
+--------------
+- Vectorization: Slots and events are generated for all the blocks of a session at once. Spikes are
+  generated from a table of segments (five per slot): the number of spikes in each segment is drawn
+  for all the segments at once, then the spikes are placed uniformly within their segments.
+- Streaming: The total number of spikes of a unit is known as soon as the counts are drawn, so that
+  the output file is allocated upfront as a memory-mapped NPY file and filled by chunks of at most
+  ``chunk_size`` spikes. Only one chunk is held in memory at a time, and the result does not depend
+  on the chunk size (the random streams are consumed in the same order).
+- Units and sites are processed one after the other by `generate_dataset`, so that data sets of
+  arbitrary size (e.g. 10⁹ spikes) can be written with bounded memory.
+
+See Also
+--------
+`core.processors.parse.extract_events.SessionParser`: Parser of the raw events.
+`core.data_structures.events_properties.EventsProperties`: Raw events of one session.
+`core.data_structures.trials_properties.TrialsProperties`: Trials of one or several sessions.
+`core.data_structures.spike_times.SpikeTrains`: Spiking times of one unit.
+"""
+# DISABLED WARNINGS
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=arguments-differ
+# Scope: `process` methods in `SessionGenerator` and `SpikesGenerator`.
+# Reason: See the note in ``core/__init__.py``
+# --------------------------------------------------------------------------------------------------
+
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from core.attributes.brain_info import Unit
+from core.attributes.exp_structure import Session
+from core.constants import D_CLK, D_WARN, D_PRESHOCK, D_SHOCK
+from core.coordinates.exp_structure_coord import CoordRecording, CoordBlock, CoordSlot
+from core.data_components.core_data import CoreData
+from core.data_components.core_dimensions import Dimensions
+from core.data_structures.spike_times import SpikeTrains
+from core.data_structures.trials_properties import TrialsProperties
+from core.pipelines.parse_sessions import COLUMNS, ParseSessions
+from core.processors.base_processor import Processor
+from core.processors.parse.extract_events import EventType
+from utils.io_data.savers import SaverCSVDataFrame
+from utils.storage_rulers.impl_path_rulers import (
+    EventsPropertiesPath,
+    TrialsPropertiesPath,
+    SpikeTrainsPath,
+)
+
+
+@dataclass(frozen=True)
+class TaskLayout:
+    """
+    Structure of the blocks and slots in the sessions of one task.
+
+    Attributes
+    ----------
+    task : str
+        Task of the sessions ("PTD", "CLK").
+    stim_ref, stim_tar : str
+        Identities of the reference and target stimuli, as written in the raw events.
+    stim_warn : str
+        Identity of the warning stimulus preceding the main stimulus in each slot (empty if none).
+    d_pre, d_warn, d_stim, d_post : float
+        Durations (in seconds) of the pre-stimulus silence, warning stimulus (0 if none), stimulus
+        and post-stimulus silence in each slot.
+    n_ref_max : int
+        Maximal number of reference slots in a block (drawn uniformly from 1 to `n_ref_max`).
+    p_target : float
+        Probability that a block ends with a target slot.
+    p_error : float
+        Probability of a shock after a target (error of the animal).
+    d_slot : float
+        (Property) Total duration of a slot.
+    """
+
+    task: str
+    stim_ref: str
+    stim_tar: str
+    stim_warn: str = ""
+    d_pre: float = 0.4
+    d_warn: float = 0.0
+    d_stim: float = 0.75
+    d_post: float = 0.8
+    n_ref_max: int = 6
+    p_target: float = 0.8
+    p_error: float = 0.1
+
+    def __post_init__(self) -> None:
+        if D_PRESHOCK + D_SHOCK > self.d_post:
+            raise ValueError(f"Post-stimulus silence too short for shocks: {self.d_post}")
+        if self.n_ref_max < 1 or not 0 <= self.p_target <= 1 or not 0 <= self.p_error <= 1:
+            raise ValueError(f"Invalid layout: {self}")
+
+    @property
+    def d_slot(self) -> float:
+        """Total duration of a slot."""
+        return self.d_pre + self.d_warn + self.d_stim + self.d_post
+
+
+TASK_LAYOUTS = MappingProxyType(
+    {
+        "PTD": TaskLayout(task="PTD", stim_ref="TORC_448_06_v501", stim_tar="2000"),
+        "CLK": TaskLayout(
+            task="CLK",
+            stim_ref="ClickTrain_10",
+            stim_tar="ClickTrain_36",
+            stim_warn="TORC_448_06_v501",
+            d_warn=D_WARN,
+            d_stim=D_CLK,
+        ),
+    }
+)
+"""Default layouts of the sessions for each task."""
+
+
+@dataclass(frozen=True)
+class RateModel:
+    """
+    Distribution of the firing rates of the units.
+
+    Attributes
+    ----------
+    baseline : float
+        Median baseline firing rate across units (in spikes/s).
+    baseline_sigma : float
+        Standard deviation of the logarithm of the baseline rates across units.
+    gain_sigma : float
+        Standard deviation of the logarithm of the response gains (ratio between the evoked and
+        baseline rates) of each unit to each category of stimulus (median gain: 1).
+    onset_ratio : float
+        Ratio between the rate of the onset transient and the sustained response.
+    d_onset : float
+        Duration of the onset transient (in seconds).
+    active_gain : float
+        Scaling of the evoked responses in the active state.
+    """
+
+    baseline: float = 5.0
+    baseline_sigma: float = 0.5
+    gain_sigma: float = 0.5
+    onset_ratio: float = 3.0
+    d_onset: float = 0.05
+    active_gain: float = 1.2
+
+
+SPIKES_DTYPE = np.dtype(
+    [("spikes", np.float64), ("recording", np.int32), ("block", np.int32), ("slot", np.int32)]
+)
+"""Record of one spike: time relative to the start of its slot, and labels of the slot."""
+
+CATEGORIES = ("R", "T")
+"""Categories of the main stimuli, in the order of their integer codes."""
+
+
+class SessionGenerator(Processor):
+    """
+    Generate the raw events and the trials of synthetic sessions.
+
+    Attributes
+    ----------
+    n_blocks : int, default=40
+        Number of blocks in each session.
+
+    Methods
+    -------
+    `draw_slots`
+    `build_events`
+
+    Examples
+    --------
+    >>> generator = SessionGenerator(n_blocks=40)
+    >>> events, trials = generator.process(session="syn001a01_p_PTD", seed=0)
+    >>> EventsProperties(session=Session("syn001a01_p_PTD")).format(raw=events)
+
+    See Also
+    --------
+    `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
+    """
+
+    def __init__(self, n_blocks: int = 40) -> None:
+        if n_blocks < 1:
+            raise ValueError(f"Invalid number of blocks: {n_blocks}")
+        self.n_blocks = n_blocks
+
+    def process(
+        self, session: Optional[str] = None, seed: int = 0, **kwargs
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        session : str
+            Identifier of the session, which determines its recording number, attentional state and
+            task (see `Session`).
+        seed : int | np.random.SeedSequence
+            Seed for the random structure of the blocks.
+
+        Returns
+        -------
+        events : pd.DataFrame
+            Raw events, with the columns of the CSV files: ``TrialNum``, ``Event``, ``StartTime``,
+            ``StopTime``.
+        trials : pd.DataFrame
+            Ground truth for the trials (slots), one row per slot, with columns: ``recording``,
+            ``task``, ``attention``, ``block``, ``slot``, ``category``, ``error``, ``t_start``,
+            ``t_on``, ``t_off``, ``t_warn``, ``t_end`` (times relative to the start of the block).
+        """
+        assert session is not None
+        site_rec, attention, task = session.rsplit("_", 2)  # format of `Session`
+        if task not in TASK_LAYOUTS or attention not in ("a", "p") or not site_rec[-2:].isdigit():
+            raise ValueError(f"Invalid session: {session}")
+        rec, layout = site_rec[-2:], TASK_LAYOUTS[task]
+        trials = self.draw_slots(layout, self.n_blocks, np.random.default_rng(seed))
+        trials.insert(0, "attention", attention)
+        trials.insert(0, "task", task)
+        trials.insert(0, "recording", int(rec))
+        events = self.build_events(layout, trials)
+        return events, trials
+
+    @staticmethod
+    def draw_slots(layout: TaskLayout, n_blocks: int, rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Draw the number and categories of the slots in each block, and compute their timing.
+
+        Returns
+        -------
+        trials : pd.DataFrame
+            See `process`, without the columns identifying the session.
+        """
+        n_ref = rng.integers(1, layout.n_ref_max + 1, size=n_blocks)
+        has_target = rng.random(n_blocks) < layout.p_target
+        n_slots = n_ref + has_target
+        ends = np.cumsum(n_slots)
+        n_tot = int(ends[-1])
+        block = np.repeat(np.arange(1, n_blocks + 1), n_slots)
+        slot = np.arange(n_tot) - np.repeat(ends - n_slots, n_slots) + 1
+        is_target = np.zeros(n_tot, dtype=bool)
+        is_target[ends[has_target] - 1] = True
+        error = is_target & (rng.random(n_tot) < layout.p_error)
+        t_start = (slot - 1) * layout.d_slot
+        t_on = t_start + layout.d_pre + layout.d_warn
+        t_off = t_on + layout.d_stim
+        t_warn = t_start + layout.d_pre if layout.d_warn > 0 else np.full(n_tot, np.nan)
+        return pd.DataFrame(
+            {
+                "block": block,
+                "slot": slot,
+                "category": np.array(CATEGORIES)[is_target.astype(int)],
+                "error": error,
+                "t_start": t_start,
+                "t_on": t_on,
+                "t_off": t_off,
+                "t_warn": t_warn,
+                "t_end": t_off + layout.d_post,
+            }
+        )
+
+    @staticmethod
+    def build_events(layout: TaskLayout, trials: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the raw events corresponding to the slots.
+
+        Arguments
+        ---------
+        layout : TaskLayout
+            Layout of the session.
+        trials : pd.DataFrame
+            Slots of the session, as returned by `draw_slots`.
+
+        Returns
+        -------
+        events : pd.DataFrame
+            See `process`.
+
+        Implementation
+        --------------
+        Each slot yields up to five events (pre-stimulus silence, warning, stimulus, post-stimulus
+        silence, shock), stored in arrays of shape ``(n_slots, 5)`` and masked where absent. The
+        descriptions are picked in a table indexed by the type of event and the category. The
+        delimiters of the blocks are added and all the events are sorted by block, then by order
+        of appearance.
+        """
+        t_start, t_on, t_off = (trials[c].to_numpy() for c in ("t_start", "t_on", "t_off"))
+        t_end, error = trials["t_end"].to_numpy(), trials["error"].to_numpy()
+        categ = (trials["category"].to_numpy() == "T").astype(int)
+        t_shock = t_off + D_PRESHOCK
+        starts = np.stack([t_start, t_start + layout.d_pre, t_on, t_off, t_shock], axis=1)
+        stops = np.stack([t_start + layout.d_pre, t_on, t_off, t_end, t_shock + D_SHOCK], axis=1)
+        present = np.ones_like(starts, dtype=bool)
+        present[:, 1] = layout.d_warn > 0
+        present[:, 4] = error
+        labels = ("Reference", "Target")
+        stims = (layout.stim_ref, layout.stim_tar)
+        table = np.array(
+            [
+                [f"{EventType.PRESTIM.value} , {stims[c]} , {labels[c]}" for c in (0, 1)],
+                [f"{EventType.STIM.value} , {layout.stim_warn} , {labels[c]}" for c in (0, 1)],
+                [f"{EventType.STIM.value} , {stims[c]} , {labels[c]}" for c in (0, 1)],
+                [f"{EventType.POSTSTIM.value} , {stims[c]} , {labels[c]}" for c in (0, 1)],
+                [EventType.SHOCK.value] * 2,
+            ],
+            dtype=object,
+        )
+        description = table[np.arange(5)[None, :], categ[:, None]]
+        block = trials["block"].to_numpy()
+        # Delimiters of the blocks: start at 0, stop at the end of the last slot
+        last = np.flatnonzero(np.diff(block, append=block[-1] + 1))
+        blocks, block_end = block[last], t_end[last]
+        n_blocks, n_events = len(blocks), int(present.sum())
+        order = np.concatenate([np.zeros(n_blocks), np.arange(1, n_events + 1)])
+        order = np.concatenate([order, np.full(n_blocks, np.inf)])
+        trial_num = np.concatenate([blocks, np.repeat(block[:, None], 5, axis=1)[present], blocks])
+        sorter = np.lexsort((order, trial_num))
+        return pd.DataFrame(
+            {
+                "TrialNum": trial_num[sorter],
+                "Event": np.concatenate(
+                    [
+                        np.full(n_blocks, EventType.TRIALSTART.value, dtype=object),
+                        description[present],
+                        np.full(n_blocks, EventType.TRIALSTOP.value, dtype=object),
+                    ]
+                )[sorter],
+                "StartTime": np.concatenate([np.zeros(n_blocks), starts[present], block_end])[
+                    sorter
+                ],
+                "StopTime": np.concatenate([np.zeros(n_blocks), stops[present], block_end])[
+                    sorter
+                ],
+            }
+        )
+
+
+class SpikesGenerator(Processor):
+    """
+    Generate the spiking times of one unit across its sessions.
+
+    Attributes
+    ----------
+    rate_model : RateModel
+        Distribution of the firing rates across units.
+    chunk_size : int, default=10_000_000
+        Maximal number of spikes generated at once (except for a single segment exceeding it).
+
+    Methods
+    -------
+    `draw_rates`
+    `build_segments`
+    `fill`
+
+    Examples
+    --------
+    Stream the spikes of one unit to a memory-mapped NPY file:
+
+    >>> generator = SpikesGenerator(chunk_size=1_000_000)
+    >>> spikes = generator.process(trials=[trials_1, trials_2], seed=0, path="unit_spk.npy")
+    >>> spikes["spikes"], spikes["block"]  # fields of `SPIKES_DTYPE`
+
+    See Also
+    --------
+    `core.processors.preprocess.base_processor.Processor`
+        Base class for all processors: see class-level attributes and template methods.
+    """
+
+    def __init__(
+        self, rate_model: Optional[RateModel] = None, chunk_size: int = 10_000_000
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+        self.rate_model = rate_model if rate_model is not None else RateModel()
+        self.chunk_size = chunk_size
+
+    def process(
+        self,
+        trials: Optional[Sequence[pd.DataFrame]] = None,
+        seed: int = 0,
+        path: Optional[Union[str, Path]] = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Implement the abstract method of the base class `Processor`.
+
+        Arguments
+        ---------
+        trials : Sequence[pd.DataFrame]
+            Trials of the sessions in which the unit was recorded, as returned by
+            `SessionGenerator.process`.
+        seed : int | np.random.SeedSequence
+            Seed for the rates and spikes of the unit.
+        path : str | Path, optional
+            Path of a NPY file in which the spikes are streamed. If None, the spikes are generated
+            in memory.
+
+        Returns
+        -------
+        spikes : np.ndarray
+            Spikes of the unit, ordered by recording, block, slot and time. Dtype: `SPIKES_DTYPE`.
+            Memory-mapped array if `path` is provided. Shape: ``(n_spikes,)``.
+        """
+        assert trials is not None
+        rng = np.random.default_rng(seed)
+        rates = self.draw_rates(self.rate_model, rng)
+        segments = [self.build_segments(t, rates, self.rate_model) for t in trials]
+        labels, start, dur, rate = (np.concatenate(s) for s in zip(*segments))
+        counts = rng.poisson(rate * dur)
+        n_spikes = int(counts.sum())
+        if path is None:
+            spikes = np.empty(n_spikes, dtype=SPIKES_DTYPE)
+        else:
+            spikes = np.lib.format.open_memmap(
+                Path(path).with_suffix(".npy"), mode="w+", dtype=SPIKES_DTYPE, shape=(n_spikes,)
+            )
+        self.fill(spikes, labels, start, dur, counts, rng, self.chunk_size)
+        if isinstance(spikes, np.memmap):
+            spikes.flush()
+        return spikes
+
+    @staticmethod
+    def draw_rates(rate_model: RateModel, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw the rates of one unit.
+
+        Returns
+        -------
+        rates : np.ndarray
+            Baseline rate, followed by the evoked rates for references, targets and warnings
+            (in spikes/s). Shape: ``(4,)``.
+        """
+        baseline = rate_model.baseline * np.exp(rate_model.baseline_sigma * rng.standard_normal())
+        gains = np.exp(rate_model.gain_sigma * rng.standard_normal(3))
+        return np.concatenate([[baseline], baseline * gains])
+
+    @staticmethod
+    def build_segments(
+        trials: pd.DataFrame, rates: np.ndarray, rate_model: RateModel
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the segments of constant rate in the slots of one session.
+
+        Arguments
+        ---------
+        trials : pd.DataFrame
+            Trials of one session.
+        rates : np.ndarray
+            Rates of the unit, see `draw_rates`.
+        rate_model : RateModel
+            See the attributes of the processor.
+
+        Returns
+        -------
+        labels : np.ndarray
+            Recording, block and slot of each segment. Shape: ``(n_slots * 5, 3)``.
+        start, dur, rate : np.ndarray
+            Start (relative to the start of the slot), duration and rate of each segment.
+            Shape: ``(n_slots * 5,)``.
+
+        Notes
+        -----
+        Segments of each slot: baseline, warning (empty if none), onset transient, sustained
+        response, baseline.
+        """
+        t_start = trials["t_start"].to_numpy()
+        on = trials["t_on"].to_numpy() - t_start
+        off = trials["t_off"].to_numpy() - t_start
+        end = trials["t_end"].to_numpy() - t_start
+        warn = np.where(np.isnan(trials["t_warn"].to_numpy()), on, trials["t_warn"] - t_start)
+        onset_end = np.minimum(on + rate_model.d_onset, off)
+        bounds = np.stack([np.zeros_like(on), warn, on, onset_end, off, end], axis=1)
+        active = trials["attention"].to_numpy() == "a"
+        scale = np.where(active, rate_model.active_gain, 1.0)
+        evoked = rates[1 + (trials["category"].to_numpy() == "T")] * scale
+        rate = np.stack(
+            [
+                np.full_like(on, rates[0]),
+                rates[3] * scale,
+                evoked * rate_model.onset_ratio,
+                evoked,
+                np.full_like(on, rates[0]),
+            ],
+            axis=1,
+        )
+        labels = trials[["recording", "block", "slot"]].to_numpy(dtype=np.int64)
+        return (
+            np.repeat(labels, 5, axis=0),
+            bounds[:, :-1].ravel(),
+            np.diff(bounds, axis=1).ravel(),
+            rate.ravel(),
+        )
+
+    @staticmethod
+    def fill(
+        spikes: np.ndarray,
+        labels: np.ndarray,
+        start: np.ndarray,
+        dur: np.ndarray,
+        counts: np.ndarray,
+        rng: np.random.Generator,
+        chunk_size: int,
+    ) -> None:
+        """
+        Place the spikes uniformly in their segments, chunk by chunk, sorted within each segment.
+
+        Arguments
+        ---------
+        spikes : np.ndarray
+            Output array, filled in place. Dtype: `SPIKES_DTYPE`. Shape: ``(counts.sum(),)``.
+        labels, start, dur : np.ndarray
+            See `build_segments`.
+        counts : np.ndarray
+            Number of spikes in each segment.
+        rng : np.random.Generator
+            Random generator for the positions of the spikes.
+        chunk_size : int
+            Maximal number of spikes per chunk. Chunks contain whole segments.
+
+        Implementation
+        --------------
+        In each chunk, the spikes are assigned to their segment index ``k`` (in order) and to a
+        uniform position ``u`` in ``[0, 1)`` within the segment. Sorting the keys ``k + u`` sorts
+        the positions within each segment while keeping the segments in order, in a single call.
+        The keys only depend on the global segment indices, so that the result does not depend on
+        the chunks.
+        """
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        first = 0
+        while first < len(counts):
+            last = np.searchsorted(offsets, offsets[first] + chunk_size, side="right") - 1
+            last = max(last, first + 1)
+            seg = np.repeat(np.arange(first, last), counts[first:last])
+            key = seg + rng.random(len(seg))
+            key.sort()  # segments are contiguous in `seg`: sort the positions within each segment
+            u = np.clip(key - seg, 0.0, np.nextafter(1.0, 0.0))
+            chunk = spikes[offsets[first] : offsets[last]]
+            chunk["spikes"] = start[seg] + dur[seg] * u
+            chunk["recording"] = labels[seg, 0]
+            chunk["block"] = labels[seg, 1]
+            chunk["slot"] = labels[seg, 2]
+            first = last
+
+
+def generate_dataset(
+    root_data: Union[str, Path],
+    n_units: int,
+    n_sessions: int,
+    units_per_site: int = 10,
+    n_blocks: int = 40,
+    rate_model: Optional[RateModel] = None,
+    chunk_size: int = 10_000_000,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Generate and write a synthetic data set, site by site and unit by unit.
+
+    Arguments
+    ---------
+    root_data : str | Path
+        Root directory of the data set, organized as the real data (see the path rulers).
+    n_units : int
+        Total number of units.
+    n_sessions : int
+        Number of sessions per site, alternating between passive and active states, then between
+        tasks PTD and CLK.
+    units_per_site : int, default=10
+        Number of units recorded at each site (at most 260, for valid unit identifiers).
+    n_blocks : int, default=40
+        Number of blocks in each session.
+    rate_model : RateModel, optional
+        Distribution of the firing rates across units.
+    chunk_size : int, default=10_000_000
+        Maximal number of spikes held in memory.
+    seed : int
+        Seed of the data set. Each site and unit uses an independent stream derived from it.
+
+    Returns
+    -------
+    summary : pd.DataFrame
+        One row per unit, with columns ``unit``, ``site``, ``n_spikes``.
+
+    Notes
+    -----
+    Files written for each session: raw events (`EventsPropertiesPath`, CSV, loaded by
+    `EventsProperties.format` and parsed by `ParseSessions`) and ground truth of the trials
+    (`TrialsPropertiesPath`, CSV, see `to_trials_properties`). Files written for each unit: spikes
+    (`SpikeTrainsPath`, NPY with dtype `SPIKES_DTYPE`, see `to_spike_trains`).
+    """
+    if not 1 <= units_per_site <= 260:
+        raise ValueError(f"Invalid number of units per site: {units_per_site} (1 to 260)")
+    n_sites = -(-n_units // units_per_site)
+    path_events = EventsPropertiesPath(root_data)
+    path_trials = TrialsPropertiesPath(root_data)
+    path_spikes = SpikeTrainsPath(root_data)
+    sessions_generator = SessionGenerator(n_blocks=n_blocks)
+    spikes_generator = SpikesGenerator(rate_model=rate_model, chunk_size=chunk_size)
+    electrodes = [f"{e}{u}" for e in "abcdefghijklmnopqrstuvwxyz" for u in range(10)]
+    rows = []
+    for i_site, site_seed in enumerate(np.random.SeedSequence(seed).spawn(n_sites)):
+        site = f"syn{i_site + 1:03d}a"
+        n_units_site = min(units_per_site, n_units - i_site * units_per_site)
+        seeds = site_seed.spawn(n_sessions + n_units_site)
+        trials = []
+        for rec in range(n_sessions):
+            session = f"{site}{rec + 1:02d}_{'pa'[rec % 2]}_{('PTD', 'CLK')[rec // 2 % 2]}"
+            events, trials_session = sessions_generator.process(session=session, seed=seeds[rec])
+            for ruler, table in ((path_events, events), (path_trials, trials_session)):
+                path = ruler.get_path(session)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                SaverCSVDataFrame(path).save(table)
+            trials.append(trials_session)
+        for i_unit in range(n_units_site):
+            unit = f"{site}-{electrodes[i_unit]}"
+            path = path_spikes.get_path(unit)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            spikes = spikes_generator.process(
+                trials=trials, seed=seeds[n_sessions + i_unit], path=path
+            )
+            rows.append({"unit": unit, "site": site, "n_spikes": len(spikes)})
+            del spikes  # release the memory map
+    return pd.DataFrame(rows, columns=["unit", "site", "n_spikes"])
+
+
+def to_spike_trains(unit: str, spikes: np.ndarray) -> SpikeTrains:
+    """
+    Convert the spikes of one unit into the data structure of the analysis.
+
+    Arguments
+    ---------
+    unit : str
+        Identifier of the unit.
+    spikes : np.ndarray
+        Spikes of the unit, as returned by `SpikesGenerator.process` or loaded from the file written
+        by `generate_dataset` (possibly memory-mapped). Dtype: `SPIKES_DTYPE`.
+
+    Returns
+    -------
+    spike_trains : SpikeTrains
+        Spiking times relative to the start of their slot, with the coordinates ``recording``,
+        ``block`` and ``slot``.
+
+    Examples
+    --------
+    >>> spikes = np.load(SpikeTrainsPath(root_data).get_path(unit).with_suffix(".npy"))
+    >>> spike_trains = to_spike_trains(unit, spikes)
+    """
+    dims = Dimensions("spikes")
+    return SpikeTrains(
+        unit=Unit(unit),
+        data=CoreData(np.asarray(spikes["spikes"]), dims=dims),
+        recording=CoordRecording(np.asarray(spikes["recording"], dtype=np.int64), dims=dims),
+        block=CoordBlock(np.asarray(spikes["block"], dtype=np.int64), dims=dims),
+        slot=CoordSlot(np.asarray(spikes["slot"], dtype=np.int64), dims=dims),
+    )
+
+
+def to_trials_properties(
+    sessions: Sequence[str], trials: Sequence[pd.DataFrame]
+) -> TrialsProperties:
+    """
+    Convert the ground truth of the trials of several sessions into the data structure of the
+    analysis.
+
+    Arguments
+    ---------
+    sessions : Sequence[str]
+        Identifiers of the sessions.
+    trials : Sequence[pd.DataFrame]
+        Trials of each session, as returned by `SessionGenerator.process` or loaded from the files
+        written by `generate_dataset`.
+
+    Returns
+    -------
+    trials_properties : TrialsProperties
+        Properties of the trials across all the sessions, in the format of `ParseSessions`: the
+        output of the parser on the raw events of the same sessions is identical.
+
+    See Also
+    --------
+    `core.pipelines.parse_sessions.ParseSessions.assemble`
+    """
+    results = [{name: table[name].to_numpy() for name in COLUMNS} for table in trials]
+    return ParseSessions.assemble([Session(s) for s in sessions], results)
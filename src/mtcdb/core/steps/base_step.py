@@ -9,6 +9,8 @@ Classes
 from abc import ABC, abstractmethod
 from typing import Any
 
+from utils.misc.tracing import traced
+
 
 class Step(ABC):
     """
@@ -34,6 +36,13 @@ class Step(ABC):
 
     """
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Open a tracing span around the `execute` method of each concrete step."""
+        super().__init_subclass__(**kwargs)
+        method = cls.__dict__.get("execute")
+        if callable(method) and not getattr(method, "__isabstractmethod__", False):
+            setattr(cls, "execute", traced(method, cls.__name__, "step"))
+
     @abstractmethod
     def execute(self) -> None:
         """Execute the step of the pipeline."""
@@ -9,5 +9,5 @@ Classes
 from typing import Any, List, Optional
 
 from core.steps.base_step import Step
-from attributes.brain_info import Area, Unit
+from core.attributes.brain_info import Area, Unit
 from utils.io_data.base_loader import Loader
@@ -15,6 +15,18 @@ data_transfer
 ingest
     Prepares data for processing.
 """
-from importlib.metadata import version
 
-__version__ = version(__package__)
+
+def __getattr__(name: str):
+    """
+    Resolve the package version at the first access (PEP 562), as in `core`.
+
+    The installed metadata is not required to import the subpackages (e.g. in tests run from the
+    source tree).
+    """
+    if name == "__version__":
+        from importlib.metadata import version  # pylint: disable=import-outside-toplevel
+
+        globals()["__version__"] = value = version(__package__)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,268 @@
+"""
+:mod:`etl.data_transfer.manifest` [module]
+
+Record the state of the transferred files to skip unchanged entries of a sync map.
+
+Classes
+-------
+:class:`EntryState`
+:class:`TransferManifest`
+
+Notes
+-----
+The manifest is a JSON file stored on the local machine. For each entry of a sync map (identified
+by its direction, source and destination), it stores the state of the local side at the time of
+its last successful transfer:
+
+.. code-block:: json
+
+    {
+        "upload|data/raw/session1/|data/raw/session1/": {
+            "n_files": 12,
+            "size": 104857,
+            "mtime_ns": 1718000000000000000,
+            "listing": "5d41402abc4b2a76b9719d911017c592...",
+            "hash": "7d793037a0760186574b0282f2f435e7..."
+        }
+    }
+
+An entry is considered unchanged without reading the content of the files if the number of files,
+the total size, the latest modification time and the digest of the listing (relative paths, sizes
+and modification times of all the files) match. Otherwise, the content hash is recomputed: files
+which were only touched (new modification time, same content) are still considered unchanged, and
+their new status is recorded so that their content is not hashed again in the next runs.
+
+Warning
+-------
+The manifest only reflects the transfers performed from this machine. It cannot detect changes
+made on the remote server by other means. Delete the manifest file to force a full transfer.
+"""
+from dataclasses import asdict, dataclass, replace
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Dict, List, Optional, Tuple, Union
+
+
+@dataclass(frozen=True)
+class EntryState:
+    """
+    State of a file or a directory tree.
+
+    Attributes
+    ----------
+    n_files : int
+        Number of regular files.
+    size : int
+        Total size of the files (bytes).
+    mtime_ns : int
+        Latest modification time among the files (nanoseconds).
+    listing : str
+        Digest of the relative paths, sizes and modification times of all the files.
+    hash : str, optional
+        Digest of the relative paths and contents of all the files. Only computed on demand.
+    """
+
+    n_files: int
+    size: int
+    mtime_ns: int
+    listing: str
+    hash: Optional[str] = None
+
+    def same_stat(self, other: "EntryState") -> bool:
+        """Compare the states without their content hashes."""
+        return (self.n_files, self.size, self.mtime_ns, self.listing) == (
+            other.n_files,
+            other.size,
+            other.mtime_ns,
+            other.listing,
+        )
+
+
+class TransferManifest:
+    """
+    Persistent record of the states of the transferred entries.
+
+    Class Attributes
+    ----------------
+    CHUNK_SIZE : int
+        Size of the chunks read to hash the content of the files (bytes).
+
+    Attributes
+    ----------
+    path : Path
+        Path to the JSON file storing the manifest.
+    entries : Dict[str, Dict]
+        States of the entries, indexed by the keys returned by :meth:`get_key`.
+
+    Methods
+    -------
+    :meth:`get_key`
+    :meth:`list_files`
+    :meth:`eval_state`
+    :meth:`eval_hash`
+    :meth:`is_unchanged`
+    :meth:`record`
+    :meth:`load`
+    :meth:`save`
+    """
+
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, path: Union[Path, str]):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self.load()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}> Path: {self.path}, Entries: {len(self.entries)}"
+
+    @staticmethod
+    def get_key(direction: str, source: Union[Path, str], destination: Union[Path, str]) -> str:
+        """
+        Identify an entry of the sync map.
+
+        Notes
+        -----
+        Paths are kept as strings since a trailing slash in the source changes the behavior of
+        `rsync` (contents of the directory vs. directory itself).
+        """
+        return f"{direction}|{source}|{destination}"
+
+    @staticmethod
+    def list_files(path: Path) -> List[Tuple[str, os.stat_result]]:
+        """
+        List the regular files in a file or a directory tree, with their status.
+
+        Returns
+        -------
+        files : List[Tuple[str, os.stat_result]]
+            Relative paths (from `path`, empty for a single file) and status of the files, sorted by
+            path. Empty if the path does not exist.
+        """
+        if path.is_file():
+            return [("", path.stat())]
+        files = []
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                full_path = Path(dirpath) / name
+                if full_path.is_file():
+                    files.append((full_path.relative_to(path).as_posix(), full_path.stat()))
+        return sorted(files, key=lambda item: item[0])
+
+    @classmethod
+    def eval_state(cls, path: Union[Path, str]) -> EntryState:
+        """
+        Compute the state of a file or a directory tree from the status of its files only.
+
+        Returns
+        -------
+        state : EntryState
+            State of the entry, without content hash.
+        """
+        files = cls.list_files(Path(path))
+        listing = hashlib.sha1()
+        for rel_path, stat in files:
+            listing.update(f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        return EntryState(
+            n_files=len(files),
+            size=sum(stat.st_size for _, stat in files),
+            mtime_ns=max((stat.st_mtime_ns for _, stat in files), default=0),
+            listing=listing.hexdigest(),
+        )
+
+    @classmethod
+    def eval_hash(cls, path: Union[Path, str]) -> str:
+        """
+        Compute the digest of the relative paths and contents of the files in an entry.
+
+        Returns
+        -------
+        digest : str
+            Hexadecimal SHA-1 digest.
+        """
+        path = Path(path)
+        digest = hashlib.sha1()
+        for rel_path, _ in cls.list_files(path):
+            digest.update(f"{rel_path}\0".encode())
+            with open(path / rel_path if rel_path else path, "rb") as file:
+                while chunk := file.read(cls.CHUNK_SIZE):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def is_unchanged(self, key: str, path: Union[Path, str]) -> Tuple[bool, EntryState]:
+        """
+        Check whether an entry is unchanged since its last recorded transfer.
+
+        Arguments
+        ---------
+        key : str
+            Identifier of the entry, see :meth:`get_key`.
+        path : Path or str
+            Full path to the local side of the entry.
+
+        Returns
+        -------
+        unchanged : bool
+            True if the entry was recorded and its files are identical to the recorded state.
+        state : EntryState
+            Current state of the entry, to record after the transfer. Includes the content hash if
+            it had to be computed.
+
+        Implementation
+        --------------
+        The content hash is only computed if the status of the files differs from the recorded one,
+        to avoid reading the files of unchanged entries.
+        """
+        state = self.eval_state(path)
+        previous = self.entries.get(key)
+        if previous is None or state.n_files == 0:
+            return False, state
+        previous_state = EntryState(**previous)
+        if state.same_stat(previous_state):
+            return True, replace(state, hash=previous_state.hash)
+        state = replace(state, hash=self.eval_hash(path))
+        return state.hash == previous_state.hash, state
+
+    def record(self, key: str, path: Union[Path, str], state: EntryState) -> None:
+        """
+        Record the state of an entry after a successful transfer.
+
+        Arguments
+        ---------
+        key, path
+            See :meth:`is_unchanged`.
+        state : EntryState
+            State of the entry returned by :meth:`is_unchanged`. Its content hash is computed if
+            missing (new entry).
+        """
+        if state.hash is None:
+            state = replace(state, hash=self.eval_hash(path))
+        self.entries[key] = asdict(state)
+
+    def load(self) -> None:
+        """Load the entries from the manifest file, if it exists."""
+        if self.path.is_file():
+            with open(self.path, "r", encoding="utf-8") as file:
+                self.entries = json.load(file)
+
+    def save(self) -> None:
+        """
+        Save the entries in the manifest file.
+
+        Implementation
+        --------------
+        The content is written to a temporary file in the same directory and moved atomically, so
+        that an interrupted run does not leave a corrupted manifest.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(self.entries, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
@@ -6,7 +6,9 @@ Transfers files and directories between a local workspace and a remote server.
 Functionalities:
 
 - Transfer in both directions: upload (from local to remote) and download (from remote to local).
-- Process a sync map to transfer multiple files and directories at once.
+- Process a sync map to transfer multiple files and directories at once, concurrently.
+- Share a single SSH connection across all the checks and transfers (connection multiplexing).
+- Skip the uploads of entries which are unchanged since their last transfer (local manifest).
 
 Arguments
 ---------
@@ -21,6 +23,12 @@ Arguments
     files from the remote server.
 --dry-run : flag
     Simulate the operations without executing them.
+--workers : int
+    Number of concurrent transfers. Default: 4.
+--no-manifest : flag
+    Transfer all the entries, without reading nor updating the manifest of previous transfers.
+--no-multiplex : flag
+    Open one SSH connection per command instead of a shared master connection.
 
 Usage
 -----
@@ -42,6 +50,11 @@ To simulate an upload:
 
     python transfer.py --env-path path/to/.env --sync-map-path path/to/sync_map.yml --direction upload --dry-run
 
+To upload with 8 concurrent transfers:
+
+.. code-block:: bash
+
+    python transfer.py --env-path path/to/.env --sync-map-path path/to/sync_map.yml --direction upload --workers 8
 
 Notes
 -----
@@ -76,12 +89,16 @@ Rules for the paths in the sync map:
 
 """
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 import subprocess
-from typing import Dict, List, Union, Optional
+import tempfile
+from typing import Dict, Generator, List, Union, Optional, Tuple
 
 import yaml
 
+from etl.data_transfer.manifest import EntryState, TransferManifest
 from utils.io_data.loaders import LoaderYAML
 from utils.path_system.local_server import LocalServer
 from utils.path_system.remote_server import RemoteServer
@@ -99,13 +116,18 @@ class TransferManager:
     ----------------
     valid_directions : List[str]
         List of valid directions for the transfer: "upload" and "download".
+    control_persist : int
+        Duration (seconds) for which the master SSH connection stays open after its last use.
+    manifest_name : str
+        Name of the default manifest file, in the root directory of the local workspace.
 
     Attributes
     ----------
     user : str
         Username on the remote server.
     host : str
-        IP address or hostname of the remote server.
+        IP address or hostname of the remote server. If None (and not set afterwards in the remote
+        server), both sides of the transfer are local paths (e.g. mounted volume, tests).
     root_remote : Path
         Custom path of the root directory of the workspace on the remote server.
     root_local : Path
@@ -122,15 +144,38 @@ class TransferManager:
         retrieve files from the remote server.
     dry_run : bool, default=False
         If True, operations are only simulated rather than executed.
+    n_workers : int, default=1
+        Number of concurrent transfers.
+    multiplex : bool, default=True
+        Whether to share a single SSH connection across all the checks and transfers.
+    control_dir : Path, optional
+        Directory of the control socket of the master SSH connection. Default: temporary directory
+        created for the duration of :meth:`process_map`.
+    manifest : :class:`TransferManifest`, optional
+        Record of the uploaded entries, to skip the unchanged ones. None to disable.
 
     Methods
     -------
     :meth:`transfer`
     :meth:`process_map`
+    :meth:`select_entries`
+    :meth:`connection`
+    :meth:`ssh_options`
     :meth:`_check_direction`
     :meth:`_run_rsync`
     :meth:`load_sync_map`
 
+    Notes
+    -----
+    Connection multiplexing (OpenSSH options `ControlMaster`, `ControlPath`, `ControlPersist`): a
+    master connection is opened once, and all the subsequent `ssh` commands (directory checks,
+    `rsync` transfers through `-e`) are tunneled through its control socket instead of performing
+    a new handshake. This is what makes concurrent transfers of many small entries efficient.
+
+    The manifest is only used for uploads, where the local side is the source of the transfer. For
+    downloads, the state of the remote source is unknown locally, so that all entries are
+    transferred (`rsync` itself skips unchanged files).
+
     See Also
     --------
     :class:`pathlib.Path`
@@ -140,9 +185,12 @@ class TransferManager:
         Used here to get the full path of source files or directories.
     :meth:`subprocess.run`
         Execute a command in a subprocess.
+    :class:`etl.data_transfer.manifest.TransferManifest`
     """
 
     valid_directions = ["upload", "download"]
+    control_persist = 60
+    manifest_name = ".transfer_manifest.json"
 
     def __init__(
         self,
@@ -153,6 +201,11 @@ class TransferManager:
         sync_map: Optional[SyncMapType] = None,
         direction: str = "upload",
         dry_run: bool = False,
+        n_workers: int = 1,
+        multiplex: bool = True,
+        control_dir: Optional[Union[Path, str]] = None,
+        use_manifest: bool = True,
+        manifest_path: Optional[Union[Path, str]] = None,
     ):
         self.user = user
         self.host = host
@@ -162,6 +215,94 @@ class TransferManager:
         self._check_direction(direction)
         self.direction = direction
         self.dry_run = dry_run
+        self.n_workers = max(1, n_workers)
+        self.multiplex = multiplex
+        self.control_dir = Path(control_dir) if control_dir is not None else None
+        self.manifest: Optional[TransferManifest] = None
+        if use_manifest:
+            if manifest_path is None:
+                manifest_path = self.local_server.root_path / self.manifest_name
+            self.manifest = TransferManifest(manifest_path)
+
+    @property
+    def is_local(self) -> bool:
+        """Whether the "remote" side is a local path (no host configured)."""
+        return self.remote_server.host is None
+
+    @property
+    def target(self) -> str:
+        """SSH destination of the remote server (`user@host`), read from the remote server since
+        credentials may be loaded after initialization."""
+        return f"{self.remote_server.user}@{self.remote_server.host}"
+
+    def ssh_options(self) -> List[str]:
+        """
+        Build the SSH options for connection multiplexing.
+
+        Returns
+        -------
+        options : List[str]
+            Options passed to all `ssh` commands. Empty if multiplexing is disabled or if no control
+            directory is set (outside :meth:`connection`).
+
+        Notes
+        -----
+        The token `%C` in the control path is expanded by `ssh` into a hash of the connection
+        parameters (local host, remote host, port, user), which keeps the socket path short and
+        unique per server.
+        """
+        if not self.multiplex or self.control_dir is None:
+            return []
+        return [
+            "-o",
+            "ControlMaster=auto",
+            "-o",
+            f"ControlPath={self.control_dir / '%C'}",
+            "-o",
+            f"ControlPersist={self.control_persist}",
+        ]
+
+    @contextmanager
+    def connection(self) -> Generator[None, None, None]:
+        """
+        Open a master SSH connection shared by all the commands executed in the context.
+
+        Implementation
+        --------------
+        - Open the master in the background (`-f`) without remote command (`-N`) *before* starting
+          concurrent transfers. Otherwise, concurrent commands would race to become the master
+          and most of them would perform their own handshake.
+        - Propagate the options to the remote server, so that its checks use the same socket.
+        - Close the master explicitly at the end (`-O exit`) rather than waiting for
+          `ControlPersist` to expire.
+        - If the master cannot be opened, commands fall back to individual connections.
+
+        Nothing is done for local transfers or if multiplexing is disabled.
+        """
+        if self.is_local or not self.multiplex:
+            yield
+            return
+        with tempfile.TemporaryDirectory(prefix="mtcdb-ssh-") as tmp_dir:
+            own_dir = self.control_dir is None
+            if own_dir:
+                self.control_dir = Path(tmp_dir)
+            else:
+                self.control_dir.mkdir(parents=True, exist_ok=True)
+            self.remote_server.ssh_options = self.ssh_options()
+            opened = subprocess.run(
+                ["ssh", *self.ssh_options(), "-fN", self.target], check=False
+            ).returncode == 0
+            if not opened:
+                print(f"[WARNING] Failed to open a master connection to {self.host}")
+            try:
+                yield
+            finally:
+                if opened:
+                    exit_cmd = ["ssh", *self.ssh_options(), "-O", "exit", self.target]
+                    subprocess.run(exit_cmd, check=False, capture_output=True)
+                self.remote_server.ssh_options = []
+                if own_dir:
+                    self.control_dir = None
 
     def transfer(self, local_path: Path, remote_path: Path):
         """
@@ -177,14 +318,16 @@ class TransferManager:
         # Build full paths
         local_full_path = self.local_server.build_path(local_path)
         remote_full_path = self.remote_server.build_path(remote_path)
+        remote_side = self.local_server if self.is_local else self.remote_server
+        remote = str(remote_full_path) if self.is_local else f"{self.target}:{remote_full_path}"
         # Set source and destination paths based on the transfer direction
         if self.direction == "upload":
-            self.remote_server.is_dir(remote_full_path)
+            remote_side.is_dir(remote_full_path)
             source = str(local_full_path)
-            destination = f"{self.user}@{self.host}:{remote_full_path}"
+            destination = remote
         elif self.direction == "download":
             self.local_server.is_dir(local_full_path)
-            source = f"{self.user}@{self.host}:{remote_full_path}"
+            source = remote
             destination = str(local_full_path)
         else:
             raise ValueError(f"[ERROR] Invalid direction: {self.direction}")
@@ -192,22 +335,87 @@ class TransferManager:
         print(f"[INFO] Transfer from {source} to {destination}")
         self._run_rsync(source, destination)
 
+    def select_entries(self) -> List[Tuple[Dict[str, Path], Optional[str], Optional[EntryState]]]:
+        """
+        Select the entries of the sync map to transfer, by skipping the unchanged uploads.
+
+        The current states of the skipped entries are recorded in the manifest (saved at the end
+        of :meth:`process_map`), so that the files which were only touched are compared by status
+        in the next runs.
+
+        Returns
+        -------
+        entries : List[Tuple[Dict[str, Path], str, EntryState]]
+            Entries to transfer, with their key and current state in the manifest (None if the
+            manifest is not used).
+
+        See Also
+        --------
+        :meth:`TransferManifest.is_unchanged`
+        """
+        if self.manifest is None or self.direction != "upload":
+            return [(paths, None, None) for paths in self.sync_map]
+        entries = []
+        for paths in self.sync_map:
+            key = self.manifest.get_key(self.direction, paths["source"], paths["destination"])
+            local_full_path = self.local_server.build_path(paths["source"])
+            unchanged, state = self.manifest.is_unchanged(key, local_full_path)
+            if unchanged:
+                print(f"[INFO] Skip unchanged entry: {paths['source']}")
+                # Refresh the status of touched files, so that their content is not hashed again
+                self.manifest.record(key, local_full_path, state)
+            else:
+                entries.append((paths, key, state))
+        return entries
+
     def process_map(self):
         """
         Transfer all files or directories specified in the sync map.
 
-        Arguments
-        ---------
-        direction : str, {"upload", "download"}
-            Direction of the transfer: see :meth:`_check_direction`.
+        Raises
+        ------
+        subprocess.CalledProcessError
+            If any transfer failed, after the completion of all the other transfers. The successful
+            transfers are recorded in the manifest beforehand.
+
+        Implementation
+        --------------
+        Transfers are I/O bound subprocesses, so that they are run concurrently in a pool of
+        threads. The manifest is updated in the main thread once all transfers are complete.
 
         See Also
         --------
         :meth:`transfer`
+        :meth:`select_entries`
+        :meth:`connection`
         """
         print(f"[INFO] Process sync map. Direction: {self.direction}.")
-        for paths in self.sync_map:
-            self.transfer(paths["source"], paths["destination"])
+        entries = self.select_entries()
+        print(f"[INFO] Transfer {len(entries)}/{len(self.sync_map)} entries")
+
+        def run(paths: Dict[str, Path]) -> Optional[subprocess.CalledProcessError]:
+            try:
+                self.transfer(paths["source"], paths["destination"])
+                return None
+            except subprocess.CalledProcessError as exc:
+                print(f"[ERROR] Failed transfer: {paths['source']} ({exc})")
+                return exc
+
+        with self.connection():
+            if self.n_workers <= 1 or len(entries) <= 1:
+                errors = [run(paths) for paths, _, _ in entries]
+            else:
+                with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+                    errors = list(executor.map(run, [paths for paths, _, _ in entries]))
+        if self.manifest is not None and not self.dry_run:
+            for (paths, key, state), error in zip(entries, errors):
+                if error is None and key is not None and state is not None:
+                    self.manifest.record(key, self.local_server.build_path(paths["source"]), state)
+            self.manifest.save()
+        failures = [error for error in errors if error is not None]
+        if failures:
+            raise failures[0]
+        print(f"[SUCCESS] Transferred {len(entries)} entries")
 
     def _check_direction(self, direction: str):
         """
@@ -241,7 +449,7 @@ class TransferManager:
         --------
         :command:`rsync`
             Command-line utility to synchronize files and directories between two locations.
-            Syntax (here): `rsync -avz <source_path> <destination_path>`
+            Syntax (here): `rsync -avz [-e "ssh <options>"] <source_path> <destination_path>`
 
             Options:
 
@@ -249,6 +457,7 @@ class TransferManager:
             `-v` (verbose)  : Display the progress of the transfer
             `-z`            : Compress data during the transfer
             `-n` (dry-run)  : Simulate the transfer without executing it
+            `-e` (rsh)      : Remote shell, to reuse the master SSH connection
 
         Warning
         -------
@@ -258,6 +467,9 @@ class TransferManager:
         command = ["rsync", "-avz"]
         if self.dry_run:
             command.append("--dry-run")
+        ssh_options = self.ssh_options()
+        if ssh_options and not self.is_local:
+            command.extend(["-e", " ".join(["ssh", *ssh_options])])
         command.extend([source, destination])
         subprocess.run(command, check=True)
 
@@ -324,10 +536,27 @@ def main():
         action="store_true",  # flag to set the dry_run attribute to True
         help="Simulate operations without executing them.",
     )
+    parser.add_argument("--workers", type=int, default=4, help="Number of concurrent transfers.")
+    parser.add_argument(
+        "--no-manifest",
+        action="store_true",
+        help="Transfer all entries, ignoring the manifest of previous transfers.",
+    )
+    parser.add_argument(
+        "--no-multiplex",
+        action="store_true",
+        help="Do not share a master SSH connection across commands.",
+    )
     args = parser.parse_args()
 
     # Initialize the transfer manager
-    transfer_manager = TransferManager(direction=args.direction, dry_run=args.dry_run)
+    transfer_manager = TransferManager(
+        direction=args.direction,
+        dry_run=args.dry_run,
+        n_workers=args.workers,
+        multiplex=not args.no_multiplex,
+        use_manifest=not args.no_manifest,
+    )
     # Load configurations from files
     transfer_manager.remote_server.load_network_config(args.env_path)
     transfer_manager.load_sync_map(args.sync_map_path)
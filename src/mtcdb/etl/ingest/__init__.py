@@ -5,6 +5,10 @@ Package for data ingestion in Multi-Task Context-Dependent Behavior PhD (2022-20
 
 Modules
 -------
+:mod:`evp_reader`
+    Streaming reader for baphy's EVP files.
+:mod:`process_evp`
+    Batch conversion of EVP files to CSV or NPY files.
 
 
 Sub-Packages
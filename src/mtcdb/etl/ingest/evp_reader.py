@@ -0,0 +1,256 @@
+"""
+:mod:`etl.ingest.evp_reader` [module]
+
+Read the continuous signals stored by baphy in EVP files (``.evp`` or ``.evp.gz``).
+
+Classes
+-------
+:class:`EVPHeader`
+:class:`EVPReader`
+
+Notes
+-----
+Binary layout of an EVP file (version 5, little-endian), as written by baphy's ``evpwrite``:
+
+1. Main header: 10 ``uint32`` values, see :attr:`EVPReader.HEADER_FIELDS`. The positions are those
+   read by baphy's ``evpread`` (``header(1)`` to ``header(8)`` in MATLAB): version, number of spike
+   and auxiliary channels, their sampling rates, number of trials, then number of LFP channels and
+   their sampling rate. The last two values are reserved.
+2. For each trial:
+
+   - Trial header: 3 ``uint32`` values, the number of samples per channel for the spike, auxiliary
+     and LFP signals in the trial.
+   - Spike samples: ``int16``, ``n_spike_samples * n_spike_chans`` values.
+   - Auxiliary samples: ``int16``, ``n_aux_samples * n_aux_chans`` values.
+   - LFP samples: ``int16``, ``n_lfp_samples * n_lfp_chans`` values.
+
+   Within each signal block, samples are stored channel by channel (column-major order in MATLAB).
+
+The reader replaces the former MATLAB-based ingestion (``evpread`` called through the MATLAB engine
+on a decompressed copy of the file): the compressed file is decompressed on the fly by `gzip` and
+only the blocks of the requested signal are converted to arrays, the others being skipped.
+
+See Also
+--------
+:mod:`etl.ingest.process_evp`: Batch conversion of EVP files.
+"""
+from dataclasses import dataclass
+import gzip
+from pathlib import Path
+from types import MappingProxyType
+from typing import BinaryIO, Generator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class EVPHeader:
+    """
+    Main header of an EVP file.
+
+    Attributes
+    ----------
+    version : int
+        Version of the EVP format (only version 5 is supported).
+    n_spike_chans, n_aux_chans, n_lfp_chans : int
+        Number of channels for each signal.
+    spike_fs, aux_fs, lfp_fs : int
+        Sampling rates of each signal (Hz).
+    n_trials : int
+        Number of trials (blocks, in the terminology of the analysis) in the file.
+    """
+
+    version: int
+    n_spike_chans: int
+    n_aux_chans: int
+    n_lfp_chans: int
+    spike_fs: int
+    aux_fs: int
+    lfp_fs: int
+    n_trials: int
+
+    def n_chans(self, signal: str) -> int:
+        """Number of channels for one signal (``"spike"``, ``"aux"`` or ``"lfp"``)."""
+        return getattr(self, f"n_{signal}_chans")
+
+    def fs(self, signal: str) -> int:
+        """Sampling rate for one signal (``"spike"``, ``"aux"`` or ``"lfp"``)."""
+        return getattr(self, f"{signal}_fs")
+
+
+class EVPReader:
+    """
+    Streaming reader for EVP files.
+
+    Class Attributes
+    ----------------
+    VERSION : int
+        Supported version of the EVP format.
+    HEADER_FIELDS : Tuple[str, ...]
+        Names of the values in the main header, in the order of the file (the last ones are
+        reserved). The LFP fields follow the number of trials.
+    HEADER_SIZE : int
+        Number of ``uint32`` values in the main header.
+    SIGNALS : Tuple[str, ...]
+        Signals stored in each trial, in order.
+    INDEX_DTYPE, SAMPLE_DTYPE : np.dtype
+        Data types of the headers and of the samples.
+    OPENERS : MappingProxyType[str, Callable]
+        Functions to open the files depending on their last suffix (default: `open`).
+
+    Attributes
+    ----------
+    path : Path
+        Path to the EVP file. Files ending in ``.gz`` are decompressed on the fly.
+
+    Methods
+    -------
+    :meth:`open`
+    :meth:`read_header`
+    :meth:`iter_trials`
+    :meth:`read`
+
+    Examples
+    --------
+    Read the first auxiliary channel across all trials:
+
+    >>> reader = EVPReader("tan025b01_p_FTC.evp.gz")
+    >>> signal, trial_idx = reader.read("aux", channels=[0])
+    >>> signal.shape  # (n_samples_tot, n_channels)
+    (1250000, 1)
+    >>> trial_idx  # start index of each trial in the signal
+    array([0, 25000, 50000, ...])
+
+    Notes
+    -----
+    Equivalent MATLAB call: ``[~, ~, rA, ATrialIdx] = evpread(path, 'auxchans', 1)``, except that
+    the trial indices are 0-based here.
+    """
+
+    VERSION = 5
+    HEADER_FIELDS = (
+        "version",
+        "n_spike_chans",
+        "n_aux_chans",
+        "spike_fs",
+        "aux_fs",
+        "n_trials",
+        "n_lfp_chans",
+        "lfp_fs",
+    )
+    HEADER_SIZE = 10
+    SIGNALS = ("spike", "aux", "lfp")
+    INDEX_DTYPE = np.dtype("<u4")
+    SAMPLE_DTYPE = np.dtype("<i2")
+    OPENERS = MappingProxyType({".gz": gzip.open})
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}> Path: {self.path}"
+
+    def open(self) -> BinaryIO:
+        """Open the file in binary mode, with on-the-fly decompression if compressed."""
+        opener = self.OPENERS.get(self.path.suffix, open)
+        return opener(self.path, "rb")  # type: ignore[operator]
+
+    @classmethod
+    def read_values(cls, file: BinaryIO, n: int, dtype: np.dtype) -> np.ndarray:
+        """
+        Read a fixed number of values from the current position of the file.
+
+        Raises
+        ------
+        EOFError
+            If the file ends before the expected number of values.
+        """
+        n_bytes = n * dtype.itemsize
+        buffer = file.read(n_bytes)
+        if len(buffer) != n_bytes:
+            raise EOFError(f"[ERROR] Truncated EVP file: {len(buffer)} bytes instead of {n_bytes}")
+        return np.frombuffer(buffer, dtype=dtype)
+
+    @classmethod
+    def read_header(cls, file: BinaryIO) -> EVPHeader:
+        """
+        Read and validate the main header.
+
+        Raises
+        ------
+        ValueError
+            If the version of the file is not supported.
+        """
+        values = cls.read_values(file, cls.HEADER_SIZE, cls.INDEX_DTYPE)
+        header = EVPHeader(**{name: int(v) for name, v in zip(cls.HEADER_FIELDS, values)})
+        if header.version != cls.VERSION:
+            raise ValueError(f"[ERROR] Unsupported EVP version: {header.version} != {cls.VERSION}")
+        return header
+
+    def iter_trials(
+        self, signal: str = "aux", channels: Optional[Sequence[int]] = None
+    ) -> Generator[np.ndarray, None, None]:
+        """
+        Iterate over the trials and yield the samples of one signal.
+
+        Arguments
+        ---------
+        signal : {"spike", "aux", "lfp"}
+            Signal to extract.
+        channels : Sequence[int], optional
+            Indices of the channels to extract (0-based). Default: all channels of the signal.
+
+        Yields
+        ------
+        samples : np.ndarray
+            Samples of the selected channels in one trial. Shape: ``(n_samples, n_channels)``.
+
+        Implementation
+        --------------
+        The blocks of the other signals are skipped by seeking forward: for compressed files, they
+        are decompressed in the internal buffer of `gzip` without being converted to arrays.
+        """
+        if signal not in self.SIGNALS:
+            raise ValueError(f"[ERROR] Invalid signal: {signal} not in {self.SIGNALS}")
+        with self.open() as file:
+            header = self.read_header(file)
+            n_chans = [header.n_chans(s) for s in self.SIGNALS]
+            i_signal = self.SIGNALS.index(signal)
+            selection = list(range(n_chans[i_signal])) if channels is None else list(channels)
+            for _ in range(header.n_trials):
+                n_samples = self.read_values(file, len(self.SIGNALS), self.INDEX_DTYPE)
+                for i, (n_smpl, n_ch) in enumerate(zip(n_samples, n_chans)):
+                    n_bytes = int(n_smpl) * n_ch * self.SAMPLE_DTYPE.itemsize
+                    if i != i_signal:
+                        file.seek(n_bytes, 1)
+                        continue
+                    block = self.read_values(file, int(n_smpl) * n_ch, self.SAMPLE_DTYPE)
+                    block = block.reshape(n_ch, int(n_smpl))  # channel-major storage
+                    yield block[selection].T
+
+    def read(
+        self, signal: str = "aux", channels: Optional[Sequence[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read one signal across all trials.
+
+        Arguments
+        ---------
+        signal, channels
+            See :meth:`iter_trials`.
+
+        Returns
+        -------
+        samples : np.ndarray
+            Samples of the selected channels, concatenated across trials.
+            Shape: ``(n_samples_tot, n_channels)``.
+        trial_idx : np.ndarray
+            Index of the first sample of each trial in `samples`. Shape: ``(n_trials,)``.
+        """
+        trials: List[np.ndarray] = list(self.iter_trials(signal, channels))
+        counts = np.array([len(t) for t in trials], dtype=np.int64)
+        trial_idx = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+        if not trials:
+            n_channels = 0 if channels is None else len(channels)
+            return np.zeros((0, n_channels), dtype=self.SAMPLE_DTYPE), trial_idx[:0]
+        return np.concatenate(trials, axis=0), trial_idx
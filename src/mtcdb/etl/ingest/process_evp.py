@@ -1,33 +1,169 @@
+"""
+:mod:`etl.ingest.process_evp` [module]
+
+Convert the auxiliary signals of baphy's EVP files to CSV or NPY files, for a whole directory of
+recordings.
+
+Arguments
+---------
+--input-dir : str
+    Directory containing the EVP files (``.evp`` or ``.evp.gz``), searched recursively.
+--output-dir : str
+    Directory where the converted files are written (same relative structure as the inputs).
+--format : {"npy", "csv"}
+    Output format. Default: "npy".
+--channels : int
+    Indices of the auxiliary channels to extract (0-based). Default: 0.
+--workers : int
+    Number of worker processes. Default: number of CPUs.
+
+Usage
+-----
+.. code-block:: bash
+
+    python process_evp.py --input-dir /data/MDdata --output-dir /data/raw/aux --workers 8
+
+Notes
+-----
+Outputs for a recording ``{name}.evp.gz``:
+
+- Format "npy": ``{name}.npy`` (samples, shape ``(n_samples_tot, n_channels)``) and
+  ``{name}_trial_idx.npy`` (start index of each trial).
+- Format "csv": ``{name}.csv`` with one column per channel (``rA1``, ``rA2``...) and one column
+  ``trial`` with the trial number of each sample (1-based, as in baphy).
+
+See Also
+--------
+:class:`etl.ingest.evp_reader.EVPReader`
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import os
-import subprocess
-import gzip
-import shutil
-import matlab.engine
+from pathlib import Path
+from typing import List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from etl.ingest.evp_reader import EVPReader
+from utils.io_data.savers import SaverCSVDataFrame, SaverNPY
+
+
+EVP_PATTERNS = ("*.evp", "*.evp.gz")
+"""Glob patterns of the EVP files to convert."""
+
+
+def get_stem(path: Path) -> str:
+    """Name of the recording, without the EVP extensions (e.g. ``tan025b01_p_FTC``)."""
+    name = path.name
+    for ext in (".gz", ".evp"):
+        name = name.removesuffix(ext)
+    return name
+
+
+def convert_file(
+    path: Union[str, Path],
+    output_dir: Union[str, Path],
+    fmt: str = "npy",
+    channels: Sequence[int] = (0,),
+) -> Path:
+    """
+    Convert the auxiliary signals of one EVP file.
+
+    Arguments
+    ---------
+    path : str or Path
+        Path to the EVP file.
+    output_dir : str or Path
+        Directory where the converted file is written.
+    fmt : {"npy", "csv"}
+        Output format.
+    channels : Sequence[int]
+        Indices of the auxiliary channels to extract (0-based).
+
+    Returns
+    -------
+    path_out : Path
+        Path of the main output file.
+    """
+    path = Path(path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    samples, trial_idx = EVPReader(path).read("aux", channels=channels)
+    path_out = output_dir / get_stem(path)
+    if fmt == "npy":
+        SaverNPY(path_out).save(samples)
+        SaverNPY(output_dir / f"{get_stem(path)}_trial_idx").save(trial_idx)
+    elif fmt == "csv":
+        trial = np.repeat(np.arange(1, len(trial_idx) + 1), np.diff(np.r_[trial_idx, len(samples)]))
+        table = pd.DataFrame(samples, columns=[f"rA{c + 1}" for c in channels])
+        table["trial"] = trial
+        SaverCSVDataFrame(path_out).save(table)
+    else:
+        raise ValueError(f"[ERROR] Invalid format: {fmt} ('npy'/'csv')")
+    return path_out.with_suffix(f".{fmt}")
+
+
+def find_files(input_dir: Union[str, Path]) -> List[Path]:
+    """Find the EVP files in a directory (recursively), in sorted order."""
+    input_dir = Path(input_dir)
+    return sorted({p for pattern in EVP_PATTERNS for p in input_dir.rglob(pattern)})
 
 
-# Step 2: Start MATLAB and set the path
-eng = matlab.engine.start_matlab()
-eng.cd(clone_dir, nargout=0)
-eng.baphy_set_path(nargout=0)
+def process_directory(
+    input_dir: Union[str, Path],
+    output_dir: Union[str, Path],
+    fmt: str = "npy",
+    channels: Sequence[int] = (0,),
+    n_workers: int | None = None,
+) -> List[Path]:
+    """
+    Convert all the EVP files in a directory, in a pool of worker processes.
 
-# Step 3: Unzip the .evp.gz file
-evp_gz_path = "/mnt/working2/esther/data4/MDdata/tan025b/tan025b01_p_FTC.evp.gz"
-evp_path = evp_gz_path[:-3]
+    Arguments
+    ---------
+    input_dir, output_dir : str or Path
+        Directories of the input and output files. The relative structure of the input directory is
+        reproduced in the output directory.
+    fmt, channels
+        See :func:`convert_file`.
+    n_workers : int, optional
+        Number of worker processes. Default: number of CPUs. If 1, files are converted serially.
 
-with gzip.open(evp_gz_path, 'rb') as f_in:
-    with open(evp_path, 'wb') as f_out:
-        shutil.copyfileobj(f_in, f_out)
+    Returns
+    -------
+    paths_out : List[Path]
+        Paths of the converted files, in the order of the input files.
+    """
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    paths = find_files(input_dir)
+    print(f"[INFO] Convert {len(paths)} EVP files from {input_dir} to {output_dir}")
+    dirs_out = [output_dir / p.parent.relative_to(input_dir) for p in paths]
+    args = (paths, dirs_out, repeat(fmt), repeat(tuple(channels)))
+    n_workers = min(n_workers or os.cpu_count() or 1, max(len(paths), 1))
+    if n_workers <= 1:
+        paths_out = list(map(convert_file, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            paths_out = list(executor.map(convert_file, *args))
+    print(f"[SUCCESS] Converted {len(paths_out)} files")
+    return paths_out
 
-# Step 4: Call MATLAB script to process the data
-output_csv_path = evp_path.replace(".evp", ".csv")
-eng.process_evp(evp_path, output_csv_path, nargout=0)
 
-# Step 5: Call MATLAB script to process the data
-output_csv_path = evp_path.replace(".evp", ".csv")
-eng.process_evp(evp_path, output_csv_path, nargout=0)
+def main():
+    """Execute the conversion of a directory of EVP files."""
+    parser = argparse.ArgumentParser(description="Convert baphy EVP files to CSV or NPY files.")
+    parser.add_argument("--input-dir", type=str, required=True, help="Directory of EVP files.")
+    parser.add_argument("--output-dir", type=str, required=True, help="Output directory.")
+    parser.add_argument("--format", type=str, choices=["npy", "csv"], default="npy")
+    parser.add_argument(
+        "--channels", type=int, nargs="+", default=[0], help="Auxiliary channels (0-based)."
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    args = parser.parse_args()
+    process_directory(args.input_dir, args.output_dir, args.format, args.channels, args.workers)
 
-# Step 6: Remove the locally unzipped file
-print(f"Removing {evp_path}")
-os.remove(evp_path)
 
-print(f"CSV file saved to {output_csv_path}")
+if __name__ == "__main__":
+    main()
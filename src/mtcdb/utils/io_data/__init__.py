@@ -58,3 +58,36 @@ See Also
     requiring conversion to strings (e.g. :func:`open`, :func:`np.savetxt`, :func:`pd.to_csv`)
     The library `pathlib` also handles differences between operating systems (POSIX, WindowsPath).
 """
+from utils.misc.lazy import lazy_exports
+
+# Loaders and savers are exported lazily: their modules are only imported at the first access.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "utils.io_data.base_io": ("FileExt", "IOHandler"),
+        "utils.io_data.base_loader": ("Loader",),
+        "utils.io_data.base_saver": ("Saver",),
+        "utils.io_data.loaders": (
+            "LoaderPKL",
+            "LoaderDILL",
+            "LoaderNPY",
+            "LoaderNPZ",
+            "LoaderCSVtoList",
+            "LoaderCSVtoArray",
+            "LoaderCSVtoArrayFloat",
+            "LoaderCSVtoArrayInt",
+            "LoaderCSVtoArrayStr",
+            "LoaderCSVtoDataFrame",
+            "LoaderYAML",
+        ),
+        "utils.io_data.savers": (
+            "SaverPKL",
+            "SaverDILL",
+            "SaverNPY",
+            "SaverNPZ",
+            "SaverCSVList",
+            "SaverCSVArray",
+            "SaverCSVDataFrame",
+        ),
+    },
+)
@@ -22,7 +22,7 @@ class FileExt(str):
     Class Attributes
     ----------------
     OPTIONS : FrozenSet[str]
-        Valid extension values (strings).
+        Valid extension values (strings, including the leading period).
 
     Methods
     -------
@@ -30,7 +30,7 @@ class FileExt(str):
     `add_period`
     """
 
-    OPTIONS = frozenset({"csv", "npy", "pkl", "yml"})
+    OPTIONS = frozenset({".csv", ".npy", ".npz", ".pkl", ".yml"})
 
     def __new__(cls, ext: str) -> Self:
         ext = cls.add_period(ext)
@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Union, Any
 
 from utils.io_data.base_io import IOHandler
+from utils.misc.tracing import TRACER
 
 
 class Loader(IOHandler):
@@ -58,8 +59,8 @@ class Loader(IOHandler):
 
     def __init__(self, path: Union[str, Path]) -> None:
         super().__init__(path)  # call the constructor of IOHandler
-        if not self.server.is_file(path):
-            raise FileNotFoundError(f"Inexistent path: {path}")
+        if not self.server.is_file(self.path):
+            raise FileNotFoundError(f"Inexistent path: {self.path}")
 
     def load(self) -> Any:
         """
@@ -75,6 +76,11 @@ class Loader(IOHandler):
         Exception
             If the loading process fails.
 
+        Notes
+        -----
+        When the tracer is enabled, the size of the file is reported as read in the current span
+        (see `utils.misc.tracing`).
+
         See Also
         --------
         `utils.path_system.manage_local.LocalServer.is_file`
@@ -85,6 +91,8 @@ class Loader(IOHandler):
         except Exception as exc:
             print(f"'{self.__class__.__name__}' failed for path '{self.path}' ")
             raise exc
+        if TRACER.enabled:
+            TRACER.add_io(read=self.path.stat().st_size)
         return data
 
     @abstractmethod
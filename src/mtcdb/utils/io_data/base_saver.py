@@ -39,6 +39,7 @@ from pathlib import Path
 from typing import Any, Union
 
 from utils.io_data.base_io import IOHandler
+from utils.misc.tracing import TRACER
 
 
 class Saver(IOHandler):
@@ -92,12 +93,16 @@ class Saver(IOHandler):
         --------
         `utils.path_system.manage_local.LocalServer.check_parent`
             Check the existence of the parent directory.
+        `utils.misc.tracing.Tracer.add_io`
+            Report the size of the saved file when the tracer is enabled.
         """
         try:
             self._save(data)
         except Exception as exc:
             print(f"'{self.__class__.__name__}' failed for path '{self.path}' ")
             raise exc
+        if TRACER.enabled and self.path.is_file():
+            TRACER.add_io(written=self.path.stat().st_size)
 
     @abstractmethod
     def _save(self, data: Any) -> None:
@@ -10,6 +10,7 @@ Classes
 `LoaderPKL`
 `LoaderDILL`
 `LoaderNPY`
+`LoaderNPZ`
 `LoaderCSVtoList`
 `LoaderCSVtoArray`
 `LoaderCSVtoArrayFloat`
@@ -27,18 +28,28 @@ Implementation
 --------------
 Each Loader subclass implements the abstract method `_load` to load data from a specific file format
 to a specific target type.
+
+Heavy dependencies (`pandas`, `dill`, `yaml`) are imported in the `_load` methods which need them,
+so that importing this module (e.g. only to load NPY files) does not pay for them.
 """
+import mmap
+from pathlib import Path
 import pickle
-from typing import Any, Union, List, Dict
+from typing import Any, Optional, Union, List, Dict, TYPE_CHECKING
 
 import csv
-import dill
 import numpy as np
-import pandas as pd
-import yaml
 
 from utils.io_data.base_io import FileExt
 from utils.io_data.base_loader import Loader
+from utils.io_data.sidecar import SidecarCache, HAS_PYARROW
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+CSV_ENGINE = "pyarrow" if HAS_PYARROW else "c"
+"""Parser used by `pandas.read_csv`: multi-threaded Arrow parser if available, else C parser."""
 
 
 class LoaderPKL(Loader):
@@ -73,6 +84,8 @@ class LoaderDILL(Loader):
 
     def _load(self) -> Any:
         """Implement the abstract method of the `Loader` base class."""
+        import dill  # pylint: disable=import-outside-toplevel
+
         with self.path.open("rb") as file:
             return dill.load(file)
 
@@ -93,6 +106,23 @@ class LoaderNPY(Loader):
         return np.load(self.path)
 
 
+class LoaderNPZ(Loader):
+    """
+    Load named numpy arrays from a NPZ file to a dictionary.
+
+    See Also
+    --------
+    `numpy.load`
+    """
+
+    EXT = FileExt("npz")
+
+    def _load(self) -> Dict[str, np.ndarray]:
+        """Implement the abstract method of the `Loader` base class."""
+        with np.load(self.path) as archive:
+            return {name: archive[name] for name in archive.files}
+
+
 class LoaderCSVtoList(Loader):
     """
     Load data from a CSV file to a list of lists.
@@ -118,9 +148,16 @@ class LoaderCSVtoArray(Loader):
     Class Attributes
     ----------------
     DTYPE : str, default="float"
-        Data type of the array contents, passed as argument in the loader function `numpy.loadtxt`.
+        Data type of the array contents, passed as argument to the CSV parser.
         Valid values: `int`, `float`, `str`, `complex`, `bool`, `object`.
 
+    Attributes
+    ----------
+    cache : bool, default=True
+        Whether to store the parsed content in a binary sidecar and serve subsequent loads from it.
+    cache_dir : Path, optional
+        Directory where the sidecar is stored. Default: directory of the CSV file.
+
     Notes
     -----
     This class is refined by three subclasses to specify the data type of the array contents:
@@ -131,6 +168,10 @@ class LoaderCSVtoArray(Loader):
 
     Those subclasses only redefine the attribute :attr:`DTYPE` to specify the data type.
 
+    The first load parses the CSV file and writes a `.npy` sidecar keyed by the path, modification
+    time and size of the CSV file (and the data type). Subsequent loads memory-map the sidecar
+    (copy-on-write), until the CSV file is modified.
+
     Warning
     -------
     If the data type is not specified, the default type is ``float``.
@@ -142,30 +183,95 @@ class LoaderCSVtoArray(Loader):
 
     See Also
     --------
-    `csv.reader`
+    `utils.io_data.sidecar.SidecarCache`
     """
 
     EXT = FileExt("csv")
     DTYPE = "float"
 
+    def __init__(
+        self,
+        path: Union[str, Path],
+        cache: bool = True,
+        cache_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        super().__init__(path)
+        self.cache = cache
+        self.cache_dir = cache_dir
+
     def _load(self) -> np.ndarray:
-        """Load a CSV file into a numpy array.
+        """
+        Load a CSV file into a numpy array, via its sidecar if available.
+
+        See Also
+        --------
+        `SidecarCache.load`, `SidecarCache.store`
+        """
+        if not self.cache:
+            return self.parse()
+        sidecar = SidecarCache(self.path, ext=".npy", tag=self.DTYPE, cache_dir=self.cache_dir)
+        data = sidecar.load()
+        if data is None:
+            data = self.parse()
+            sidecar.store(data)
+        return data
+
+    def parse(self) -> np.ndarray:
+        """
+        Parse the CSV file into a numpy array.
 
         Warning
         -------
-        The attribute `tpe` should specify the precise *data type* of the array contents:
+        The attribute `DTYPE` should specify the precise *data type* of the array contents:
 
         - For float data : np.ndarray[np.float64]
         - For integer data : np.ndarray[np.int64]
         - For string data : np.ndarray[np.str_]
 
+        Notes
+        -----
+        The output matches the one of `numpy.loadtxt(file, delimiter=",", dtype=DTYPE)`: axes of
+        length one are squeezed, string fields are kept verbatim (empty fields included), text
+        after ``#`` is ignored, and an empty file (or containing only comments) gives an empty
+        array.
+
         See Also
         --------
-        `numpy.loadtxt(file, delimiter, dtype)`
-            Load data from a text file. It is used instead of the `csv` module for efficiency: it
-            loads the CSV file at once, while the `csv` module reads the file line by line.
+        `pandas.read_csv`
+            Parse the file in blocks, with several threads if the `pyarrow` engine is available
+            (see :data:`CSV_ENGINE`). It replaces `numpy.loadtxt`, which parses line by line in a
+            single thread. The `pyarrow` engine does not support comments: files containing ``#``
+            are parsed by the C engine.
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        if self.path.stat().st_size == 0:
+            return np.empty(0, dtype=self.DTYPE)
+        options: Dict[str, Any] = {"header": None, "engine": CSV_ENGINE}
+        if self.has_comments():
+            options.update(engine="c", comment="#")
+        if self.DTYPE == "str":
+            # `keep_default_na=False`: without it, the pyarrow engine returns "nan" for empty fields
+            options.update(dtype=str, na_filter=False, keep_default_na=False)
+        else:
+            options.update(dtype=self.DTYPE)
+        try:
+            df = pd.read_csv(self.path, **options)
+        except pd.errors.EmptyDataError:  # only comments or blank lines
+            return np.empty(0, dtype=self.DTYPE)
+        return np.squeeze(df.to_numpy(dtype=self.DTYPE))
+
+    def has_comments(self) -> bool:
         """
-        return np.loadtxt(self.path, delimiter=",", dtype=self.DTYPE)
+        Check whether the CSV file contains the comment character ``#``.
+
+        Implementation
+        --------------
+        The file is memory-mapped and searched as raw bytes, which is much faster than parsing it.
+        """
+        with open(self.path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return content.find(b"#") != -1
 
 
 class LoaderCSVtoArrayFloat(LoaderCSVtoArray):
@@ -190,16 +296,53 @@ class LoaderCSVtoDataFrame(Loader):
     """
     Load data from a CSV file to a pandas DataFrame.
 
+    Attributes
+    ----------
+    cache : bool, default=True
+        Whether to store the parsed content in a binary sidecar and serve subsequent loads from it.
+    cache_dir : Path, optional
+        Directory where the sidecar is stored. Default: directory of the CSV file.
+
+    Notes
+    -----
+    The sidecar is stored in the Feather format (memory-mapped at loading) if `pyarrow` is
+    available, otherwise in the Pickle format.
+
     See Also
     --------
     `pandas.read_csv`
+    `utils.io_data.sidecar.SidecarCache`
     """
 
     EXT = FileExt("csv")
 
-    def _load(self) -> pd.DataFrame:
+    def __init__(
+        self,
+        path: Union[str, Path],
+        cache: bool = True,
+        cache_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        super().__init__(path)
+        self.cache = cache
+        self.cache_dir = cache_dir
+
+    def _load(self) -> "pd.DataFrame":
         """Implement the abstract method of the `Loader` base class."""
-        return pd.read_csv(self.path)
+        if not self.cache:
+            return self.parse()
+        ext = ".feather" if HAS_PYARROW else ".pkl"
+        sidecar = SidecarCache(self.path, ext=ext, cache_dir=self.cache_dir)
+        data = sidecar.load()
+        if data is None:
+            data = self.parse()
+            sidecar.store(data)
+        return data
+
+    def parse(self) -> "pd.DataFrame":
+        """Parse the CSV file with the fastest available engine (see :data:`CSV_ENGINE`)."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        return pd.read_csv(self.path, engine=CSV_ENGINE)
 
 
 class LoaderYAML(Loader):
@@ -278,5 +421,7 @@ class LoaderYAML(Loader):
 
     def _load(self) -> Union[Dict, List]:
         """Implement the abstract method of the `Loader` base class."""
+        import yaml  # pylint: disable=import-outside-toplevel
+
         with self.path.open("r", encoding="utf-8") as file:
             return yaml.safe_load(file)
@@ -10,6 +10,7 @@ Classes
 `SaverPKL`
 `SaverDILL`
 `SaverNPY`
+`SaverNPZ`
 `SaverCSVList`
 `SaverCSVArray`
 `SaverCSVDataFrame`
@@ -22,16 +23,17 @@ See Also
 """
 
 import pickle
-from typing import Any, List
+from typing import Any, List, Mapping, TYPE_CHECKING
 
 import csv
-import dill
 import numpy as np
-import pandas as pd
 
 from utils.io_data.base_io import FileExt
 from utils.io_data.base_saver import Saver
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class SaverPKL(Saver):
     """
@@ -75,6 +77,8 @@ class SaverDILL(Saver):
 
     def _save(self, data: Any) -> None:
         """Implement the abstract method of the `Loader` base class."""
+        import dill  # pylint: disable=import-outside-toplevel
+
         with self.path.open("wb") as file:
             dill.dump(data, file)
 
@@ -95,6 +99,22 @@ class SaverNPY(Saver):
         np.save(self.path, data)
 
 
+class SaverNPZ(Saver):
+    """
+    Save several named numpy arrays in the NPZ format (uncompressed archive).
+
+    See Also
+    --------
+    `numpy.savez`
+    """
+
+    EXT = FileExt("npz")
+
+    def _save(self, data: Mapping[str, np.ndarray]) -> None:
+        """Implement the abstract method of the `Saver` base class."""
+        np.savez(self.path, **data)
+
+
 class SaverCSVList(Saver):
     """
     Save a list of lists to a CSV file.
@@ -179,5 +199,5 @@ class SaverCSVDataFrame(Saver):
     EXT = FileExt("csv")
     SAVE_INDEX = False
 
-    def _save(self, data: pd.DataFrame) -> None:
+    def _save(self, data: "pd.DataFrame") -> None:
         data.to_csv(self.path, index=self.SAVE_INDEX)
@@ -0,0 +1,221 @@
+"""
+`utils.io_data.sidecar` [module]
+
+Binary sidecar cache for raw CSV files.
+
+Classes
+-------
+`SidecarCache`
+
+Notes
+-----
+Parsing large CSV files (spike times, events) is the slowest step when starting a fresh analysis
+session, although the same raw files are parsed again and again. After a first parse, the content
+is stored in a binary *sidecar* file next to the source, and subsequent loads are served from it by
+memory mapping.
+
+The sidecar is identified by a *fingerprint* of the source file (resolved path, modification time
+and size) and of the parsing options (e.g. data type). Any modification of the source file changes
+its fingerprint, so that stale sidecars are never used and are removed at the next store.
+
+See Also
+--------
+`utils.io_data.loaders.LoaderCSVtoArray`: Loader which uses `.npy` sidecars.
+`utils.io_data.loaders.LoaderCSVtoDataFrame`: Loader which uses `.feather` (or `.pkl`) sidecars.
+"""
+
+import hashlib
+from importlib.util import find_spec
+import os
+from pathlib import Path
+import tempfile
+from typing import Optional, Union, Callable, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+HAS_PYARROW = find_spec("pyarrow") is not None
+"""Whether the optional dependency `pyarrow` is available: fast CSV parsing and memory-mapped
+DataFrames. It is looked up without being imported, since it is only used through `pandas`."""
+
+
+class SidecarCache:
+    """
+    Binary cache of the parsed content of a source file.
+
+    Class Attributes
+    ----------------
+    PREFIX : str
+        Prefix of the sidecar file names, which hides them in the directory listings.
+    SEP : str
+        Separator between the source file name and the fingerprint in the sidecar file names.
+
+    Attributes
+    ----------
+    source : Path
+        Path to the source file (e.g. raw CSV file).
+    ext : str
+        Extension of the sidecar file, including the leading period. It determines the binary format
+        of the sidecar (options: ``".npy"`` for numpy arrays, ``".feather"`` or ``".pkl"`` for
+        pandas DataFrames).
+    tag : str
+        Additional identifier of the parsing options, included in the fingerprint.
+    cache_dir : Path
+        Directory where the sidecar is stored. Default: directory of the source file.
+
+    Methods
+    -------
+    `stem` (property)
+    `fingerprint`
+    `get_path`
+    `load`
+    `store`
+    `clear`
+
+    Examples
+    --------
+    Load an array from a CSV file, with caching:
+
+    >>> cache = SidecarCache("path/to/data.csv", ext=".npy", tag="float")
+    >>> data = cache.load()
+    >>> if data is None:
+    ...     data = np.loadtxt("path/to/data.csv", delimiter=",")
+    ...     cache.store(data)
+
+    Notes
+    -----
+    Failures to write the sidecar (e.g. read-only raw data directory) are not fatal: a warning is
+    printed and the data is simply not cached.
+
+    Implementation
+    --------------
+    - Sidecars are written in a temporary file first, then moved atomically to their final path.
+      Thereby, concurrent readers never observe partially written sidecars.
+    - Arrays are loaded with ``mmap_mode="c"`` (copy-on-write): the data is paged from disk on
+      demand and can be modified in memory without altering the sidecar.
+    - DataFrames are stored in the Feather format (Arrow IPC) and loaded with memory mapping if
+      `pyarrow` is available, otherwise in the Pickle format.
+    """
+
+    PREFIX = "."
+    SEP = ".cache-"
+
+    def __init__(
+        self,
+        source: Union[str, Path],
+        ext: str,
+        tag: str = "",
+        cache_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.source = Path(source)
+        self.ext = ext
+        self.tag = tag
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else self.source.parent
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}> Source: {self.source}, Sidecar: {self.get_path()}"
+
+    @property
+    def stem(self) -> str:
+        """Common part of the names of all the sidecars of the source with the same tag."""
+        tag = f".{self.tag}" if self.tag else ""
+        return f"{self.PREFIX}{self.source.name}{tag}{self.SEP}"
+
+    def fingerprint(self) -> str:
+        """
+        Compute the fingerprint of the source file and parsing options.
+
+        Returns
+        -------
+        key : str
+            Hexadecimal digest of the resolved path, modification time (ns), size (bytes) of the
+            source file and the tag.
+        """
+        stat = self.source.stat()
+        raw = f"{self.source.resolve()}|{stat.st_mtime_ns}|{stat.st_size}|{self.tag}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def get_path(self) -> Path:
+        """Get the path of the sidecar matching the current state of the source file."""
+        return self.cache_dir / f"{self.stem}{self.fingerprint()}{self.ext}"
+
+    def load(self) -> Union[np.ndarray, "pd.DataFrame", None]:
+        """
+        Load the cached content if a valid sidecar exists.
+
+        Returns
+        -------
+        data : np.ndarray | pd.DataFrame | None
+            Content of the sidecar, or None if the sidecar is missing, stale or unreadable.
+        """
+        path = self.get_path()
+        if not path.is_file():
+            return None
+        try:
+            if self.ext == ".npy":
+                return np.load(path, mmap_mode="c", allow_pickle=False)
+            import pandas as pd  # pylint: disable=import-outside-toplevel
+
+            if self.ext == ".feather":
+                return pd.read_feather(path, memory_map=True)
+            return pd.read_pickle(path)
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"[WARNING] Invalid sidecar ignored: {path} ({exc})")
+            return None
+
+    def store(self, data: Union[np.ndarray, "pd.DataFrame"]) -> Optional[Path]:
+        """
+        Store content in a new sidecar and remove the stale sidecars of the same source.
+
+        Arguments
+        ---------
+        data : np.ndarray | pd.DataFrame
+            Parsed content of the source file.
+
+        Returns
+        -------
+        path : Path | None
+            Path to the sidecar, or None if it could not be written.
+        """
+        path = self.get_path()
+        writer: Callable[[str], None]
+        if self.ext == ".npy":
+            writer = lambda tmp: np.save(tmp, np.asarray(data), allow_pickle=False)
+        elif self.ext == ".feather":
+            writer = lambda tmp: data.to_feather(tmp)  # type: ignore[union-attr]
+        else:
+            writer = lambda tmp: data.to_pickle(tmp)  # type: ignore[union-attr]
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=self.ext)
+            os.close(fd)
+            try:
+                writer(tmp)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"[WARNING] Sidecar not written: {path} ({exc})")
+            return None
+        self.clear(keep=path)
+        return path
+
+    def clear(self, keep: Optional[Path] = None) -> None:
+        """
+        Remove the sidecars of the source file.
+
+        Arguments
+        ---------
+        keep : Path, optional
+            Sidecar to preserve (typically, the one matching the current state of the source).
+        """
+        for path in self.cache_dir.glob(f"{self.stem}*{self.ext}"):
+            if keep is not None and path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -7,6 +7,9 @@ Modules
 -------
 :mod:`sequences`
 :mod:`functions`
+:mod:`tracing`
+:mod:`lazy`
+:mod:`shared_arrays`
 
 See Also
 --------
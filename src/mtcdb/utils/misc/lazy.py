@@ -0,0 +1,69 @@
+"""
+:mod:`utils.misc.lazy` [module]
+
+Deferred imports of the public objects of a package (PEP 562).
+
+Functions
+---------
+:func:`lazy_exports`
+
+Notes
+-----
+Worker processes often import a single module of a package. Re-exporting objects in the
+``__init__.py`` of a package with ordinary imports would load all the modules which define them
+(and their heavy dependencies, e.g. `pandas`, `scipy`) at the first import of the package. Instead,
+the module ``__getattr__`` hook (PEP 562) imports the defining module at the first access to one of
+the exported names, and caches the object in the package namespace so that subsequent accesses are
+ordinary attribute lookups.
+
+Examples
+--------
+In the ``__init__.py`` of a package:
+
+>>> __getattr__, __dir__ = lazy_exports(__name__, {"utils.io_data.savers": ("SaverNPY",)})
+
+Then, in client code, the module `savers` is only imported here:
+
+>>> from utils.io_data import SaverNPY
+
+See Also
+--------
+`PEP 562 <https://peps.python.org/pep-0562/>`_: Module ``__getattr__`` and ``__dir__``.
+"""
+from importlib import import_module
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, Tuple[str, ...]]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build the module-level ``__getattr__`` and ``__dir__`` functions of a package.
+
+    Arguments
+    ---------
+    package : str
+        Name of the package (``__name__`` in its ``__init__.py``).
+    exports : Dict[str, Tuple[str, ...]]
+        Names of the exported objects, by absolute name of their defining module.
+
+    Returns
+    -------
+    getattr_func, dir_func : Callable
+        Functions to assign to ``__getattr__`` and ``__dir__`` in the namespace of the package.
+    """
+    origins = {name: module for module, names in exports.items() for name in names}
+
+    def getattr_func(name: str) -> Any:
+        module = origins.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module), name)
+        setattr(sys.modules[package], name, value)  # cache: next accesses bypass `__getattr__`
+        return value
+
+    def dir_func() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(origins))
+
+    return getattr_func, dir_func
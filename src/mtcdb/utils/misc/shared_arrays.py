@@ -0,0 +1,456 @@
+"""
+:mod:`utils.misc.shared_arrays` [module]
+
+Distribution of read-only arrays and data structures to worker processes via shared memory.
+
+Classes
+-------
+:class:`ArrayHandle`
+:class:`StructureHandle`
+:class:`SharedRegistry`
+
+Functions
+---------
+:func:`attach`
+:func:`detach_all`
+:func:`sweep_stale`
+
+Notes
+-----
+Passing a data structure (e.g. `SpikeTrains`, `TrialsProperties`) to the tasks of a process pool
+pickles its arrays into each task. Instead, the parent process places the arrays once in shared
+memory segments (`multiprocessing.shared_memory`), and sends to the workers lightweight handles
+(segment name, offset, shape, dtype and component metadata). In the workers, a handle rebuilds a
+view over the mapped segment without copying: the cost of broadcasting is the mapping of pages,
+which are only loaded on access and shared by all the processes.
+
+Memory layout: Several arrays can be packed in a single segment (e.g. the spikes of all the units
+and their coordinates), each at an offset aligned on `ALIGNMENT` bytes. This limits the number of
+file descriptors and mappings in each worker.
+
+Lifecycle:
+
+- The registry (parent process) owns the segments. They are unlinked when the registry is closed,
+  when it is garbage-collected, or at the exit of the interpreter.
+- If the parent process is killed, the segments it created are unlinked by the resource tracker
+  of `multiprocessing`. Segments left by a crash of the tracker itself can be removed with
+  `sweep_stale`, since their names contain the PID of the process which created them.
+- Workers attach to each segment once (cached by name) and do not register it in the resource
+  tracker, so that the exit of a worker never unlinks a segment still used by the others.
+- Shared views are read-only: workers must copy the arrays they modify.
+
+Examples
+--------
+>>> with SharedRegistry() as registry:
+...     handles = registry.share_structures("spikes", spike_trains)  # one segment for all units
+...     with ProcessPoolExecutor() as pool:
+...         results = list(pool.map(analyze, handles))
+
+In the worker:
+
+>>> def analyze(handle):
+...     spike_train = handle.open()  # `SpikeTrains` whose components are views on shared memory
+
+See Also
+--------
+`multiprocessing.shared_memory.SharedMemory`
+"""
+from dataclasses import dataclass, field
+import inspect
+from itertools import count
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import os
+from pathlib import Path
+import sys
+import threading
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+import weakref
+
+import numpy as np
+
+PREFIX = "mtcdb"
+"""Prefix of the names of the segments created by the registries."""
+
+ALIGNMENT = 64
+"""Alignment (in bytes) of the arrays packed in a segment (cache line size)."""
+
+SHM_DIR = Path("/dev/shm")
+"""Directory in which the segments appear as files (Linux)."""
+
+
+@dataclass(frozen=True)
+class ArrayHandle:
+    """
+    Picklable reference to an array stored in a shared memory segment.
+
+    Attributes
+    ----------
+    segment : str
+        Name of the shared memory segment.
+    offset : int
+        Position of the first byte of the array in the segment.
+    shape : Tuple[int, ...]
+        Shape of the array.
+    dtype : np.dtype
+        Data type of the array (structured types are supported, object types are not).
+    component : type
+        Class of the original array, used to rebuild it (`np.ndarray` or `DataComponent` subclass).
+    dims : Any, optional
+        Dimensions of the original data component, if any.
+    metadata : Dict[str, Any]
+        Metadata attributes of the original data component (see `DataComponent.METADATA`).
+
+    Methods
+    -------
+    `open`
+    """
+
+    segment: str
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: np.dtype
+    component: type = np.ndarray
+    dims: Any = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the array (in bytes)."""
+        return int(np.prod(self.shape, dtype=np.int64)) * self.dtype.itemsize
+
+    def open(self) -> np.ndarray:
+        """
+        Rebuild the array as a read-only view on the shared segment (attached if necessary).
+
+        Returns
+        -------
+        array : np.ndarray
+            View of the original class, with the original dimensions and metadata.
+        """
+        shm = attach(self.segment)
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf, offset=self.offset)
+        array.flags.writeable = False
+        if self.component is np.ndarray:
+            return array
+        return self.component(array, dims=self.dims, **self.metadata)
+
+
+@dataclass(frozen=True)
+class StructureHandle:
+    """
+    Picklable reference to a data structure whose components are stored in shared memory.
+
+    Attributes
+    ----------
+    structure : type
+        Class of the data structure (e.g. `SpikeTrains`).
+    metadata : Dict[str, Any]
+        Arguments of the constructor of the structure other than its components (e.g. ``unit``).
+    components : Dict[str, ArrayHandle]
+        Handles of the core data (key ``data``) and of the active coordinates (by name).
+
+    Methods
+    -------
+    `open`
+    """
+
+    structure: type
+    metadata: Dict[str, Any]
+    components: Dict[str, ArrayHandle]
+
+    def open(self) -> Any:
+        """Rebuild the data structure from views on the shared segments."""
+        components = {name: handle.open() for name, handle in self.components.items()}
+        return self.structure(**self.metadata, **components)
+
+
+_COUNTER = count()
+"""Numbers of the segments created in the current process (unique names across registries)."""
+
+
+class SharedRegistry:
+    """
+    Owner of the shared memory segments distributed to worker processes.
+
+    Attributes
+    ----------
+    prefix : str
+        Prefix of the names of the segments, followed by the PID of the process and a counter.
+    segments : Dict[str, SharedMemory]
+        Segments created by the registry, by key.
+
+    Methods
+    -------
+    `share`
+    `share_arrays`
+    `share_structures`
+    `release`
+    `close`
+
+    Examples
+    --------
+    Share the trials table and check the cost in memory:
+
+    >>> registry = SharedRegistry()
+    >>> handle = registry.share("trials", trials)  # `TrialsProperties`
+    >>> registry.nbytes
+    >>> registry.close()
+    """
+
+    def __init__(self, prefix: str = PREFIX) -> None:
+        self.prefix = prefix
+        self.segments: Dict[str, SharedMemory] = {}
+        # Unlink the segments when the registry is collected or at exit (without referencing it)
+        self._finalizer = weakref.finalize(self, _release_all, self.segments)
+
+    def __enter__(self) -> "SharedRegistry":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<SharedRegistry> {len(self.segments)} segments, {self.nbytes} bytes"
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the segments (in bytes)."""
+        return sum(shm.size for shm in self.segments.values())
+
+    def share(self, key: str, obj: Any) -> Any:
+        """
+        Place an array or a data structure in its own segment.
+
+        Arguments
+        ---------
+        key : str
+            Key of the segment in the registry.
+        obj : np.ndarray | DataStructure
+            Object to share.
+
+        Returns
+        -------
+        handle : ArrayHandle | StructureHandle
+        """
+        if isinstance(obj, np.ndarray):
+            return self.share_arrays(key, {"array": obj})["array"]
+        return self.share_structures(key, [obj])[0]
+
+    def share_arrays(self, key: str, arrays: Mapping[str, np.ndarray]) -> Dict[str, ArrayHandle]:
+        """
+        Pack several arrays in a single segment.
+
+        Arguments
+        ---------
+        key : str
+            Key of the segment in the registry.
+        arrays : Mapping[str, np.ndarray]
+            Arrays to share, by name. Data components keep their class, dimensions and metadata.
+
+        Returns
+        -------
+        handles : Dict[str, ArrayHandle]
+            Handles of the arrays, by name.
+
+        Raises
+        ------
+        ValueError
+            If the key is already used in the registry.
+            If an array contains Python objects, which cannot be shared.
+        """
+        if key in self.segments:
+            raise ValueError(f"Segment '{key}' already shared.")
+        arrays = {name: np.asanyarray(array) for name, array in arrays.items()}
+        offsets, size = {}, 0
+        for name, array in arrays.items():
+            if array.dtype.hasobject:
+                raise ValueError(f"Array '{name}' with dtype {array.dtype} cannot be shared.")
+            offsets[name] = size
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT  # round up to the alignment
+        segment = f"{self.prefix}_{os.getpid()}_{next(_COUNTER)}"
+        shm = SharedMemory(name=segment, create=True, size=max(size, 1))
+        self.segments[key] = shm
+        handles = {}
+        for name, array in arrays.items():
+            target = np.ndarray(array.shape, array.dtype, buffer=shm.buf, offset=offsets[name])
+            target[...] = array  # single copy, in the parent process
+            component = type(array)
+            fields = getattr(component, "METADATA", {})
+            metadata = {attr: getattr(array, attr, None) for attr in fields}
+            handles[name] = ArrayHandle(
+                segment=shm.name,
+                offset=offsets[name],
+                shape=array.shape,
+                dtype=array.dtype,
+                component=component,
+                dims=getattr(array, "dims", None),
+                metadata=metadata,
+            )
+        return handles
+
+    def share_structures(self, key: str, structures: Sequence[Any]) -> List[StructureHandle]:
+        """
+        Pack the components of several data structures in a single segment.
+
+        Arguments
+        ---------
+        key : str
+            Key of the segment in the registry.
+        structures : Sequence[DataStructure]
+            Data structures to share (e.g. the spike trains of all the units of a population).
+
+        Returns
+        -------
+        handles : List[StructureHandle]
+            Handles of the structures, in the same order.
+
+        Notes
+        -----
+        The metadata of each structure are the arguments of its constructor which are stored under
+        the same attribute name (e.g. ``unit``, ``smpl_rate``). They are pickled with the handle,
+        and should therefore remain small.
+        """
+        arrays = {}
+        for i, structure in enumerate(structures):
+            if structure.has_data():
+                arrays[f"{i}/data"] = structure.data
+            for name, coord in structure.iter_coords():
+                arrays[f"{i}/{name}"] = coord
+        packed = self.share_arrays(key, arrays)
+        handles = []
+        for i, structure in enumerate(structures):
+            components = {
+                name.split("/", 1)[1]: handle
+                for name, handle in packed.items()
+                if name.split("/", 1)[0] == str(i)
+            }
+            handles.append(
+                StructureHandle(type(structure), self.get_metadata(structure), components)
+            )
+        return handles
+
+    @staticmethod
+    def get_metadata(structure: Any) -> Dict[str, Any]:
+        """Collect the arguments of the constructor of a structure, except its components."""
+        skip = (inspect.Parameter.VAR_KEYWORD, inspect.Parameter.VAR_POSITIONAL)
+        parameters = inspect.signature(type(structure)).parameters.values()
+        return {
+            param.name: getattr(structure, param.name)
+            for param in parameters
+            if param.kind not in skip and param.name != "data" and hasattr(structure, param.name)
+        }
+
+    def release(self, key: str) -> None:
+        """
+        Unlink one segment.
+
+        Warning
+        -------
+        Views which are still used in this process or in the workers remain valid (the memory is
+        freed when the last mapping is closed), but the segment cannot be attached anymore.
+        """
+        _release(self.segments.pop(key))
+
+    def close(self) -> None:
+        """Unlink all the segments of the registry (idempotent)."""
+        _release_all(self.segments)
+
+
+def _release(shm: SharedMemory) -> None:
+    """Unlink a segment owned by this process and close its mapping if it is not used."""
+    try:
+        shm.unlink()
+    except FileNotFoundError:  # already removed (e.g. by `sweep_stale`)
+        pass
+    try:
+        shm.close()
+    except BufferError:  # views still exported in this process: mapping closed with them
+        pass
+
+
+def _release_all(segments: Dict[str, SharedMemory]) -> None:
+    """Release all the segments of a registry and empty it."""
+    while segments:
+        _release(segments.popitem()[1])
+
+
+_ATTACHED: Dict[str, SharedMemory] = {}
+"""Segments attached in the current process, by name."""
+
+_LOCK = threading.Lock()
+
+
+def attach(name: str) -> SharedMemory:
+    """
+    Attach to an existing segment, once per process.
+
+    Implementation
+    --------------
+    Before Python 3.13, attaching to a segment registers it in the resource tracker, which unlinks
+    it when the process exits (and warns about a leak). Registration is suppressed so that only the
+    owner of the segment manages its lifetime.
+    """
+    with _LOCK:
+        shm = _ATTACHED.get(name)
+        if shm is None:
+            if sys.version_info >= (3, 13):
+                shm = SharedMemory(name=name, track=False)  # pylint: disable=unexpected-keyword-arg
+            else:
+                register = resource_tracker.register
+                resource_tracker.register = lambda *args, **kwargs: None
+                try:
+                    shm = SharedMemory(name=name)
+                finally:
+                    resource_tracker.register = register
+            _ATTACHED[name] = shm
+        return shm
+
+
+def detach_all() -> None:
+    """Close the mappings of the segments attached in this process which are no longer used."""
+    with _LOCK:
+        for name, shm in list(_ATTACHED.items()):
+            try:
+                shm.close()
+            except BufferError:  # views still alive
+                continue
+            del _ATTACHED[name]
+
+
+def sweep_stale(prefix: str = PREFIX, directory: Path = SHM_DIR) -> List[str]:
+    """
+    Unlink the segments created by processes which are no longer running.
+
+    Arguments
+    ---------
+    prefix : str, default=`PREFIX`
+        Prefix of the names of the segments to inspect.
+    directory : Path, default=`SHM_DIR`
+        Directory in which the segments appear as files. On systems without such a directory, no
+        segment is found.
+
+    Returns
+    -------
+    removed : List[str]
+        Names of the unlinked segments.
+    """
+    removed = []
+    for path in directory.glob(f"{prefix}_*_*") if directory.is_dir() else []:
+        pid = path.name[len(prefix) + 1 :].split("_")[0]
+        if not pid.isdigit() or _is_alive(int(pid)):
+            continue
+        path.unlink(missing_ok=True)
+        removed.append(path.name)
+    return removed
+
+
+def _is_alive(pid: int) -> bool:
+    """Check whether a process is running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # running under another user
+        return True
+    return True
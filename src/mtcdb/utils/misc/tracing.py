@@ -0,0 +1,441 @@
+"""
+:mod:`utils.misc.tracing` [module]
+
+Nested span tracing of the analysis runs: pipelines, graph nodes, steps, factories, builders,
+processors.
+
+Classes
+-------
+:class:`SpanRecord`
+:class:`Tracer`
+
+Functions
+---------
+:func:`traced`
+:func:`trace_run`
+:func:`get_run_dir`
+:func:`current_rss`
+:func:`summarize`
+:func:`format_summary`
+
+Notes
+-----
+Each traced call opens a span, nested in the span of its caller (one stack per thread). The tasks
+of a `TaskGraph` run in a thread pool are nested in the span which submitted them. Spans measure,
+inclusively of their nested spans:
+
+- wall time (``time.perf_counter``),
+- CPU time of the process (``time.process_time``),
+- variation of the resident set size (RSS) of the process between the start and the end,
+- bytes read and written through the `Loader` and `Saver` classes (reported by `add_io`).
+
+Instrumentation points:
+
+- `Pipeline.execute`, `Step.execute`, `Factory.create`, `Builder.build`: wrapped by `traced` at
+  the creation of each subclass (in the ``__init_subclass__`` method of the base classes).
+- `Processor.process`: wrapped by `core.processors.profiling.instrument`.
+- `Node.call`: each task of a `core.pipelines.task_graph.TaskGraph`, which calls the factories and
+  processors of the pipeline.
+- `Loader.load`, `Saver.save`: report the size of the file on disk.
+
+When the tracer is disabled (default), each wrapper only checks one flag before calling the
+original method.
+
+Examples
+--------
+Trace a pipeline run and save the trace in the run directory:
+
+>>> with trace_run() as tracer:
+...     pipeline.execute(inputs)
+>>> print(format_summary(tracer.summary()))
+
+See Also
+--------
+:mod:`core.processors.profiling`: Finer per-processor statistics (percentiles, array sizes).
+"""
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import wraps
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Union
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+SPAN_KINDS = ("pipeline", "node", "step", "factory", "builder", "processor")
+"""Kinds of spans, from the outermost to the innermost level of the analysis."""
+
+MEASURES = ("cpu_s", "rss_delta", "bytes_read", "bytes_written")
+"""Measures of each span exported as arguments of the trace events (besides the wall time)."""
+
+DEFAULT_RUN_DIR = Path("outputs")
+"""Run directory used outside of a Hydra application (same as ``hydra.run.dir``)."""
+
+
+@dataclass
+class SpanRecord:
+    """
+    Measures of one completed span.
+
+    Attributes
+    ----------
+    id : int
+        Identifier of the span, unique within a trace.
+    parent : int
+        Identifier of the enclosing span (-1 for root spans).
+    kind : str
+        Level of the traced object (see `SPAN_KINDS`).
+    name : str
+        Name of the traced class.
+    start : float
+        Start time (``time.perf_counter``, in seconds).
+    wall_s, cpu_s : float
+        Wall and CPU times (in seconds).
+    rss_delta : int
+        Variation of the resident set size (in bytes).
+    bytes_read, bytes_written : int
+        Bytes read and written in the span and its nested spans.
+    thread : int
+        Identifier of the thread which executed the span.
+    """
+
+    id: int
+    parent: int
+    kind: str
+    name: str
+    start: float
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rss_delta: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    thread: int = 0
+
+
+class Tracer:
+    """
+    Collector of nested spans.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether the spans are recorded.
+    spans : List[SpanRecord]
+        Completed spans, in order of completion.
+    path : Path, optional
+        Path of the last saved trace.
+
+    Methods
+    -------
+    `enable`
+    `disable`
+    `reset`
+    `current`
+    `span`
+    `add_io`
+    `summary`
+    `save`
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.spans: List[SpanRecord] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()  # stack of the open spans of the current thread
+        self._next_id = 0
+        self.path: Optional[Path] = None
+
+    def enable(self) -> None:
+        """Start recording the spans."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording the spans (the completed spans are kept)."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Clear the completed spans."""
+        with self._lock:
+            self.spans.clear()
+            self._next_id = 0
+
+    def _stack(self) -> List[SpanRecord]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Optional[SpanRecord]:
+        """Get the innermost open span of the current thread, if any."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def span(self, name: str, kind: str, parent: Optional[SpanRecord] = None) -> ContextManager:
+        """
+        Open a span nested in the current span of the thread.
+
+        Arguments
+        ---------
+        name : str
+            Name of the traced object (usually its class name).
+        kind : str
+            Level of the traced object (see `SPAN_KINDS`).
+        parent : SpanRecord, optional
+            Span opened in another thread, in which to nest the span if no span is open in the
+            current thread (e.g. tasks submitted to a thread pool, see `current`).
+
+        Returns
+        -------
+        context : ContextManager
+            Context which closes the span on exit (no-op if the tracer is disabled).
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, kind, parent)
+
+    @contextmanager
+    def _span(
+        self, name: str, kind: str, outer: Optional[SpanRecord] = None
+    ) -> Iterator[SpanRecord]:
+        stack = self._stack()
+        with self._lock:
+            span_id = self._next_id
+            self._next_id += 1
+        if stack:
+            outer = stack[-1]
+        parent = outer.id if outer is not None else -1
+        rss_start, cpu_start = current_rss(), time.process_time()
+        record = SpanRecord(span_id, parent, kind, name, time.perf_counter())
+        record.thread = threading.get_ident()
+        stack.append(record)
+        try:
+            yield record
+        finally:
+            record.wall_s = time.perf_counter() - record.start
+            record.cpu_s = time.process_time() - cpu_start
+            record.rss_delta = current_rss() - rss_start
+            stack.pop()
+            with self._lock:
+                if outer is not None:  # inclusive I/O of the enclosing span
+                    outer.bytes_read += record.bytes_read
+                    outer.bytes_written += record.bytes_written
+                self.spans.append(record)
+
+    def add_io(self, read: int = 0, written: int = 0) -> None:
+        """Report bytes read or written in the current span of the thread (if any)."""
+        stack = self._stack()
+        if stack:
+            stack[-1].bytes_read += read
+            stack[-1].bytes_written += written
+
+    def summary(self) -> "pd.DataFrame":
+        """Aggregate the completed spans (see `summarize`)."""
+        with self._lock:
+            records = [asdict(span) for span in self.spans]
+        return summarize(records)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Save the completed spans in a JSON file.
+
+        The file contains the raw spans (key ``spans``) and the corresponding events in the Chrome
+        trace-event format (key ``traceEvents``), so that it can be opened directly in
+        ``chrome://tracing`` or Perfetto.
+
+        Returns
+        -------
+        path : Path
+            Path of the saved file.
+        """
+        with self._lock:
+            records = [asdict(span) for span in self.spans]
+        events = [
+            {
+                "name": record["name"],
+                "cat": record["kind"],
+                "ph": "X",
+                "ts": record["start"] * 1e6,
+                "dur": record["wall_s"] * 1e6,
+                "pid": os.getpid(),
+                "tid": record["thread"],
+                "args": {key: record[key] for key in MEASURES},
+            }
+            for record in records
+        ]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as file:
+            json.dump({"spans": records, "traceEvents": events, "displayTimeUnit": "ms"}, file)
+        self.path = path
+        return path
+
+
+TRACER = Tracer()
+"""Tracer shared by all the instrumented classes (disabled by default)."""
+
+
+def traced(func: Callable, name: str, kind: str) -> Callable:
+    """
+    Wrap a method to open a span around each call when the shared tracer is enabled.
+
+    Arguments
+    ---------
+    func : Callable
+        Original method.
+    name : str
+        Name of the class which defines the method.
+    kind : str
+        Level of the class (see `SPAN_KINDS`).
+
+    Returns
+    -------
+    wrapper : Callable
+        Method with the same signature.
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not TRACER.enabled:
+            return func(self, *args, **kwargs)
+        with TRACER.span(name, kind):
+            return func(self, *args, **kwargs)
+
+    wrapper.__traced__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def get_run_dir() -> Path:
+    """
+    Directory of the current run.
+
+    Returns
+    -------
+    run_dir : Path
+        Output directory of the Hydra application if one is running (``hydra.run.dir`` in
+        ``config/hydra/output.yaml``), otherwise `DEFAULT_RUN_DIR`.
+    """
+    try:
+        from hydra.core.hydra_config import HydraConfig  # pylint: disable=import-outside-toplevel
+
+        return Path(HydraConfig.get().runtime.output_dir)
+    except (ImportError, ValueError):  # hydra not installed or not initialized
+        return DEFAULT_RUN_DIR
+
+
+@contextmanager
+def trace_run(
+    run_dir: Optional[Union[str, Path]] = None, filename: Optional[str] = None
+) -> Iterator[Tracer]:
+    """
+    Enable the shared tracer within a context and save the trace on exit (even after an error).
+
+    Arguments
+    ---------
+    run_dir : str or Path, optional
+        Directory in which to save the trace. Default: see `get_run_dir`.
+    filename : str, optional
+        Name of the trace file. Default: ``trace_<date>-<time>.json``, so that runs sharing the
+        same directory do not overwrite each other.
+
+    Yields
+    ------
+    tracer : Tracer
+        Shared tracer, whose spans remain available after the context. The path of the saved
+        trace is stored in its attribute ``path``.
+    """
+    run_dir = Path(run_dir) if run_dir is not None else get_run_dir()
+    if filename is None:
+        filename = f"trace_{datetime.now():%Y%m%d-%H%M%S}.json"
+    TRACER.reset()
+    TRACER.enable()
+    try:
+        yield TRACER
+    finally:
+        TRACER.disable()
+        TRACER.save(run_dir / filename)
+
+
+def current_rss() -> int:
+    """
+    Resident set size of the current process (in bytes).
+
+    Notes
+    -----
+    On Linux, the current RSS is read from ``/proc/self/statm``. Elsewhere, the maximal RSS reported
+    by `resource.getrusage` is used as an approximation (0 if unavailable).
+    """
+    try:
+        with open("/proc/self/statm", "rb") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource  # pylint: disable=import-outside-toplevel
+
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except ImportError:
+            return 0
+
+
+def summarize(records: List[Dict[str, Any]]) -> "pd.DataFrame":
+    """
+    Aggregate spans by kind and name.
+
+    Arguments
+    ---------
+    records : List[Dict[str, Any]]
+        Spans as dictionaries (fields of `SpanRecord`).
+
+    Returns
+    -------
+    summary : pd.DataFrame
+        One row per traced object, with columns: ``kind``, ``name``, ``n_calls``, ``wall_s``,
+        ``cpu_s`` (cumulative), ``rss_delta`` (maximum), ``bytes_read``, ``bytes_written``
+        (cumulative). Rows are ordered by kind (from the outermost level) and decreasing wall time.
+
+    Warnings
+    --------
+    Times and I/O are inclusive of the nested spans: recursive calls of the same object are counted
+    several times.
+    """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    columns = ["kind", "name", "n_calls", "wall_s", "cpu_s", "rss_delta"]
+    columns += ["bytes_read", "bytes_written"]
+    if not records:
+        return pd.DataFrame(columns=columns)
+    spans = pd.DataFrame(records)
+    summary = (
+        spans.groupby(["kind", "name"], sort=False)
+        .agg(
+            n_calls=("id", "size"),
+            wall_s=("wall_s", "sum"),
+            cpu_s=("cpu_s", "sum"),
+            rss_delta=("rss_delta", "max"),
+            bytes_read=("bytes_read", "sum"),
+            bytes_written=("bytes_written", "sum"),
+        )
+        .reset_index()
+    )
+    order = {kind: i for i, kind in enumerate(SPAN_KINDS)}
+    summary["_level"] = summary["kind"].map(order).fillna(len(order))
+    summary = summary.sort_values(["_level", "wall_s"], ascending=[True, False])
+    return summary.drop(columns="_level").reset_index(drop=True)[columns]
+
+
+def format_summary(summary: "pd.DataFrame") -> str:
+    """Format a summary of spans as a text table, with sizes in MiB."""
+    if summary.empty:
+        return "No traced span."
+    table = summary.copy()
+    for col in ("rss_delta", "bytes_read", "bytes_written"):
+        table[col] = table[col] / 2**20
+    names = {"rss_delta": "rss_delta_mib", "bytes_read": "read_mib", "bytes_written": "written_mib"}
+    table = table.rename(columns=names)
+    return table.to_string(index=False, float_format=lambda x: f"{x:.3f}")
@@ -7,7 +7,7 @@ Classes
 """
 import subprocess
 from pathlib import Path
-from typing import Union, Optional
+from typing import List, Optional, Sequence, Union
 from dotenv import dotenv_values
 
 from utils.path_system.base_path_manager import ServerInterface
@@ -33,10 +33,14 @@ class RemoteServer(ServerInterface):
         IP address or hostname of the remote server.
     root_path : Path
         See :attr:`ServerInterface.root_path`.
+    ssh_options : List[str]
+        Additional options inserted in every `ssh` command (e.g. connection multiplexing, see
+        :meth:`etl.data_transfer.transfer.TransferManager.ssh_options`). Default: none.
 
     Methods
     -------
     :meth:`load_network_config`
+    :meth:`ssh_command`
 
     See Also
     --------
@@ -51,10 +55,12 @@ class RemoteServer(ServerInterface):
         user: Optional[str] = None,
         host: Optional[str] = None,
         root_path: Optional[Union[Path, str]] = None,
+        ssh_options: Optional[Sequence[str]] = None,
     ):
         super().__init__(root_path=root_path)
         self.user = user
         self.host = host
+        self.ssh_options: List[str] = list(ssh_options) if ssh_options is not None else []
 
     def load_network_config(self, path: Union[Path, str]) -> None:
         """
@@ -89,6 +95,22 @@ class RemoteServer(ServerInterface):
         print(f"[INFO] Credentials for the remote server: {self.user}@{self.host}")
         print(f"       Root path: {self.root_path}")
 
+    def ssh_command(self, remote_command: str) -> List[str]:
+        """
+        Build the command to execute a shell command on the remote server.
+
+        Arguments
+        ---------
+        remote_command : str
+            Command to execute on the remote server.
+
+        Returns
+        -------
+        command : List[str]
+            Arguments for :func:`subprocess.run`: `ssh [options] user@host remote_command`.
+        """
+        return ["ssh", *self.ssh_options, f"{self.user}@{self.host}", remote_command]
+
     def is_dir(self, path: Union[Path, str]) -> bool:
         """
         See :meth:`ServerInterface.is_dir`.
@@ -97,7 +119,7 @@ class RemoteServer(ServerInterface):
         --------
         :command:`test` with p-option `-d`: Check if the path is a directory.
         """
-        command = ["ssh", f"{self.user}@{self.host}", f"test -d {path}"]
+        command = self.ssh_command(f"test -d {path}")
         result = subprocess.run(command, check=False)
         if result.returncode == 0:
             print(f"[VALID] Existing directory: {path} on {self.host}")
@@ -114,7 +136,7 @@ class RemoteServer(ServerInterface):
         --------
         :command:`test` with option `-f`: Check if the path is a file.
         """
-        command = ["ssh", f"{self.user}@{self.host}", f"test -f {path}"]
+        command = self.ssh_command(f"test -f {path}")
         result = subprocess.run(command, check=False)
         if result.returncode == 0:
             print(f"[VALID] Existing file: {path} on {self.host}")
@@ -131,7 +153,7 @@ class RemoteServer(ServerInterface):
         --------
         :command:`mkdir` with option `-p`(`--parents`): Create parent directories if needed.
         """
-        command = ["ssh", f"{self.user}@{self.host}", f"mkdir -p {path}"]
+        command = self.ssh_command(f"mkdir -p {path}")
         result = subprocess.run(command, capture_output=True, text=True, check=False)
         if result.returncode != 0:
             print(f"[ERROR] {result.stderr}")
@@ -6,7 +6,12 @@ Implementations of path generation rules.
 Classes
 -------
 :class:`SpikeTimesRawPath`
+:class:`TrialsPropertiesPath`
+:class:`ParsedSessionPath`
+:class:`UnitsInfoPath`
+:class:`TrialsPropertiesUnitsPath`
 :class:`SpikeTrainsPath`
+:class:`FineCountsPath`
 :class:`FiringRatesUnitPath`
 :class:`FiringRatesPopPath`
 :class:`DecoderPath`
@@ -94,6 +99,55 @@ class TrialsPropertiesPath(PathRuler):
         return self.root_data / "processed" / "sessions_info" / session
 
 
+class ParsedSessionPath(PathRuler):
+    """Path generation rules used by the cache of the parsed events of each session."""
+
+    def get_path(self, session: str) -> Path:
+        """
+        Construct the path for the parsed events of one session, cached by `ParseSessions`.
+
+        Parameters
+        ----------
+        session: str
+
+        Returns
+        -------
+        Path
+            Format: ``{root}/processed/parsed_sessions/{session}``
+        """
+        return self.root_data / "processed" / "parsed_sessions" / session
+
+
+class UnitsInfoPath(PathRuler):
+    """Path generation rules for the inventory of the units (area and training of each unit)."""
+
+    def get_path(self) -> Path:
+        """
+        Construct the path for the table of all the recorded units.
+
+        Returns
+        -------
+        Path
+            Format: ``{root}/processed/units_info``
+        """
+        return self.root_data / "processed" / "units_info"
+
+
+class TrialsPropertiesUnitsPath(PathRuler):
+    """Path generation rules used by the unit-specific `TrialsProperties` of all the units."""
+
+    def get_path(self) -> Path:
+        """
+        Construct the path for the container of the trials properties of all the units.
+
+        Returns
+        -------
+        Path
+            Format: ``{root}/processed/sessions_info/units``
+        """
+        return self.root_data / "processed" / "sessions_info" / "units"
+
+
 class SpikeTrainsPath(PathRuler):
     """Path generation rules used by `SpikeTrains` data structures."""
 
@@ -113,6 +167,25 @@ class SpikeTrainsPath(PathRuler):
         return self.root_data / "processed" / "spike_trains" / f"{unit}_spk"
 
 
+class FineCountsPath(PathRuler):
+    """Path generation rules used by `FineCounts` caches, stored alongside the spike trains."""
+
+    def get_path(self, unit: str) -> Path:
+        """
+        Construct the path for a file storing the fine-resolution spike counts of one unit.
+
+        Parameters
+        ----------
+        unit: str
+
+        Returns
+        -------
+        Path
+            Format: ``{root}/processed/spike_trains/{unit}_cnt``
+        """
+        return self.root_data / "processed" / "spike_trains" / f"{unit}_cnt"
+
+
 class FiringRatesUnitPath(PathRuler):
     """Path generation rules used by `FiringRatesUnit` data structures."""
 
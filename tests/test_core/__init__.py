@@ -4,8 +4,11 @@
 Sub-Packages
 ------------
 :mod:`test_core.test_attributes`
+:mod:`test_core.test_builders`
+:mod:`test_core.test_composites`
 :mod:`test_core.test_coordinates`
 :mod:`test_core.test_data_structures`
+:mod:`test_core.test_pipelines`
 
 See Also
 --------
@@ -0,0 +1,12 @@
+"""
+`test_core.test_attributes` [subpackage]
+
+Modules
+-------
+`test_core.test_attributes.test_exp_structure`
+`test_core.test_attributes.test_trial_analysis_labels`
+
+See Also
+--------
+`core.attributes`: Tested subpackage.
+"""
@@ -0,0 +1,73 @@
+"""
+`test_core.test_attributes.test_exp_structure` [module]
+
+See Also
+--------
+`core.attributes.exp_structure`: Tested module.
+"""
+
+import pytest
+
+from core.attributes.exp_structure import Block, Recording, Session, Slot
+
+
+@pytest.mark.parametrize(
+    "cls, value, valid",
+    argvalues=[
+        (Recording, 1, True),
+        (Recording, 0, False),
+        (Block, 40, True),
+        (Slot, 7, True),
+        (Slot, 8, False),
+    ],
+    ids=["rec_min", "rec_below", "block_unbounded", "slot_max", "slot_above"],
+)
+def test_exp_structure_bounds(cls, value, valid):
+    """
+    Test the bounds checked at the creation of positional attributes.
+
+    Expected Output
+    ---------------
+    Instance for the values within the bounds, ValueError otherwise.
+    """
+    if valid:
+        assert cls(value) == value
+    else:
+        with pytest.raises(ValueError):
+            cls(value)
+
+
+def test_session_components():
+    """
+    Test the components extracted from a session ID.
+
+    Test Inputs
+    -----------
+    ``"avo052a04_p_PTD"``
+
+    Expected Output
+    ---------------
+    Site ``"avo052a"``, recording 4, passive attention, task PTD.
+    """
+    session = Session("avo052a04_p_PTD")
+    assert Session.split_id(session) == ("avo052a", "04", "p", "PTD")
+    assert session.site == "avo052a"
+    assert session.recording == 4 and isinstance(session.recording, Recording)
+    assert (session.attention, session.task) == ("p", "PTD")
+
+
+@pytest.mark.parametrize(
+    "value",
+    argvalues=["avo052a4_p_PTD", "avo052a04_x_PTD", "avo052a04_p_XYZ", "avo052a00_p_PTD"],
+    ids=["rec_digits", "attention", "task", "rec_zero"],
+)
+def test_session_invalid(value):
+    """
+    Test the rejection of invalid session IDs.
+
+    Expected Output
+    ---------------
+    ValueError
+    """
+    with pytest.raises(ValueError):
+        Session(value)
@@ -0,0 +1,31 @@
+"""
+`test_core.test_attributes.test_trial_analysis_labels` [module]
+
+See Also
+--------
+`core.attributes.trial_analysis_labels`: Tested module.
+"""
+
+import pytest
+
+from core.attributes.trial_analysis_labels import Fold, TrialIndex
+
+
+@pytest.mark.parametrize(
+    "cls, value, valid",
+    argvalues=[(Fold, 0, True), (Fold, 2, True), (Fold, -1, False), (TrialIndex, -3, False)],
+    ids=["fold_min", "fold", "fold_below", "index_below"],
+)
+def test_trial_analysis_label_bounds(cls, value, valid):
+    """
+    Test the validation of the labels at their creation.
+
+    Expected Output
+    ---------------
+    Instance for the non-negative values, ValueError otherwise.
+    """
+    if valid:
+        assert cls(value) == value
+    else:
+        with pytest.raises(ValueError):
+            cls(value)
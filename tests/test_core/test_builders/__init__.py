@@ -0,0 +1,11 @@
+"""
+:mod:`test_core.test_builders` [subpackage]
+
+Modules
+-------
+:mod:`test_core.test_builders.test_build_condition_averages`
+
+See Also
+--------
+:mod:`core.builders`: Tested subpackage.
+"""
@@ -0,0 +1,98 @@
+"""
+`test_core.test_builders.test_build_condition_averages` [module]
+
+Notes
+-----
+Conditions are represented by plain labels: the builder stores them without interpreting them.
+
+See Also
+--------
+`core.builders.build_condition_averages`: Tested module.
+`core.data_structures.condition_averages`: Tested module (product).
+"""
+# pylint: disable=redefined-outer-name
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from core.attributes.brain_info import Area, Training
+from core.builders.build_condition_averages import ConditionAveragesBuilder
+from core.coordinates.brain_info_coord import CoordUnit
+from core.coordinates.time_coord import CoordTime
+from core.data_components.core_data import CoreRates
+from core.data_components.core_dimensions import Dimensions
+from core.data_structures.condition_averages import ConditionAverages
+from core.data_structures.firing_rates_pop import FiringRatesPop
+
+
+CONDITIONS = ("PTD-R", "PTD-T", "CLK-R")
+COUNTS = (3, 5, 2)
+
+
+@pytest.fixture
+def population():
+    """Pseudo-population of 2 ensembles of 3 units, 2 folds, 10 trials and 4 time points."""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(2, 3, 2, sum(COUNTS), 4))
+    dims = Dimensions("ensembles", "units", "folds", "trials", "time")
+    units = [[f"avo052a-d{2 * i + j}" for j in range(1, 4)] for i in range(2)]
+    return FiringRatesPop(
+        area=Area("PFC"),
+        training=Training(True),
+        data=CoreRates(values, dims=dims),
+        units=CoordUnit(units, dims=Dimensions("ensembles", "units")),
+        time=CoordTime(np.arange(4) * 0.1, dims=Dimensions("time")),
+    )
+
+
+@pytest.mark.parametrize("stat", argvalues=["mean", "var"])
+def test_build(population, stat):
+    """
+    Test the condition averages built from the grouped reductions of a population.
+
+    Test Inputs
+    -----------
+    stat : str
+        Statistic computed in each condition.
+
+    Expected Output
+    ---------------
+    - Statistic of each block of trials, along the dimension ``conditions`` which replaces the
+      dimension ``trials``.
+    - Metadata and coordinates ``units`` and ``time`` of the population.
+    """
+    averages = ConditionAveragesBuilder(stat=stat, ddof=1).build(population, CONDITIONS, COUNTS)
+    assert isinstance(averages, ConditionAverages)
+    assert averages.dims == Dimensions("ensembles", "units", "folds", "conditions", "time")
+    assert averages.shape == (2, 3, 2, 3, 4)
+    values = np.asarray(population.get_data())
+    starts = np.cumsum((0,) + COUNTS)
+    for c in range(len(CONDITIONS)):
+        block = values[:, :, :, starts[c] : starts[c + 1]]
+        expected = block.mean(axis=3) if stat == "mean" else block.var(axis=3, ddof=1)
+        assert_allclose(averages.get_data()[:, :, :, c], expected)
+    assert averages.stat == stat
+    assert averages.conditions == CONDITIONS and averages.counts == COUNTS
+    assert averages.n_conditions == 3
+    assert averages.area == population.area and averages.training == population.training
+    assert_array_equal(averages.get_coord("units"), population.get_coord("units"))
+    assert_array_equal(averages.get_coord("time"), population.get_coord("time"))
+
+
+@pytest.mark.parametrize(
+    "stat, counts",
+    argvalues=[("count", COUNTS), ("mean", COUNTS[:2]), ("mean", (3, 5, 3))],
+    ids=["count", "missing_count", "uncovered_trials"],
+)
+def test_build_invalid(population, stat, counts):
+    """
+    Test the errors for invalid statistics and blocks.
+
+    Expected Output
+    ---------------
+    ValueError for the statistic "count", for numbers of conditions and counts which differ, and
+    for blocks which do not cover the trials.
+    """
+    with pytest.raises(ValueError):
+        ConditionAveragesBuilder(stat=stat).build(population, CONDITIONS, counts)
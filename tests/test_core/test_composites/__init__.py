@@ -0,0 +1,13 @@
+"""
+`test_core.test_composites` [subpackage]
+
+Modules
+-------
+`test_core.test_composites.test_attribute_set`
+`test_core.test_composites.test_base_container`
+`test_core.test_composites.test_prefetch`
+
+See Also
+--------
+`core.composites`: Tested subpackage.
+"""
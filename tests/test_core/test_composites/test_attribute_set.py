@@ -0,0 +1,24 @@
+"""
+`test_core.test_composites.test_attribute_set` [module]
+
+See Also
+--------
+`core.composites.attribute_set`: Tested module.
+`core.composites.exp_conditions`: Tested module (subclass).
+"""
+
+from core.attributes.exp_factors import Category, Task
+from core.composites.exp_conditions import ExpCondition
+
+
+def test_hash():
+    """
+    Test experimental conditions as keys of dictionaries.
+
+    Expected Output
+    ---------------
+    Equal conditions (same factors in any order) share the same key, distinct conditions do not.
+    """
+    counts = {ExpCondition(Task("PTD"), Category("R")): 1, ExpCondition(Task("CLK")): 2}
+    assert counts[ExpCondition(Category("R"), Task("PTD"))] == 1
+    assert ExpCondition(Task("PTD")) not in counts
@@ -0,0 +1,120 @@
+"""
+`test_core.test_composites.test_base_container` [module]
+
+See Also
+--------
+`core.composites.base_container`: Tested module.
+"""
+# pylint: disable=missing-class-docstring
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import copy
+
+import numpy as np
+import pytest
+
+from core.composites.base_container import Container, MIN_PARALLEL, map_ordered
+
+
+class Value:
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def scale(self, factor: int) -> int:
+        return self.value * factor
+
+
+def scale(x: int, factor: int = 1) -> int:
+    return x * factor
+
+
+def check_positive(x: int) -> int:
+    if x < 0:
+        raise ValueError(x)
+    return x
+
+
+class RecordingExecutor(Executor):
+    """Serial executor recording the chunk sizes passed to `map`."""
+
+    _max_workers = 2
+
+    def __init__(self) -> None:
+        self.chunksizes = []
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1):
+        self.chunksizes.append(chunksize)
+        return map(fn, *iterables)
+
+
+KEYS = [5, 3, 9, 1, 7, 0, 8, 2, 6, 4]  # non-sorted: order of insertion must be preserved
+
+
+@pytest.mark.parametrize(
+    "executor_type",
+    [None, ThreadPoolExecutor, ProcessPoolExecutor],
+    ids=["serial", "thread", "process"],
+)
+def test_apply_fill_proxy(executor_type):
+    """
+    Test that the results of `apply`, `fill` and the method proxy do not depend on the executor.
+
+    Test Inputs
+    -----------
+    Container of 10 integer keys in non-sorted order.
+
+    Expected Output
+    ---------------
+    Same values and key order as the serial mapping, with the type of the results.
+    """
+    executor = executor_type(max_workers=2) if executor_type else None
+    try:
+        container = Container({k: k for k in KEYS}, key_type=int, value_type=int)
+        result = container.apply(scale, executor=executor, factor=3)
+        assert list(result.items()) == [(k, 3 * k) for k in KEYS]
+        container.fill(scale, executor=executor, chunksize=3, factor=2)
+        assert list(container.items()) == [(k, 2 * k) for k in KEYS]
+        values = Container({k: Value(k) for k in KEYS}, key_type=int, value_type=Value)
+        scaled = values.scale(4, executor=executor)
+        assert list(scaled.items()) == [(k, 4 * k) for k in KEYS] and scaled.value_type is int
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def test_chunking():
+    """Test the serial fallback for small inputs and the default chunk size."""
+    executor = RecordingExecutor()
+    items = list(range(MIN_PARALLEL - 1))
+    assert map_ordered(scale, items, executor) == items
+    assert not executor.chunksizes
+    assert map_ordered(scale, list(range(100)), executor) == list(range(100))
+    assert executor.chunksizes == [13]  # 100 items / (4 chunks * 2 workers), rounded up
+    map_ordered(scale, list(range(100)), executor, chunksize=50)
+    assert executor.chunksizes[-1] == 50
+
+
+def test_errors():
+    """Test that exceptions raised in the workers are propagated."""
+    container = Container({k: k - 5 for k in KEYS}, key_type=int, value_type=int)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with pytest.raises(ValueError):
+            container.apply(check_positive, executor=executor)
+
+
+def test_special_methods():
+    """
+    Test that special methods are not proxied to the values.
+
+    Expected Output
+    ---------------
+    Deep copy of the container itself (not a container of the copies returned by the proxy of
+    `np.ndarray.__deepcopy__`), with independent values.
+    """
+    container = Container({k: np.arange(3) for k in KEYS}, key_type=int, value_type=np.ndarray)
+    copied = copy.deepcopy(container)
+    assert isinstance(copied, Container) and list(copied) == KEYS
+    copied[KEYS[0]][0] = -1
+    assert container[KEYS[0]][0] == 0
+    with pytest.raises(AttributeError):
+        getattr(container, "__missing_special__")
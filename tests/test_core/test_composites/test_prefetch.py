@@ -0,0 +1,139 @@
+"""
+`test_core.test_composites.test_prefetch` [module]
+
+See Also
+--------
+`core.composites.prefetch`: Tested module.
+"""
+# pylint: disable=missing-class-docstring
+# pylint: disable=protected-access
+
+import threading
+
+import numpy as np
+import pytest
+
+from core.composites.base_container import Container
+from core.composites.prefetch import PrefetchedContainer
+from utils.io_data.loaders import LoaderNPY
+from utils.storage_rulers.impl_path_rulers import SpikeTrainsPath
+
+
+UNITS = [f"u{i}" for i in range(8)]
+
+
+@pytest.fixture(name="path_ruler")
+def fixture_path_ruler(tmp_path):
+    """Spike files of 8 units, unit ``i`` containing ``100 * (i + 1)`` spikes."""
+    path_ruler = SpikeTrainsPath(tmp_path)
+    for i, unit in enumerate(UNITS):
+        path = path_ruler.get_path(unit).with_suffix(".npy")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, np.arange(100 * (i + 1), dtype=float))
+    return path_ruler
+
+
+class GatedLoader(LoaderNPY):
+    """Loader recording the loaded paths and blocked until a gate is opened."""
+
+    gate = threading.Event()
+    loaded: list = []
+
+    def _load(self):
+        self.gate.wait(timeout=5)
+        GatedLoader.loaded.append(self.path.stem)
+        return super()._load()
+
+
+def test_iteration(path_ruler):
+    """
+    Test that the values are loaded in order and that the interface matches `Container`.
+
+    Expected Output
+    ---------------
+    - Items in the order of the keys, with the content of the files.
+    - `apply` returns a `Container` with the same keys.
+    - No load is pending after a complete iteration and the closing of the container.
+    """
+    with PrefetchedContainer(UNITS, path_ruler, key_type=str, read_ahead=3) as spikes:
+        assert len(spikes) == 8 and "u3" in spikes and "u9" not in spikes
+        for i, (unit, values) in enumerate(spikes.items()):
+            assert unit == UNITS[i] and len(values) == 100 * (i + 1)
+            assert len(spikes.pending) <= 3
+        counts = spikes.apply(len)
+        assert isinstance(counts, Container)
+        assert counts.list_values() == [100 * (i + 1) for i in range(8)]
+        assert not spikes.pending
+    assert spikes._executor is None
+
+
+def test_read_ahead(path_ruler):
+    """
+    Test that the next files are loaded while the current value is used, within the budget.
+
+    Test Inputs
+    -----------
+    Read-ahead of 4 files, byte budget of the files of the next 2 units (about 3 KB each).
+
+    Expected Output
+    ---------------
+    After the access to the first unit, the loads of the next units are submitted, and their total
+    size does not exceed the budget.
+    """
+    sizes = [path_ruler.get_path(unit).with_suffix(".npy").stat().st_size for unit in UNITS]
+    budget = sizes[1] + sizes[2]
+    GatedLoader.gate.clear()
+    GatedLoader.loaded.clear()
+    spikes = PrefetchedContainer(
+        UNITS, path_ruler, GatedLoader, key_type=str, read_ahead=4, max_bytes=budget
+    )
+    try:
+        threading.Timer(0.1, GatedLoader.gate.set).start()
+        assert len(spikes["u0"]) == 100
+        assert list(spikes.pending) == ["u1", "u2"]
+        assert spikes.pending_bytes == budget
+        spikes.pending["u2"].result(timeout=5)  # prefetched before being requested
+        assert {"u1_spk", "u2_spk"} <= set(GatedLoader.loaded)
+        assert len(spikes["u1"]) == 200
+    finally:
+        spikes.close()
+        GatedLoader.gate.set()
+
+
+def test_errors(path_ruler):
+    """Test that a missing file raises at the access to its key only."""
+    path_ruler.get_path("u2").with_suffix(".npy").unlink()
+    with PrefetchedContainer(UNITS, path_ruler, key_type=str) as spikes:
+        assert len(spikes["u1"]) == 200
+        with pytest.raises(FileNotFoundError):
+            spikes["u2"]  # pylint: disable=pointless-statement
+        assert len(spikes["u3"]) == 400
+        with pytest.raises(KeyError):
+            spikes["u9"]  # pylint: disable=pointless-statement
+
+
+@pytest.mark.parametrize(
+    "order",
+    [["u0", "u0"], ["u2", "u1"], ["u3", "u0", "u3"]],
+    ids=["reread", "backwards", "jump_back"],
+)
+def test_random_access_budget(path_ruler, order):
+    """
+    Test that a key is always read when requested, even if the next keys fill the byte budget.
+
+    Test Inputs
+    -----------
+    Byte budget smaller than the files of the read-ahead window, keys accessed again or in
+    decreasing order.
+
+    Expected Output
+    ---------------
+    Values of the requested keys, and pending loads within the budget (except the requested key).
+    """
+    budget = path_ruler.get_path("u1").with_suffix(".npy").stat().st_size
+    with PrefetchedContainer(
+        UNITS, path_ruler, key_type=str, read_ahead=3, max_bytes=budget
+    ) as spikes:
+        for unit in order:
+            assert len(spikes[unit]) == 100 * (UNITS.index(unit) + 1)
+            assert len(spikes.pending) <= 1 or spikes.pending_bytes <= budget
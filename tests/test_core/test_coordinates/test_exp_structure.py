@@ -17,7 +17,7 @@ but apply for all subclasses of :class:`CoordExpStructure`.
 import numpy as np
 import pytest
 
-from core.coordinates.exp_structure_coord import CoordRecording
+from core.coordinates.exp_structure_coord import CoordRecording, CoordSlot
 from core.attributes.exp_structure import Recording
 
 
@@ -59,3 +59,18 @@ def test_coord_recording_count_by_lab():
     count = coord.count_by_lab()
     expected_count = {1: 5, 2: 5}
     assert count == expected_count
+
+
+def test_coord_sentinel():
+    """
+    Test the validation of the values against the attribute, with the sentinel value.
+
+    Expected Output
+    ---------------
+    Sentinel accepted as an unset value (e.g. in `from_shape`), invalid slots rejected.
+    """
+    coord = CoordSlot.from_shape(3)
+    assert np.all(coord == CoordSlot.SENTINEL)
+    CoordSlot(np.array([0, 7, CoordSlot.SENTINEL]))
+    with pytest.raises(ValueError):
+        CoordSlot(np.array([1, 8]))
@@ -5,11 +5,13 @@ See Also
 --------
 `core.data_components.core_data`: Tested module.
 """
+import pickle
 
 import numpy as np
 import pytest
 
 from core.data_components.core_data import CoreData
+from core.data_components.core_dimensions import Dimensions
 
 
 @pytest.mark.parametrize("dims", argvalues=[None, ("time", "units")], ids=["default", "with_dims"])
@@ -45,29 +47,54 @@ def test_numpy_inheritance(dims):
 
 
 @pytest.mark.parametrize(
-    "dims", argvalues=[("time",), ("invalid", "time")], ids=["missing_dim", "invalid_name"]
+    "dims", argvalues=[("time",), ("time", "time")], ids=["missing_dim", "duplicate_name"]
 )
 def test_invalid_instantiation(dims):
     """
-    Test the instantiation of a core data object with a mismatch in the number of dimensions.
+    Test the instantiation of a core data object with invalid dimensions.
 
     Test Inputs
     -----------
     values : np.ndarray
         2D array.
     dims : Tuple[str]
-        Invalid dimension. Case 1: missing dimension. Case 2: invalid dimension name.
+        Invalid dimensions. Case 1: missing dimension. Case 2: duplicate dimension name.
 
     Expected Output
     ---------------
     Case 1: ValueError is raised by the ``__new__`` method.
-    Case 2: ValueError is raised by the ``DimName`` class within the ``__new__`` method.
+    Case 2: ValueError is raised by the ``Dimensions`` class within the ``__new__`` method.
     """
     values = np.zeros((5, 10))
     with pytest.raises(ValueError):
         CoreData(values, dims=dims)
 
 
+def test_default_dims():
+    """
+    Test the instantiation of a core data object without dimension names.
+
+    Expected Output
+    ---------------
+    The placeholder of unnamed dimensions is repeated for each axis, without being rejected as a
+    duplicate name.
+    """
+    data = CoreData(np.zeros((5, 10)))
+    assert list(data.dims) == [Dimensions.DEFAULT] * 2
+
+
+def test_pickle():
+    """
+    Test that a core data object keeps its dimension names through pickling (e.g. when sent to a
+    worker process or saved to a file).
+    """
+    data = CoreData(np.arange(50.0).reshape(5, 10), dims=("time", "units"))
+    loaded = pickle.loads(pickle.dumps(data))
+    assert isinstance(loaded, CoreData)
+    assert loaded.dims == data.dims
+    np.testing.assert_array_equal(loaded, data)
+
+
 def test_delegation():
     """
     Test the `get_axis` and `get_dim` methods delegated to the `Dimensions` class.
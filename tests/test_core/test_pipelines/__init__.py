@@ -0,0 +1,13 @@
+"""
+`test_core.test_pipelines` [subpackage]
+
+Modules
+-------
+`test_core.test_pipelines.test_build_populations`
+`test_core.test_pipelines.test_parse_sessions`
+`test_core.test_pipelines.test_task_graph`
+
+See Also
+--------
+`core.pipelines`: Tested subpackage.
+"""
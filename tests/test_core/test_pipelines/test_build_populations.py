@@ -0,0 +1,166 @@
+"""
+`test_core.test_pipelines.test_build_populations` [module]
+
+See Also
+--------
+`core.pipelines.build_populations`: Tested module.
+"""
+# pylint: disable=missing-class-docstring
+
+import pandas as pd
+import pytest
+
+from core.attributes.brain_info import Area, Training, Unit
+from core.attributes.exp_factors import Category, Task
+from core.attributes.exp_structure import Session
+from core.composites.base_container import Container
+from core.composites.exp_conditions import ExpCondition
+from core.coordinates.exp_factor_coord import CoordCategory, CoordTask
+from core.data_structures.firing_rates_pop import FiringRatesPop
+from core.data_structures.trials_properties import TrialsProperties
+from core.pipelines.build_populations import (
+    BatchPopulations,
+    PopulationTask,
+    PopulationWorker,
+    load_grid,
+)
+from core.pipelines.format_population_data import FormatPopulation, FormatPopulationConfig
+from core.processors.simulate.synthetic_sessions import generate_dataset, to_trials_properties
+from utils.io_data.savers import SaverCSVDataFrame, SaverPKL
+from utils.storage_rulers.impl_path_rulers import (
+    TrialsPropertiesPath,
+    TrialsPropertiesUnitsPath,
+    UnitsInfoPath,
+)
+
+
+class DummyPipeline:
+    def execute(self, inputs) -> None:
+        if inputs == "PFC":
+            raise ValueError("Not enough units")
+
+
+class DummyWorker(PopulationWorker):
+    def load_inputs(self, task):
+        self.get("shared", lambda: "inputs shared by all the tasks")
+        return str(task.area)
+
+    def create_pipeline(self):
+        return DummyPipeline()
+
+
+class CategoryPTD(ExpCondition):
+    REQUIRED_FACTORS = {Task: {Task("PTD")}, Category: {Category("R"), Category("T")}}
+
+
+def test_load_grid(tmp_path):
+    """
+    Test the enumeration of the combinations of areas and training statuses.
+
+    Test Inputs
+    -----------
+    Parameters file with areas A1 and PFC, without trainings.
+
+    Expected Output
+    ---------------
+    Both training statuses for A1, only the trained status for PFC (not recorded in naive animals).
+    """
+    path = tmp_path / "params.yml"
+    path.write_text("areas:\n  - A1\n  - PFC\n", encoding="utf-8")
+    tasks = load_grid(path)
+    assert [task.key for task in tasks] == ["A1_Trained", "PFC_Trained", "A1_Naive"]
+    assert tasks[0] == PopulationTask(Area("A1"), Training(True))
+
+
+@pytest.mark.parametrize("workers", [1, 2], ids=["in_process", "pool"])
+def test_batch(tmp_path, workers):
+    """
+    Test the batch execution, the cache of the shared inputs and the resumption.
+
+    Test Inputs
+    -----------
+    Four combinations (three trained areas, one naive area), the pipeline failing for PFC.
+
+    Expected Output
+    ---------------
+    - First run: all the tasks succeed except PFC, with a marker for each successful task. The
+      shared inputs are loaded at most once per worker.
+    - Resumed run: the completed tasks are skipped, the failed task is run again.
+    """
+    tasks = [PopulationTask(Area(a), Training(True)) for a in ("A1", "dPEG", "PFC")]
+    tasks.append(PopulationTask(Area("A1"), Training(False)))
+    batch = BatchPopulations(None, tmp_path, workers=workers, worker_type=DummyWorker)
+    results = batch.run(tasks)
+    assert [r.key for r in results] == [task.key for task in tasks]
+    assert [r.status for r in results] == ["done", "done", "failed", "done"]
+    assert "ValueError" in results[2].error
+    assert 1 <= sum(r.n_loads for r in results) <= workers
+    assert [task.marker(tmp_path).is_file() for task in tasks] == [True, True, False, True]
+    # Resume
+    reported = []
+    batch.resume = True
+    results = batch.run(tasks, callback=reported.append)
+    assert [r.status for r in results] == ["skipped", "skipped", "failed", "skipped"]
+    assert len(reported) == len(tasks)
+
+
+def test_invalid_workers():
+    """Test that an invalid number of workers is rejected."""
+    with pytest.raises(ValueError):
+        BatchPopulations(None, workers=0)
+
+
+def test_worker_format_population(tmp_path):
+    """
+    Test the real pipeline of the batch on one combination of synthetic data.
+
+    Test Inputs
+    -----------
+    Synthetic data set of 3 units recorded in 2 sessions of task PTD. Units inventory (area A1,
+    trained animals) and trials properties of the units saved at the paths read by the worker.
+    Conditions: both categories in task PTD.
+
+    Expected Output
+    ---------------
+    - Pipeline created by the worker: `FormatPopulation`.
+    - Population with one ensemble of the 3 units, pseudo-trials in each fold and for each unit,
+      and trial coordinates with as many labels as pseudo-trials.
+    - Task run by the worker without error.
+    """
+    summary = generate_dataset(tmp_path, n_units=3, n_sessions=2, units_per_site=3, n_blocks=10)
+    sessions = [Session("syn001a01_p_PTD"), Session("syn001a02_a_PTD")]
+    trials = [
+        pd.read_csv(TrialsPropertiesPath(tmp_path).get_path(s).with_suffix(".csv"))
+        for s in sessions
+    ]
+    units = [Unit(unit) for unit in summary["unit"]]
+    trials_properties = to_trials_properties(sessions, trials)
+    units_info = pd.DataFrame({"unit": units, "area": "A1", "training": True})
+    for path in (UnitsInfoPath(tmp_path).get_path(), TrialsPropertiesUnitsPath(tmp_path).get_path()):
+        path.parent.mkdir(parents=True, exist_ok=True)
+    SaverCSVDataFrame(UnitsInfoPath(tmp_path).get_path()).save(units_info)
+    SaverPKL(TrialsPropertiesUnitsPath(tmp_path).get_path()).save(
+        Container(
+            {unit: trials_properties for unit in units},
+            key_type=Unit,
+            value_type=TrialsProperties,
+        )
+    )
+    config = FormatPopulationConfig(
+        exp_condition_type=CategoryPTD,
+        n_folds=2,
+        coords_trials={"task": CoordTask, "category": CoordCategory},
+    )
+    task = PopulationTask(Area("A1"), Training(True))
+    worker = PopulationWorker(config, tmp_path)
+    pipeline = worker.create_pipeline()
+    assert isinstance(pipeline, FormatPopulation)
+    population = pipeline.execute(worker.load_inputs(task))
+    assert isinstance(population, FiringRatesPop)
+    assert population.units.shape == (1, 3) and set(population.units[0]) == set(units)
+    n_ens, n_units, n_folds, n_trials = population.pseudo_trials_idx.shape
+    assert (n_ens, n_units, n_folds) == (1, 3, 2) and n_trials > 0
+    assert set(population.task) == {"PTD"} and set(population.category) == {"R", "T"}
+    assert len(population.category) == n_trials
+    result = worker.run(task)
+    assert result.status == "done", result.error
@@ -0,0 +1,138 @@
+"""
+`test_core.test_pipelines.test_format_population_data` [module]
+
+See Also
+--------
+`core.pipelines.format_population_data`: Tested module.
+"""
+# pylint: disable=missing-class-docstring
+
+import numpy as np
+import pytest
+
+from core.attributes.brain_info import Area, Training, Unit
+from core.attributes.exp_factors import Category, Task
+from core.attributes.exp_structure import Session
+from core.composites.base_container import Container
+from core.composites.exp_conditions import ExpCondition
+from core.coordinates.exp_factor_coord import CoordCategory, CoordTask
+from core.data_components.core_data import CoreIndices
+from core.data_components.core_dimensions import Dimensions
+from core.data_structures.trials_properties import TrialsProperties
+from core.pipelines.format_population_data import (
+    FormatPopulation,
+    FormatPopulationConfig,
+    FormatPopulationInputs,
+)
+from utils.misc.tracing import trace_run
+
+
+class TaskCategory(ExpCondition):
+    REQUIRED_FACTORS = {
+        Task: {Task("PTD"), Task("CLK")},
+        Category: {Category("R"), Category("T")},
+    }
+
+
+@pytest.fixture
+def config():
+    return FormatPopulationConfig(
+        exp_condition_type=TaskCategory,
+        n_folds=2,
+        coords_trials={"task": CoordTask, "category": CoordCategory},
+    )
+
+
+def make_inputs(n_units: int, n_trials: int) -> FormatPopulationInputs:
+    """Units with the same number of trials, drawn at random in the four conditions."""
+    rng = np.random.default_rng(0)
+    dims = Dimensions("trials")
+    units = [Unit(f"avo052a-d{u}") for u in range(n_units)]
+    trials_properties = Container(
+        {
+            unit: TrialsProperties(
+                sessions=[Session("avo052a01_p_PTD")],
+                data=CoreIndices(np.arange(n_trials), dims=dims),
+                task=CoordTask(rng.choice(["PTD", "CLK"], size=n_trials), dims=dims),
+                category=CoordCategory(rng.choice(["R", "T"], size=n_trials), dims=dims),
+            )
+            for unit in units
+        },
+        key_type=Unit,
+        value_type=TrialsProperties,
+    )
+    return FormatPopulationInputs(
+        area=Area("A1"), training=Training(True), units=units, trials_properties=trials_properties
+    )
+
+
+def test_build_graph(config):
+    """
+    Test the declaration of the tasks of the pipeline.
+
+    Expected Output
+    ---------------
+    - Graph valid with the inputs of the pipeline (units and their trials properties), producing
+      all its targets.
+    - Dependencies: the ensembles depend on the selection of the units, the pseudo-trials on the
+      ensembles, and the trial coordinates and time do not depend on the ensembles (run
+      concurrently).
+    """
+    graph = FormatPopulation(config).build_graph()
+    order = graph.validate(inputs=("units", "trials_properties"), targets=FormatPopulation.TARGETS)
+    assert set(order) == {
+        "features_by_unit",
+        "counts_actual",
+        "counts_final",
+        "selected_units",
+        "coord_units",
+        "coord_pseudo_trials",
+        "coords_trials",
+        "coord_time",
+    }
+    assert set(FormatPopulation.TARGETS) <= set(graph.producers)
+    dependencies = graph.dependencies()
+    assert dependencies["coord_units"] == ["selected_units"]
+    assert set(dependencies["coord_pseudo_trials"]) == {
+        "coord_units",
+        "features_by_unit",
+        "counts_final",
+    }
+    assert dependencies["coords_trials"] == ["counts_final"]
+    assert not dependencies["coord_time"]
+    assert order.index("coord_units") < order.index("coord_pseudo_trials")
+
+
+@pytest.mark.parametrize("max_workers", argvalues=[1, 2], ids=["sequential", "threads"])
+def test_execute_traced(tmp_path, config, max_workers):
+    """
+    Test the spans recorded by the tracer during a run of the pipeline.
+
+    Test Inputs
+    -----------
+    Population of 4 units, 120 trials each.
+
+    Expected Output
+    ---------------
+    - Coordinates set in the data structure: one ensemble of the 4 units, pseudo-trials in each
+      fold, trial coordinates for the pseudo-trials.
+    - Spans: one span of kind ``node`` for each task of the graph, nested in the pipeline span, and
+      the spans of the factories nested in the nodes which call them.
+    """
+    config.max_workers = max_workers
+    with trace_run(run_dir=tmp_path, filename="trace.json") as tracer:
+        population = FormatPopulation(config).execute(make_inputs(n_units=4, n_trials=120))
+    assert population.units.shape == (1, 4)
+    assert population.pseudo_trials_idx.shape[:3] == (1, 4, 2)
+    assert len(population.task) == population.pseudo_trials_idx.shape[3]
+    spans = {span.id: span for span in tracer.spans}
+    nodes = {span.name: span for span in spans.values() if span.kind == "node"}
+    assert set(nodes) == set(FormatPopulation(config).build_graph().nodes)
+    assert all(spans[span.parent].kind == "pipeline" for span in nodes.values())
+    factories = {
+        span.name: spans[span.parent].name for span in spans.values() if span.kind == "factory"
+    }
+    assert factories["FactoryCoordUnit"] == "coord_units"
+    assert factories["FactoryPseudoTrials"] == "coord_pseudo_trials"
+    assert factories["FactoryCoordExpFactor"] == "coords_trials"
+    assert "step" not in {span.kind for span in spans.values()}
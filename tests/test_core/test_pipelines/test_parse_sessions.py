@@ -0,0 +1,157 @@
+"""
+`test_core.test_pipelines.test_parse_sessions` [module]
+
+Notes
+-----
+Raw events tables are written in a temporary data root at the paths of `EventsPropertiesPath`, in
+the format of the CSV files exported from the MATLAB structure ``exptevents``.
+
+See Also
+--------
+`core.pipelines.parse_sessions`: Tested module.
+`core.data_structures.trials_properties`: Tested module (offsets of the sessions).
+"""
+# pylint: disable=redefined-outer-name
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pandas as pd
+import pytest
+
+from core.attributes.exp_structure import Session
+from core.pipelines.parse_sessions import (
+    ParseSessions,
+    ParseSessionsConfig,
+    ParseSessionsInputs,
+    parse_session,
+)
+from core.processors.parse.extract_events import SessionParser
+from utils.storage_rulers.impl_path_rulers import (
+    EventsPropertiesPath,
+    ParsedSessionPath,
+    TrialsPropertiesPath,
+)
+
+
+PRE = "'PreStimSilence , TORC_448_06_v501 , Reference'"
+STIM_R = "'Stim , TORC_448_06_v501 , Reference'"
+STIM_T = "'Stim , 2000 , Target'"
+POST = "'PostStimSilence , TORC_448_06_v501 , Reference'"
+
+EVENTS = {
+    "avo052a04_p_PTD": [  # 2 blocks, 3 slots, no shock
+        "TRIALSTART",
+        PRE,
+        STIM_R,
+        POST,
+        PRE,
+        STIM_T,
+        POST,
+        "TRIALSTOP",
+        "TRIALSTART",
+        PRE,
+        STIM_R,
+        POST,
+        "TRIALSTOP",
+    ],
+    "avo052a05_a_CLK": [  # 1 block, 2 slots, shock in the second one
+        "TRIALSTART",
+        PRE,
+        STIM_R,
+        POST,
+        PRE,
+        STIM_R,  # warning stimulus
+        STIM_T,
+        "BEHAVIOR,SHOCKON",
+        POST,
+        "TRIALSTOP",
+    ],
+}
+"""Raw events of two sessions at the same site."""
+
+
+def write_events(root, session, events):
+    """Write the raw events table of one session (times: index of the event)."""
+    n = len(events)
+    table = pd.DataFrame(
+        {
+            "Event": events,
+            "StartTime": np.arange(n, dtype=float),
+            "StopTime": np.arange(n, dtype=float) + 0.5,
+        }
+    )
+    path = EventsPropertiesPath(root).get_path(session).with_suffix(".csv")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def root(tmp_path):
+    """Data root containing the raw events of the sessions in `EVENTS`."""
+    for session, events in EVENTS.items():
+        write_events(tmp_path, session, events)
+    return tmp_path
+
+
+@pytest.mark.parametrize("n_workers", argvalues=[1, 2], ids=["serial", "pool"])
+def test_parse_sessions(root, n_workers):
+    """
+    Test the pipeline `ParseSessions` on two sessions, end to end.
+
+    Test Inputs
+    -----------
+    n_workers : int
+        Number of processes parsing the sessions.
+
+    Expected Output
+    ---------------
+    - Trials of both sessions concatenated in the order of the inputs, with their offsets.
+    - Session-level labels (recording, task, attention) broadcast to the trials of each session.
+    - Error column marking the slot with a shock.
+    - Same subset of trials for each session with and without the offsets.
+    """
+    sessions = [Session(session) for session in EVENTS]
+    config = ParseSessionsConfig(n_workers=n_workers, root_data=root)
+    trials = ParseSessions(config).execute(ParseSessionsInputs(sessions=sessions))
+    assert trials.n_trials == 5
+    assert trials.sessions == sessions
+    assert_array_equal(trials.offsets, [0, 3, 5])
+    assert_array_equal(trials.get_coord("recording"), [4, 4, 4, 5, 5])
+    assert_array_equal(trials.get_coord("task"), ["PTD", "PTD", "PTD", "CLK", "CLK"])
+    assert_array_equal(trials.get_coord("attention"), ["p", "p", "p", "a", "a"])
+    assert_array_equal(trials.get_coord("block"), [1, 1, 2, 1, 1])
+    assert_array_equal(trials.get_coord("slot"), [1, 2, 1, 1, 2])
+    assert_array_equal(trials.get_coord("category"), ["R", "T", "R", "R", "T"])
+    assert_array_equal(trials.get_coord("t_warn")[3:], [np.nan, 5.0])
+    assert_array_equal(trials.get_coord("error"), [False, False, False, False, True])
+    subset = trials.get_session("avo052a05_a_CLK")
+    trials.offsets = None  # select by recording number
+    expected = trials.get_session("avo052a05_a_CLK")
+    for name in ("recording", "category", "t_on", "error"):
+        assert_array_equal(subset.get_coord(name), expected.get_coord(name))
+
+
+def test_parse_session_cache(root, mocker):
+    """
+    Test the cache of the parsed sessions.
+
+    Expected Output
+    ---------------
+    - Cache written at the path of `ParsedSessionPath`, not at the path of `TrialsPropertiesPath`
+      (reserved for the trials properties).
+    - Second call served from the cache, without parsing.
+    - Session parsed again after a modification of its raw events.
+    """
+    session = "avo052a05_a_CLK"
+    spy = mocker.spy(SessionParser, "process")
+    columns = parse_session(session, root_data=root)
+    assert ParsedSessionPath(root).get_path(session).with_suffix(".pkl").is_file()
+    assert not TrialsPropertiesPath(root).get_path(session).parent.exists()
+    cached = parse_session(session, root_data=root)
+    assert spy.call_count == 1, "Cached session parsed again"
+    assert_array_equal(cached["error"], columns["error"])
+    write_events(root, session, EVENTS[session][:4] + ["TRIALSTOP"])
+    columns = parse_session(session, root_data=root)
+    assert spy.call_count == 2, "Modified session not parsed again"
+    assert_array_equal(columns["slot"], [1])
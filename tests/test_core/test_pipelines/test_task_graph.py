@@ -0,0 +1,127 @@
+"""
+`test_core.test_pipelines.test_task_graph` [module]
+
+See Also
+--------
+`core.pipelines.task_graph`: Tested module.
+"""
+# pylint: disable=missing-class-docstring
+
+import threading
+import weakref
+
+import pytest
+
+from core.pipelines.task_graph import TaskGraph
+
+
+class Payload:
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+
+def build_graph(refs, log):
+    """
+    Graph: ``x -> a -> (b, c) -> d``, where ``b`` and ``c`` are independent.
+
+    The intermediate ``a`` is registered in `refs` (weak reference) and each node appends its name
+    and the liveness of ``a`` to `log` when it starts.
+    """
+
+    def make_a(x):
+        log.append(("a", None))
+        payload = Payload(x + 1)
+        refs["a"] = weakref.ref(payload)
+        return payload
+
+    def make_b(a):
+        log.append(("b", refs["a"]() is not None))
+        return a.value * 2
+
+    def make_c(a):
+        log.append(("c", refs["a"]() is not None))
+        return a.value * 3
+
+    def make_d(b, c):
+        log.append(("d", refs["a"]() is not None))
+        return b + c
+
+    graph = TaskGraph()
+    graph.add("d", make_d, inputs=("b", "c"))  # registration order does not matter
+    graph.add("a", make_a, inputs=("x",))
+    graph.add("b", make_b, inputs=("a",))
+    graph.add("c", make_c, inputs=("a",))
+    return graph
+
+
+@pytest.mark.parametrize("max_workers", [1, 2], ids=["sequential", "threads"])
+def test_run(max_workers):
+    """
+    Test the results, the order of execution and the release of the intermediates.
+
+    Test Inputs
+    -----------
+    Graph ``x -> a -> (b, c) -> d`` with ``x = 1``, targets ``b`` and ``d``.
+
+    Expected Output
+    ---------------
+    - Results: ``b = 4``, ``d = 10``.
+    - Each node runs after its dependencies.
+    - ``a`` is alive while ``b`` and ``c`` run, and released before ``d`` runs.
+    """
+    refs, log = {}, []
+    results = build_graph(refs, log).run({"x": 1}, targets=("b", "d"), max_workers=max_workers)
+    assert results == {"b": 4, "d": 10}
+    names = [name for name, _ in log]
+    assert names[0] == "a" and names[-1] == "d" and set(names[1:3]) == {"b", "c"}
+    alive = dict(log)
+    assert alive["b"] and alive["c"] and not alive["d"]
+
+
+def test_concurrency():
+    """Test that independent nodes run at the same time with several workers."""
+    barrier = threading.Barrier(2, timeout=5)  # deadlock (timeout) if run sequentially
+    graph = TaskGraph()
+    graph.add("b", lambda: barrier.wait() >= 0)
+    graph.add("c", lambda: barrier.wait() >= 0)
+    assert graph.run(targets=("b", "c"), max_workers=2) == {"b": True, "c": True}
+
+
+def test_multiple_outputs_and_dot():
+    """Test nodes with several outputs and the export of the graph."""
+    graph = TaskGraph()
+    graph.add("split", divmod, inputs=("n", "k"), outputs=("q", "r"))
+    graph.add("total", lambda q, r: q + r, inputs=("q", "r"))
+    assert graph.run({"n": 7, "k": 3}, targets=("total",)) == {"total": 3}
+    dot = graph.to_dot()
+    assert '"value:n" -> "split"' in dot and '"split" -> "value:r"' in dot
+
+
+@pytest.mark.parametrize(
+    "nodes, inputs",
+    [
+        ([("a", ("missing",))], {}),
+        ([("a", ("b",)), ("b", ("a",))], {}),
+    ],
+    ids=["missing_input", "cycle"],
+)
+def test_invalid(nodes, inputs):
+    """Test the validation of the graph before running it."""
+    graph = TaskGraph()
+    for name, node_inputs in nodes:
+        graph.add(name, lambda *args: None, inputs=node_inputs)
+    with pytest.raises(ValueError):
+        graph.run(inputs)
+
+
+def test_errors():
+    """Test that the error of a node is propagated and stops the scheduling."""
+    ran = []
+    graph = TaskGraph()
+    graph.add("a", lambda: 1 / 0)
+    graph.add("b", ran.append, inputs=("a",))
+    with pytest.raises(ZeroDivisionError):
+        graph.run(max_workers=2)
+    assert not ran
+    with pytest.raises(ValueError):
+        graph.add("a", lambda: None)
@@ -0,0 +1,14 @@
+"""
+:mod:`test_core.test_fit_models` [subpackage]
+
+Tests for the subpackage :mod:`core.processors.fit_models`.
+
+Modules
+-------
+test_fit_models.test_cross_validation: Tests :mod:`core.processors.fit_models.cross_validation`.
+test_fit_models.test_decoding: Tests :mod:`core.processors.fit_models.decoding`.
+test_fit_models.test_design_matrix: Tests :mod:`core.processors.fit_models.design_matrix`.
+test_fit_models.test_epairs: Tests :mod:`core.processors.fit_models.epairs`.
+test_fit_models.test_gmm_sweep: Tests :mod:`core.processors.fit_models.gmm_sweep`.
+test_fit_models.test_linear_regression: Tests :mod:`core.processors.fit_models.linear_regression`.
+"""
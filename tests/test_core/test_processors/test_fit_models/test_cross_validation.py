@@ -0,0 +1,89 @@
+"""
+`test_core.test_processors.test_fit_models.test_cross_validation` [module]
+
+Notes
+-----
+Reference held-out predictions are obtained by refitting `LinearRegressionModel` on each training
+set from scratch.
+
+See Also
+--------
+`core.processors.fit_models.cross_validation`: Tested module.
+"""
+
+import numpy as np
+import pytest
+
+from core.processors.fit_models.cross_validation import CrossValidator
+from core.processors.fit_models.linear_regression import LinearRegressionModel
+
+
+@pytest.mark.parametrize("fit_intercept", argvalues=[True, False], ids=["intercept", "centered"])
+def test_process_matches_refit(fit_intercept):
+    """
+    Test that the downdated solutions match independent fits on each training set.
+
+    Test Inputs
+    -----------
+    X : np.ndarray
+        Random design matrix of the pseudo-trials. Shape: ``(n_trials, n_features) = (8, 3)``.
+    Y : np.ndarray
+        Random targets with the dimensions of `FiringRatesPop`.
+        Shape: ``(n_ens, n_units, n_folds, n_trials, n_t) = (2, 4, 5, 8, 6)``.
+
+    Expected Output
+    ---------------
+    Held-out predictions equal to the references, and R² of shape ``(n_ens, n_units, n_t)``.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(8, 3))
+    Y = rng.normal(size=(2, 4, 5, 8, 6))
+    r2, predictions = CrossValidator(fit_intercept=fit_intercept).process(X=X, Y=Y)
+    assert r2.shape == (2, 4, 6), "Wrong shape for R²"
+    assert predictions.shape == Y.shape, "Wrong shape for predictions"
+    model = LinearRegressionModel(fit_intercept=fit_intercept)
+    X_train = np.tile(X, (4, 1))  # pseudo-trials of the 4 training folds
+    for k in range(5):
+        Y_train = np.delete(Y, k, axis=2).reshape(2, 4, 4 * 8, 6)
+        coefficients, intercept = model.process(X=X_train, Y=Y_train, axis=2)
+        expected = model.predict(X, coefficients, intercept, axis=2)
+        np.testing.assert_allclose(predictions[:, :, k], expected, atol=1e-10)
+
+
+def test_r2_values():
+    """
+    Test the held-out R² for an informative and a non-informative target.
+
+    Test Inputs
+    -----------
+    Targets of shape ``(n_folds, n_trials, n_targets) = (4, 15, 2)``, with folds and trials along
+    axes 0 and 1.
+
+    Expected Output
+    ---------------
+    R² close to 1 for a noiseless linear target, negative or close to 0 for pure noise.
+    """
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(15, 2))
+    Y = np.stack([np.tile(X @ [1.0, -2.0] + 0.5, (4, 1)), rng.normal(size=(4, 15))], axis=-1)
+    r2, _ = CrossValidator().process(X=X, Y=Y, folds_axis=0, trials_axis=1)
+    assert r2[0] == pytest.approx(1.0), "Linear target not recovered"
+    assert r2[1] < 0.1, "Noise target explained"
+
+
+@pytest.mark.parametrize(
+    "n_folds, n_trials",
+    argvalues=[(1, 8), (3, 7), (0, 8)],
+    ids=["single_fold", "trials_mismatch", "no_fold"],
+)
+def test_invalid_shapes(n_folds, n_trials):
+    """
+    Test the validation of the folds and trials axes.
+
+    Expected Output
+    ---------------
+    ValueError, including for an empty folds axis.
+    """
+    X = np.ones((8, 2))
+    with pytest.raises(ValueError):
+        CrossValidator().process(X=X, Y=np.zeros((1, 3, n_folds, n_trials, 2)))
@@ -0,0 +1,92 @@
+"""
+`test_core.test_processors.test_fit_models.test_decoding` [module]
+
+See Also
+--------
+`core.processors.fit_models.decoding`: Tested module.
+"""
+
+import numpy as np
+import pytest
+
+from core.processors.fit_models.decoding import LinearDecoder
+
+
+def make_data(rng, n_ens=2, n_units=8, n_folds=3, n_trials=40, n_t=6, signal_bins=(2, 3)):
+    """Firing rates with a class-dependent offset in some time bins only."""
+    labels = np.repeat([0, 1], n_trials // 2)
+    data = rng.normal(size=(n_ens, n_units, n_folds, n_trials, n_t))
+    direction = rng.normal(size=(n_ens, n_units))
+    for t in signal_bins:
+        data[..., t] += 2 * direction[:, :, None, None] * (2 * labels - 1)
+    return data, labels
+
+
+def test_fit_matches_direct_lda():
+    """
+    Test the weights obtained from the downdated statistics against a direct computation.
+
+    Test Inputs
+    -----------
+    Training set: folds 1 and 2 of one ensemble (fold 0 held out), no shrinkage.
+
+    Expected Output
+    ---------------
+    Weights :math:`\\Sigma^{-1} \\mu_{c,t}` with the pooled within-class covariance computed from
+    the centered samples of all the classes and time bins.
+    """
+    rng = np.random.default_rng(0)
+    data, labels = make_data(rng)
+    x = data[0]
+    gram_folds, sums_folds = LinearDecoder.eval_stats(x, labels, 2)
+    counts = np.bincount(labels) * 2
+    weights, _ = LinearDecoder.fit(
+        gram_folds[1:].sum(axis=0), sums_folds[1:].sum(axis=0), counts, x.shape[-1], 0.0
+    )
+    train = x[:, 1:]  # (n_units, 2, n_trials, n_t)
+    means = np.stack([train[:, :, labels == c].mean(axis=(1, 2)) for c in (0, 1)])
+    centered = train - means[labels].transpose(1, 0, 2)[:, None]
+    samples = centered.reshape(len(x), -1)
+    cov = samples @ samples.T / (samples.shape[1] - 2 * x.shape[-1])
+    rhs = means.transpose(1, 2, 0).reshape(len(x), -1)  # (n_units, n_t * n_classes)
+    expected = np.linalg.solve(cov, rhs)
+    np.testing.assert_allclose(weights, expected.T.reshape(x.shape[-1], 2, len(x)))
+
+
+@pytest.mark.parametrize("cross_temporal", argvalues=[True, False], ids=["cross", "diagonal"])
+def test_process(cross_temporal):
+    """
+    Test the accuracy of time-resolved and cross-temporal decoding.
+
+    Test Inputs
+    -----------
+    Class signal along a fixed direction in time bins 2 and 3 only.
+
+    Expected Output
+    ---------------
+    High accuracy when training and testing within bins 2-3, chance level when training on a bin
+    without signal. The diagonal of the cross-temporal matrix equals the time-resolved accuracy.
+    """
+    rng = np.random.default_rng(1)
+    data, labels = make_data(rng)
+    decoder = LinearDecoder(shrinkage=0.1, cross_temporal=cross_temporal)
+    accuracy = decoder.process(data=data, labels=labels)
+    if cross_temporal:
+        assert accuracy.shape == (2, 3, 6, 6)
+        assert np.all(accuracy[..., 2, 3] > 0.9) and np.all(accuracy[..., 3, 2] > 0.9)
+        assert np.all(accuracy[..., 0, :].mean(axis=-1) < 0.75)
+        diagonal = LinearDecoder(cross_temporal=False).process(data=data, labels=labels)
+        np.testing.assert_allclose(np.diagonal(accuracy, axis1=2, axis2=3), diagonal)
+    else:
+        assert accuracy.shape == (2, 3, 6)
+        assert np.all(accuracy[..., [2, 3]] > 0.9)
+        assert np.all(accuracy[..., [0, 1, 4, 5]].mean(axis=-1) < 0.75)
+
+
+def test_process_invalid():
+    """
+    Test that decoding without cross-validation folds raises an error.
+    """
+    data = np.zeros((1, 3, 1, 4, 2))
+    with pytest.raises(ValueError):
+        LinearDecoder().process(data=data, labels=np.array([0, 0, 1, 1]))
@@ -0,0 +1,110 @@
+"""
+`test_core.test_processors.test_fit_models.test_design_matrix` [module]
+
+Notes
+-----
+Experimental conditions are represented by hashable mappings from the factor classes to their
+values, which is the interface used by the builder (``condition.get(factor)``).
+
+See Also
+--------
+`core.processors.fit_models.design_matrix`: Tested module.
+"""
+
+import numpy as np
+import pytest
+
+from core.attributes.exp_factors import Task, Category
+from core.processors.fit_models.design_matrix import DesignMatrixBuilder, build_design
+
+
+class Condition(dict):
+    """Hashable experimental condition mapping factor classes to their values."""
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+
+COND_PTD_R = Condition({Task: Task("PTD"), Category: Category("R")})
+COND_PTD_T = Condition({Task: Task("PTD"), Category: Category("T")})
+COND_CLK_R = Condition({Task: Task("CLK"), Category: Category("R")})
+COND_CLK_T = Condition({Task: Task("CLK"), Category: Category("T")})
+ORDER = (COND_PTD_R, COND_PTD_T, COND_CLK_R, COND_CLK_T)
+COUNTS = {COND_PTD_R: 3, COND_PTD_T: 2, COND_CLK_R: 1, COND_CLK_T: 4}
+
+
+def labels(factor):
+    """Labels of one factor for each trial, obtained by scanning the conditions."""
+    return np.concatenate([[c[factor]] * COUNTS[c] for c in ORDER])
+
+
+@pytest.mark.parametrize(
+    "encoding, expected_names",
+    argvalues=[
+        ("onehot", ("task[CLK]", "task[PTD]", "category[R]", "category[T]")),
+        ("effect", ("task[PTD]", "category[T]")),
+    ],
+    ids=["onehot", "effect"],
+)
+def test_encodings(encoding, expected_names):
+    """
+    Test the encodings of the factors against the trial labels.
+
+    Expected Output
+    ---------------
+    One-hot: indicator of each level. Effect: 1 for the level, -1 for the reference level.
+    """
+    X, names = DesignMatrixBuilder(factors=(Task, Category), encoding=encoding).process(
+        order_conditions=ORDER, counts_by_condition=COUNTS
+    )
+    assert names == expected_names
+    assert X.shape == (10, len(expected_names))
+    task, categ = labels(Task), labels(Category)
+    if encoding == "onehot":
+        np.testing.assert_array_equal(X[:, 1], task == "PTD")
+        np.testing.assert_array_equal(X[:, 3], categ == "T")
+    else:
+        np.testing.assert_array_equal(X[:, 0], np.where(task == "PTD", 1, -1))
+        np.testing.assert_array_equal(X[:, 1], np.where(categ == "T", 1, -1))
+
+
+def test_interaction_and_normalize():
+    """
+    Test an interaction term and the normalization of the regressors.
+
+    Expected Output
+    ---------------
+    Interaction equal to the product of the main effects (before normalization). Normalized
+    columns with zero mean and unit variance across trials.
+    """
+    builder = DesignMatrixBuilder(factors=(Task, Category), interactions=((Task, Category),))
+    X, names = builder.process(order_conditions=ORDER, counts_by_condition=COUNTS)
+    assert names[-1] == "task[PTD]:category[T]"
+    np.testing.assert_array_equal(X[:, 2], X[:, 0] * X[:, 1])
+    builder = DesignMatrixBuilder(
+        factors=(Task, Category), interactions=((Task, Category),), normalize=True
+    )
+    Z, _ = builder.process(order_conditions=ORDER, counts_by_condition=COUNTS)
+    np.testing.assert_allclose(Z.mean(axis=0), 0, atol=1e-12)
+    np.testing.assert_allclose(Z.std(axis=0), 1, atol=1e-12)
+
+
+def test_cache():
+    """
+    Test that identical conditions and counts reuse the cached read-only matrix.
+
+    Expected Output
+    ---------------
+    The same array object for two builders with the same configuration, and a new array for
+    different counts.
+    """
+    build_design.cache_clear()
+    kwargs = {"order_conditions": ORDER, "counts_by_condition": COUNTS}
+    X1, _ = DesignMatrixBuilder(factors=(Task,)).process(**kwargs)
+    X2, _ = DesignMatrixBuilder(factors=(Task,)).process(**kwargs)
+    assert X1 is X2, "Design matrix rebuilt"
+    assert not X1.flags.writeable, "Cached matrix is writeable"
+    X3, _ = DesignMatrixBuilder(factors=(Task,)).process(
+        order_conditions=ORDER, counts_by_condition={**COUNTS, COND_CLK_T: 5}
+    )
+    assert X3.shape == (11, 1), "Cache key ignores the counts"
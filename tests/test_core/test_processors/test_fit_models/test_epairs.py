@@ -0,0 +1,107 @@
+"""
+`test_core.test_processors.test_fit_models.test_epairs` [module]
+
+See Also
+--------
+`core.processors.fit_models.epairs`: Tested module.
+"""
+
+import numpy as np
+import pytest
+
+from core.processors.fit_models.epairs import EPAIRS
+
+
+def reference_nn_angles(B, k):
+    """Nearest-neighbor angles computed with explicit loops over pairs of units."""
+    n = len(B)
+    angles = np.zeros(n)
+    for i in range(n):
+        others = []
+        for j in range(n):
+            if i != j:
+                cos = B[i] @ B[j] / (np.linalg.norm(B[i]) * np.linalg.norm(B[j]))
+                others.append(np.arccos(np.clip(cos, -1, 1)))
+        angles[i] = np.mean(sorted(others)[:k])
+    return angles
+
+
+def test_nn_angles():
+    """
+    Test the vectorized nearest-neighbor angles against explicit loops, with a batch dimension.
+    """
+    rng = np.random.default_rng(0)
+    B = rng.normal(size=(2, 30, 4))
+    angles = EPAIRS.nn_angles(B, n_neighbors=3)
+    assert angles.shape == (2, 30)
+    for b in range(2):
+        np.testing.assert_allclose(angles[b], reference_nn_angles(B[b], 3))
+
+
+def test_eval_batch_size():
+    """
+    Test that the batch size respects the memory budget and the number of draws.
+
+    Expected Output
+    ---------------
+    Budget per draw: two cosine matrices and three tensors of vectors, in float64.
+    """
+    per_draw = (2 * 100 * 100 + 3 * 100 * 4) * 8
+    assert EPAIRS.eval_batch_size(100, 4, n_null=1000, max_bytes=per_draw * 7) == 7
+    assert EPAIRS.eval_batch_size(100, 4, n_null=1000, max_bytes=per_draw * 7 - 1) == 6
+    assert EPAIRS.eval_batch_size(100, 4, n_null=5, max_bytes=1 << 30) == 5
+    assert EPAIRS.eval_batch_size(10_000, 4, n_null=5, max_bytes=1) == 1
+
+
+def test_budget_shared(mocker):
+    """
+    Test that the memory budget is divided across the threads.
+
+    Expected Output
+    ---------------
+    Each ensemble samples its null with the budget divided by the number of threads (bounded by
+    the number of ensembles).
+    """
+    spy = mocker.spy(EPAIRS, "sample_null")
+    B = np.random.default_rng(0).normal(size=(3, 10, 2))
+    EPAIRS(n_null=5, max_bytes=1200, n_workers=4).process(coefficients=B)
+    assert [call.args[3] for call in spy.call_args_list] == [400] * 3
+
+
+@pytest.mark.parametrize(
+    "clustered, offset",
+    argvalues=[(True, 0.0), (False, 0.0), (False, 3.0)],
+    ids=["clustered", "random", "offset"],
+)
+def test_process(clustered, offset):
+    """
+    Test the p-values for clustered and non-clustered selectivity vectors.
+
+    Test Inputs
+    -----------
+    Three ensembles of 60 units in 3 dimensions:
+
+    - clustered: vectors concentrated around 3 orthogonal directions;
+    - random: Gaussian vectors (same distribution as the null);
+    - offset: Gaussian vectors shifted by a common offset (same distribution as the null after
+      centering).
+
+    Expected Output
+    ---------------
+    Significant p-values for the clustered vectors only. Identical results for identical seeds.
+    """
+    rng = np.random.default_rng(1)
+    if clustered:
+        centers = np.repeat(np.eye(3), 20, axis=0)
+        B = centers[None] + 0.05 * rng.normal(size=(3, 60, 3))
+    else:
+        B = offset + rng.normal(size=(3, 60, 3))
+    epairs = EPAIRS(n_null=200, max_bytes=60 * 60 * 16 * 32, n_workers=2)
+    angles, null_stats, p_values = epairs.process(coefficients=B, seed=0)
+    assert angles.shape == (3, 60) and null_stats.shape == (3, 200) and p_values.shape == (3,)
+    if clustered:
+        assert np.all(p_values < 0.01), f"Clusters not detected: {p_values}"
+    else:
+        assert np.all(p_values > 0.01), f"False positive: {p_values}"
+    _, null_stats_2, _ = epairs.process(coefficients=B, seed=0)
+    np.testing.assert_array_equal(null_stats, null_stats_2)
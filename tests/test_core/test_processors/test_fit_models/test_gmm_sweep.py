@@ -0,0 +1,93 @@
+"""
+`test_core.test_processors.test_fit_models.test_gmm_sweep` [module]
+
+See Also
+--------
+`core.processors.fit_models.gmm_sweep`: Tested module.
+"""
+
+import numpy as np
+import pytest
+from scipy.stats import multivariate_normal
+
+from core.processors.fit_models.gmm_sweep import GMMSweep, fit_chain, fit_em, log_densities
+
+
+def make_clusters(rng, n_clusters, n_per_cluster=40, n_features=2, spread=0.1):
+    """Samples around `n_clusters` well-separated centers."""
+    centers = 3 * np.eye(max(n_clusters, n_features))[:n_clusters, :n_features]
+    centers[:, 0] += 3 * np.arange(n_clusters)
+    X = np.repeat(centers, n_per_cluster, axis=0)
+    return X + spread * rng.normal(size=X.shape)
+
+
+def test_log_densities():
+    """
+    Test the vectorized log-densities against `scipy.stats.multivariate_normal`.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(50, 3))
+    means = rng.normal(size=(2, 3))
+    A = rng.normal(size=(2, 3, 3))
+    covs = A @ np.swapaxes(A, 1, 2) + np.eye(3)
+    expected = np.column_stack([multivariate_normal(means[j], covs[j]).logpdf(X) for j in range(2)])
+    np.testing.assert_allclose(log_densities(X, means, covs), expected)
+
+
+def test_fit_em_monotonic():
+    """
+    Test that EM does not decrease the log-likelihood with more iterations.
+    """
+    rng = np.random.default_rng(1)
+    X = make_clusters(rng, 3)
+    means = X[rng.choice(len(X), 3, replace=False)]
+    init = (np.full(3, 1 / 3), means, np.tile(np.eye(2), (3, 1, 1)))
+    lls = [fit_em(X, init, n_iter, tol=0.0, reg_covar=1e-6)[1] for n_iter in (1, 5, 20)]
+    assert lls[0] <= lls[1] + 1e-9 <= lls[2] + 2e-9
+
+
+def test_fit_chain():
+    """
+    Test the log-likelihood increases of chains on data with 3 clusters.
+
+    Expected Output
+    ---------------
+    Best log-likelihoods across chains: large increases up to k=3, small increases beyond. A single
+    chain may miss the optimum when it splits the wrong component, hence several restarts.
+    """
+    rng = np.random.default_rng(2)
+    X = make_clusters(rng, 3)
+    seeds = np.random.SeedSequence(0).spawn(5)
+    lls = np.max([fit_chain(X, k_max=5, seed=seed) for seed in seeds], axis=0)
+    delta = np.diff(lls)
+    assert lls.shape == (5,)
+    assert np.all(delta[:2] > 50)
+    assert np.all(np.abs(delta[2:]) < delta[:2].min() / 2)
+
+
+@pytest.mark.parametrize("n_workers", argvalues=[1, 2], ids=["serial", "pool"])
+def test_process(n_workers):
+    """
+    Test the table of the sweep across ensembles, serially and in a process pool.
+
+    Test Inputs
+    -----------
+    Two ensembles with 2 and 3 clusters respectively.
+
+    Expected Output
+    ---------------
+    One row per ensemble and k, with NaN increases for k=1. Identical tables regardless of the
+    number of workers.
+    """
+    rng = np.random.default_rng(3)
+    B = np.stack([make_clusters(rng, 2, n_per_cluster=60), make_clusters(rng, 3)])
+    sweep = GMMSweep(k_max=4, n_restarts=3, n_workers=n_workers)
+    table = sweep.process(coefficients=B, seed=0)
+    assert list(table.columns) == ["ensemble", "k", "log_likelihood", "delta_log_likelihood"]
+    assert len(table) == 2 * 4
+    assert table.loc[table["k"] == 1, "delta_log_likelihood"].isna().all()
+    delta = table.pivot(index="ensemble", columns="k", values="delta_log_likelihood")
+    assert delta.loc[0, 2] > 50 and delta.loc[0, 3] < delta.loc[0, 2] / 2
+    assert delta.loc[1, 3] > 50
+    serial = GMMSweep(k_max=4, n_restarts=3, n_workers=1).process(coefficients=B, seed=0)
+    np.testing.assert_allclose(table["log_likelihood"], serial["log_likelihood"])
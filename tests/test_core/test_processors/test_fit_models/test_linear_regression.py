@@ -0,0 +1,112 @@
+"""
+`test_core.test_processors.test_fit_models.test_linear_regression` [module]
+
+Notes
+-----
+Reference solutions are obtained with `np.linalg.lstsq`, fitted separately for each target.
+
+See Also
+--------
+`core.processors.fit_models.linear_regression`: Tested module.
+"""
+
+import numpy as np
+import pytest
+
+from core.processors.fit_models.linear_regression import LinearRegressionModel
+
+
+def reference_fit(X, y, fit_intercept):
+    """Fit one target with `np.linalg.lstsq`, returning the coefficients and the intercept."""
+    if fit_intercept:
+        X = np.column_stack([np.ones(len(X)), X])
+    b = np.linalg.lstsq(X, y, rcond=None)[0]
+    return (b[1:], b[0]) if fit_intercept else (b, 0.0)
+
+
+@pytest.mark.parametrize("method", argvalues=["qr", "pinv"], ids=["qr", "pinv"])
+@pytest.mark.parametrize("fit_intercept", argvalues=[True, False], ids=["intercept", "centered"])
+def test_process_batched(method, fit_intercept):
+    """
+    Test that the batched solution matches independent fits for each target.
+
+    Test Inputs
+    -----------
+    X : np.ndarray
+        Random design matrix. Shape: ``(n_trials, n_features) = (30, 4)``.
+    Y : np.ndarray
+        Random targets with trials along axis 2. Shape: ``(n_ens, n_units, n_trials, n_t)``.
+
+    Expected Output
+    ---------------
+    Coefficients of shape ``(n_ens, n_units, n_features, n_t)`` and intercepts of shape
+    ``(n_ens, n_units, n_t)`` equal to the reference solutions.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(30, 4))
+    Y = rng.normal(size=(2, 3, 30, 5))
+    model = LinearRegressionModel(fit_intercept=fit_intercept, method=method)
+    coefficients, intercept = model.process(X=X, Y=Y, axis=2)
+    assert coefficients.shape == (2, 3, 4, 5), "Wrong shape for coefficients"
+    assert intercept.shape == (2, 3, 5), "Wrong shape for intercept"
+    for idx in np.ndindex(2, 3):
+        for t in range(5):
+            b, b0 = reference_fit(X, Y[idx][:, t], fit_intercept)
+            np.testing.assert_allclose(coefficients[idx][:, t], b, atol=1e-10)
+            np.testing.assert_allclose(intercept[idx][t], b0, atol=1e-10)
+
+
+def test_process_1d_and_predict():
+    """
+    Test the fit of a single exact linear target and the predictions.
+
+    Expected Output
+    ---------------
+    Exact recovery of the coefficients and the intercept, and predictions equal to the target.
+    """
+    X = np.arange(20, dtype=float).reshape(10, 2) ** 0.5
+    y = 3 * X[:, 0] - 2 * X[:, 1] + 1
+    model = LinearRegressionModel()
+    coefficients, intercept = model.process(X=X, Y=y)
+    np.testing.assert_allclose(coefficients, [3, -2], atol=1e-8)
+    np.testing.assert_allclose(intercept, 1, atol=1e-8)
+    np.testing.assert_allclose(model.predict(X, coefficients, intercept), y, atol=1e-8)
+
+
+def test_rank_deficient():
+    """
+    Test the fallback to the pseudo-inverse for a rank-deficient design matrix.
+
+    Test Inputs
+    -----------
+    X : np.ndarray
+        Design matrix with two identical columns.
+
+    Expected Output
+    ---------------
+    Minimum-norm solution: the weight is split equally between the identical columns.
+    """
+    x = np.linspace(-1, 1, 12)
+    X = np.column_stack([x, x])
+    coefficients, _ = LinearRegressionModel(method="qr").process(X=X, Y=2 * x)
+    np.testing.assert_allclose(coefficients, [1, 1], atol=1e-8)
+
+
+def test_shared_operator():
+    """
+    Test that a precomputed operator gives the same result as the internal factorization.
+    """
+    rng = np.random.default_rng(1)
+    X, Y = rng.normal(size=(15, 3)), rng.normal(size=(15, 8))
+    model = LinearRegressionModel()
+    operator = model.factorize(X, fit_intercept=True)
+    expected = model.process(X=X, Y=Y)
+    actual = model.process(X=X, Y=Y, operator=operator)
+    for a, e in zip(actual, expected):
+        np.testing.assert_allclose(a, e)
+
+
+def test_invalid_shapes():
+    """Test the error raised when the numbers of trials differ between X and Y."""
+    with pytest.raises(ValueError):
+        LinearRegressionModel().process(X=np.zeros((5, 2)), Y=np.zeros((4, 3)))
@@ -0,0 +1,9 @@
+"""
+:mod:`test_core.test_parse` [subpackage]
+
+Tests for the subpackage :mod:`core.processors.parse`.
+
+Modules
+-------
+test_parse.test_extract_events: Tests :mod:`core.processors.parse.extract_events`.
+"""
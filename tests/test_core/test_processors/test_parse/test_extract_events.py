@@ -0,0 +1,215 @@
+"""
+:mod:`test_core.test_parse.test_extract_events` [module]
+
+See Also
+--------
+:mod:`core.processors.parse.extract_events`: Tested module.
+"""
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pandas as pd
+import pytest
+
+from core.processors.parse.extract_events import SessionParser
+
+
+PRE = "'PreStimSilence , TORC_448_06_v501 , Reference'"
+STIM_R = "'Stim , TORC_448_06_v501 , Reference'"
+STIM_T = "'Stim , 2000 , Target'"
+POST = "'PostStimSilence , TORC_448_06_v501 , Reference'"
+
+EVENTS = [
+    "TRIALSTART",  # block 1
+    PRE,
+    STIM_R,
+    POST,
+    PRE,
+    STIM_R,  # warning stimulus
+    STIM_T,
+    "BEHAVIOR,SHOCKON",
+    POST,
+    "TRIALSTOP",
+    "TRIALSTART",  # block 2
+    PRE,
+    STIM_R,
+    POST,
+    PRE,  # interrupted slot
+    STIM_R,
+    "TRIALSTOP",
+    "TRIALSTART",  # unclosed block
+    PRE,
+    STIM_R,
+    POST,
+]
+
+
+@pytest.fixture
+def events():
+    """Raw events table with the columns of the CSV files. Times: index of the event."""
+    n = len(EVENTS)
+    return pd.DataFrame(
+        {
+            "TrialNum": np.zeros(n, dtype=int),
+            "Event": EVENTS,
+            "StartTime": np.arange(n, dtype=float),
+            "StopTime": np.arange(n, dtype=float) + 0.5,
+        }
+    )
+
+
+def test_session_parser(events):
+    """
+    Test :meth:`SessionParser.process` on a table covering the main configurations.
+
+    Test Inputs
+    -----------
+    events : pd.DataFrame
+        Block 1: Two slots, the second one with a warning stimulus and a shock.
+        Block 2: One complete slot and one interrupted slot (no PostStimSilence).
+        Block 3: Never closed.
+
+    Expected Outputs
+    ----------------
+    Three slots: two in block 1, one in block 2.
+    """
+    slot, block, categ, t_on, t_off, t_warn, t_end, error = SessionParser().process(events=events)
+    assert_array_equal(slot, [1, 2, 1])
+    assert_array_equal(block, [1, 1, 2])
+    assert_array_equal(categ, ["R", "T", "R"])
+    assert_array_equal(t_on, [2.0, 6.0, 12.0])
+    assert_array_equal(t_off, [2.5, 6.5, 12.5])
+    assert_array_equal(t_warn, [np.nan, 5.0, np.nan])
+    assert_array_equal(t_end, [3.5, 8.5, 13.5])
+    assert_array_equal(error, [False, True, False])
+
+
+def test_session_parser_arrays(events):
+    """
+    Test :meth:`SessionParser.process` with a mapping of arrays named after the inputs.
+
+    Expected Outputs
+    ----------------
+    Identical results as with the raw DataFrame.
+    """
+    arrays = {
+        "description": events["Event"].to_numpy(),
+        "t_start": events["StartTime"].to_numpy(),
+        "t_end": events["StopTime"].to_numpy(),
+    }
+    parser = SessionParser()
+    for actual, expected in zip(parser.process(events=arrays), parser.process(events=events)):
+        assert_array_equal(actual, expected)
+
+
+@pytest.mark.parametrize(
+    "description, expected_type, expected_categ",
+    argvalues=[
+        (PRE, "PreStimSilence", "R"),
+        (STIM_T, "Stim", "T"),
+        ("TRIALSTART", "TRIALSTART", ""),
+        ("BEHAVIOR,SHOCKON", "BEHAVIOR,SHOCKON", ""),
+        ("'Stim , TORC , Unknown'", "Stim", "UNKNOWN"),
+    ],
+    ids=["prestim", "target", "single", "shock", "unknown"],
+)
+def test_tokenize(description, expected_type, expected_categ):
+    """
+    Test :meth:`SessionParser.tokenize` on individual descriptions.
+
+    Expected Outputs
+    ----------------
+    Event type (first token or shock label) and alias of the stimulus category.
+    """
+    event_type, category = SessionParser.tokenize(np.array([description, description]))
+    assert_array_equal(event_type, [expected_type] * 2)
+    assert_array_equal(category, [expected_categ] * 2)
+
+
+def test_mark_blocks():
+    """
+    Test :meth:`SessionParser.mark_blocks` with events outside blocks and an unclosed block.
+
+    Expected Outputs
+    ----------------
+    Delimiters and events outside closed blocks are assigned to 0.
+    """
+    event_type = np.array(
+        ["Stim", "TRIALSTART", "Stim", "TRIALSTOP", "Stim", "TRIALSTART", "Stim", "TRIALSTOP"]
+        + ["TRIALSTART", "Stim"]
+    )
+    expected = [0, 0, 1, 0, 0, 0, 2, 0, 0, 0]
+    assert_array_equal(SessionParser.mark_blocks(event_type), expected)
+
+
+@pytest.mark.parametrize(
+    "event_type, expected",
+    argvalues=[
+        (
+            ["TRIALSTART", "Stim", "TRIALSTOP", "TRIALSTOP", "TRIALSTART", "Stim", "TRIALSTOP"],
+            [0, 1, 0, 0, 0, 2, 0],
+        ),
+        (
+            ["TRIALSTART", "Stim", "TRIALSTART", "Stim", "TRIALSTOP", "Stim"]
+            + ["TRIALSTART", "Stim", "TRIALSTOP"],
+            [0, 0, 0, 1, 0, 0, 0, 2, 0],
+        ),
+    ],
+    ids=["duplicate_stop", "unclosed_then_outside"],
+)
+def test_mark_blocks_malformed(event_type, expected):
+    """
+    Test :meth:`SessionParser.mark_blocks` on malformed sequences of delimiters.
+
+    Test Inputs
+    -----------
+    event_type : list[str]
+        Duplicate ``TRIALSTOP`` between two blocks, or unclosed block followed by an event after a
+        ``TRIALSTOP``.
+
+    Expected Outputs
+    ----------------
+    Later blocks are kept and numbered consecutively, events after a ``TRIALSTOP`` are outside
+    blocks.
+    """
+    assert_array_equal(SessionParser.mark_blocks(np.array(event_type)), expected)
+
+
+@pytest.mark.parametrize(
+    "events_list, expected",
+    argvalues=[
+        (
+            ["TRIALSTART", PRE, STIM_R, POST, "TRIALSTOP", "TRIALSTOP"]
+            + ["TRIALSTART", PRE, STIM_R, POST, "TRIALSTOP"],
+            ([1, 1], [1, 2]),
+        ),
+        (
+            ["TRIALSTART", PRE, STIM_R, POST, "TRIALSTART", PRE, STIM_R, POST, "TRIALSTOP"]
+            + [PRE, STIM_R, POST, "TRIALSTART", PRE, STIM_R, POST, "TRIALSTOP"],
+            ([1, 1], [1, 2]),
+        ),
+    ],
+    ids=["duplicate_stop", "unclosed_then_outside"],
+)
+def test_session_parser_malformed(events_list, expected):
+    """
+    Test :meth:`SessionParser.process` on malformed event tables.
+
+    Expected Outputs
+    ----------------
+    expected : Tuple[List[int], List[int]]
+        Slots (within blocks) and blocks: one slot in each closed block, the events outside
+        blocks being ignored.
+    """
+    n = len(events_list)
+    events = pd.DataFrame(
+        {
+            "TrialNum": np.zeros(n, dtype=int),
+            "Event": events_list,
+            "StartTime": np.arange(n, dtype=float),
+            "StopTime": np.arange(n, dtype=float) + 0.5,
+        }
+    )
+    slot, block, *_ = SessionParser().process(events=events)
+    assert_array_equal(slot, expected[0])
+    assert_array_equal(block, expected[1])
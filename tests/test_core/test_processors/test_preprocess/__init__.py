@@ -6,4 +6,8 @@ Tests for the subpackage :mod:`core.preprocess`.
 Modules
 -------
 test_preprocess.test_firing_rates: Tests :mod:`core.processors.preprocess.firing_rates`.
+test_preprocess.test_count_cache: Tests :mod:`core.processors.preprocess.count_cache`.
+test_preprocess.test_denoise_pca: Tests :mod:`core.processors.preprocess.denoise_pca`.
+test_preprocess.test_group_trials: Tests :mod:`core.processors.preprocess.group_trials`.
+test_preprocess.test_z_score: Tests :mod:`core.processors.preprocess.z_score`.
 """
@@ -0,0 +1,131 @@
+"""
+`test_core.test_processors.test_preprocess.test_count_cache` [module]
+
+Notes
+-----
+The rates derived from the fine counts are compared to the direct conversion of the spike times by
+`FiringRatesConverter`, trial by trial.
+
+See Also
+--------
+`core.processors.preprocess.count_cache`: Tested module.
+"""
+
+import numpy as np
+import pytest
+
+from core.constants import SMPL_RATE
+from core.processors.preprocess.convert_to_rates import FiringRatesConverter
+from core.processors.preprocess.count_cache import DT_FINE, FineCounts, FineCountsCache
+
+
+N_TRIALS = 4
+T_MAX = 1.0
+
+
+@pytest.fixture
+def spikes_trials():
+    """Spike times on the sampling grid of the recordings, and their trial indices."""
+    rng = np.random.default_rng(0)
+    trials = rng.integers(0, N_TRIALS, size=400)
+    spikes = rng.integers(0, int(T_MAX * SMPL_RATE), size=400) / SMPL_RATE
+    return spikes, trials
+
+
+def test_from_spikes(spikes_trials):
+    """
+    Test that the fine counts preserve the number of spikes of each trial.
+    """
+    spikes, trials = spikes_trials
+    fine = FineCounts.from_spikes(spikes, trials, N_TRIALS, T_MAX)
+    assert fine.counts.shape == (N_TRIALS, int(round(T_MAX / DT_FINE)))
+    np.testing.assert_array_equal(fine.counts.sum(axis=1), np.bincount(trials, minlength=N_TRIALS))
+
+
+@pytest.mark.parametrize(
+    "t_bin, smooth_window, mode",
+    argvalues=[
+        (0.01, 0.05, "valid"),
+        (0.05, 0.1, "valid"),
+        (0.01, 0.05, "same"),
+        (0.02, 0.1, "same"),
+    ],
+)
+def test_rates_match_converter(spikes_trials, t_bin, smooth_window, mode):
+    """
+    Test that the rates derived from the fine counts match the direct conversion.
+
+    Test Inputs
+    -----------
+    Time bins which are integer multiples of the fine bin, both convolution modes.
+
+    Expected Output
+    ---------------
+    Same smoothed rates as `FiringRatesConverter.process` on the spikes of each trial.
+    """
+    spikes, trials = spikes_trials
+    fine = FineCounts.from_spikes(spikes, trials, N_TRIALS, T_MAX)
+    rates = fine.rates(t_bin=t_bin, smooth_window=smooth_window, mode=mode)
+    converter = FiringRatesConverter(t_bin, T_MAX, smooth_window, mode)
+    for trial in range(N_TRIALS):
+        expected = converter.process(spikes[trials == trial])
+        np.testing.assert_allclose(rates[trial], expected, atol=1e-9)
+
+
+def test_rebin_invalid():
+    """
+    Test that a time bin which is not a multiple of the fine bin raises an error.
+    """
+    fine = FineCounts(counts=np.zeros((1, 1000), dtype=np.int32))
+    with pytest.raises(ValueError):
+        fine.rebin(0.0015)
+
+
+def test_rates_invalid_window():
+    """
+    Test that a smoothing window shorter than the time bin raises an error.
+    """
+    fine = FineCounts(counts=np.zeros((1, 1000), dtype=np.int32))
+    with pytest.raises(ValueError):
+        fine.rates(t_bin=0.01, smooth_window=0.005)
+
+
+def test_cache(tmp_path, spikes_trials):
+    """
+    Test that the cache saves the counts on disk and reloads them in a new cache.
+    """
+    spikes, trials = spikes_trials
+    cache = FineCountsCache(tmp_path)
+    fine = cache.get("unit1", spikes, trials, N_TRIALS, T_MAX)
+    assert cache.path_ruler.get_path("unit1").with_suffix(".npz").is_file()
+    reloaded = FineCountsCache(tmp_path).get("unit1", spikes[:0], trials[:0], N_TRIALS, T_MAX)
+    np.testing.assert_array_equal(reloaded.counts, fine.counts)
+    assert reloaded.dt == fine.dt
+
+
+def test_cache_stale_source(tmp_path, spikes_trials):
+    """
+    Test that the cached counts are recomputed when the spike file of the unit changes.
+
+    Test Inputs
+    -----------
+    Spike file rewritten with half of the spikes after the first call (new size and modification
+    time), with the same number of trials.
+
+    Expected Output
+    ---------------
+    The second call (in a new cache, from disk) returns the counts of the new spikes, and a third
+    call without change reuses them.
+    """
+    spikes, trials = spikes_trials
+    source = tmp_path / "unit1_spk.npy"
+    np.save(source, spikes)
+    FineCountsCache(tmp_path).get("unit1", spikes, trials, N_TRIALS, T_MAX, source=source)
+    spikes, trials = spikes[::2], trials[::2]
+    np.save(source, spikes)
+    fine = FineCountsCache(tmp_path).get("unit1", spikes, trials, N_TRIALS, T_MAX, source=source)
+    assert fine.counts.sum() == len(spikes)
+    reloaded = FineCountsCache(tmp_path).get(
+        "unit1", spikes[:0], trials[:0], N_TRIALS, T_MAX, source=source
+    )
+    np.testing.assert_array_equal(reloaded.counts, fine.counts)
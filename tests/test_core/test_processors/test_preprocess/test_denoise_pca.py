@@ -0,0 +1,196 @@
+"""
+`test_core.test_processors.test_preprocess.test_denoise_pca` [module]
+
+Notes
+-----
+Test data: firing rates generated from a low-dimensional latent signal mixed into many units (same
+mixing in all the folds), with one latent pattern per condition, plus independent noise in each
+trial.
+
+See Also
+--------
+`core.processors.preprocess.denoise_pca`: Tested module.
+"""
+
+import numpy as np
+import pytest
+
+from core.processors.preprocess.denoise_pca import PCADenoiser
+
+
+def make_population(n_ens=2, n_units=60, n_folds=2, counts=(15, 10, 5), n_t=8, rank=2, noise=0.5):
+    """
+    Generate firing rates with a low-rank condition structure.
+
+    Returns
+    -------
+    data : np.ndarray
+        Shape: ``(n_ens, n_units, n_folds, n_trials, n_t)``.
+    signal : np.ndarray
+        Noiseless firing rates, same shape.
+    """
+    rng = np.random.default_rng(0)
+    mixing = rng.normal(size=(n_ens, n_units, 1, 1, 1, rank))
+    latents = rng.normal(size=(len(counts), n_t, rank))
+    latents_trials = np.repeat(latents, counts, axis=0)  # (n_trials, n_t, rank)
+    signal = np.sum(mixing * latents_trials, axis=-1) + np.zeros((1, 1, n_folds, 1, 1)) + 10.0
+    data = signal + noise * rng.normal(size=signal.shape)
+    return data, signal
+
+
+def test_condition_means():
+    """
+    Test the grouped reduction over contiguous blocks of trials.
+
+    Expected Output
+    ---------------
+    Means equal to those obtained by slicing each block.
+    """
+    x = np.arange(2 * 6 * 3, dtype=float).reshape(2, 6, 3)
+    counts = np.array([1, 3, 2])
+    means = PCADenoiser.condition_means(x, counts)
+    assert means.shape == (2, 3, 3)
+    for i, (start, end) in enumerate([(0, 1), (1, 4), (4, 6)]):
+        np.testing.assert_allclose(means[:, i], x[:, start:end].mean(axis=1))
+
+
+def test_training_means():
+    """
+    Test the condition means of the training folds.
+
+    Expected Output
+    ---------------
+    For each held-out fold, means equal to those computed on the trials of the other folds.
+    """
+    data, _ = make_population(n_folds=3)
+    counts = np.array([15, 10, 5])
+    train = PCADenoiser.training_means(PCADenoiser.condition_means(data, counts))
+    assert train.shape == (2, 3, 60, 3 * 8)
+    for k in range(3):
+        trials = np.delete(data, k, axis=2)  # (n_ens, n_units, 2, n_trials, n_t)
+        expected = PCADenoiser.condition_means(trials, counts).mean(axis=2)
+        np.testing.assert_allclose(train[:, k], expected.reshape(2, 60, -1))
+
+
+def test_fit_components_batched():
+    """
+    Test the batched fit against the SVD of each stacked matrix.
+
+    Expected Output
+    ---------------
+    Same number of components and same subspace as the separate decompositions, with zero columns
+    beyond the number of components of each matrix.
+    """
+    rng = np.random.default_rng(2)
+    means = rng.normal(size=(2, 3, 20, 12)) * 0.6 ** np.arange(12)
+    means[1, 2] = 5.0  # constant condition means: no variance
+    denoiser = PCADenoiser(var_explained=0.8)
+    mu, components, n_components = denoiser.fit_components(means)
+    assert n_components[1, 2] == 0 and not np.any(components[1, 2])
+    for i in range(2):
+        for k in range(3):
+            if (i, k) == (1, 2):
+                continue
+            A = means[i, k] - means[i, k].mean(axis=1, keepdims=True)
+            U, S, _ = np.linalg.svd(A, full_matrices=False)
+            n = np.argmax(np.cumsum(S**2) / np.sum(S**2) >= 0.8) + 1
+            assert n_components[i, k] == n
+            W = components[i, k, :, :n]
+            np.testing.assert_allclose(W @ W.T, U[:, :n] @ U[:, :n].T, atol=1e-10)
+            assert not np.any(components[i, k, :, n:])
+    np.testing.assert_allclose(mu, means.mean(axis=-1))
+
+
+def test_process_low_rank():
+    """
+    Test that denoising recovers the dimensionality and reduces the noise.
+
+    Expected Output
+    ---------------
+    Number of components at most the rank of the signal, and denoised data closer to the
+    noiseless signal than the input.
+    """
+    data, signal = make_population()
+    denoised, n_components = PCADenoiser(var_explained=0.9).process(data=data, counts=[15, 10, 5])
+    assert n_components.shape == (2, 2)
+    assert np.all((n_components >= 1) & (n_components <= 2)), f"{n_components}"
+    error_in = np.mean((data - signal) ** 2)
+    error_out = np.mean((denoised - signal) ** 2)
+    assert error_out < 0.2 * error_in, "Noise not reduced"
+
+
+def test_process_in_place():
+    """
+    Test that the output can be written in place, with results identical to a separate output.
+    """
+    data, _ = make_population()
+    denoiser = PCADenoiser(chunk_trials=7)
+    expected, _ = denoiser.process(data=data, counts=[15, 10, 5])
+    result, _ = denoiser.process(data=data, counts=[15, 10, 5], out=data)
+    assert result is data, "Output not written in place"
+    np.testing.assert_allclose(data, expected)
+
+
+def test_no_leakage():
+    """
+    Test that the subspace applied to each fold does not depend on the trials of this fold.
+
+    Test Inputs
+    -----------
+    Population in which the trials of fold 0 are replaced by large noise.
+
+    Expected Output
+    ---------------
+    Denoised folds 1 and 2 change (their training set includes fold 0), but the projection of fold
+    0 uses the same components as before: its output is the projection of the new trials onto the
+    subspace fitted on folds 1 and 2.
+    """
+    data, _ = make_population(n_folds=3)
+    denoiser = PCADenoiser(var_explained=0.9)
+    counts = [15, 10, 5]
+    _, n_ref = denoiser.process(data=data, counts=counts)
+    noisy = data.copy()
+    noisy[:, :, 0] = np.random.default_rng(3).normal(scale=50.0, size=noisy[:, :, 0].shape)
+    denoised, n_components = denoiser.process(data=noisy, counts=counts)
+    assert np.array_equal(n_components[:, 0], n_ref[:, 0]), "Held-out fold used in the fit"
+    means = denoiser.training_means(denoiser.condition_means(data, np.array(counts)))
+    mu, components, _ = denoiser.fit_components(means)
+    expected = np.empty_like(noisy)
+    denoiser.project(noisy, mu, components, expected, chunk_trials=256)
+    np.testing.assert_allclose(denoised[:, :, 0], expected[:, :, 0])
+
+
+@pytest.mark.parametrize(
+    "max_bytes", argvalues=[1, 200_000], ids=["one_ensemble", "two_ensembles"]
+)
+def test_process_batches(max_bytes):
+    """
+    Test that processing the ensembles in batches under a memory budget gives the same results.
+
+    Test Inputs
+    -----------
+    max_bytes : int
+        Budget smaller than the arrays of one ensemble (batches of 1), or fitting 2 ensembles.
+
+    Expected Output
+    ---------------
+    Denoised data and numbers of components identical to a single batch of all the ensembles.
+    """
+    data, _ = make_population(n_ens=5)
+    counts = [15, 10, 5]
+    expected, n_expected = PCADenoiser().process(data=data, counts=counts)
+    n_units, n_folds, n_samples = data.shape[1], data.shape[2], len(counts) * data.shape[4]
+    batch = PCADenoiser.eval_batch_size(n_units, n_folds, n_samples, 5, max_bytes)
+    assert batch == (1 if max_bytes == 1 else 2)
+    denoised, n_components = PCADenoiser(max_bytes=max_bytes).process(data=data, counts=counts)
+    np.testing.assert_allclose(denoised, expected)
+    assert np.array_equal(n_components, n_expected)
+
+
+def test_invalid_counts():
+    """Test the errors raised for counts which do not sum to the number of trials, or one fold."""
+    data, _ = make_population()
+    with pytest.raises(ValueError):
+        PCADenoiser().process(data=data, counts=[10, 10])
+    with pytest.raises(ValueError):
+        PCADenoiser().process(data=data[:, :, :1], counts=[15, 10, 5])
@@ -0,0 +1,98 @@
+"""
+`test_core.test_processors.test_preprocess.test_group_trials` [module]
+
+See Also
+--------
+`core.processors.preprocess.group_trials`: Tested module.
+"""
+
+import numpy as np
+import pytest
+
+from core.processors.preprocess.group_trials import GroupedReducer
+
+
+BOUNDARIES = [(0, 3), (3, 8), (8, 10)]
+"""Contiguous blocks of 3, 5 and 2 trials."""
+
+
+def reference(x, labels, axis, stat, ddof):
+    """Grouped statistics computed with a loop over the groups."""
+    funcs = {
+        "sum": lambda v: v.sum(axis=axis),
+        "mean": lambda v: v.mean(axis=axis),
+        "var": lambda v: v.var(axis=axis, ddof=ddof),
+    }
+    groups = np.unique(labels)
+    return np.stack([funcs[stat](np.compress(labels == g, x, axis=axis)) for g in groups], axis)
+
+
+@pytest.mark.parametrize("stat", argvalues=["sum", "mean", "var"])
+@pytest.mark.parametrize("axis", argvalues=[0, 2], ids=["axis0", "axis2"])
+def test_process_boundaries(stat, axis):
+    """
+    Test the reduction of contiguous blocks against a loop over the groups.
+
+    Test Inputs
+    -----------
+    Data with 10 trials along `axis`, in 3 blocks.
+
+    Expected Output
+    ---------------
+    Statistic of each block along the same axis.
+    """
+    rng = np.random.default_rng(0)
+    shape = [4, 3, 5]
+    shape[axis] = 10
+    x = rng.normal(size=shape)
+    labels = np.repeat([0, 1, 2], [3, 5, 2])
+    reducer = GroupedReducer(stat=stat, ddof=1)
+    reduced, groups = reducer.process(data=x, axis=axis, boundaries=BOUNDARIES)
+    np.testing.assert_array_equal(groups, [0, 1, 2])
+    np.testing.assert_allclose(reduced, reference(x, labels, axis, stat, ddof=1))
+
+
+@pytest.mark.parametrize("stat", argvalues=["sum", "mean", "var"])
+def test_process_labels(stat):
+    """
+    Test the reduction of unsorted labels against a loop over the groups.
+
+    Test Inputs
+    -----------
+    Data of shape ``(2, 3, 12, 4)`` with string labels in shuffled order along axis 2.
+
+    Expected Output
+    ---------------
+    Statistic of each group, in the order of the sorted labels.
+    """
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(2, 3, 12, 4))
+    labels = rng.permutation(np.array(["c", "a", "b"] * 4))
+    reduced, groups = GroupedReducer(stat=stat).process(data=x, axis=2, labels=labels)
+    np.testing.assert_array_equal(groups, ["a", "b", "c"])
+    np.testing.assert_allclose(reduced, reference(x, labels, 2, stat, ddof=0))
+
+
+def test_process_count():
+    """
+    Test the counts of trials with both strategies.
+    """
+    x = np.zeros((10, 2))
+    reducer = GroupedReducer(stat="count")
+    counts, _ = reducer.process(data=x, boundaries=BOUNDARIES)
+    np.testing.assert_array_equal(counts, [3, 5, 2])
+    counts, _ = reducer.process(data=x, labels=np.repeat(["x", "y"], [4, 6]))
+    np.testing.assert_array_equal(counts, [4, 6])
+
+
+@pytest.mark.parametrize(
+    "boundaries",
+    argvalues=[[(0, 3), (4, 10)], [(0, 3), (3, 9)], [(0, 0), (0, 10)]],
+    ids=["gap", "incomplete", "empty"],
+)
+def test_process_invalid_boundaries(boundaries):
+    """
+    Test that non-contiguous, incomplete or empty blocks raise an error.
+    """
+    with pytest.raises(ValueError):
+        GroupedReducer().process(data=np.zeros(10), boundaries=boundaries)
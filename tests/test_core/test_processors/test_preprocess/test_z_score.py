@@ -0,0 +1,92 @@
+"""
+`test_core.test_processors.test_preprocess.test_z_score` [module]
+
+Notes
+-----
+Reference statistics are computed with `np.mean` and `np.std` on the full arrays.
+
+See Also
+--------
+`core.processors.preprocess.z_score`: Tested module.
+"""
+
+import numpy as np
+import pytest
+
+from core.processors.preprocess.z_score import RunningStats, ZScorer
+
+
+RNG = np.random.default_rng(0)
+X = RNG.normal(loc=5.0, scale=3.0, size=(4, 6, 50, 3))  # (ensembles, units, trials, time)
+
+
+@pytest.mark.parametrize("axes", argvalues=[None, (0, 2)], ids=["global", "per-unit-time"])
+def test_accumulate_chunks(axes):
+    """
+    Test that the streaming merge over chunks matches the statistics of the full array.
+
+    Test Inputs
+    -----------
+    Chunks of `X` along the ensembles axis (4 chunks of one ensemble).
+
+    Expected Output
+    ---------------
+    Mean and standard deviation equal to those of the full array along the same axes.
+    """
+    zscorer = ZScorer(axes=axes)
+    stats = zscorer.accumulate(X[i : i + 1] for i in range(len(X)))
+    expected_axes = tuple(range(X.ndim)) if axes is None else axes
+    np.testing.assert_allclose(stats.mean, X.mean(axis=expected_axes, keepdims=True))
+    np.testing.assert_allclose(stats.std(), X.std(axis=expected_axes, keepdims=True))
+    parallel = zscorer.reduce_parallel([X[:1], X[1:3], X[3:]], n_workers=3)
+    np.testing.assert_allclose(parallel.mean, stats.mean)
+    np.testing.assert_allclose(parallel.m2, stats.m2)
+
+
+def test_merge_stability():
+    """
+    Test the numerical stability of the merge for samples with a large offset.
+
+    Expected Output
+    ---------------
+    Variance of ``1e9 + [0, 1, 2, 3]`` equal to 1.25, merged from single samples.
+    """
+    values = 1e9 + np.arange(4.0)
+    stats = RunningStats.from_chunk(values[:1])
+    for v in values[1:]:
+        stats = stats.merge(RunningStats.from_chunk(np.array([v])))
+    assert stats.var().item() == pytest.approx(1.25)
+
+
+def test_process_in_place():
+    """
+    Test z-scoring in place with precomputed statistics.
+
+    Expected Output
+    ---------------
+    The input array itself is returned and modified, with zero mean and unit variance per unit and
+    time bin.
+    """
+    x = X.copy()
+    zscorer = ZScorer(axes=(0, 2))
+    stats = zscorer.accumulate(x[i : i + 1] for i in range(len(x)))
+    z = zscorer.process(x=x, stats=stats, out=x)
+    assert z is x, "Output not written in place"
+    np.testing.assert_allclose(x.mean(axis=(0, 2)), 0, atol=1e-12)
+    np.testing.assert_allclose(x.std(axis=(0, 2)), 1)
+
+
+def test_process_default():
+    """
+    Test z-scoring without precomputed statistics nor output array.
+
+    Expected Output
+    ---------------
+    New array equal to the reference z-score, input left unchanged.
+    """
+    x = np.array([[1, 2, 1, 2], [0, 1, 0, 1]])
+    z = ZScorer(axes=1).process(x=x)
+    np.testing.assert_allclose(z, [[-1, 1, -1, 1], [-1, 1, -1, 1]])
+    assert x.dtype == np.int64 and x[0, 0] == 1, "Input modified"
+    with pytest.raises(ValueError):
+        ZScorer().process(x=x, out=x)  # integer output
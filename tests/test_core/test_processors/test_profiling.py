@@ -0,0 +1,143 @@
+"""
+`test_core.test_processors.test_profiling` [module]
+
+See Also
+--------
+`core.processors.profiling`: Tested module.
+"""
+# pylint: disable=missing-class-docstring
+# pylint: disable=arguments-differ
+
+import json
+
+import numpy as np
+import pytest
+
+from core.processors.base_processor import Processor
+from core.processors.profiling import PROFILER, profile_processors, nbytes
+
+
+class Inner(Processor):
+    def process(self, x=None, **kwargs):
+        return np.ones(100_000) * x.sum()  # allocate 800 kB
+
+
+class Outer(Processor):
+    def __init__(self, n_inner: int = 2) -> None:
+        self.n_inner = n_inner
+
+    def process(self, x=None, **kwargs):
+        inner = Inner()
+        return tuple(inner.process(x=x) for _ in range(self.n_inner))
+
+
+def test_disabled():
+    """
+    Test that no call is recorded when the profiler is disabled, and that the wrapped method
+    preserves the behavior and the metadata of the original one.
+    """
+    PROFILER.reset()
+    output = Outer().process(x=np.ones(3))
+    assert len(output) == 2 and output[0][0] == 3
+    assert not PROFILER.stats and not PROFILER.events
+    assert Outer.process.__name__ == "process" and Outer.process.__instrumented__
+
+
+def test_enabled(tmp_path):
+    """
+    Test the statistics, the nesting of the trace events and the exports.
+
+    Test Inputs
+    -----------
+    Three calls to `Outer`, each calling `Inner` twice, with memory tracing.
+
+    Expected Output
+    ---------------
+    - Counts: 3 calls to `Outer`, 6 calls to `Inner`.
+    - Sizes: inputs of 24 bytes per call, outputs of 800 kB per `Inner` call.
+    - Peaks: at least the output of `Inner` (800 kB), twice for `Outer` (both outputs kept).
+    - Trace: each `Inner` span nested in an `Outer` span.
+    """
+    x = np.ones(3)
+    with profile_processors(trace_memory=True) as profiler:
+        for _ in range(3):
+            Outer().process(x=x)
+    assert not PROFILER.enabled
+    summary = profiler.summary().set_index("processor")
+    assert summary.loc["Outer", "n_calls"] == 3 and summary.loc["Inner", "n_calls"] == 6
+    assert summary.loc["Inner", "input_bytes"] == 6 * x.nbytes
+    assert summary.loc["Inner", "output_bytes"] == 6 * 800_000
+    assert summary.loc["Outer", "output_bytes"] == 3 * 2 * 800_000
+    assert summary.loc["Inner", "peak_bytes"] >= 800_000
+    assert summary.loc["Outer", "peak_bytes"] >= 2 * 800_000
+    assert summary.loc["Outer", "total_s"] >= summary.loc["Inner", "total_s"]
+    assert summary.loc["Inner", "p50_s"] <= summary.loc["Inner", "p95_s"]
+    # Nesting of the spans
+    outer = [e for e in profiler.events if e["name"] == "Outer"]
+    for event in (e for e in profiler.events if e["name"] == "Inner"):
+        assert any(
+            o["ts"] <= event["ts"] and event["ts"] + event["dur"] <= o["ts"] + o["dur"]
+            for o in outer
+        )
+    # Exports
+    profiler.to_json(tmp_path / "summary.json")
+    profiler.to_chrome_trace(tmp_path / "trace.json")
+    records = json.loads((tmp_path / "summary.json").read_text())
+    assert {r["processor"] for r in records} == {"Outer", "Inner"}
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert len(trace["traceEvents"]) == 9
+    assert all(e["ph"] == "X" for e in trace["traceEvents"])
+
+
+def test_peak_before_nested():
+    """
+    Test that the peak of an outer call includes the memory it released before a nested call.
+
+    Test Inputs
+    -----------
+    Outer processor which allocates and frees 8 MB, then calls `Inner` (800 kB).
+
+    Expected Output
+    ---------------
+    Peak of the outer call at least 8 MB, peak of the nested call below 8 MB.
+    """
+
+    class Transient(Processor):
+        def process(self, x=None, **kwargs):
+            buffer = np.ones(1_000_000)  # 8 MB, released before the nested call
+            del buffer
+            return Inner().process(x=x)
+
+    with profile_processors(trace_memory=True) as profiler:
+        Transient().process(x=np.ones(3))
+    peaks = profiler.summary().set_index("processor")["peak_bytes"]
+    assert peaks["Transient"] >= 8_000_000
+    assert 800_000 <= peaks["Inner"] < 8_000_000
+
+
+def test_exception_recorded():
+    """
+    Test that a call raising an exception is still recorded and leaves the profiler consistent.
+    """
+
+    class Failing(Processor):
+        def process(self, **kwargs):
+            raise RuntimeError("failure")
+
+    with profile_processors(trace_memory=True) as profiler:
+        with pytest.raises(RuntimeError):
+            Failing().process()
+        Inner().process(x=np.ones(1))
+    assert profiler.summary().set_index("processor")["n_calls"].to_dict() == {
+        "Failing": 1,
+        "Inner": 1,
+    }
+
+
+def test_nbytes():
+    """
+    Test the size of the arrays nested in containers.
+    """
+    a, b = np.zeros(10), np.zeros((2, 5), dtype=np.int32)
+    assert nbytes(((a,), {"b": b, "c": 1}, [a, "x"])) == 80 + 40 + 80
+    assert nbytes(None) == 0
@@ -0,0 +1,9 @@
+"""
+:mod:`test_core.test_simulate` [subpackage]
+
+Tests for the subpackage :mod:`core.processors.simulate`.
+
+Modules
+-------
+test_simulate.test_synthetic_sessions: Tests :mod:`core.processors.simulate.synthetic_sessions`.
+"""
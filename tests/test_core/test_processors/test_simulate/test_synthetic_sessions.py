@@ -0,0 +1,163 @@
+"""
+`test_core.test_processors.test_simulate.test_synthetic_sessions` [module]
+
+See Also
+--------
+`core.processors.simulate.synthetic_sessions`: Tested module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.attributes.brain_info import Unit
+from core.attributes.exp_structure import Session
+from core.data_structures.events_properties import EventsProperties
+from core.data_structures.spike_times import SpikeTrains
+from core.pipelines.parse_sessions import ParseSessions, ParseSessionsConfig, ParseSessionsInputs
+from core.processors.parse.extract_events import SessionParser
+from core.processors.simulate.synthetic_sessions import (
+    RateModel,
+    SessionGenerator,
+    SpikesGenerator,
+    generate_dataset,
+    to_spike_trains,
+    to_trials_properties,
+)
+from utils.storage_rulers.impl_path_rulers import (
+    EventsPropertiesPath,
+    SpikeTrainsPath,
+    TrialsPropertiesPath,
+)
+
+
+@pytest.mark.parametrize(
+    "session", argvalues=["syn001a01_p_PTD", "syn001a04_a_CLK"], ids=["PTD", "CLK"]
+)
+def test_session_parsed(session):
+    """
+    Test that the raw events of a synthetic session are parsed into its ground truth trials.
+
+    Expected Output
+    ---------------
+    Same slots, blocks, categories, timings and errors in the parser outputs and in the trials
+    table. Warnings only in task CLK.
+    """
+    events, trials = SessionGenerator(n_blocks=20).process(session=session, seed=0)
+    slot, block, categ, t_on, t_off, t_warn, t_end, error = SessionParser().process(events=events)
+    np.testing.assert_array_equal(slot, trials["slot"])
+    np.testing.assert_array_equal(block, trials["block"])
+    np.testing.assert_array_equal(categ, trials["category"])
+    np.testing.assert_array_equal(error, trials["error"])
+    for name, values in (("t_on", t_on), ("t_off", t_off), ("t_warn", t_warn), ("t_end", t_end)):
+        np.testing.assert_allclose(values, trials[name])
+    assert np.all(np.isnan(t_warn)) == session.endswith("PTD")
+    assert set(categ) == {"R", "T"}
+
+
+def test_spikes_rates():
+    """
+    Test the spikes of one unit against its rates.
+
+    Test Inputs
+    -----------
+    Homogeneous units (no heterogeneity, unit gains): constant rate of 20 spikes/s in all the
+    segments except the onset transient (ratio 1).
+
+    Expected Output
+    ---------------
+    Spikes sorted within each slot, within the slot duration, with a total count close to the
+    expected count (Poisson, 5 standard deviations).
+    """
+    _, trials = SessionGenerator(n_blocks=50).process(session="syn001a01_p_PTD", seed=0)
+    model = RateModel(baseline=20.0, baseline_sigma=0, gain_sigma=0, onset_ratio=1.0)
+    spikes = SpikesGenerator(rate_model=model).process(trials=[trials], seed=0)
+    duration = (trials["t_end"] - trials["t_start"]).to_numpy()
+    expected = 20.0 * duration.sum()
+    assert abs(len(spikes) - expected) < 5 * np.sqrt(expected)
+    assert np.all(spikes["spikes"] >= 0) and np.all(spikes["spikes"] < duration.max())
+    same_slot = (np.diff(spikes["block"]) == 0) & (np.diff(spikes["slot"]) == 0)
+    assert np.all(np.diff(spikes["spikes"])[same_slot] >= 0)
+
+
+def test_spikes_chunks(tmp_path):
+    """
+    Test that the spikes streamed by small chunks to a file match the spikes generated at once.
+    """
+    _, trials = SessionGenerator(n_blocks=10).process(session="syn001a02_a_PTD", seed=0)
+    in_memory = SpikesGenerator(chunk_size=10**9).process(trials=[trials], seed=1)
+    streamed = SpikesGenerator(chunk_size=50).process(
+        trials=[trials], seed=1, path=tmp_path / "unit_spk"
+    )
+    np.testing.assert_array_equal(np.load(tmp_path / "unit_spk.npy"), in_memory)
+    np.testing.assert_array_equal(streamed, in_memory)
+
+
+def test_generate_dataset(tmp_path):
+    """
+    Test the files written for a data set spanning several sites.
+
+    Test Inputs
+    -----------
+    12 units, 5 per site (3 sites, the last one incomplete), 2 sessions per site.
+
+    Expected Output
+    ---------------
+    One spikes file per unit, with the spikes of both sessions (recordings 1 and 2), and one events
+    and trials file per session.
+    """
+    summary = generate_dataset(tmp_path, n_units=12, n_sessions=2, units_per_site=5, n_blocks=5)
+    assert summary["site"].value_counts().to_dict() == {"syn001a": 5, "syn002a": 5, "syn003a": 2}
+    for unit, n_spikes in zip(summary["unit"], summary["n_spikes"]):
+        spikes = np.load(tmp_path / "processed" / "spike_trains" / f"{unit}_spk.npy")
+        assert len(spikes) == n_spikes
+        assert set(np.unique(spikes["recording"])) <= {1, 2}
+    assert len(list((tmp_path / "raw" / "expt_events").glob("*.csv"))) == 6
+    assert len(list((tmp_path / "processed" / "sessions_info").glob("*.csv"))) == 6
+
+
+def test_round_trip(tmp_path):
+    """
+    Test that the files of a generated data set are loaded into the data structures of the
+    analysis.
+
+    Test Inputs
+    -----------
+    3 units at one site, 2 sessions.
+
+    Expected Output
+    ---------------
+    - Valid identifiers for the units and sessions.
+    - Raw events formatted by `EventsProperties`.
+    - Trials properties parsed from the raw events by `ParseSessions`, identical to the ground truth
+      of the trials converted by `to_trials_properties`.
+    - Spikes converted by `to_spike_trains`, whose trials are all found in the trials properties.
+    """
+    summary = generate_dataset(tmp_path, n_units=3, n_sessions=2, units_per_site=3, n_blocks=5)
+    sessions = [Session("syn001a01_p_PTD"), Session("syn001a02_a_PTD")]
+    truth = []
+    for session in sessions:
+        raw = pd.read_csv(EventsPropertiesPath(tmp_path).get_path(session).with_suffix(".csv"))
+        events = EventsProperties(session=session)
+        events.format(raw=raw)
+        assert events.session == session and len(events.data) == len(raw)
+        path = TrialsPropertiesPath(tmp_path).get_path(session).with_suffix(".csv")
+        truth.append(pd.read_csv(path))
+    expected = to_trials_properties(sessions, truth)
+    config = ParseSessionsConfig(n_workers=1, use_cache=False, root_data=tmp_path)
+    parsed = ParseSessions(config).execute(ParseSessionsInputs(sessions=sessions))
+    assert parsed.n_trials == expected.n_trials
+    for name in expected.coords:
+        actual, desired = np.asarray(parsed.get_coord(name)), np.asarray(expected.get_coord(name))
+        if desired.dtype.kind == "f":  # times
+            np.testing.assert_allclose(actual, desired)
+        else:
+            np.testing.assert_array_equal(actual, desired)
+    keys = set(parsed.iter_trials("recording", "block", "slot"))
+    for unit in summary["unit"]:
+        spikes = np.load(SpikeTrainsPath(tmp_path).get_path(unit).with_suffix(".npy"))
+        spike_trains = to_spike_trains(unit, spikes)
+        assert isinstance(spike_trains, SpikeTrains) and spike_trains.unit == Unit(unit)
+        assert len(spike_trains.data) == len(spikes)
+        labels = zip(spike_trains.recording, spike_trains.block, spike_trains.slot)
+        assert set(labels) <= keys
@@ -0,0 +1,7 @@
+"""
+:mod:`test_etl` [package]
+
+See Also
+--------
+:mod:`etl`: Tested package.
+"""
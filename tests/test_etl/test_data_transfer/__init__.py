@@ -0,0 +1,10 @@
+"""
+:mod:`test_etl.test_data_transfer` [subpackage]
+
+Tests for the subpackage :mod:`etl.data_transfer`.
+
+Modules
+-------
+test_data_transfer.test_transfer: Tests :mod:`etl.data_transfer.transfer` and
+:mod:`etl.data_transfer.manifest`.
+"""
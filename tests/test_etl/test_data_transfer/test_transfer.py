@@ -0,0 +1,230 @@
+"""
+`test_etl.test_data_transfer.test_transfer` [module]
+
+Notes
+-----
+Local-to-local transfers (no host) are used as a stand-in for the remote server: the "remote" root
+is a temporary directory. Tests which execute `rsync` are skipped if it is not installed.
+
+See Also
+--------
+`etl.data_transfer.transfer`: Tested module.
+`etl.data_transfer.manifest`: Tested module.
+"""
+# pylint: disable=redefined-outer-name
+
+import os
+from pathlib import Path
+import shutil
+import subprocess
+
+import pytest
+
+from etl.data_transfer.manifest import TransferManifest
+from etl.data_transfer.transfer import TransferManager
+
+
+HAS_RSYNC = shutil.which("rsync") is not None
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """
+    Local and "remote" roots, with several session directories in the local root.
+
+    Returns
+    -------
+    root_local, root_remote : Path
+    sync_map : List[Dict[str, Path]]
+        One entry per session directory (contents copied into the remote directory).
+    """
+    root_local, root_remote = tmp_path / "local", tmp_path / "remote"
+    sync_map = []
+    for i in range(5):
+        session_dir = root_local / f"session{i}"
+        session_dir.mkdir(parents=True)
+        (session_dir / "events.csv").write_text(f"Event,StartTime\nTRIALSTART,{i}\n")
+        (root_remote / f"session{i}").mkdir(parents=True)
+        sync_map.append({"source": Path(f"session{i}"), "destination": Path(f"session{i}")})
+    return root_local, root_remote, sync_map
+
+
+def copy_entry(manager, source, destination):
+    """Replacement of `rsync` for local transfers (copy a directory into a directory)."""
+    src = Path(source)
+    shutil.copytree(src, Path(destination) / src.name, dirs_exist_ok=True)
+
+
+def test_manifest_states(tmp_path):
+    """
+    Test the detection of unchanged entries by the manifest.
+
+    Test Inputs
+    -----------
+    A directory recorded in the manifest, then:
+
+    - left intact,
+    - touched (new modification time, same content),
+    - modified (new content).
+
+    Expected Output
+    ---------------
+    Unchanged in the first two cases, changed in the last one. The manifest is persisted on disk.
+    """
+    directory = tmp_path / "data"
+    directory.mkdir()
+    (directory / "a.txt").write_text("content")
+    manifest = TransferManifest(tmp_path / "manifest.json")
+    key = manifest.get_key("upload", "data", "data")
+    unchanged, state = manifest.is_unchanged(key, directory)
+    assert not unchanged, "New entry considered unchanged"
+    manifest.record(key, directory, state)
+    manifest.save()
+    manifest = TransferManifest(tmp_path / "manifest.json")  # reload from disk
+    assert manifest.is_unchanged(key, directory)[0], "Intact entry considered changed"
+    stat = (directory / "a.txt").stat()
+    os.utime(directory / "a.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert manifest.is_unchanged(key, directory)[0], "Touched entry considered changed"
+    (directory / "a.txt").write_text("CONTENT")
+    assert not manifest.is_unchanged(key, directory)[0], "Modified entry considered unchanged"
+
+
+@pytest.mark.parametrize("n_workers", argvalues=[1, 4], ids=["serial", "parallel"])
+def test_process_map_incremental(workspace, mocker, n_workers):
+    """
+    Test that a second upload only transfers the modified entries.
+
+    Test Inputs
+    -----------
+    n_workers : int
+        Number of concurrent transfers.
+
+    Expected Output
+    ---------------
+    All entries transferred in the first run, only the modified one in the second run.
+
+    Implementation
+    --------------
+    Replace `rsync` by a local copy to check the scheduling of the transfers independently of its
+    availability.
+    """
+    root_local, root_remote, sync_map = workspace
+    mock_rsync = mocker.patch.object(TransferManager, "_run_rsync", autospec=True)
+    mock_rsync.side_effect = copy_entry
+    kwargs = {"root_local": root_local, "root_remote": root_remote, "n_workers": n_workers}
+    TransferManager(sync_map=sync_map, **kwargs).process_map()
+    assert mock_rsync.call_count == len(sync_map), "Missing transfers in the first run"
+    assert (root_remote / "session3" / "session3" / "events.csv").is_file(), "File not copied"
+    (root_local / "session3" / "events.csv").write_text("Event,StartTime\nTRIALSTOP,3\n")
+    mock_rsync.reset_mock()
+    TransferManager(sync_map=sync_map, **kwargs).process_map()
+    assert mock_rsync.call_count == 1, "Unchanged entries transferred again"
+    assert "session3" in mock_rsync.call_args.args[1], "Wrong entry transferred"
+
+
+def test_process_map_touched(workspace, mocker):
+    """
+    Test that the status of touched entries is refreshed in the manifest.
+
+    Test Inputs
+    -----------
+    Entry touched (new modification time, same content) after a first upload, then two uploads.
+
+    Expected Output
+    ---------------
+    No transfer in the last two runs. The content is hashed in the second run only, since the new
+    status is recorded.
+    """
+    root_local, root_remote, sync_map = workspace
+    mock_rsync = mocker.patch.object(TransferManager, "_run_rsync", autospec=True)
+    mock_rsync.side_effect = copy_entry
+    kwargs = {"root_local": root_local, "root_remote": root_remote}
+    TransferManager(sync_map=sync_map, **kwargs).process_map()
+    path = root_local / "session1" / "events.csv"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    mock_rsync.reset_mock()
+    spy_hash = mocker.spy(TransferManifest, "eval_hash")
+    TransferManager(sync_map=sync_map, **kwargs).process_map()
+    assert spy_hash.call_count == 1, "Touched entry not hashed"
+    spy_hash.reset_mock()
+    TransferManager(sync_map=sync_map, **kwargs).process_map()
+    assert spy_hash.call_count == 0, "Refreshed entry hashed again"
+    assert mock_rsync.call_count == 0, "Touched entry transferred"
+
+
+def test_process_map_failure(workspace, mocker):
+    """
+    Test that a failed transfer is not recorded in the manifest and is reported.
+
+    Expected Output
+    ---------------
+    CalledProcessError raised after all transfers. In the next run, only the failed entry is
+    transferred.
+    """
+    root_local, root_remote, sync_map = workspace
+
+    def fail_session2(manager, source, destination):
+        if source.endswith("session2"):
+            raise subprocess.CalledProcessError(23, "rsync")
+        copy_entry(manager, source, destination)
+
+    mock_rsync = mocker.patch.object(TransferManager, "_run_rsync", autospec=True)
+    mock_rsync.side_effect = fail_session2
+    kwargs = {"root_local": root_local, "root_remote": root_remote, "n_workers": 3}
+    with pytest.raises(subprocess.CalledProcessError):
+        TransferManager(sync_map=sync_map, **kwargs).process_map()
+    assert mock_rsync.call_count == len(sync_map), "Transfers interrupted by the failure"
+    mock_rsync.reset_mock()
+    mock_rsync.side_effect = copy_entry
+    TransferManager(sync_map=sync_map, **kwargs).process_map()
+    assert mock_rsync.call_count == 1, "Failed entry not retried alone"
+
+
+def test_multiplexing_commands(tmp_path, mocker):
+    """
+    Test that all SSH commands share the control socket of a single master connection.
+
+    Expected Output
+    ---------------
+    One command opening the master (`-fN`), directory checks and `rsync` (through `-e`) with the
+    same `ControlPath`, and one command closing the master (`-O exit`).
+    """
+    mock_run = mocker.patch("subprocess.run")
+    mock_run.return_value = mocker.Mock(returncode=0)
+    sync_map = [{"source": Path("a"), "destination": Path("a")}]
+    manager = TransferManager(
+        user="user",
+        host="host",
+        root_local=tmp_path,
+        root_remote="/remote",
+        sync_map=sync_map,
+        control_dir=tmp_path / "ctl",
+        use_manifest=False,
+    )
+    manager.process_map()
+    commands = [call.args[0] for call in mock_run.call_args_list]
+    control_path = f"ControlPath={tmp_path / 'ctl' / '%C'}"
+    assert commands[0][-2:] == ["-fN", "user@host"], "Master connection not opened first"
+    assert control_path in commands[1], "Directory check outside the master connection"
+    rsync = commands[2]
+    assert rsync[0] == "rsync" and control_path in rsync[rsync.index("-e") + 1], "Rsync not muxed"
+    assert rsync[-1] == "user@host:/remote/a", "Wrong remote destination"
+    assert commands[-1][-3:] == ["-O", "exit", "user@host"], "Master connection not closed"
+
+
+@pytest.mark.skipif(not HAS_RSYNC, reason="rsync not installed")
+def test_local_rsync(workspace):
+    """
+    Test an actual local-to-local transfer with `rsync`.
+
+    Expected Output
+    ---------------
+    Files copied in the first run, no transfer in the second run (entries skipped).
+    """
+    root_local, root_remote, sync_map = workspace
+    kwargs = {"root_local": root_local, "root_remote": root_remote, "n_workers": 2}
+    TransferManager(sync_map=sync_map, **kwargs).process_map()
+    assert (root_remote / "session0" / "session0" / "events.csv").is_file(), "File not copied"
+    manager = TransferManager(sync_map=sync_map, **kwargs)
+    assert not manager.select_entries(), "Unchanged entries selected"
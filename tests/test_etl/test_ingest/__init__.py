@@ -0,0 +1,9 @@
+"""
+:mod:`test_etl.test_ingest` [subpackage]
+
+Tests for the subpackage :mod:`etl.ingest`.
+
+Modules
+-------
+test_ingest.test_evp_reader: Tests :mod:`etl.ingest.evp_reader` and :mod:`etl.ingest.process_evp`.
+"""
@@ -0,0 +1,248 @@
+"""
+:mod:`test_etl.test_ingest.test_evp_reader` [module]
+
+Notes
+-----
+The fixtures are EVP files written by :func:`write_evp` following the binary layout documented in
+:mod:`etl.ingest.evp_reader`, with known signals in each trial. Spike and LFP blocks are filled with
+distinct values to detect any misalignment when they are skipped.
+
+:data:`EVP_BYTES` spells out a small file byte by byte, with the header positions read by baphy's
+``evpread``, independently of :attr:`EVPReader.HEADER_FIELDS`.
+
+Recordings converted by MATLAB can be checked with :func:`test_matlab_reference`: set the
+environment variable ``MTCDB_EVP_REFERENCE`` to a directory containing, for each recording
+``<name>.evp`` (or ``<name>.evp.gz``), the outputs of ``[~, ~, rA, ATrialIdx] = evpread(path,
+'auxchans', 1)`` saved as ``<name>_rA.npy`` and ``<name>_ATrialIdx.npy``.
+
+See Also
+--------
+:mod:`etl.ingest.evp_reader`: Tested module.
+:mod:`etl.ingest.process_evp`: Tested module.
+"""
+import gzip
+import os
+from pathlib import Path
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pandas as pd
+import pytest
+
+from etl.ingest.evp_reader import EVPReader
+from etl.ingest.process_evp import convert_file, process_directory
+
+
+N_SPIKE_CHANS, N_AUX_CHANS, N_LFP_CHANS = 2, 3, 1
+N_SAMPLES = [(40, 10, 4), (60, 15, 6), (20, 5, 2)]  # (spike, aux, lfp) samples per trial
+
+
+def make_aux(n_trials=len(N_SAMPLES)):
+    """Expected auxiliary signals: one array per trial, shape (n_samples, n_channels)."""
+    rng = np.random.default_rng(0)
+    return [
+        rng.integers(-1000, 1000, size=(N_SAMPLES[t][1], N_AUX_CHANS), dtype=np.int16)
+        for t in range(n_trials)
+    ]
+
+
+def write_evp(path, aux, version=5, compress=False):
+    """Write an EVP file with the expected auxiliary signals (see module notes)."""
+    header = np.zeros(EVPReader.HEADER_SIZE, dtype="<u4")
+    # Positions of ``evpread``: version, spike/aux channels, spike/aux rates, trials, LFP channels/rate
+    header[:8] = [version, N_SPIKE_CHANS, N_AUX_CHANS, 25000, 1000, len(aux), N_LFP_CHANS, 2000]
+    chunks = [header.tobytes()]
+    for (n_spk, n_aux, n_lfp), samples in zip(N_SAMPLES, aux):
+        chunks.append(np.array([n_spk, n_aux, n_lfp], dtype="<u4").tobytes())
+        chunks.append(np.full(n_spk * N_SPIKE_CHANS, 7, dtype="<i2").tobytes())
+        chunks.append(samples.T.astype("<i2").tobytes())  # channel-major
+        chunks.append(np.full(n_lfp * N_LFP_CHANS, -7, dtype="<i2").tobytes())
+    opener = gzip.open if compress else open
+    with opener(path, "wb") as file:
+        file.write(b"".join(chunks))
+    return path
+
+
+def u32(*values):
+    """Little-endian bytes of unsigned 32-bit integers."""
+    return b"".join(v.to_bytes(4, "little") for v in values)
+
+
+def i16(*values):
+    """Little-endian bytes of signed 16-bit integers."""
+    return b"".join(v.to_bytes(2, "little", signed=True) for v in values)
+
+
+EVP_BYTES = b"".join(
+    [
+        # Main header: header(1) to header(10) in ``evpread``
+        u32(5, 1, 2, 20000, 1000, 2, 1, 500, 0, 0),
+        # Trial 1: 4 spike, 3 aux, 2 LFP samples per channel
+        u32(4, 3, 2),
+        i16(100, 101, 102, 103),  # spike channel 1
+        i16(1, 2, 3),  # aux channel 1
+        i16(-1, -2, -3),  # aux channel 2
+        i16(500, 501),  # LFP channel 1
+        # Trial 2: 2 spike, 1 aux, 0 LFP samples per channel
+        u32(2, 1, 0),
+        i16(200, 201),
+        i16(4),
+        i16(-4),
+    ]
+)
+"""Two-trial EVP file (1 spike, 2 auxiliary and 1 LFP channels), byte by byte."""
+
+
+@pytest.mark.parametrize(
+    "signal, expected_samples, expected_idx",
+    argvalues=[
+        ("aux", [[1, -1], [2, -2], [3, -3], [4, -4]], [0, 3]),
+        ("spike", [[100], [101], [102], [103], [200], [201]], [0, 4]),
+        ("lfp", [[500], [501]], [0, 2]),
+    ],
+    ids=["aux", "spike", "lfp"],
+)
+def test_read_bytes(tmp_path, signal, expected_samples, expected_idx):
+    """
+    Test :class:`EVPReader` on a file written byte by byte.
+
+    Test Inputs
+    -----------
+    :data:`EVP_BYTES`, with sampling rates 20000 Hz (spike), 1000 Hz (aux) and 500 Hz (LFP).
+
+    Expected Outputs
+    ----------------
+    - Header fields at the positions read by ``evpread``.
+    - Samples of each signal in the column-major layout, with an empty LFP block in trial 2.
+    """
+    path = tmp_path / "rec.evp"
+    path.write_bytes(EVP_BYTES)
+    reader = EVPReader(path)
+    with reader.open() as file:
+        header = reader.read_header(file)
+    assert (header.n_spike_chans, header.n_aux_chans, header.n_lfp_chans) == (1, 2, 1)
+    assert (header.spike_fs, header.aux_fs, header.lfp_fs) == (20000, 1000, 500)
+    assert header.n_trials == 2
+    samples, trial_idx = reader.read(signal)
+    assert_array_equal(samples, expected_samples)
+    assert_array_equal(trial_idx, expected_idx)
+
+
+def find_references():
+    """Recordings with MATLAB outputs in the directory ``MTCDB_EVP_REFERENCE`` (see module notes)."""
+    directory = os.environ.get("MTCDB_EVP_REFERENCE")
+    if directory is None:
+        return []
+    return sorted(
+        path
+        for path in Path(directory).iterdir()
+        if path.name.endswith((".evp", ".evp.gz"))
+    )
+
+
+@pytest.mark.skipif(not find_references(), reason="MTCDB_EVP_REFERENCE not set or empty")
+@pytest.mark.parametrize("path", argvalues=find_references(), ids=lambda path: path.name)
+def test_matlab_reference(path):
+    """
+    Test :meth:`EVPReader.read` against the outputs of ``evpread`` on a real recording.
+
+    Expected Outputs
+    ----------------
+    Same samples as ``rA`` and same trial indices as ``ATrialIdx`` (1-based in MATLAB).
+    """
+    name = path.name.removesuffix(".gz").removesuffix(".evp")
+    samples, trial_idx = EVPReader(path).read("aux", channels=[0])
+    assert_array_equal(samples[:, 0], np.load(path.parent / f"{name}_rA.npy").ravel())
+    assert_array_equal(trial_idx + 1, np.load(path.parent / f"{name}_ATrialIdx.npy").ravel())
+
+
+@pytest.mark.parametrize("compress", argvalues=[False, True], ids=["raw", "gzip"])
+def test_read_aux(tmp_path, compress):
+    """
+    Test :meth:`EVPReader.read` for all the auxiliary channels.
+
+    Expected Outputs
+    ----------------
+    Samples concatenated across trials and start index of each trial.
+    """
+    aux = make_aux()
+    name = "rec.evp.gz" if compress else "rec.evp"
+    samples, trial_idx = EVPReader(write_evp(tmp_path / name, aux, compress=compress)).read("aux")
+    assert_array_equal(samples, np.concatenate(aux))
+    assert_array_equal(trial_idx, [0, 10, 25])
+
+
+def test_read_channels(tmp_path):
+    """
+    Test :meth:`EVPReader.read` for a selection of channels.
+
+    Expected Outputs
+    ----------------
+    Only the selected channels, in the requested order.
+    """
+    aux = make_aux()
+    samples, _ = EVPReader(write_evp(tmp_path / "rec.evp", aux)).read("aux", channels=[2, 0])
+    assert_array_equal(samples, np.concatenate(aux)[:, [2, 0]])
+
+
+def test_invalid_version(tmp_path):
+    """
+    Test :meth:`EVPReader.read_header` with an unsupported version.
+
+    Expected Outputs
+    ----------------
+    ValueError
+    """
+    path = write_evp(tmp_path / "rec.evp", make_aux(), version=4)
+    with pytest.raises(ValueError):
+        EVPReader(path).read()
+
+
+def test_truncated_file(tmp_path):
+    """
+    Test :meth:`EVPReader.read` with a file ending in the middle of a trial.
+
+    Expected Outputs
+    ----------------
+    EOFError
+    """
+    path = write_evp(tmp_path / "rec.evp", make_aux())
+    path.write_bytes(path.read_bytes()[:-200])
+    with pytest.raises(EOFError):
+        EVPReader(path).read()
+
+
+def test_convert_csv(tmp_path):
+    """
+    Test :func:`convert_file` in the CSV format.
+
+    Expected Outputs
+    ----------------
+    One column per selected channel and one column for the trial number (1-based) of each sample.
+    """
+    aux = make_aux()
+    path = write_evp(tmp_path / "rec.evp.gz", aux, compress=True)
+    path_out = convert_file(path, tmp_path / "out", fmt="csv", channels=[0, 1])
+    table = pd.read_csv(path_out)
+    assert list(table.columns) == ["rA1", "rA2", "trial"]
+    assert_array_equal(table[["rA1", "rA2"]].to_numpy(), np.concatenate(aux)[:, :2])
+    assert_array_equal(table["trial"], np.repeat([1, 2, 3], [10, 15, 5]))
+
+
+def test_process_directory(tmp_path):
+    """
+    Test :func:`process_directory` with several workers on nested recordings.
+
+    Expected Outputs
+    ----------------
+    NPY files for each recording in the same relative structure, with the expected content.
+    """
+    aux = make_aux()
+    (tmp_path / "in" / "site").mkdir(parents=True)
+    write_evp(tmp_path / "in" / "a.evp.gz", aux, compress=True)
+    write_evp(tmp_path / "in" / "site" / "b.evp", aux)
+    paths_out = process_directory(tmp_path / "in", tmp_path / "out", fmt="npy", n_workers=2)
+    assert paths_out == [tmp_path / "out" / "a.npy", tmp_path / "out" / "site" / "b.npy"]
+    for path in paths_out:
+        assert_array_equal(np.load(path), np.concatenate(aux)[:, [0]])
+    assert_array_equal(np.load(tmp_path / "out" / "a_trial_idx.npy"), [0, 10, 25])
@@ -0,0 +1,89 @@
+"""
+:mod:`test_import_time` [module]
+
+Regression tests of the import graph: heavy dependencies should only be loaded at their first use.
+
+Notes
+-----
+Each module is imported in a fresh interpreter with the ``-X importtime`` option, which reports
+every module imported (with its self and cumulative import times, in microseconds) on the standard
+error stream.
+
+See Also
+--------
+:mod:`utils.misc.lazy`: Deferred exports of packages (PEP 562).
+"""
+import os
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+
+HEAVY_DEPENDENCIES = frozenset({"scipy", "sklearn", "pandas", "dill", "yaml", "pyarrow"})
+"""Top-level packages which should not be imported at startup."""
+
+IMPORT_BUDGET = 1.0
+"""Maximal cumulative import time of each module (in seconds), far above the expected time."""
+
+MODULES = [
+    "core",
+    "core.processors",
+    "core.processors.base_processor",
+    "core.processors.preprocess.convert_to_rates",
+    "core.processors.fit_models.linear_regression",
+    "core.processors.fit_models.cross_validation",
+    "core.processors.fit_models.decoding",
+    "core.pipelines.base_pipeline",
+    "utils.io_data",
+    "utils.io_data.loaders",
+    "utils.io_data.savers",
+]
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter and parse the report of ``-X importtime``.
+
+    Returns
+    -------
+    times : Dict[str, int]
+        Cumulative import time (in microseconds) of each imported module, by full name.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", MODULES, ids=MODULES)
+def test_import_time(module):
+    """
+    Test that importing a module of the package does not load heavy dependencies.
+
+    Test Inputs
+    -----------
+    module : str
+        Module imported at the startup of worker processes.
+
+    Expected Output
+    ---------------
+    No module of the heavy dependencies is imported, and the cumulative import time is below
+    `IMPORT_BUDGET`.
+    """
+    times = import_times(module)
+    loaded = {name.split(".")[0] for name in times} & HEAVY_DEPENDENCIES
+    assert not loaded, f"Eager import of {sorted(loaded)} by {module}"
+    assert times[module] < IMPORT_BUDGET * 1e6
@@ -19,6 +19,8 @@ See Also
 `utils.io_data.loaders`: Tested module.
 """
 
+import warnings
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -42,6 +44,7 @@ from utils.io_data.loaders import (
     LoaderCSVtoArrayStr,
     LoaderCSVtoDataFrame,
     LoaderNPY,
+    LoaderNPZ,
     LoaderPKL,
     LoaderDILL,
     LoaderYAML,
@@ -51,6 +54,7 @@ from utils.io_data.savers import (
     SaverCSVArray,
     SaverCSVDataFrame,
     SaverNPY,
+    SaverNPZ,
     SaverPKL,
     SaverDILL,
 )
@@ -110,6 +114,68 @@ def test_saver_loader_csv(tmp_path, data, expected, loader_class, saver_class):
         assert content.equals(expected), "Content mismatch"
 
 
+@pytest.mark.parametrize("cache", [False, True], ids=["parsed", "sidecar"])
+def test_loader_csv_str_empty_fields(tmp_path, cache):
+    """
+    Test that `LoaderCSVtoArrayStr` keeps empty and NA-like fields verbatim, like `numpy.loadtxt`.
+
+    Test Inputs
+    -----------
+    CSV file with empty fields and the strings ``NA``, ``nan`` and ``null``.
+
+    Expected Output
+    ---------------
+    Empty fields are loaded as ``''`` and the other fields as written, both when the file is parsed
+    and when the content is served from the sidecar (second load).
+    """
+    filepath = tmp_path / "test.csv"
+    filepath.write_text("a,b,,c\nNA,,nan,null\n", encoding="utf-8")
+    expected = np.loadtxt(filepath, delimiter=",", dtype="str")
+    for _ in range(2):
+        content = LoaderCSVtoArrayStr(filepath, cache=cache).load()
+        assert content.tolist() == [["a", "b", "", "c"], ["NA", "", "nan", "null"]]
+        assert np.array_equal(content, expected)
+
+
+@pytest.mark.parametrize(
+    "text, loader_class",
+    argvalues=[
+        ("# header\n1,2\n3,4 # trailing\n", LoaderCSVtoArrayFloat),
+        ("# header\n1,2\n3,4 # trailing\n", LoaderCSVtoArrayInt),
+        ("# header\na,b\nc,d\n", LoaderCSVtoArrayStr),
+        ("", LoaderCSVtoArrayFloat),
+        ("", LoaderCSVtoArrayStr),
+        ("# only a comment\n", LoaderCSVtoArrayFloat),
+    ],
+    ids=["comments_float", "comments_int", "comments_str", "empty_float", "empty_str", "only_comment"],
+)
+@pytest.mark.parametrize("cache", [False, True], ids=["parsed", "sidecar"])
+def test_loader_csv_comments_empty(tmp_path, text, loader_class, cache):
+    """
+    Test that `LoaderCSVtoArray` handles comments and empty files like `numpy.loadtxt`.
+
+    Test Inputs
+    -----------
+    text : str
+        Content of the CSV file: with comment lines and trailing comments, empty, or only comments.
+
+    Expected Output
+    ---------------
+    Same content, shape and data type as `numpy.loadtxt`, both when the file is parsed and when
+    the content is served from the sidecar (second load).
+    """
+    filepath = tmp_path / "test.csv"
+    filepath.write_text(text, encoding="utf-8")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)  # empty input
+        expected = np.loadtxt(filepath, delimiter=",", dtype=loader_class.DTYPE)
+    for _ in range(2):
+        content = loader_class(filepath, cache=cache).load()
+        assert content.shape == expected.shape
+        assert content.dtype.kind == expected.dtype.kind
+        assert np.array_equal(content, expected)
+
+
 def test_saver_loader_npy(tmp_path):
     """
     Test for `SaverNPY` and `LoaderNPY` classes.
@@ -135,6 +201,29 @@ def test_saver_loader_npy(tmp_path):
     assert np.array_equal(content, data_array), "Content mismatch"
 
 
+def test_saver_loader_npz(tmp_path):
+    """
+    Test for `SaverNPZ` and `LoaderNPZ` classes.
+
+    Test Inputs
+    -----------
+    data : Dict[str, numpy.ndarray]
+        Named NumPy arrays.
+
+    Expected Output
+    ---------------
+    data : Dict[str, numpy.ndarray]
+        Dictionary with the same names and identical arrays.
+    """
+    data = {"values": data_array, "scalar": np.array(0.5)}
+    filepath = tmp_path / "test.npz"
+    SaverNPZ(filepath).save(data)
+    content = LoaderNPZ(filepath).load()
+    assert content.keys() == data.keys(), "Names mismatch"
+    for name, values in data.items():
+        assert np.array_equal(content[name], values), "Content mismatch"
+
+
 @pytest.mark.parametrize(
     "data, is_custom_class",
     argvalues=[(data_dict, False), (data_obj, True)],
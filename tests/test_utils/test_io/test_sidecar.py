@@ -0,0 +1,136 @@
+"""
+`test_utils.test_io.test_sidecar` [module]
+
+Notes
+-----
+The CSV loaders are used to produce the sidecars, since they are their main clients. The tests focus
+on the cache behavior (creation, reuse, invalidation), while the content itself is checked in
+`test_utils.test_io.test_savers_loaders`.
+
+See Also
+--------
+`utils.io_data.sidecar`: Tested module.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mock_data.python_objects import data_array_float, data_array_int, data_df
+from utils.io_data.loaders import LoaderCSVtoArrayFloat, LoaderCSVtoArrayInt, LoaderCSVtoDataFrame
+from utils.io_data.savers import SaverCSVArray, SaverCSVDataFrame
+from utils.io_data.sidecar import SidecarCache
+
+
+def list_sidecars(directory):
+    """List the sidecar files in a directory."""
+    return sorted(p.name for p in directory.iterdir() if SidecarCache.SEP in p.name)
+
+
+@pytest.mark.parametrize(
+    "data, loader_class",
+    argvalues=[(data_array_float, LoaderCSVtoArrayFloat), (data_array_int, LoaderCSVtoArrayInt)],
+    ids=["float", "int"],
+)
+def test_sidecar_reuse(tmp_path, data, loader_class):
+    """
+    Test that the first load creates a sidecar which serves the subsequent loads.
+
+    Test Inputs
+    -----------
+    data : np.ndarray
+        Array saved in a CSV file.
+
+    Expected Output
+    ---------------
+    One `.npy` sidecar after the first load. The second load returns a memory-mapped array with the
+    same content.
+    """
+    filepath = tmp_path / "test.csv"
+    SaverCSVArray(filepath).save(data)
+    first = loader_class(filepath).load()
+    assert len(list_sidecars(tmp_path)) == 1, "Sidecar not created"
+    second = loader_class(filepath).load()
+    assert isinstance(second, np.memmap), "Second load not served from the sidecar"
+    assert np.array_equal(first, second), "Content mismatch"
+    assert np.array_equal(second, data), "Content mismatch"
+
+
+def test_sidecar_invalidation(tmp_path):
+    """
+    Test that a modification of the source file invalidates the sidecar.
+
+    Test Inputs
+    -----------
+    data : np.ndarray
+        Array saved in a CSV file, then overwritten with different content.
+
+    Expected Output
+    ---------------
+    The second load returns the new content and the stale sidecar is removed.
+    """
+    filepath = tmp_path / "test.csv"
+    SaverCSVArray(filepath).save(data_array_float)
+    LoaderCSVtoArrayFloat(filepath).load()
+    stale = list_sidecars(tmp_path)
+    new_data = data_array_float * 2
+    SaverCSVArray(filepath).save(new_data)
+    stat = filepath.stat()
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # ensure mtime changes
+    content = LoaderCSVtoArrayFloat(filepath).load()
+    assert np.array_equal(content, new_data), "Stale content loaded"
+    sidecars = list_sidecars(tmp_path)
+    assert len(sidecars) == 1 and sidecars != stale, "Stale sidecar not replaced"
+
+
+def test_sidecar_disabled(tmp_path):
+    """
+    Test that no sidecar is written when the cache is disabled.
+
+    Expected Output
+    ---------------
+    No sidecar in the directory of the CSV file.
+    """
+    filepath = tmp_path / "test.csv"
+    SaverCSVArray(filepath).save(data_array_float)
+    content = LoaderCSVtoArrayFloat(filepath, cache=False).load()
+    assert np.array_equal(content, data_array_float), "Content mismatch"
+    assert not list_sidecars(tmp_path), "Unexpected sidecar"
+
+
+def test_sidecar_copy_on_write(tmp_path):
+    """
+    Test that modifying a loaded array does not alter the sidecar.
+
+    Expected Output
+    ---------------
+    A subsequent load returns the original content.
+    """
+    filepath = tmp_path / "test.csv"
+    SaverCSVArray(filepath).save(data_array_float)
+    LoaderCSVtoArrayFloat(filepath).load()
+    content = LoaderCSVtoArrayFloat(filepath).load()
+    content[...] = 0
+    reloaded = LoaderCSVtoArrayFloat(filepath).load()
+    assert np.array_equal(reloaded, data_array_float), "Sidecar altered"
+
+
+def test_sidecar_dataframe(tmp_path):
+    """
+    Test the sidecar of DataFrames in a separate cache directory.
+
+    Expected Output
+    ---------------
+    One sidecar in the cache directory, none next to the CSV file. Both loads return the input data.
+    """
+    filepath = tmp_path / "test.csv"
+    cache_dir = tmp_path / "cache"
+    SaverCSVDataFrame(filepath).save(data_df)
+    first = LoaderCSVtoDataFrame(filepath, cache_dir=cache_dir).load()
+    second = LoaderCSVtoDataFrame(filepath, cache_dir=cache_dir).load()
+    assert len(list_sidecars(cache_dir)) == 1, "Sidecar not created in the cache directory"
+    assert not list_sidecars(tmp_path), "Unexpected sidecar next to the source"
+    pd.testing.assert_frame_equal(first, data_df)
+    pd.testing.assert_frame_equal(second, data_df)
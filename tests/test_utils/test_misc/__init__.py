@@ -5,6 +5,9 @@ Modules
 -------
 :mod:`test_utils.test_misc.test_sequences`
 :mod:`test_utils.test_misc.test_functions`
+:mod:`test_utils.test_misc.test_tracing`
+:mod:`test_utils.test_misc.test_lazy`
+:mod:`test_utils.test_misc.test_shared_arrays`
 
 See Also
 --------
@@ -0,0 +1,31 @@
+"""
+:mod:`test_utils.test_misc.test_lazy` [module]
+
+See Also
+--------
+:mod:`utils.misc.lazy`: Tested module.
+"""
+import sys
+
+import pytest
+
+import utils.io_data
+
+
+def test_lazy_exports():
+    """
+    Test the deferred exports of a package (`utils.io_data`).
+
+    Expected Output
+    ---------------
+    - Exported names are listed by `dir` and resolved to the objects of their defining module.
+    - Resolved objects are cached in the namespace of the package.
+    - Unknown names raise an `AttributeError`.
+    """
+    assert "SaverNPY" in dir(utils.io_data)
+    from utils.io_data import SaverNPY  # pylint: disable=import-outside-toplevel
+
+    assert SaverNPY is sys.modules["utils.io_data.savers"].SaverNPY
+    assert vars(utils.io_data)["SaverNPY"] is SaverNPY
+    with pytest.raises(AttributeError):
+        getattr(utils.io_data, "SaverXYZ")
@@ -0,0 +1,164 @@
+"""
+:mod:`test_utils.test_misc.test_shared_arrays` [module]
+
+See Also
+--------
+:mod:`utils.misc.shared_arrays`: Tested module.
+"""
+# pylint: disable=missing-class-docstring
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import os
+import pickle
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from utils.misc.shared_arrays import SharedRegistry, sweep_stale
+
+
+SPIKES_DTYPE = np.dtype([("spikes", np.float64), ("block", np.int32)])
+
+
+class Component(np.ndarray):
+    METADATA = {"unit": None}
+
+    def __new__(cls, values, dims=None, **metadata):
+        obj = np.asarray(values).view(cls)
+        obj.dims = dims
+        obj.unit = metadata.get("unit")
+        return obj
+
+
+class Structure:
+    def __init__(self, unit, data=None, **coords):
+        self.unit = unit
+        self.data = data
+        self.coords = coords
+
+    def has_data(self):
+        return self.data is not None
+
+    def iter_coords(self):
+        yield from self.coords.items()
+
+
+def summarize(handle):
+    """Worker task: reduce a shared array and report whether it is a view on the segment."""
+    array = handle.open()
+    return float(array["spikes"].sum()), array.base is not None, array.flags.writeable
+
+
+def test_share_arrays():
+    """
+    Test packing several arrays in one segment and rebuilding them.
+
+    Test Inputs
+    -----------
+    Structured array of 1000 spikes, data component of 3 floats with dimensions and metadata.
+
+    Expected Output
+    ---------------
+    - One segment, arrays at aligned offsets.
+    - Handles: small when pickled, rebuilt as read-only views with the original class and metadata.
+    """
+    spikes = np.zeros(1000, dtype=SPIKES_DTYPE)
+    spikes["spikes"] = np.arange(1000)
+    rates = Component(np.arange(3.0), dims=("time",), unit="u1")
+    with SharedRegistry() as registry:
+        handles = registry.share_arrays("store", {"spikes": spikes, "rates": rates})
+        assert len(registry.segments) == 1
+        assert handles["rates"].offset % 64 == 0
+        assert len(pickle.dumps(handles["spikes"])) < 500
+        view = handles["spikes"].open()
+        assert np.array_equal(view, spikes) and not view.flags.writeable
+        assert np.shares_memory(view, handles["spikes"].open())  # same mapping, no copy
+        rebuilt = handles["rates"].open()
+        assert isinstance(rebuilt, Component)
+        assert rebuilt.dims == ("time",) and rebuilt.unit == "u1"
+        assert np.array_equal(rebuilt, rates)
+
+
+def test_share_structures():
+    """Test sharing the components of several structures in one segment."""
+    structures = [Structure(f"u{i}", np.full(5, i), block=np.arange(5)) for i in range(3)]
+    with SharedRegistry() as registry:
+        handles = registry.share_structures("units", structures)
+        assert len(registry.segments) == 1
+        for i, handle in enumerate(handles):
+            structure = handle.open()
+            assert structure.unit == f"u{i}"
+            assert np.array_equal(structure.data, np.full(5, i))
+            assert np.array_equal(structure.coords["block"], np.arange(5))
+
+
+def test_workers():
+    """
+    Test reading a shared array in worker processes.
+
+    Expected Output
+    ---------------
+    - Each worker reads a read-only view on the segment.
+    - The exit of the workers does not unlink the segment, which is unlinked when the registry is
+      closed.
+    """
+    spikes = np.zeros(10_000, dtype=SPIKES_DTYPE)
+    spikes["spikes"] = 1.0
+    with SharedRegistry() as registry:
+        handle = registry.share("spikes", spikes)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(summarize, [handle] * 4))
+        assert results == [(10_000.0, True, False)] * 4
+        assert np.array_equal(handle.open(), spikes)  # still available
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=handle.segment)
+    assert not registry.segments
+
+
+def test_invalid():
+    """Test errors for arrays of objects and duplicate keys."""
+    with SharedRegistry() as registry:
+        with pytest.raises(ValueError):
+            registry.share("objects", np.array(["a", None], dtype=object))
+        registry.share("x", np.ones(3))
+        with pytest.raises(ValueError):
+            registry.share("x", np.ones(3))
+
+
+def test_cleanup_on_crash():
+    """Test that the segments of a killed process are unlinked by the resource tracker."""
+    code = (
+        "import os, signal, numpy as np\n"
+        "from utils.misc.shared_arrays import SharedRegistry\n"
+        "registry = SharedRegistry()\n"
+        "print(registry.share('x', np.ones(100)).segment, flush=True)\n"
+        "os.kill(os.getpid(), signal.SIGKILL)\n"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=False, env=os.environ
+    )
+    segment = process.stdout.strip()
+    assert segment.startswith("mtcdb_")
+    for _ in range(50):  # the tracker unlinks asynchronously
+        try:
+            SharedMemory(name=segment).close()
+        except FileNotFoundError:
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail(f"Segment {segment} not unlinked.")
+
+
+def test_sweep_stale(tmp_path):
+    """Test removing the segments of dead processes only."""
+    with subprocess.Popen([sys.executable, "-c", "pass"]) as process:
+        dead = process.pid  # reaped when the context exits
+    (tmp_path / f"mtcdb_{dead}_0").touch()
+    (tmp_path / f"mtcdb_{os.getpid()}_0").touch()
+    (tmp_path / "other_1_0").touch()
+    assert sweep_stale(directory=tmp_path) == [f"mtcdb_{dead}_0"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"mtcdb_{os.getpid()}_0", "other_1_0"]
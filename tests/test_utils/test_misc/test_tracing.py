@@ -0,0 +1,116 @@
+"""
+:mod:`test_utils.test_misc.test_tracing` [module]
+
+See Also
+--------
+:mod:`utils.misc.tracing`: Tested module.
+"""
+# pylint: disable=missing-class-docstring
+# pylint: disable=arguments-differ
+
+import json
+
+import numpy as np
+
+from core.pipelines.base_pipeline import Pipeline
+from core.processors.base_processor import Processor
+from core.steps.base_step import Step
+from utils.io_data.loaders import LoaderNPY
+from utils.io_data.savers import SaverNPY
+from utils.misc.tracing import TRACER, format_summary, summarize, trace_run
+
+
+class Doubler(Processor):
+    def process(self, x=None, **kwargs):
+        return 2 * x
+
+
+class SaveStep(Step):
+    def __init__(self, path) -> None:
+        self.path = path
+
+    def execute(self) -> None:
+        x = LoaderNPY(self.path).load()
+        SaverNPY(self.path).save(Doubler().process(x=x))
+
+    def load_checkpoint(self):
+        return None
+
+    def save_checkpoint(self) -> None:
+        return None
+
+
+class DummyPipeline(Pipeline):
+    def execute(self, inputs) -> None:
+        for _ in range(2):
+            SaveStep(inputs).execute()
+
+
+def test_disabled(tmp_path):
+    """Test that no span is recorded when the tracer is disabled."""
+    path = tmp_path / "data.npy"
+    np.save(path, np.ones(10))
+    TRACER.reset()
+    DummyPipeline(config=None).execute(path)
+    assert not TRACER.spans
+    assert np.all(np.load(path) == 4)
+    assert DummyPipeline.execute.__traced__ and SaveStep.execute.__name__ == "execute"
+
+
+def test_trace_run(tmp_path):
+    """
+    Test the nesting of the spans, the I/O measures and the saved trace.
+
+    Test Inputs
+    -----------
+    Pipeline running two steps, each loading and saving an array of 1000 floats and calling one
+    processor.
+
+    Expected Output
+    ---------------
+    - Spans: 1 pipeline, 2 steps, 2 processors, each step nested in the pipeline and each processor
+      in a step.
+    - I/O: each step reads and writes one file, the pipeline accumulates the I/O of both steps.
+    - Trace file: saved in the run directory, with the raw spans and the Chrome trace events.
+    """
+    path = tmp_path / "data.npy"
+    np.save(path, np.ones(1000))
+    size = path.stat().st_size
+    with trace_run(run_dir=tmp_path / "run", filename="trace.json") as tracer:
+        DummyPipeline(config=None).execute(path)
+    assert not TRACER.enabled
+    spans = {span.id: span for span in tracer.spans}
+    kinds = [span.kind for span in tracer.spans]
+    assert [kinds.count(kind) for kind in ("pipeline", "step", "processor")] == [1, 2, 2]
+    for span in spans.values():
+        if span.kind == "step":
+            assert spans[span.parent].kind == "pipeline"
+            assert span.bytes_read == size and span.bytes_written == size
+        elif span.kind == "processor":
+            assert spans[span.parent].kind == "step"
+        else:
+            assert span.parent == -1
+            assert span.bytes_read == 2 * size and span.bytes_written == 2 * size
+        assert span.wall_s >= 0 and span.cpu_s >= 0
+    summary = tracer.summary()
+    assert list(summary["kind"]) == ["pipeline", "step", "processor"]
+    assert list(summary["n_calls"]) == [1, 2, 2]
+    assert "DummyPipeline" in format_summary(summary)
+    # Saved trace
+    assert tracer.path == tmp_path / "run" / "trace.json"
+    with tracer.path.open("r", encoding="utf-8") as file:
+        content = json.load(file)
+    assert len(content["spans"]) == len(content["traceEvents"]) == 5
+    assert summarize(content["spans"]).equals(summary)
+
+
+def test_trace_run_error(tmp_path):
+    """Test that the trace is saved and the tracer disabled even if the run fails."""
+    try:
+        with trace_run(run_dir=tmp_path, filename="trace.json"):
+            Doubler().process(x=None)
+    except TypeError:
+        pass
+    assert not TRACER.enabled
+    assert (tmp_path / "trace.json").is_file()
+    assert [span.name for span in TRACER.spans] == ["Doubler"]